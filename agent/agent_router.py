@@ -1,17 +1,121 @@
-"""Agent Router - Single coordinator agent with all tools"""
+"""Agent Router - Session-scoped coordinator agents with all tools"""
 from strands import Agent, tool
 from strands.models import BedrockModel
+from strands.tools.executors import ConcurrentToolExecutor
+import asyncio
 import json
-from agents.customer_agent import list_customers, get_customer_profile
-from agents.product_agent import list_available_bonds, get_product_details, search_market_data
-from agents.marketing_agent import send_email, get_recent_emails
-from agents.recommendation_agent import get_bond_recommendations_for_customer, get_most_sellable_bond_with_customers
+import os
+from agents.customer_agent import list_customers_async, get_customer_profile_async, customer_query_async
+from agents.product_agent import list_available_bonds_async, get_product_details_async, search_market_data_async
+from agents.marketing_agent import send_email_async, get_recent_emails_async
+from agents.recommendation_agent import get_bond_recommendations_for_customer_async, get_most_sellable_bond_with_customers_async
+from utils.session_pool import SessionAgentPool
+from utils.tool_concurrency import ToolConcurrencyLimiter
+
+COORDINATOR_POOL_MAX_AGENTS = int(os.environ.get('COORDINATOR_POOL_MAX_AGENTS', '64'))
+COORDINATOR_POOL_IDLE_TTL_SECONDS = float(os.environ.get('COORDINATOR_POOL_IDLE_TTL_SECONDS', '900'))
+DEFAULT_SESSION_ID = 'default'
+# Coordinator state: how many turns of the client's history its messages cover
+HISTORY_TURNS_STATE = 'historyTurns'
+
+# Per-tool caps on simultaneous calls (the Lambda round trips themselves are bounded
+# process-wide by LAMBDA_MAX_CONCURRENCY in agents/tool_transport.py)
+TOOL_DEFAULT_CONCURRENCY = int(os.environ.get('TOOL_DEFAULT_CONCURRENCY', '4'))
+TOOL_CONCURRENCY_LIMITS = {
+    'customer_get_profile': 8,
+    'product_get_details': 8,
+    'marketing_send_email': 2,
+}
+
+COORDINATOR_SYSTEM_PROMPT = """You are the Bank X Financial Assistant.
+
+**Your Role:**
+- Process user requests and use appropriate tools to fulfill them
+- Provide comprehensive responses combining information from multiple sources when needed
+- Guide users through workflows that require multiple steps
+- Analyze customer profiles and recommend suitable bond products
+
+**Available Tools:**
+
+**Customer Management:**
+- customer_list_customers(fields, sort_by, descending, limit, cursor): List customers a page at a time (ID, name, email by default); pass nextCursor as cursor for the next page
+- customer_get_profile(customer_id): Get detailed customer profile
+- customer_query(filters, fields, sort_by, descending, limit, offset): Find customers by segment (risk tolerance, sectors, goals, bond interest, account status, liquidity needs, portfolio value, income, horizon, last contact) with counts and a page of results
+
+**Product Information:**
+- product_list_bonds(fields, sort_by, descending, limit, cursor): Show available bond products a page at a time, optionally sorted (e.g. sort_by="yield")
+- product_get_details(product_name): Get detailed product information
+- product_search_market(product_type): Research market trends and comparable products
+
+**Bond Recommendations:**
+- recommendation_get_bond_recommendations(customer_id, top_k): Rank bonds for a customer with a deterministic suitability score and per-factor breakdown (risk, sector, horizon, affordability, liquidity, ESG)
+- recommendation_find_most_sellable_bond(limit): Find the bond with highest demand/sellability and the customers already matched to it, each with the reasons they suit it
+
+**Email Operations:**
+- marketing_send_email(customer_email, subject, body, approved, preview_id): Send marketing emails (requires two-step approval)
+  * Step 1: Call with approved=False to preview email and get preview_id
+  * Step 2: Show preview to user and ask for confirmation
+  * Step 3: Call with approved=True and preview_id to actually send
+- marketing_get_recent_emails(limit): View recently sent emails
+
+**Workflow Examples:**
+
+For "Show all bonds":
+1. Use product_list_bonds() to get all available products
+
+For "Get customer details":
+1. Use customer_get_profile() with the customer ID
+
+For customer segment questions (e.g. "high-risk customers interested in green bonds"):
+1. Use customer_query() with one filter per condition, e.g.
+   {"riskTolerance": "high", "preferredSectors": ["green"], "interestedInBonds": true}
+2. Report the total and the customers on the page; fetch more pages with offset=nextOffset only if needed
+3. Do not page through customer_get_profile to answer a segment question
+
+For "Recommend bonds for [customer]":
+1. Use recommendation_get_bond_recommendations(customer_id) to get the ranked bonds (already scored; do not re-rank)
+2. Provide natural language recommendations explaining, from the factor breakdown, why each bond suits their profile
+
+For "Find most sellable bond and suitable customers":
+1. Use recommendation_find_most_sellable_bond() to get the top-demand bond and its matched customers
+2. The matching is already computed over every customer's full profile (interest in bonds, portfolio
+   vs. minimum investment, risk tolerance vs. risk rating, goal or sector alignment); do not call
+   customer_get_profile for each customer or re-check the matches
+3. Explain why each matched customer suits the bond, using their reasons
+4. Provide customer IDs and emails for matched customers
+5. If user wants to send emails, coordinate with marketing workflow
+
+For "Email customers about bonds":
+1. Use product_get_details() to get product information
+2. Use customer_query() (or customer_list_customers() for everyone) to identify target customers
+3. For each email:
+   a. Call marketing_send_email() with approved=False to get preview
+   b. Show preview to user and ask for confirmation
+   c. If user confirms, call marketing_send_email() again with approved=True and the preview_id
+   d. If user declines, skip and move to next customer
+
+For "Show market trends":
+1. Use product_search_market() for market analysis
+
+**Important Guidelines:**
+- Always use tools to get current, accurate information
+- Combine multiple tool calls when needed for comprehensive responses
+- Present information clearly and professionally
+- For email operations, ALWAYS follow the two-step approval process:
+  1. Generate preview first (approved=False)
+  2. Present preview to user and explicitly ask for confirmation
+  3. Only send (approved=True with preview_id) after user confirms with "yes", "send", or similar affirmation
+  4. Do NOT send emails without user confirmation
+- For email operations, create personalized, detailed messages
+- For recommendations, explain your analysis in conversational, natural language
+- Ensure proper formatting for all responses"""
 
 
 class AgentRouter:
-    """Single coordinator agent with all tools integrated"""
+    """Coordinator agents with all tools integrated, pooled per session"""
     
-    def __init__(self, customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent):
+    def __init__(self, customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent, model=None,
+                 history_compactor=None):
         # Store agents for reference (not used for tool execution)
         self.customer_agent = customer_agent
         self.product_agent = product_agent
@@ -20,16 +124,38 @@ class AgentRouter:
         self.recommendation_agent = recommendation_agent
         
         model_id = "global.anthropic.claude-haiku-4-5-20251001-v1:0"
-        model = BedrockModel(model_id=model_id)
+        self.model = model or BedrockModel(model_id=model_id)
+
+        # Bounds what a session coordinator retains between turns (None: unbounded)
+        self.history_compactor = history_compactor
+
+        # Tools requested together in one model turn run concurrently and await their
+        # Lambda calls without blocking the event loop
+        self.tool_limiter = ToolConcurrencyLimiter(
+            default_limit=TOOL_DEFAULT_CONCURRENCY,
+            limits=TOOL_CONCURRENCY_LIMITS,
+        )
         
         # Define all tools directly at this level
         @tool
-        def customer_list_customers():
-            """Get the list of all Bank X customers. Returns a summary list with customer ID, name, and email."""
-            return list_customers()
+        async def customer_list_customers(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                                          cursor: str = None):
+            """Get a page of Bank X customers. By default each has customer ID, name, and email.
+            
+            Args:
+                fields: Customer fields to return (default: customerId, name, email), e.g. ["name", "portfolioValue"]
+                sort_by: Optional field to order by (default: customerId)
+                descending: Sort from the highest value (default: False)
+                limit: Customers on the page (default: 50, max 500)
+                cursor: nextCursor from the previous page, with the same sort_by and descending
+            
+            Returns:
+                The page of customers, the total number of customers, and nextCursor (null on the last page)
+            """
+            return await self.tool_limiter.run('customer_list_customers', list_customers_async, fields, sort_by, descending, limit, cursor)
         
         @tool
-        def customer_get_profile(customer_id: str):
+        async def customer_get_profile(customer_id: str):
             """Get the full profile for a specific customer by their customer ID.
             
             Args:
@@ -38,27 +164,64 @@ class AgentRouter:
             Returns:
                 Full customer profile including portfolio value, investment preferences, and bond interest
             """
-            return get_customer_profile(customer_id)
+            return await self.tool_limiter.run('customer_get_profile', get_customer_profile_async, customer_id)
         
         @tool
-        def product_list_bonds():
-            """Get a list of all available bond products. Returns a summary with product name, yield, maturity, and minimum investment for each bond."""
-            return list_available_bonds()
+        async def customer_query(filters: dict = None, fields: list = None, sort_by: str = None, descending: bool = False,
+                                 limit: int = 20, offset: int = 0):
+            """Find customers by segment using the customer indexes, instead of reading profiles one by one.
+            
+            Args:
+                filters: Field -> condition; every field must match. Categorical fields take a value or a
+                    list of values (any may match): riskTolerance ("low", "medium", "high"), preferredSectors,
+                    investmentGoals, interestedInBonds (true/false), accountStatus, liquidityNeeds. Range
+                    fields take {"min": ..., "max": ...} (inclusive, either optional) or an exact value:
+                    portfolioValue, annualIncome, investmentHorizon (years), lastContact ("YYYY-MM-DD").
+                    Example: {"riskTolerance": "high", "preferredSectors": ["green"], "portfolioValue": {"min": 100000}}
+                fields: Customer fields to return for each customer on the page (default: customerId, name, email)
+                sort_by: Optional range field to order by (e.g. "portfolioValue")
+                descending: Sort from the highest value (default: False)
+                limit: Customers on the page (default: 20, max 200)
+                offset: Matches to skip, for the next page (use nextOffset from the previous result)
+            
+            Returns:
+                The total number of matches, the matching customer IDs (up to 1000), a page of customers
+                with the requested fields, and nextOffset (null on the last page)
+            """
+            return await self.tool_limiter.run('customer_query', customer_query_async, filters, fields, sort_by, descending, limit, offset)
         
         @tool
-        def product_get_details(product_name: str):
+        async def product_list_bonds(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                                     cursor: str = None):
+            """Get a page of available bond products. By default each has product name, type, yield, maturity, minimum investment and credit rating.
+            
+            Args:
+                fields: Bond fields to return instead of the summary, e.g. ["name", "yield", "esgScore"]
+                sort_by: Optional field to order by, e.g. "yield" (default: productId)
+                descending: Sort from the highest value (default: False)
+                limit: Bonds on the page (default: 50, max 500)
+                cursor: nextCursor from the previous page, with the same sort_by and descending
+            
+            Returns:
+                The page of bonds, the total number of bonds, and nextCursor (null on the last page)
+            """
+            return await self.tool_limiter.run('product_list_bonds', list_available_bonds_async, fields, sort_by, descending, limit, cursor)
+        
+        @tool
+        async def product_get_details(product_name: str):
             """Get detailed information about a financial product.
             
             Args:
-                product_name: The name of the product (e.g., 'government-bond-y', 'UK Government Bond Series Y')
+                product_name: The product ID, name or file name (e.g., 'BOND-GB-2025-Y', 'UK Government Bond Series Y',
+                    'government-bond-y'); partial names such as 'corporate bond a' also match
             
             Returns:
                 Full product details including yield, maturity, minimum investment, and description
             """
-            return get_product_details(product_name)
+            return await self.tool_limiter.run('product_get_details', get_product_details_async, product_name)
         
         @tool
-        def product_search_market(product_type: str):
+        async def product_search_market(product_type: str):
             """Search for market data and comparable products for a given product type.
             
             Args:
@@ -67,10 +230,10 @@ class AgentRouter:
             Returns:
                 Market analysis including yield trends and comparable products with description
             """
-            return search_market_data(product_type)
+            return await self.tool_limiter.run('product_search_market', search_market_data_async, product_type)
         
         @tool
-        def marketing_send_email(customer_email: str, subject: str, body: str, approved: bool = False, preview_id: str = ""):
+        async def marketing_send_email(customer_email: str, subject: str, body: str, approved: bool = False, preview_id: str = ""):
             """Send an email to a customer. Requires two-step process: preview first, then send with approval.
             
             WORKFLOW:
@@ -88,10 +251,10 @@ class AgentRouter:
             Returns:
                 Preview response (with preview_id) if approved=False, or confirmation message if approved=True
             """
-            return send_email(customer_email, subject, body, approved, preview_id)
+            return await self.tool_limiter.run('marketing_send_email', send_email_async, customer_email, subject, body, approved, preview_id)
         
         @tool
-        def marketing_get_recent_emails(limit: int = 10):
+        async def marketing_get_recent_emails(limit: int = 10):
             """Get metadata for the most recently sent emails.
             
             Args:
@@ -100,30 +263,32 @@ class AgentRouter:
             Returns:
                 List of recent email metadata including timestamp, recipient, and subject
             """
-            return get_recent_emails(limit)
+            return await self.tool_limiter.run('marketing_get_recent_emails', get_recent_emails_async, limit)
         
         @tool
-        def recommendation_get_bond_recommendations(customer_id: str):
+        async def recommendation_get_bond_recommendations(customer_id: str, top_k: int = 3):
             """Get personalized bond recommendations for a specific customer.
             
-            Analyzes the customer's profile (risk tolerance, investment horizon, financial goals, 
-            portfolio size, preferred sectors) against available bonds to provide tailored recommendations.
+            Scores every available bond against the customer's profile (risk tolerance, preferred
+            sectors, investment horizon, portfolio size, liquidity needs) plus the bond's ESG score,
+            and returns the best matches. The ranking is deterministic; explain it, do not redo it.
             
             Args:
                 customer_id: The customer ID (e.g., 'CUST-001')
+                top_k: How many of the best-scoring bonds to return (default: 3)
             
             Returns:
-                Customer and bond data for the AI to analyze and generate natural language recommendations
+                The top bonds with a 0-100 score and per-factor breakdown, plus excluded bonds with reasons
             """
-            return get_bond_recommendations_for_customer(customer_id)
+            return await self.tool_limiter.run('recommendation_get_bond_recommendations', get_bond_recommendations_for_customer_async, customer_id, top_k)
         
         @tool
-        def recommendation_find_most_sellable_bond():
-            """Find the most sellable bond (highest demand) and identify all suitable customers.
+        async def recommendation_find_most_sellable_bond(limit: int = 50):
+            """Find the most sellable bond (highest demand) and the customers who suit it.
             
             This tool:
             1. Identifies the bond with the highest sellability (demandScore/sellabilityRank)
-            2. Returns all customer profiles for analysis
+            2. Matches every customer's full profile against it server-side
             3. Provides demand metrics and trends for the top bond
             
             Use this to answer questions like:
@@ -131,116 +296,104 @@ class AgentRouter:
             - "Find the most popular bond and who should buy it"
             - "Which bond has the highest demand and which customers would be interested?"
             
+            Args:
+                limit: Most matched customers to return, largest portfolios first (default: 50)
+            
             Returns:
-                JSON with the most sellable bond, all customers, and demand analytics
+                JSON with the most sellable bond, the matched customers with reasons, and demand analytics
             """
-            return get_most_sellable_bond_with_customers()
+            return await self.tool_limiter.run('recommendation_find_most_sellable_bond', get_most_sellable_bond_with_customers_async, limit)
         
-        # Create coordinator agent with all tools
-        self.coordinator = Agent(
-            model=model,
-            tools=[
-                customer_list_customers,
-                customer_get_profile,
-                product_list_bonds,
-                product_get_details,
-                product_search_market,
-                marketing_send_email,
-                marketing_get_recent_emails,
-                recommendation_get_bond_recommendations,
-                recommendation_find_most_sellable_bond
-            ],
-            system_prompt="""You are the Bank X Financial Assistant.
+        self.tools = [
+            customer_list_customers,
+            customer_get_profile,
+            customer_query,
+            product_list_bonds,
+            product_get_details,
+            product_search_market,
+            marketing_send_email,
+            marketing_get_recent_emails,
+            recommendation_get_bond_recommendations,
+            recommendation_find_most_sellable_bond
+        ]
 
-**Your Role:**
-- Process user requests and use appropriate tools to fulfill them
-- Provide comprehensive responses combining information from multiple sources when needed
-- Guide users through workflows that require multiple steps
-- Analyze customer profiles and recommend suitable bond products
-
-**Available Tools:**
-
-**Customer Management:**
-- customer_list_customers(): List all customers with ID, name, email
-- customer_get_profile(customer_id): Get detailed customer profile
-
-**Product Information:**
-- product_list_bonds(): Show all available bond products  
-- product_get_details(product_name): Get detailed product information
-- product_search_market(product_type): Research market trends and comparable products
-
-**Bond Recommendations:**
-- recommendation_get_bond_recommendations(customer_id): Generate personalized bond recommendations for a customer based on their risk tolerance, investment horizon, goals, and portfolio
-- recommendation_find_most_sellable_bond(): Find the bond with highest demand/sellability and identify all suitable customers for it
-
-**Email Operations:**
-- marketing_send_email(customer_email, subject, body, approved, preview_id): Send marketing emails (requires two-step approval)
-  * Step 1: Call with approved=False to preview email and get preview_id
-  * Step 2: Show preview to user and ask for confirmation
-  * Step 3: Call with approved=True and preview_id to actually send
-- marketing_get_recent_emails(limit): View recently sent emails
+        # One coordinator per session so concurrent users never share message history
+        self.sessions = SessionAgentPool(
+            self._create_coordinator,
+            max_agents=COORDINATOR_POOL_MAX_AGENTS,
+            idle_ttl_seconds=COORDINATOR_POOL_IDLE_TTL_SECONDS,
+            lock_factory=asyncio.Lock,
+        )
 
-**Workflow Examples:**
+    def _create_coordinator(self):
+        """Create a coordinator agent with all tools (the model client is shared)"""
+        return Agent(
+            model=self.model,
+            tools=self.tools,
+            system_prompt=COORDINATOR_SYSTEM_PROMPT,
+            tool_executor=ConcurrentToolExecutor(),
+            callback_handler=None
+        )
 
-For "Show all bonds":
-1. Use product_list_bonds() to get all available products
+    @property
+    def coordinator(self):
+        """Coordinator for callers without a session (scripts and tests)"""
+        return self.sessions.get(DEFAULT_SESSION_ID)
 
-For "Get customer details":
-1. Use customer_get_profile() with the customer ID
+    def _session_prompt(self, coordinator, user_input: str, history_context: str, history_turns: int) -> str:
+        """The prompt for a session coordinator's next turn.
 
-For "Recommend bonds for [customer]":
-1. Use recommendation_get_bond_recommendations(customer_id) to analyze customer and available bonds
-2. Provide natural language recommendations with clear reasoning about why each bond suits their profile
+        A coordinator that has carried every turn of the client's history (``history_turns``
+        of them) already holds those turns in its messages, so it gets only the new input
+        while they fit the history token budget. When its turns differ from the client's
+        (turns answered by the intent fast path or the suggestion service never reach it),
+        past the budget, or for a new or evicted coordinator, its messages are reset and
+        the compacted history is injected instead, so every earlier turn reaches the model
+        exactly once and within the budget. Callers that send no history keep their own
+        messages, trimmed oldest turn first.
+        """
+        messages = coordinator.messages
+        if history_context and coordinator.state.get(HISTORY_TURNS_STATE) != history_turns:
+            messages.clear()
+        coordinator.state.set(HISTORY_TURNS_STATE, history_turns + 1)
+        if messages and (self.history_compactor is None or self.history_compactor.fits(messages)):
+            return user_input
+        if messages and not history_context:
+            self.history_compactor.trim_messages(messages)
+            return user_input
+        messages.clear()
+        return history_context + user_input
 
-For "Find most sellable bond and suitable customers":
-1. Use recommendation_find_most_sellable_bond() to get the top-demand bond and all customers
-2. Analyze each customer against the bond characteristics
-3. List customers who are suitable based on:
-   - Interest in bonds (interestedInBonds field)
-   - Portfolio value meets minimum investment
-   - Risk tolerance matches bond risk rating
-   - Investment goals align with bond features
-   - Sector preferences match
-4. Provide customer IDs and emails for matched customers
-5. If user wants to send emails, coordinate with marketing workflow
+    async def stream_async(self, user_input: str, session_id: str = None, history_context: str = '',
+                           history_turns: int = 0):
+        """Stream response from the coordinator agent for the given session.
 
-For "Email customers about bonds":
-1. Use product_get_details() to get product information
-2. Use customer_list_customers() to identify target customers
-3. For each email:
-   a. Call marketing_send_email() with approved=False to get preview
-   b. Show preview to user and ask for confirmation
-   c. If user confirms, call marketing_send_email() again with approved=True and the preview_id
-   d. If user declines, skip and move to next customer
+        ``history_context`` is the compacted conversation history ("" for none) and
+        ``history_turns`` the number of user turns in the history it was built from. Without
+        a session id a throwaway coordinator is used, so anonymous invocations neither
+        share nor accumulate history.
+        """
+        if not session_id:
+            async for event in self._create_coordinator().stream_async(history_context + user_input):
+                yield event
+            return
 
-For "Show market trends":
-1. Use product_search_market() for market analysis
+        coordinator, lock = self.sessions.acquire(session_id)
+        async with lock:
+            prompt = self._session_prompt(coordinator, user_input, history_context, history_turns)
+            async for event in coordinator.stream_async(prompt):
+                yield event
 
-**Important Guidelines:**
-- Always use tools to get current, accurate information
-- Combine multiple tool calls when needed for comprehensive responses
-- Present information clearly and professionally
-- For email operations, ALWAYS follow the two-step approval process:
-  1. Generate preview first (approved=False)
-  2. Present preview to user and explicitly ask for confirmation
-  3. Only send (approved=True with preview_id) after user confirms with "yes", "send", or similar affirmation
-  4. Do NOT send emails without user confirmation
-- For email operations, create personalized, detailed messages
-- For recommendations, explain your analysis in conversational, natural language
-- Ensure proper formatting for all responses""",
-            callback_handler=None
-        )
-    
-    async def stream_async(self, user_input: str):
-        """Stream response from the coordinator agent"""
-        async for event in self.coordinator.stream_async(user_input):
-            yield event
-    
-    def __call__(self, user_input: str):
+    def __call__(self, user_input: str, session_id: str = None, history_context: str = '', history_turns: int = 0):
         """Synchronous call to coordinator agent"""
-        return self.coordinator(user_input)
+        if not session_id:
+            return self._create_coordinator()(history_context + user_input)
+        coordinator = self.sessions.get(session_id)
+        return coordinator(self._session_prompt(coordinator, user_input, history_context, history_turns))
 
 
-def create_agent_router(customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent):
+def create_agent_router(customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent, model=None,
+                        history_compactor=None):
     """Factory function to create an AgentRouter instance"""
-    return AgentRouter(customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent)
+    return AgentRouter(customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent, model=model,
+                       history_compactor=history_compactor)
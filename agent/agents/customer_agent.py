@@ -1,69 +1,75 @@
 """Customer Service Agent - Handles customer queries and profiles"""
 from strands import Agent, tool
-import json
-import boto3
 import os
-import time
 from strands.models import BedrockModel
-
-# Initialize Lambda client
-AWS_REGION = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'eu-west-1'))
-lambda_client = boto3.client('lambda', region_name=AWS_REGION)
+from utils.tool_output import encode_tool_output
+from .tool_transport import transport
 
 LIST_CUSTOMERS_ARN = os.environ.get('LIST_CUSTOMERS_FUNCTION_ARN', '')
 GET_CUSTOMER_ARN = os.environ.get('GET_CUSTOMER_FUNCTION_ARN', '')
+CUSTOMER_QUERY_ARN = os.environ.get('CUSTOMER_QUERY_FUNCTION_ARN', '')
 
 
-def log_event(event: dict):
-    print(json.dumps(event))
+def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Invoke a tool Lambda through the shared transport and return the parsed response."""
+    return transport.invoke(function_arn, payload, agent_name='customer_agent', tool_name=tool_name)
 
 
-def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
-    """Helper to invoke Lambda and return parsed response."""
-    start = time.perf_counter()
-    try:
-        if not function_arn:
-            return {'error': 'Lambda function ARN not configured'}
-
-        response = lambda_client.invoke(
-            FunctionName=function_arn,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(payload or {})
-        )
-
-        lambda_request_id = response.get('ResponseMetadata', {}).get('RequestId')
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-        status_code = result.get('statusCode')
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
-
-        if status_code == 200:
-            log_event({
-                'eventType': 'agent.tool.success',
-                'agentName': 'customer_agent',
-                'toolName': tool_name,
-                'functionArn': function_arn,
-                'lambdaInvokeRequestId': lambda_request_id,
-                'requestId': body.get('requestId'),
-                'durationMs': duration_ms,
-                'timestamp': time.time(),
-            })
-            return body
-
-        error_msg = body.get('error') or body.get('message') or 'Unknown error'
-        return {'error': error_msg, 'requestId': body.get('requestId'), 'statusCode': status_code}
-    except Exception as e:
-        error_msg = f"Lambda invocation failed: {str(e)}"
-        return {'error': error_msg}
+async def invoke_lambda_async(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Awaitable invoke_lambda: runs on the shared Lambda executor with a timeout."""
+    return await transport.invoke_async(function_arn, payload, agent_name='customer_agent', tool_name=tool_name)
 
 
-@tool
-def list_customers():
-    """Get the list of all Bank X customers. Returns a summary list with customer ID, name, and email."""
-    result = invoke_lambda(LIST_CUSTOMERS_ARN, tool_name='list_customers')
+def _list_page_payload(fields, sort_by, descending, limit, cursor) -> dict:
+    return {'fields': fields, 'sort_by': sort_by, 'descending': descending, 'limit': limit, 'cursor': cursor}
+
+
+def _format_customer_list(result: dict):
+    if 'error' in result:
+        return f"Error: {result['error']}"
+    return encode_tool_output({key: result.get(key) for key in ('customers', 'total', 'nextCursor')})
+
+
+def _format_customer_profile(result: dict):
     if 'error' in result:
         return f"Error: {result['error']}"
-    return json.dumps(result.get('customers', []), indent=2)
+    return encode_tool_output(result.get('customer', {}))
+
+
+def _customer_query_payload(filters, fields, sort_by, descending, limit, offset) -> dict:
+    return {
+        'filters': filters or {},
+        'fields': fields,
+        'sort_by': sort_by,
+        'descending': descending,
+        'limit': limit,
+        'offset': offset,
+    }
+
+
+def _format_customer_query(result: dict):
+    if 'error' in result:
+        return f"Error: {result['error']}"
+    return encode_tool_output({key: result.get(key) for key in ('total', 'customerIds', 'customers', 'nextOffset')})
+
+
+@tool
+def list_customers(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                   cursor: str = None):
+    """Get a page of Bank X customers. By default each has customer ID, name, and email.
+    
+    Args:
+        fields: Customer fields to return (default: customerId, name, email), e.g. ["name", "portfolioValue"]
+        sort_by: Optional field to order by (default: customerId)
+        descending: Sort from the highest value (default: False)
+        limit: Customers on the page (default: 50, max 500)
+        cursor: nextCursor from the previous page, with the same sort_by and descending
+    
+    Returns:
+        The page of customers, the total number of customers, and nextCursor (null on the last page)
+    """
+    payload = _list_page_payload(fields, sort_by, descending, limit, cursor)
+    return _format_customer_list(invoke_lambda(LIST_CUSTOMERS_ARN, payload, tool_name='list_customers'))
 
 
 @tool
@@ -76,10 +82,52 @@ def get_customer_profile(customer_id: str):
     Returns:
         Full customer profile including portfolio value, investment preferences, and bond interest
     """
-    result = invoke_lambda(GET_CUSTOMER_ARN, {'customer_id': customer_id}, tool_name='get_customer_profile')
-    if 'error' in result:
-        return f"Error: {result['error']}"
-    return json.dumps(result.get('customer', {}), indent=2)
+    return _format_customer_profile(invoke_lambda(GET_CUSTOMER_ARN, {'customer_id': customer_id}, tool_name='get_customer_profile'))
+
+
+@tool
+def customer_query(filters: dict = None, fields: list = None, sort_by: str = None, descending: bool = False,
+                   limit: int = 20, offset: int = 0):
+    """Find customers by segment using the customer indexes, instead of reading profiles one by one.
+    
+    Args:
+        filters: Field -> condition; every field must match. Categorical fields take a value or a
+            list of values (any may match): riskTolerance ("low", "medium", "high"), preferredSectors,
+            investmentGoals, interestedInBonds (true/false), accountStatus, liquidityNeeds. Range
+            fields take {"min": ..., "max": ...} (inclusive, either optional) or an exact value:
+            portfolioValue, annualIncome, investmentHorizon (years), lastContact ("YYYY-MM-DD").
+            Example: {"riskTolerance": "high", "preferredSectors": ["green"], "portfolioValue": {"min": 100000}}
+        fields: Customer fields to return for each customer on the page (default: customerId, name, email)
+        sort_by: Optional range field to order by (e.g. "portfolioValue")
+        descending: Sort from the highest value (default: False)
+        limit: Customers on the page (default: 20, max 200)
+        offset: Matches to skip, for the next page (use nextOffset from the previous result)
+    
+    Returns:
+        The total number of matches, the matching customer IDs (up to 1000), a page of customers
+        with the requested fields, and nextOffset (null on the last page)
+    """
+    payload = _customer_query_payload(filters, fields, sort_by, descending, limit, offset)
+    return _format_customer_query(invoke_lambda(CUSTOMER_QUERY_ARN, payload, tool_name='customer_query'))
+
+
+async def list_customers_async(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                               cursor: str = None):
+    """Awaitable list_customers for async callers such as the coordinator's tools."""
+    payload = _list_page_payload(fields, sort_by, descending, limit, cursor)
+    return _format_customer_list(await invoke_lambda_async(LIST_CUSTOMERS_ARN, payload, tool_name='list_customers'))
+
+
+async def get_customer_profile_async(customer_id: str):
+    """Awaitable get_customer_profile for async callers such as the coordinator's tools."""
+    return _format_customer_profile(await invoke_lambda_async(GET_CUSTOMER_ARN, {'customer_id': customer_id}, tool_name='get_customer_profile'))
+
+
+async def customer_query_async(filters: dict = None, fields: list = None, sort_by: str = None, descending: bool = False,
+                               limit: int = 20, offset: int = 0):
+    """Awaitable customer_query for async callers such as the coordinator's tools."""
+    payload = _customer_query_payload(filters, fields, sort_by, descending, limit, offset)
+    return _format_customer_query(await invoke_lambda_async(CUSTOMER_QUERY_ARN, payload, tool_name='customer_query'))
 
 
 def create_customer_agent():
@@ -89,7 +137,7 @@ def create_customer_agent():
 
     agent = Agent(
         model=model,
-        tools=[list_customers, get_customer_profile],
+        tools=[list_customers, get_customer_profile, customer_query],
         system_prompt="""You are the Bank X Customer Service Agent.
 
 Your responsibilities:
@@ -98,9 +146,11 @@ Your responsibilities:
 - Help identify customers based on their characteristics
 
 When asked about customers:
-1. Use list_customers() to get all customers
-2. Use get_customer_profile(customer_id) to get detailed information
-3. Filter and analyze customer data based on the query
+1. Use customer_query(filters) to find customers by segment (risk tolerance, sectors, goals,
+   bond interest, portfolio value, income, horizon, last contact) in one call
+2. Use get_customer_profile(customer_id) to get detailed information on specific customers
+3. Use list_customers() only when the user wants every customer; it returns a page at a time
+   (pass nextCursor as cursor for the next page)
 
 You focus ONLY on customer-related queries. For product information or marketing campaigns, 
 you will defer to the appropriate specialized agent.""",
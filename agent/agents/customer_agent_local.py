@@ -1,34 +1,38 @@
 """Customer Service Agent - Local Version"""
 from strands import Agent, tool
-import json
 import os
 from strands.models import BedrockModel
+from utils.customer_index import CustomerIndex
+from utils.local_data import local_data_source
+from utils.tool_output import encode_tool_output
 
-# Local data directory for development
-LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+CUSTOMER_SUMMARY_FIELDS = ('customerId', 'name', 'email')
 
 
 @tool
-def list_customers():
-    """Get the list of all Bank X customers. Returns a summary list with customer ID, name, and email."""
+def list_customers(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                   cursor: str = None):
+    """Get a page of Bank X customers. By default each has customer ID, name, and email.
+    
+    Args:
+        fields: Customer fields to return (default: customerId, name, email), e.g. ["name", "portfolioValue"]
+        sort_by: Optional field to order by (default: customerId)
+        descending: Sort from the highest value (default: False)
+        limit: Customers on the page (default: 50, max 500)
+        cursor: nextCursor from the previous page, with the same sort_by and descending
+    
+    Returns:
+        The page of customers, the total number of customers, and nextCursor (null on the last page)
+    """
     try:
-        filepath = os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json')
-        
-        if not os.path.exists(filepath):
-            return "Error: Customer database not found"
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            customers = json.load(f)
-        
-        summary = []
-        for customer in customers:
-            summary.append({
-                "customerId": customer.get("customerId"),
-                "name": customer.get("name"),
-                "email": customer.get("email")
-            })
-        
-        return json.dumps(summary, indent=2)
+        source = local_data_source()
+        page, next_cursor = source.customer_page(fields or CUSTOMER_SUMMARY_FIELDS, sort_by=sort_by,
+                                                 descending=descending, limit=limit, cursor=cursor)
+        return encode_tool_output({'customers': page, 'total': source.customer_count(), 'nextCursor': next_cursor})
+    except FileNotFoundError:
+        return "Error: Customer database not found"
+    except ValueError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         return f"Error listing customers: {str(e)}"
 
@@ -44,23 +48,64 @@ def get_customer_profile(customer_id: str):
         Full customer profile including portfolio value, investment preferences, and bond interest
     """
     try:
-        filepath = os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json')
-        
-        if not os.path.exists(filepath):
-            return f"Error: Customer database not found"
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            customers = json.load(f)
-        
-        for customer in customers:
-            if customer.get("customerId") == customer_id:
-                return json.dumps(customer, indent=2)
+        customer = local_data_source().customer(customer_id)
+        if customer is not None:
+            return encode_tool_output(customer)
         
         return f"Customer '{customer_id}' not found"
+    except FileNotFoundError:
+        return "Error: Customer database not found"
     except Exception as e:
         return f"Error reading customer profile: {str(e)}"
 
 
+_customer_index = None
+_customer_index_version = None
+
+
+def _load_customer_index():
+    """The customer index, built on first use and rebuilt when the customer data changes."""
+    global _customer_index, _customer_index_version
+    source = local_data_source()
+    version = source.customers_version()
+    if _customer_index is None or version != _customer_index_version:
+        _customer_index = CustomerIndex(source.customers())
+        _customer_index_version = version
+    return _customer_index
+
+
+@tool
+def customer_query(filters: dict = None, fields: list = None, sort_by: str = None, descending: bool = False,
+                   limit: int = 20, offset: int = 0):
+    """Find customers by segment using the customer indexes, instead of reading profiles one by one.
+    
+    Args:
+        filters: Field -> condition; every field must match. Categorical fields take a value or a
+            list of values (any may match): riskTolerance ("low", "medium", "high"), preferredSectors,
+            investmentGoals, interestedInBonds (true/false), accountStatus, liquidityNeeds. Range
+            fields take {"min": ..., "max": ...} (inclusive, either optional) or an exact value:
+            portfolioValue, annualIncome, investmentHorizon (years), lastContact ("YYYY-MM-DD").
+            Example: {"riskTolerance": "high", "preferredSectors": ["green"], "portfolioValue": {"min": 100000}}
+        fields: Customer fields to return for each customer on the page (default: customerId, name, email)
+        sort_by: Optional range field to order by (e.g. "portfolioValue")
+        descending: Sort from the highest value (default: False)
+        limit: Customers on the page (default: 20, max 200)
+        offset: Matches to skip, for the next page (use nextOffset from the previous result)
+    
+    Returns:
+        The total number of matches, the matching customer IDs (up to 1000), a page of customers
+        with the requested fields, and nextOffset (null on the last page)
+    """
+    try:
+        result = _load_customer_index().query(filters or {}, fields=fields, sort_by=sort_by, descending=descending,
+                                              limit=limit, offset=offset)
+        return encode_tool_output(result)
+    except FileNotFoundError:
+        return "Error: Customer database not found"
+    except Exception as e:
+        return f"Error querying customers: {str(e)}"
+
+
 def create_customer_agent():
     """Create and return the Customer Service Agent (Local)"""
     model_id = os.environ.get('BEDROCK_MODEL_ID', 'global.anthropic.claude-haiku-4-5-20251001-v1:0')
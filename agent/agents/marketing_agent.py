@@ -1,60 +1,55 @@
 """Marketing Agent - Handles email campaigns and approvals"""
 from strands import Agent, tool
-import json
-import boto3
 import os
-import time
 from strands.models import BedrockModel
-
-# Initialize Lambda client
-AWS_REGION = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'eu-west-1'))
-lambda_client = boto3.client('lambda', region_name=AWS_REGION)
+from utils.tool_output import encode_tool_output
+from .tool_transport import transport
 
 SEND_EMAIL_ARN = os.environ.get('SEND_EMAIL_FUNCTION_ARN', '')
 GET_RECENT_EMAILS_ARN = os.environ.get('GET_RECENT_EMAILS_FUNCTION_ARN', '')
 
 
-def log_event(event: dict):
-    print(json.dumps(event))
+def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Invoke a tool Lambda through the shared transport and return the parsed response."""
+    return transport.invoke(function_arn, payload, agent_name='marketing_agent', tool_name=tool_name)
 
 
-def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
-    """Helper to invoke Lambda and return parsed response."""
-    start = time.perf_counter()
-    try:
-        if not function_arn:
-            return {'error': 'Lambda function ARN not configured'}
-
-        response = lambda_client.invoke(
-            FunctionName=function_arn,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(payload or {})
-        )
-
-        lambda_request_id = response.get('ResponseMetadata', {}).get('RequestId')
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-        status_code = result.get('statusCode')
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
-
-        if status_code == 200:
-            log_event({
-                'eventType': 'agent.tool.success',
-                'agentName': 'marketing_agent',
-                'toolName': tool_name,
-                'functionArn': function_arn,
-                'lambdaInvokeRequestId': lambda_request_id,
-                'requestId': body.get('requestId'),
-                'durationMs': duration_ms,
-                'timestamp': time.time(),
-            })
-            return body
-
-        error_msg = body.get('error') or body.get('message') or 'Unknown error'
-        return {'error': error_msg, 'requestId': body.get('requestId'), 'statusCode': status_code}
-    except Exception as e:
-        error_msg = f"Lambda invocation failed: {str(e)}"
-        return {'error': error_msg}
+async def invoke_lambda_async(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Awaitable invoke_lambda: runs on the shared Lambda executor with a timeout."""
+    return await transport.invoke_async(function_arn, payload, agent_name='marketing_agent', tool_name=tool_name)
+
+
+def _format_send_email(result: dict):
+    if 'error' in result:
+        return f"Failed to send email: {result['error']}"
+    
+    # If preview mode (status=PREVIEW), return structured preview for agent to show user
+    if result.get('status') == 'PREVIEW':
+        preview_data = result.get('email_preview', {})
+        preview_id = result.get('preview_id', '')
+        # Return preview with preview_id explicitly for the agent to use in the follow-up call
+        return f"""EMAIL PREVIEW GENERATED
+Preview ID: {preview_id}
+
+To: {preview_data.get('to', '')}
+Subject: {preview_data.get('subject', '')}
+
+{preview_data.get('body', '')}
+
+---
+Confirm sending this email? Please reply 'yes' or 'no'."""
+    
+    # Approved mode - email sent
+    return result.get('message', 'Email sent successfully')
+
+
+def _format_recent_emails(result: dict):
+    if 'error' in result:
+        return f"Error: {result['error']}"
+    emails = result.get('emails', [])
+    if not emails:
+        return "No sent emails found"
+    return encode_tool_output(emails)
 
 
 @tool
@@ -83,28 +78,7 @@ def send_email(customer_email: str, subject: str, body: str, approved: bool = Fa
         'approved': approved,
         'preview_id': preview_id
     }, tool_name='send_email')
-    
-    if 'error' in result:
-        return f"Failed to send email: {result['error']}"
-    
-    # If preview mode (status=PREVIEW), return structured preview for agent to show user
-    if result.get('status') == 'PREVIEW':
-        preview_data = result.get('email_preview', {})
-        preview_id = result.get('preview_id', '')
-        # Return preview with preview_id explicitly for the agent to use in the follow-up call
-        return f"""EMAIL PREVIEW GENERATED
-Preview ID: {preview_id}
-
-To: {preview_data.get('to', '')}
-Subject: {preview_data.get('subject', '')}
-
-{preview_data.get('body', '')}
-
----
-Confirm sending this email? Please reply 'yes' or 'no'."""
-    
-    # Approved mode - email sent
-    return result.get('message', 'Email sent successfully')
+    return _format_send_email(result)
 
 
 @tool
@@ -117,13 +91,24 @@ def get_recent_emails(limit: int = 10):
     Returns:
         List of recent email metadata including timestamp, recipient, and subject
     """
-    result = invoke_lambda(GET_RECENT_EMAILS_ARN, {'limit': limit}, tool_name='get_recent_emails')
-    if 'error' in result:
-        return f"Error: {result['error']}"
-    emails = result.get('emails', [])
-    if not emails:
-        return "No sent emails found"
-    return json.dumps(emails, indent=2)
+    return _format_recent_emails(invoke_lambda(GET_RECENT_EMAILS_ARN, {'limit': limit}, tool_name='get_recent_emails'))
+
+
+async def send_email_async(customer_email: str, subject: str, body: str, approved: bool = False, preview_id: str = ""):
+    """Awaitable send_email for async callers such as the coordinator's tools."""
+    result = await invoke_lambda_async(SEND_EMAIL_ARN, {
+        'customer_email': customer_email,
+        'subject': subject,
+        'body': body,
+        'approved': approved,
+        'preview_id': preview_id
+    }, tool_name='send_email')
+    return _format_send_email(result)
+
+
+async def get_recent_emails_async(limit: int = 10):
+    """Awaitable get_recent_emails for async callers such as the coordinator's tools."""
+    return _format_recent_emails(await invoke_lambda_async(GET_RECENT_EMAILS_ARN, {'limit': limit}, tool_name='get_recent_emails'))
 
 
 def create_marketing_agent():
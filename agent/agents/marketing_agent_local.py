@@ -5,6 +5,7 @@ import os
 import hashlib
 from datetime import datetime
 from strands.models import BedrockModel
+from utils.tool_output import encode_tool_output
 
 # Local data directory for development
 LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
@@ -139,7 +140,7 @@ def get_recent_emails(limit: int = 10):
             })
         
         if result:
-            return json.dumps(result, indent=2)
+            return encode_tool_output(result)
         else:
             return "No sent emails found"
     except Exception as e:
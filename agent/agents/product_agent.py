@@ -1,70 +1,62 @@
 """Product Research Agent - Handles bond products and market data"""
 from strands import Agent, tool
-import json
-import boto3
 import os
-import time
 from strands.models import BedrockModel
-
-# Initialize Lambda client
-AWS_REGION = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'eu-west-1'))
-lambda_client = boto3.client('lambda', region_name=AWS_REGION)
+from utils.tool_output import encode_tool_output
+from .tool_transport import transport
 
 LIST_BONDS_ARN = os.environ.get('LIST_BONDS_FUNCTION_ARN', '')
 GET_PRODUCT_ARN = os.environ.get('GET_PRODUCT_FUNCTION_ARN', '')
 SEARCH_MARKET_ARN = os.environ.get('SEARCH_MARKET_FUNCTION_ARN', '')
 
 
-def log_event(event: dict):
-    print(json.dumps(event))
+def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Invoke a tool Lambda through the shared transport and return the parsed response."""
+    return transport.invoke(function_arn, payload, agent_name='product_agent', tool_name=tool_name)
 
 
-def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
-    """Helper to invoke Lambda and return parsed response."""
-    start = time.perf_counter()
-    try:
-        if not function_arn:
-            return {'error': 'Lambda function ARN not configured'}
-
-        response = lambda_client.invoke(
-            FunctionName=function_arn,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(payload or {})
-        )
-
-        lambda_request_id = response.get('ResponseMetadata', {}).get('RequestId')
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-        status_code = result.get('statusCode')
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
-
-        if status_code == 200:
-            log_event({
-                'eventType': 'agent.tool.success',
-                'agentName': 'product_agent',
-                'toolName': tool_name,
-                'functionArn': function_arn,
-                'lambdaInvokeRequestId': lambda_request_id,
-                'requestId': body.get('requestId'),
-                'durationMs': duration_ms,
-                'timestamp': time.time(),
-            })
-            return body
-
-        error_msg = body.get('error') or body.get('message') or 'Unknown error'
-        return {'error': error_msg, 'requestId': body.get('requestId'), 'statusCode': status_code}
-    except Exception as e:
-        error_msg = f"Lambda invocation failed: {str(e)}"
-        return {'error': error_msg}
+async def invoke_lambda_async(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Awaitable invoke_lambda: runs on the shared Lambda executor with a timeout."""
+    return await transport.invoke_async(function_arn, payload, agent_name='product_agent', tool_name=tool_name)
 
 
-@tool
-def list_available_bonds():
-    """Get a list of all available bond products. Returns a summary with product name, yield, maturity, and minimum investment for each bond."""
-    result = invoke_lambda(LIST_BONDS_ARN, tool_name='list_available_bonds')
+def _list_page_payload(fields, sort_by, descending, limit, cursor) -> dict:
+    return {'fields': fields, 'sort_by': sort_by, 'descending': descending, 'limit': limit, 'cursor': cursor}
+
+
+def _format_bond_list(result: dict):
+    if 'error' in result:
+        return f"Error: {result['error']}"
+    keys = ('bonds', 'total', 'nextCursor')
+    if result.get('unreadCount'):
+        # list-bonds could not read every bond file in time: the catalog is partial
+        keys += ('unreadCount', 'unreadFiles')
+    return encode_tool_output({key: result.get(key) for key in keys})
+
+
+def _format_result(result: dict, key: str, default):
     if 'error' in result:
         return f"Error: {result['error']}"
-    return json.dumps(result.get('bonds', []), indent=2)
+    return encode_tool_output(result.get(key, default))
+
+
+@tool
+def list_available_bonds(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                         cursor: str = None):
+    """Get a page of available bond products. By default each has product name, type, yield, maturity, minimum investment and credit rating.
+    
+    Args:
+        fields: Bond fields to return instead of the summary, e.g. ["name", "yield", "esgScore"]
+        sort_by: Optional field to order by, e.g. "yield" (default: productId)
+        descending: Sort from the highest value (default: False)
+        limit: Bonds on the page (default: 50, max 500)
+        cursor: nextCursor from the previous page, with the same sort_by and descending
+    
+    Returns:
+        The page of bonds, the total number of bonds, and nextCursor (null on the last page)
+    """
+    payload = _list_page_payload(fields, sort_by, descending, limit, cursor)
+    return _format_bond_list(invoke_lambda(LIST_BONDS_ARN, payload, tool_name='list_available_bonds'))
 
 
 @tool
@@ -72,15 +64,13 @@ def get_product_details(product_name: str):
     """Get detailed information about a financial product.
     
     Args:
-        product_name: The name of the product (e.g., 'government-bond-y', 'UK Government Bond Series Y')
+        product_name: The product ID, name or file name (e.g., 'BOND-GB-2025-Y', 'UK Government Bond Series Y',
+            'government-bond-y'); partial names such as 'corporate bond a' also match
     
     Returns:
         Full product details including yield, maturity, minimum investment, and description
     """
-    result = invoke_lambda(GET_PRODUCT_ARN, {'product_name': product_name}, tool_name='get_product_details')
-    if 'error' in result:
-        return f"Error: {result['error']}"
-    return json.dumps(result.get('product', {}), indent=2)
+    return _format_result(invoke_lambda(GET_PRODUCT_ARN, {'product_name': product_name}, tool_name='get_product_details'), 'product', {})
 
 
 @tool
@@ -93,10 +83,26 @@ def search_market_data(product_type: str):
     Returns:
         Market analysis including yield trends and comparable products with description
     """
-    result = invoke_lambda(SEARCH_MARKET_ARN, {'product_type': product_type}, tool_name='search_market_data')
-    if 'error' in result:
-        return f"Error: {result['error']}"
-    return json.dumps(result.get('marketData', {}), indent=2)
+    return _format_result(invoke_lambda(SEARCH_MARKET_ARN, {'product_type': product_type}, tool_name='search_market_data'), 'marketData', {})
+
+
+async def list_available_bonds_async(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                                     cursor: str = None):
+    """Awaitable list_available_bonds for async callers such as the coordinator's tools."""
+    payload = _list_page_payload(fields, sort_by, descending, limit, cursor)
+    return _format_bond_list(await invoke_lambda_async(LIST_BONDS_ARN, payload, tool_name='list_available_bonds'))
+
+
+async def get_product_details_async(product_name: str):
+    """Awaitable get_product_details for async callers such as the coordinator's tools."""
+    result = await invoke_lambda_async(GET_PRODUCT_ARN, {'product_name': product_name}, tool_name='get_product_details')
+    return _format_result(result, 'product', {})
+
+
+async def search_market_data_async(product_type: str):
+    """Awaitable search_market_data for async callers such as the coordinator's tools."""
+    result = await invoke_lambda_async(SEARCH_MARKET_ARN, {'product_type': product_type}, tool_name='search_market_data')
+    return _format_result(result, 'marketData', {})
 
 
 def create_product_agent():
@@ -115,7 +121,8 @@ Your responsibilities:
 - Compare products and analyze market conditions
 
 When asked about products:
-1. Use list_available_bonds() to see all available bond products
+1. Use list_available_bonds() to see the available bond products (sort_by="yield" etc. to order them,
+   nextCursor as cursor for the next page)
 2. Use get_product_details(product_name) for detailed product information
 3. Use search_market_data(product_type) for market analysis and comparable products
 
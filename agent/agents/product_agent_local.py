@@ -1,42 +1,39 @@
 """Product Research Agent - Local Version"""
 from strands import Agent, tool
-import json
 import os
 from strands.models import BedrockModel
-
-# Local data directory for development
-LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+from utils.bond_manifest import BOND_SUMMARY_FIELDS
+from utils.local_data import local_data_source
+from utils.pagination import paginate
+from utils.tool_output import encode_tool_output
 
 
 @tool
-def list_available_bonds():
-    """Get a list of all available bond products. Returns a summary with product name, yield, maturity, and minimum investment for each bond."""
+def list_available_bonds(fields: list = None, sort_by: str = None, descending: bool = False, limit: int = 50,
+                         cursor: str = None):
+    """Get a page of available bond products. By default each has product name, type, yield, maturity, minimum investment and credit rating.
+    
+    Args:
+        fields: Bond fields to return instead of the summary, e.g. ["name", "yield", "esgScore"]
+        sort_by: Optional field to order by, e.g. "yield" (default: productId)
+        descending: Sort from the highest value (default: False)
+        limit: Bonds on the page (default: 50, max 500)
+        cursor: nextCursor from the previous page, with the same sort_by and descending
+    
+    Returns:
+        The page of bonds, the total number of bonds, and nextCursor (null on the last page)
+    """
     try:
-        bonds_dir = os.path.join(LOCAL_DATA_DIR, 'bonds')
+        bonds = local_data_source().bonds()
         
-        # Dynamically discover all .json files in the bonds directory
-        bond_files = [f for f in os.listdir(bonds_dir) if f.endswith('.json')]
-        
-        if not bond_files:
+        if not bonds:
             return "No bond products available"
         
-        bonds_summary = []
-        for filename in bond_files:
-            filepath = os.path.join(LOCAL_DATA_DIR, 'bonds', filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    bond = json.load(f)
-                    bonds_summary.append({
-                        "productId": bond.get("productId"),
-                        "name": bond.get("name"),
-                        "type": bond.get("type"),
-                        "yield": bond.get("yield"),
-                        "maturity": bond.get("maturity"),
-                        "minInvestment": bond.get("minInvestment"),
-                        "creditRating": bond.get("creditRating")
-                    })
-        
-        return json.dumps(bonds_summary, indent=2)
+        page, next_cursor = paginate(bonds, 'productId', fields or BOND_SUMMARY_FIELDS,
+                                     sort_by=sort_by, descending=descending, limit=limit, cursor=cursor)
+        return encode_tool_output({'bonds': page, 'total': len(bonds), 'nextCursor': next_cursor})
+    except ValueError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         return f"Error listing bonds: {str(e)}"
 
@@ -46,26 +43,20 @@ def get_product_details(product_name: str):
     """Get detailed information about a financial product.
     
     Args:
-        product_name: The name of the product (e.g., 'government-bond-y', 'UK Government Bond Series Y')
+        product_name: The product ID, name or file name (e.g., 'BOND-GB-2025-Y', 'UK Government Bond Series Y',
+            'government-bond-y'); partial names such as 'corporate bond a' also match
     
     Returns:
         Full product details including yield, maturity, minimum investment, and description
     """
     try:
-        # Normalize product name to filename
-        filename = product_name.lower().replace(' ', '-').replace('uk-', '').replace('series-', '')
-        if not filename.endswith('.json'):
-            filename += '.json'
-        
-        filepath = os.path.join(LOCAL_DATA_DIR, 'bonds', filename)
+        product, suggestions = local_data_source().bond_catalog().resolve(product_name)
         
-        if not os.path.exists(filepath):
-            return f"Product '{product_name}' not found. Available products: government-bond-y.json"
+        if product is None:
+            closest = f" Closest products: {', '.join(suggestions)}" if suggestions else ""
+            return f"Product '{product_name}' not found.{closest}"
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            product = json.load(f)
-        
-        return json.dumps(product, indent=2)
+        return encode_tool_output(product)
     except Exception as e:
         return f"Error reading product details: {str(e)}"
 
@@ -83,21 +74,18 @@ def search_market_data(product_type: str):
     try:
         # Determine market data file based on product type
         if 'bond' in product_type.lower():
-            filepath = os.path.join(LOCAL_DATA_DIR, 'market-data', 'bond-market-data.json')
+            market_data_raw = local_data_source().market_data('bond-market-data.json')
         else:
             # No market data available for this product type
-            return json.dumps({
+            return encode_tool_output({
                 "productType": product_type,
                 "description": f"Market data for {product_type} is currently unavailable. Please contact your financial advisor.",
                 "comparableProducts": []
-            }, indent=2)
+            })
         
-        if not os.path.exists(filepath):
+        if market_data_raw is None:
             return f"Market data not found for {product_type}"
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            market_data_raw = json.load(f)
-        
         # Extract bond market data and add product type
         bond_data = market_data_raw.get('bonds', {})
         market_data = {
@@ -105,7 +93,7 @@ def search_market_data(product_type: str):
             **bond_data
         }
         
-        return json.dumps(market_data, indent=2)
+        return encode_tool_output(market_data)
     except Exception as e:
         return f"Error searching market data: {str(e)}"
 
@@ -1,79 +1,140 @@
 """Bond Recommendation Agent - Analyzes customer profiles and recommends suitable bonds"""
 from strands import Agent, tool
+import asyncio
 import json
-import boto3
 import os
 import time
 from strands.models import BedrockModel
-
-# Initialize Lambda client
-AWS_REGION = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'eu-west-1'))
-lambda_client = boto3.client('lambda', region_name=AWS_REGION)
+from utils.bond_scoring import build_recommendations
+from utils.customer_matching import BondMatchCriteria
+from utils.pagination import MAX_PAGE_SIZE
+from utils.tool_output import encode_tool_output
+from .tool_transport import transport
 
 GET_CUSTOMER_ARN = os.environ.get('GET_CUSTOMER_FUNCTION_ARN', '')
 LIST_CUSTOMERS_ARN = os.environ.get('LIST_CUSTOMERS_FUNCTION_ARN', '')
 LIST_BONDS_ARN = os.environ.get('LIST_BONDS_FUNCTION_ARN', '')
 
-
-def log_event(event: dict):
-    print(json.dumps(event))
+# Full bond documents: the summaries lack the risk, ESG, sector, liquidity and demand fields.
+# Scoring needs the whole catalog: fetch_all_bonds follows nextCursor from these pages
+LIST_BONDS_DETAILS = {'details': True, 'limit': MAX_PAGE_SIZE}
+# The top of list-bonds' sellability order (served from the bond catalog manifest's ranking)
+LIST_BONDS_MOST_SELLABLE = {'details': True, 'sort_by': 'sellabilityRank', 'limit': 1}
 
 
 def invoke_lambda(function_arn: str, payload: dict = None, tool_name: str = None):
-    """Helper to invoke Lambda and return parsed response."""
-    start = time.perf_counter()
-    try:
-        if not function_arn:
-            return {'error': 'Lambda function ARN not configured'}
+    """Invoke a tool Lambda through the shared transport and return the parsed response."""
+    return transport.invoke(function_arn, payload, agent_name='recommendation_agent', tool_name=tool_name)
 
-        response = lambda_client.invoke(
-            FunctionName=function_arn,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(payload or {})
-        )
 
-        lambda_request_id = response.get('ResponseMetadata', {}).get('RequestId')
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-        status_code = result.get('statusCode')
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
-
-        if status_code == 200:
-            log_event({
-                'eventType': 'agent.tool.success',
-                'agentName': 'recommendation_agent',
-                'toolName': tool_name,
-                'functionArn': function_arn,
-                'lambdaInvokeRequestId': lambda_request_id,
-                'requestId': body.get('requestId'),
-                'durationMs': duration_ms,
-                'timestamp': time.time(),
-            })
-            return body
-
-        error_msg = body.get('error') or body.get('message') or 'Unknown error'
-        return {'error': error_msg, 'requestId': body.get('requestId'), 'statusCode': status_code}
-    except Exception as e:
-        error_msg = f"Lambda invocation failed: {str(e)}"
-        return {'error': error_msg}
+async def invoke_lambda_async(function_arn: str, payload: dict = None, tool_name: str = None):
+    """Awaitable invoke_lambda: runs on the shared Lambda executor with a timeout."""
+    return await transport.invoke_async(function_arn, payload, agent_name='recommendation_agent', tool_name=tool_name)
+
+
+def _next_bonds_page(bonds_result: dict, bonds: list) -> dict:
+    """The list-bonds request for the page after ``bonds_result``, collecting its bonds into ``bonds``."""
+    bonds.extend(bonds_result.get('bonds', []))
+    return {**LIST_BONDS_DETAILS, 'cursor': bonds_result['nextCursor']}
+
+
+def _all_bonds_result(bonds_result: dict, bonds: list) -> dict:
+    """The last page's result carrying every bond read, or the error that stopped the paging."""
+    if 'error' in bonds_result:
+        return bonds_result
+    return {**bonds_result, 'bonds': bonds + bonds_result.get('bonds', []), 'nextCursor': None}
+
+
+def fetch_all_bonds() -> dict:
+    """Every bond with full details: list-bonds' pages, followed until nextCursor runs out."""
+    bonds = []
+    bonds_result = invoke_lambda(LIST_BONDS_ARN, LIST_BONDS_DETAILS, tool_name='list_bonds')
+    while 'error' not in bonds_result and bonds_result.get('nextCursor'):
+        bonds_result = invoke_lambda(LIST_BONDS_ARN, _next_bonds_page(bonds_result, bonds), tool_name='list_bonds')
+    return _all_bonds_result(bonds_result, bonds)
+
+
+async def fetch_all_bonds_async() -> dict:
+    """Awaitable fetch_all_bonds."""
+    bonds = []
+    bonds_result = await invoke_lambda_async(LIST_BONDS_ARN, LIST_BONDS_DETAILS, tool_name='list_bonds')
+    while 'error' not in bonds_result and bonds_result.get('nextCursor'):
+        bonds_result = await invoke_lambda_async(LIST_BONDS_ARN, _next_bonds_page(bonds_result, bonds),
+                                                 tool_name='list_bonds')
+    return _all_bonds_result(bonds_result, bonds)
+
+
+def _build_recommendation_data(customer_result: dict, bonds_result: dict, top_k: int):
+    if 'error' in customer_result:
+        return json.dumps({'error': f"Could not fetch customer: {customer_result['error']}"})
+    
+    customer = customer_result.get('customer', {})
+    
+    if 'error' in bonds_result:
+        return json.dumps({'error': f"Could not fetch bonds: {bonds_result['error']}"})
+    
+    return encode_tool_output(build_recommendations(customer, bonds_result.get('bonds', []), top_k))
+
+
+def _most_sellable_bond(bonds_result: dict):
+    """The bond with the lowest sellabilityRank, or an error JSON string."""
+    if 'error' in bonds_result:
+        return json.dumps({'error': f"Could not fetch bonds: {bonds_result['error']}"})
+    
+    bonds = bonds_result.get('bonds', [])
+    
+    if not bonds:
+        return json.dumps({'error': 'No bonds available'})
+    
+    # Find the most sellable bond (lowest sellabilityRank or highest demandScore)
+    return min(bonds, key=lambda b: b.get('sellabilityRank', 999))
+
+
+def _match_payload(most_sellable: dict, limit: int) -> dict:
+    """list-customers request that matches the customer book against the bond server-side."""
+    return {'match_bond': BondMatchCriteria.from_bond(most_sellable).to_payload(), 'limit': limit}
+
+
+def _build_most_sellable(bonds_result: dict, most_sellable: dict, match_result: dict):
+    if 'error' in match_result:
+        return json.dumps({'error': f"Could not match customers: {match_result['error']}"})
+    
+    result = {
+        'mostSellableBond': most_sellable,
+        'matchedCustomers': match_result.get('matchedCustomers', []),
+        'analysisContext': {
+            'timestamp': time.time(),
+            'totalBonds': bonds_result.get('total', len(bonds_result.get('bonds', []))),
+            'totalCustomers': match_result.get('scannedCount'),
+            'matchedCount': match_result.get('matchedCount'),
+            'bondDemandScore': most_sellable.get('demandScore'),
+            'bondSellabilityRank': most_sellable.get('sellabilityRank'),
+            'bondDemandTrend': most_sellable.get('demandTrend')
+        }
+    }
+    
+    return encode_tool_output(result)
 
 
 @tool
-def get_bond_recommendations_for_customer(customer_id: str):
-    """Retrieve customer profile and all available bonds for analysis and recommendation.
+def get_bond_recommendations_for_customer(customer_id: str, top_k: int = 3):
+    """Rank the available bonds for a customer with the deterministic suitability scoring engine.
     
-    This tool provides the Claude model with comprehensive customer and bond data
-    to analyze and generate personalized bond recommendations based on:
-    - Customer risk tolerance, investment horizon, and financial goals
-    - Bond risk rating, ESG score, volatility, sector exposure, and liquidity
-    - Portfolio fit and suitability matching
+    Each bond is scored 0-100 from weighted factors:
+    - Risk rating vs. the customer's risk tolerance
+    - Sector exposure vs. preferred sectors
+    - Maturity vs. investment horizon
+    - Minimum investment vs. portfolio value (bonds above the portfolio value are excluded)
+    - Liquidity rating vs. liquidity needs
+    - ESG score
     
     Args:
         customer_id: The customer ID (e.g., 'CUST-001')
+        top_k: How many of the best-scoring bonds to return (default: 3)
     
     Returns:
-        A comprehensive JSON object containing the customer profile and all available bonds
-        for Claude to analyze and generate recommendations in natural language
+        JSON with the customer's scoring inputs, the top bonds with a per-factor breakdown,
+        and the excluded bonds with reasons, for the model to explain in natural language
     """
     try:
         # Fetch customer profile
@@ -81,80 +142,69 @@ def get_bond_recommendations_for_customer(customer_id: str):
         if 'error' in customer_result:
             return json.dumps({'error': f"Could not fetch customer: {customer_result['error']}"})
         
-        customer = customer_result.get('customer', {})
-        
-        # Fetch all bonds
-        bonds_result = invoke_lambda(LIST_BONDS_ARN, {}, tool_name='list_bonds')
-        if 'error' in bonds_result:
-            return json.dumps({'error': f"Could not fetch bonds: {bonds_result['error']}"})
-        
-        bonds = bonds_result.get('bonds', [])
-        
-        # Combine into recommendation context
-        recommendation_data = {
-            'customer': customer,
-            'availableBonds': bonds,
-            'recommendationContext': {
-                'timestamp': time.time(),
-                'customerId': customer_id,
-                'bondCount': len(bonds)
-            }
-        }
-        
-        return json.dumps(recommendation_data, indent=2)
+        # Fetch every bond and rank them for the customer
+        bonds_result = fetch_all_bonds()
+        return _build_recommendation_data(customer_result, bonds_result, top_k)
     except Exception as e:
         return json.dumps({'error': f"Error fetching recommendation data: {str(e)}"})
 
 
 @tool
-def get_most_sellable_bond_with_customers():
-    """Find the most sellable bond (highest demand) and identify all customers who would be suitable buyers.
+def get_most_sellable_bond_with_customers(limit: int = 50):
+    """Find the most sellable bond (highest demand) and the customers who would be suitable buyers.
+    
+    This tool picks the bond with the best sellability ranking (demandScore/sellabilityRank)
+    and matches every customer's full profile against it in one pass. A customer matches when:
+    - They are interested in bonds
+    - Their portfolio value covers the minimum investment
+    - Their risk tolerance allows the bond's risk rating
+    - At least one investment goal or preferred sector aligns with the bond
     
-    This tool analyzes all bonds by their sellability ranking (demandScore/sellabilityRank) 
-    and matches the top bond with suitable customers based on their investment profiles.
+    Args:
+        limit: Most matched customers to return, largest portfolios first (default: 50)
     
     Returns:
         JSON object containing:
         - The most sellable bond with all details and demand metrics
-        - List of all customers in the database
-        - Matching analysis showing which customers are suitable for this bond based on:
-          * Risk tolerance alignment
-          * Portfolio value vs minimum investment
-          * Investment goals and sector preferences
-          * Interest in bonds
+        - The matched customers (ID, name, email, portfolio, risk tolerance) with the reasons they match
+        - Counts of customers scanned and matched
     """
     try:
-        # Fetch all bonds
-        bonds_result = invoke_lambda(LIST_BONDS_ARN, {}, tool_name='list_bonds')
-        if 'error' in bonds_result:
-            return json.dumps({'error': f"Could not fetch bonds: {bonds_result['error']}"})
-        
-        bonds = bonds_result.get('bonds', [])
-        
-        if not bonds:
-            return json.dumps({'error': 'No bonds available'})
-        
-        # Find the most sellable bond (lowest sellabilityRank or highest demandScore)
-        most_sellable = min(bonds, key=lambda b: b.get('sellabilityRank', 999))
+        # Fetch the most sellable bond
+        bonds_result = invoke_lambda(LIST_BONDS_ARN, LIST_BONDS_MOST_SELLABLE, tool_name='list_bonds')
+        most_sellable = _most_sellable_bond(bonds_result)
+        if isinstance(most_sellable, str):
+            return most_sellable
         
-        # Fetch all customers from Lambda-backed customer agent
-        customers_result = invoke_lambda(LIST_CUSTOMERS_ARN, {}, tool_name='list_customers')
-        customers = customers_result.get('customers', []) if isinstance(customers_result, dict) else []
-        
-        result = {
-            'mostSellableBond': most_sellable,
-            'allCustomers': customers,
-            'analysisContext': {
-                'timestamp': time.time(),
-                'totalBonds': len(bonds),
-                'totalCustomers': len(customers),
-                'bondDemandScore': most_sellable.get('demandScore'),
-                'bondSellabilityRank': most_sellable.get('sellabilityRank'),
-                'bondDemandTrend': most_sellable.get('demandTrend')
-            }
-        }
+        # Match the whole customer book against the bond inside the list-customers Lambda
+        match_result = invoke_lambda(LIST_CUSTOMERS_ARN, _match_payload(most_sellable, limit), tool_name='list_customers')
+        return _build_most_sellable(bonds_result, most_sellable, match_result)
+    except Exception as e:
+        return json.dumps({'error': f"Error analyzing sellable bonds: {str(e)}"})
+
+
+async def get_bond_recommendations_for_customer_async(customer_id: str, top_k: int = 3):
+    """Awaitable get_bond_recommendations_for_customer; fetches the customer and the bonds concurrently."""
+    try:
+        customer_result, bonds_result = await asyncio.gather(
+            invoke_lambda_async(GET_CUSTOMER_ARN, {'customer_id': customer_id}, tool_name='get_customer_profile'),
+            fetch_all_bonds_async(),
+        )
+        return _build_recommendation_data(customer_result, bonds_result, top_k)
+    except Exception as e:
+        return json.dumps({'error': f"Error fetching recommendation data: {str(e)}"})
+
+
+async def get_most_sellable_bond_with_customers_async(limit: int = 50):
+    """Awaitable get_most_sellable_bond_with_customers."""
+    try:
+        bonds_result = await invoke_lambda_async(LIST_BONDS_ARN, LIST_BONDS_MOST_SELLABLE, tool_name='list_bonds')
+        most_sellable = _most_sellable_bond(bonds_result)
+        if isinstance(most_sellable, str):
+            return most_sellable
         
-        return json.dumps(result, indent=2)
+        match_result = await invoke_lambda_async(LIST_CUSTOMERS_ARN, _match_payload(most_sellable, limit), tool_name='list_customers')
+        return _build_most_sellable(bonds_result, most_sellable, match_result)
     except Exception as e:
         return json.dumps({'error': f"Error analyzing sellable bonds: {str(e)}"})
 
@@ -177,34 +227,20 @@ Your responsibilities:
 - Provide natural language explanations for recommendations
 
 When recommending bonds for a customer:
-1. Use get_bond_recommendations_for_customer(customer_id) to fetch customer and bond data
-2. Analyze the customer's investment profile:
-   - Risk tolerance (low/medium/high)
-   - Investment horizon (years)
-   - Investment goals (capital preservation, income generation, growth, capital appreciation)
-   - Preferred sectors
-   - Liquidity needs (high/medium/low)
-   - Portfolio value and annual income
-3. Evaluate bonds based on:
-   - Risk rating alignment with customer tolerance
-   - ESG score alignment with values
-   - Volatility and liquidity match
-   - Minimum investment vs. portfolio value
-   - Sector exposure preferences
-   - Yield and maturity alignment with goals
-4. Generate personalized recommendations with clear reasoning
+1. Use get_bond_recommendations_for_customer(customer_id) to get the ranked bonds
+2. The ranking is already computed: each recommendation has a score (0-100) and a per-factor
+   breakdown (risk, sector, horizon, affordability, liquidity, esg). Do not re-rank the bonds
+3. Explain why each recommended bond suits the customer, using the factor details
+4. Mention any excluded bonds only if relevant, with the reason given
 5. Present findings in friendly, conversational natural language
 
 When finding the most sellable bond and suitable customers:
-1. Use get_most_sellable_bond_with_customers() to get the top-demand bond and all customers
+1. Use get_most_sellable_bond_with_customers() to get the top-demand bond and its matched customers
 2. Analyze the bond's characteristics (demandScore, sellabilityRank, demandTrend)
-3. Review each customer's profile to determine suitability:
-   - Check if customer is interested in bonds (interestedInBonds field)
-   - Verify portfolio value meets minimum investment requirement
-   - Match risk tolerance with bond risk rating
-   - Align investment goals with bond features
-   - Consider sector preferences and liquidity needs
-4. Create a list of suitable customers with explanations
+3. The matching is already computed: every customer was checked for interest in bonds, portfolio
+   value vs. minimum investment, risk tolerance vs. risk rating, and goal or sector alignment.
+   Do not fetch customer profiles one by one or re-check the matches
+4. Explain why each matched customer suits the bond, using their reasons
 5. Return customer IDs and emails for those who match
 
 You focus ONLY on bond recommendations and customer matching. For sending emails, 
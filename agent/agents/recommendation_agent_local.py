@@ -4,132 +4,94 @@ import json
 import os
 import time
 from strands.models import BedrockModel
-
-# Local data directory for development
-LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+from utils.bond_scoring import build_recommendations
+from utils.customer_matching import BondMatchCriteria, match_customers
+from utils.local_data import local_data_source
+from utils.tool_output import encode_tool_output
 
 
 @tool
-def get_bond_recommendations_for_customer(customer_id: str):
-    """Retrieve customer profile and all available bonds for analysis and recommendation.
+def get_bond_recommendations_for_customer(customer_id: str, top_k: int = 3):
+    """Rank the available bonds for a customer with the deterministic suitability scoring engine.
     
-    This tool provides the Claude model with comprehensive customer and bond data
-    to analyze and generate personalized bond recommendations based on:
-    - Customer risk tolerance, investment horizon, and financial goals
-    - Bond risk rating, ESG score, volatility, sector exposure, and liquidity
-    - Portfolio fit and suitability matching
+    Each bond is scored 0-100 from weighted factors:
+    - Risk rating vs. the customer's risk tolerance
+    - Sector exposure vs. preferred sectors
+    - Maturity vs. investment horizon
+    - Minimum investment vs. portfolio value (bonds above the portfolio value are excluded)
+    - Liquidity rating vs. liquidity needs
+    - ESG score
     
     Args:
         customer_id: The customer ID (e.g., 'CUST-001')
+        top_k: How many of the best-scoring bonds to return (default: 3)
     
     Returns:
-        A comprehensive JSON object containing the customer profile and all available bonds
-        for Claude to analyze and generate recommendations in natural language
+        JSON with the customer's scoring inputs, the top bonds with a per-factor breakdown,
+        and the excluded bonds with reasons, for the model to explain in natural language
     """
     try:
-        # Load customer data
-        customer_filepath = os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json')
-        if not os.path.exists(customer_filepath):
-            return json.dumps({'error': 'Customer database not found'})
-        
-        with open(customer_filepath, 'r', encoding='utf-8') as f:
-            customers = json.load(f)
-        
-        customer = None
-        for cust in customers:
-            if cust.get('customerId') == customer_id:
-                customer = cust
-                break
-        
+        source = local_data_source()
+        customer = source.customer(customer_id)
         if not customer:
             return json.dumps({'error': f"Customer '{customer_id}' not found"})
         
-        # Dynamically load all bond data
-        bonds_dir = os.path.join(LOCAL_DATA_DIR, 'bonds')
-        bond_files = [f for f in os.listdir(bonds_dir) if f.endswith('.json')] if os.path.exists(bonds_dir) else []
-        
-        bonds = []
-        for filename in bond_files:
-            filepath = os.path.join(bonds_dir, filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    bond = json.load(f)
-                    bonds.append(bond)
-        
-        # Combine into recommendation context
-        recommendation_data = {
-            'customer': customer,
-            'availableBonds': bonds,
-            'recommendationContext': {
-                'timestamp': time.time(),
-                'customerId': customer_id,
-                'bondCount': len(bonds)
-            }
-        }
-        
-        return json.dumps(recommendation_data, indent=2)
+        # Rank the bonds for the customer
+        return encode_tool_output(build_recommendations(customer, source.bonds(), top_k))
+    except FileNotFoundError:
+        return json.dumps({'error': 'Customer database not found'})
     except Exception as e:
         return json.dumps({'error': f"Error fetching recommendation data: {str(e)}"})
 
 
 @tool
-def get_most_sellable_bond_with_customers():
-    """Find the most sellable bond (highest demand) and identify all customers who would be suitable buyers.
+def get_most_sellable_bond_with_customers(limit: int = 50):
+    """Find the most sellable bond (highest demand) and the customers who would be suitable buyers.
     
-    This tool analyzes all bonds by their sellability ranking (demandScore/sellabilityRank) 
-    and matches the top bond with suitable customers based on their investment profiles.
+    This tool picks the bond with the best sellability ranking (demandScore/sellabilityRank)
+    and matches every customer's full profile against it in one pass. A customer matches when:
+    - They are interested in bonds
+    - Their portfolio value covers the minimum investment
+    - Their risk tolerance allows the bond's risk rating
+    - At least one investment goal or preferred sector aligns with the bond
+    
+    Args:
+        limit: Most matched customers to return, largest portfolios first (default: 50)
     
     Returns:
         JSON object containing:
         - The most sellable bond with all details and demand metrics
-        - List of all customers in the database
-        - Matching analysis showing which customers are suitable for this bond based on:
-          * Risk tolerance alignment
-          * Portfolio value vs minimum investment
-          * Investment goals and sector preferences
-          * Interest in bonds
+        - The matched customers (ID, name, email, portfolio, risk tolerance) with the reasons they match
+        - Counts of customers scanned and matched
     """
     try:
-        # Dynamically load all bond data
-        bonds_dir = os.path.join(LOCAL_DATA_DIR, 'bonds')
-        bond_files = [f for f in os.listdir(bonds_dir) if f.endswith('.json')] if os.path.exists(bonds_dir) else []
+        source = local_data_source()
         
-        bonds = []
-        for filename in bond_files:
-            filepath = os.path.join(bonds_dir, filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    bond = json.load(f)
-                    bonds.append(bond)
-        
-        if not bonds:
+        # Find the most sellable bond (lowest sellabilityRank)
+        most_sellable = source.most_sellable_bond()
+        if most_sellable is None:
             return json.dumps({'error': 'No bonds available'})
         
-        # Find the most sellable bond (lowest sellabilityRank or highest demandScore)
-        most_sellable = min(bonds, key=lambda b: b.get('sellabilityRank', 999))
-        
-        # Load all customers
-        customer_filepath = os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json')
-        if not os.path.exists(customer_filepath):
-            return json.dumps({'error': 'Customer database not found'})
-        
-        with open(customer_filepath, 'r', encoding='utf-8') as f:
-            customers = json.load(f)
+        # Match every customer against it in one streamed pass
+        match_result = match_customers(source.customers(), BondMatchCriteria.from_bond(most_sellable), limit)
         
         result = {
             'mostSellableBond': most_sellable,
-            'allCustomers': customers,
+            'matchedCustomers': match_result['matchedCustomers'],
             'analysisContext': {
                 'timestamp': time.time(),
-                'totalBonds': len(bonds),
-                'totalCustomers': len(customers),
+                'totalBonds': source.bond_count(),
+                'totalCustomers': match_result['scannedCount'],
+                'matchedCount': match_result['matchedCount'],
                 'bondDemandScore': most_sellable.get('demandScore'),
                 'bondSellabilityRank': most_sellable.get('sellabilityRank'),
                 'bondDemandTrend': most_sellable.get('demandTrend')
             }
         }
         
-        return json.dumps(result, indent=2)
+        return encode_tool_output(result)
+    except FileNotFoundError:
+        return json.dumps({'error': 'Customer database not found'})
     except Exception as e:
         return json.dumps({'error': f"Error analyzing sellable bonds: {str(e)}"})
 
@@ -152,34 +114,20 @@ Your responsibilities:
 - Provide natural language explanations for recommendations
 
 When recommending bonds for a customer:
-1. Use get_bond_recommendations_for_customer(customer_id) to fetch customer and bond data
-2. Analyze the customer's investment profile:
-   - Risk tolerance (low/medium/high)
-   - Investment horizon (years)
-   - Investment goals (capital preservation, income generation, growth, capital appreciation)
-   - Preferred sectors
-   - Liquidity needs (high/medium/low)
-   - Portfolio value and annual income
-3. Evaluate bonds based on:
-   - Risk rating alignment with customer tolerance
-   - ESG score alignment with values
-   - Volatility and liquidity match
-   - Minimum investment vs. portfolio value
-   - Sector exposure preferences
-   - Yield and maturity alignment with goals
-4. Generate personalized recommendations with clear reasoning
+1. Use get_bond_recommendations_for_customer(customer_id) to get the ranked bonds
+2. The ranking is already computed: each recommendation has a score (0-100) and a per-factor
+   breakdown (risk, sector, horizon, affordability, liquidity, esg). Do not re-rank the bonds
+3. Explain why each recommended bond suits the customer, using the factor details
+4. Mention any excluded bonds only if relevant, with the reason given
 5. Present findings in friendly, conversational natural language
 
 When finding the most sellable bond and suitable customers:
-1. Use get_most_sellable_bond_with_customers() to get the top-demand bond and all customers
+1. Use get_most_sellable_bond_with_customers() to get the top-demand bond and its matched customers
 2. Analyze the bond's characteristics (demandScore, sellabilityRank, demandTrend)
-3. Review each customer's profile to determine suitability:
-   - Check if customer is interested in bonds (interestedInBonds field)
-   - Verify portfolio value meets minimum investment requirement
-   - Match risk tolerance with bond risk rating
-   - Align investment goals with bond features
-   - Consider sector preferences and liquidity needs
-4. Create a list of suitable customers with explanations
+3. The matching is already computed: every customer was checked for interest in bonds, portfolio
+   value vs. minimum investment, risk tolerance vs. risk rating, and goal or sector alignment.
+   Do not fetch customer profiles one by one or re-check the matches
+4. Explain why each matched customer suits the bond, using their reasons
 5. Return customer IDs and emails for those who match
 
 You focus ONLY on bond recommendations and customer matching. For sending emails, 
@@ -0,0 +1,81 @@
+"""Lazy agent registry - builds each agent on first use instead of at import"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+def log_event(event: dict):
+    print(json.dumps(event))
+
+
+class AgentRegistry:
+    """Holds agent factories and builds each agent at most once, on first use.
+
+    Creating an agent builds a BedrockModel (and its boto3 client), so deferring that
+    work keeps module import - and therefore the runtime's /ping - fast.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = dict(factories)
+        self._agents: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.build_times_ms: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        with self._lock:
+            self._factories[name] = factory
+            self._agents.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the named agent, building it on first call."""
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown agent '{name}'")
+                start = time.perf_counter()
+                agent = self._factories[name]()
+                duration_ms = round((time.perf_counter() - start) * 1000, 2)
+                self._agents[name] = agent
+                self.build_times_ms[name] = duration_ms
+                log_event({
+                    'eventType': 'agent.registry.build',
+                    'agentName': name,
+                    'durationMs': duration_ms,
+                    'timestamp': time.time(),
+                })
+        return agent
+
+    def lazy(self, name: str) -> "LazyAgent":
+        """Return a proxy that builds the named agent when it is first used."""
+        return LazyAgent(self, name)
+
+    def is_built(self, name: str) -> bool:
+        return name in self._agents
+
+    def built(self):
+        return list(self._agents)
+
+
+class LazyAgent:
+    """Stand-in for a registry agent; attribute access or a call builds the real one."""
+
+    __slots__ = ('_registry', '_name')
+
+    def __init__(self, registry: AgentRegistry, name: str):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._registry.get(self._name)(*args, **kwargs)
+
+    def __repr__(self):
+        state = 'built' if self._registry.is_built(self._name) else 'not built'
+        return f"<LazyAgent {self._name} ({state})>"
@@ -0,0 +1,101 @@
+"""Read-through cache for catalog-style tool results (bonds, market data, customer list and queries)"""
+import json
+import os
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+from utils.ttl_cache import TTLCache
+
+CATALOG_CACHE_ENABLED = os.environ.get('CATALOG_CACHE_ENABLED', 'true').lower() != 'false'
+
+# tool name -> (ttl seconds, max entries). The bond catalog and market data change about
+# once a day; the customer list changes more often, so it expires sooner.
+CATALOG_CACHE_POLICIES: Dict[str, Tuple[float, int]] = {
+    'list_available_bonds': (float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '900')), 4),
+    'get_product_details': (float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '900')), 128),
+    'search_market_data': (float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '900')), 32),
+    'list_customers': (float(os.environ.get('CUSTOMER_LIST_CACHE_TTL_SECONDS', '300')), 4),
+    'customer_query': (float(os.environ.get('CUSTOMER_LIST_CACHE_TTL_SECONDS', '300')), 64),
+}
+# Tools that call the same Lambda under another name share that tool's cache
+CATALOG_CACHE_ALIASES = {'list_bonds': 'list_available_bonds'}
+
+
+class ToolResultCache:
+    """Per-tool TTL caches of parsed Lambda response bodies.
+
+    Entries are keyed by the data version, function ARN and canonical payload, so
+    ``set_data_version`` (a catalog snapshot refresh) invalidates everything at once.
+    The version is the ``catalogVersion`` list-bonds derives from the bond files it
+    lists; it is never taken from the invoking request.
+    Only successful, complete bodies are stored (a list-bonds page cut short by the
+    Lambda deadline reports ``unreadCount`` and is not); cached bodies are shared, so
+    callers must treat them as read-only.
+    """
+
+    def __init__(self, policies: Dict[str, Tuple[float, int]], aliases: Optional[Dict[str, str]] = None, data_version: str = ''):
+        self.aliases = dict(aliases or {})
+        self.caches = {
+            tool_name: TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+            for tool_name, (ttl_seconds, max_entries) in policies.items()
+        }
+        self.data_version = data_version
+        self._lock = threading.Lock()
+
+    def _cache_for(self, tool_name: str) -> Optional[TTLCache]:
+        return self.caches.get(self.aliases.get(tool_name, tool_name))
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return self._cache_for(tool_name) is not None
+
+    def _key(self, function_arn: str, payload: dict) -> Hashable:
+        return (self.data_version, function_arn, json.dumps(payload or {}, sort_keys=True))
+
+    def get(self, tool_name: str, function_arn: str, payload: dict) -> Optional[dict]:
+        cache = self._cache_for(tool_name)
+        if cache is None:
+            return None
+        return cache.get(self._key(function_arn, payload))
+
+    def set(self, tool_name: str, function_arn: str, payload: dict, body: dict):
+        cache = self._cache_for(tool_name)
+        if cache is None or 'error' in body:
+            return
+        version = body.get('catalogVersion')
+        if version:
+            self.set_data_version(str(version))
+        if body.get('unreadCount'):
+            return
+        cache.set(self._key(function_arn, payload), body)
+
+    def invalidate(self, tool_name: str = None):
+        """Drop one tool's cached results, or every tool's when no name is given."""
+        if tool_name is None:
+            for cache in self.caches.values():
+                cache.clear()
+            return
+        cache = self._cache_for(tool_name)
+        if cache is not None:
+            cache.clear()
+
+    def set_data_version(self, data_version: str) -> bool:
+        """Switch to a new catalog snapshot; returns True if the version changed."""
+        with self._lock:
+            if data_version == self.data_version:
+                return False
+            self.data_version = data_version
+        self.invalidate()
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            'dataVersion': self.data_version,
+            'tools': {tool_name: cache.snapshot() for tool_name, cache in self.caches.items()},
+        }
+
+
+def create_tool_cache() -> Optional[ToolResultCache]:
+    """The process-wide catalog cache, or None when CATALOG_CACHE_ENABLED=false."""
+    if not CATALOG_CACHE_ENABLED:
+        return None
+    return ToolResultCache(CATALOG_CACHE_POLICIES, CATALOG_CACHE_ALIASES)
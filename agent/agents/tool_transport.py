@@ -0,0 +1,190 @@
+"""Tool transport - the shared, pooled Lambda client behind every agent tool"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+
+from .tool_cache import create_tool_cache
+
+AWS_REGION = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'eu-west-1'))
+
+LAMBDA_MAX_CONCURRENCY = int(os.environ.get('LAMBDA_MAX_CONCURRENCY', '16'))
+LAMBDA_TIMEOUT_SECONDS = float(os.environ.get('LAMBDA_TIMEOUT_SECONDS', '30'))
+# The async executor's workers plus headroom for synchronous callers (specialised agents, fast path)
+LAMBDA_MAX_POOL_CONNECTIONS = int(os.environ.get('LAMBDA_MAX_POOL_CONNECTIONS', str(LAMBDA_MAX_CONCURRENCY + 8)))
+LAMBDA_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('LAMBDA_CONNECT_TIMEOUT_SECONDS', '2'))
+# Above the longest tool Lambda timeout (30s) so a slow but successful call is never cut off and retried
+LAMBDA_READ_TIMEOUT_SECONDS = float(os.environ.get('LAMBDA_READ_TIMEOUT_SECONDS', '35'))
+LAMBDA_MAX_ATTEMPTS = int(os.environ.get('LAMBDA_MAX_ATTEMPTS', '3'))
+
+
+def log_event(event: dict):
+    print(json.dumps(event))
+
+
+def build_lambda_config() -> Config:
+    """botocore config for tool invocations: bounded pool, keep-alive, timeouts and adaptive retries."""
+    return Config(
+        region_name=AWS_REGION,
+        max_pool_connections=LAMBDA_MAX_POOL_CONNECTIONS,
+        connect_timeout=LAMBDA_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=LAMBDA_READ_TIMEOUT_SECONDS,
+        retries={'mode': 'adaptive', 'max_attempts': LAMBDA_MAX_ATTEMPTS},
+        tcp_keepalive=True,
+    )
+
+
+class LambdaTransport:
+    """One Lambda client and one metrics path for every tool, sync or async.
+
+    ``invoke`` is the blocking call used by the specialised agents' tools. ``invoke_async``
+    runs the same round trip on a dedicated thread pool sized to ``max_concurrency``
+    (boto3 has no asyncio client), so the event loop never blocks, a burst of tool calls
+    queues here instead of exhausting the loop's default executor, and each call is
+    bounded by ``timeout_seconds``. A timed-out call returns an error to the tool
+    straight away; its worker thread is released when boto3 gives up.
+
+    Both paths log ``agent.tool.success``, ``agent.tool.failure`` and (async only)
+    ``agent.tool.timeout`` events. With a ``cache`` (see tool_cache.py), catalog-style
+    tools are answered from it when possible, skipping the Lambda entirely; their
+    success events carry ``cacheHit``.
+    """
+
+    def __init__(self, client, max_concurrency: int = 16, timeout_seconds: float = 30.0, cache=None):
+        self.client = client
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='lambda')
+
+    def _round_trip(self, function_arn: str, payload: dict):
+        """The boto3 call, including reading the streamed payload."""
+        response = self.client.invoke(
+            FunctionName=function_arn,
+            InvocationType='RequestResponse',
+            Payload=json.dumps(payload or {})
+        )
+        lambda_request_id = response.get('ResponseMetadata', {}).get('RequestId')
+        result = json.loads(response['Payload'].read())
+        return lambda_request_id, result, json.loads(result.get('body', '{}'))
+
+    def invoke(self, function_arn: str, payload: dict = None, agent_name: str = None, tool_name: str = None) -> dict:
+        """Invoke ``function_arn`` and return the parsed response body, or ``{'error': ...}``."""
+        if not function_arn:
+            return {'error': 'Lambda function ARN not configured'}
+
+        start = time.perf_counter()
+        context = {'agentName': agent_name, 'toolName': tool_name, 'functionArn': function_arn}
+        cached = self._cached(context, start, payload)
+        if cached is not None:
+            return cached
+        try:
+            outcome = self._round_trip(function_arn, payload)
+        except Exception as e:
+            return self._failed(context, start, e)
+        return self._handle(context, start, payload, *outcome)
+
+    async def invoke_async(self, function_arn: str, payload: dict = None, agent_name: str = None, tool_name: str = None) -> dict:
+        """Awaitable ``invoke`` on the bounded executor, with a timeout."""
+        if not function_arn:
+            return {'error': 'Lambda function ARN not configured'}
+
+        start = time.perf_counter()
+        context = {'agentName': agent_name, 'toolName': tool_name, 'functionArn': function_arn}
+        cached = self._cached(context, start, payload)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        try:
+            outcome = await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._round_trip, function_arn, payload),
+                self.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            log_event({
+                'eventType': 'agent.tool.timeout',
+                **context,
+                'timeoutSeconds': self.timeout_seconds,
+                'durationMs': round((time.perf_counter() - start) * 1000, 2),
+                'timestamp': time.time(),
+            })
+            return {'error': f"Lambda invocation timed out after {self.timeout_seconds:g}s"}
+        except Exception as e:
+            return self._failed(context, start, e)
+        return self._handle(context, start, payload, *outcome)
+
+    def _cacheable(self, context: dict) -> bool:
+        return self.cache is not None and self.cache.is_cacheable(context['toolName'])
+
+    def _cached(self, context: dict, start: float, payload: dict):
+        if not self._cacheable(context):
+            return None
+        body = self.cache.get(context['toolName'], context['functionArn'], payload)
+        if body is not None:
+            log_event({
+                'eventType': 'agent.tool.success',
+                **context,
+                'cacheHit': True,
+                'requestId': body.get('requestId'),
+                'durationMs': round((time.perf_counter() - start) * 1000, 2),
+                'timestamp': time.time(),
+            })
+        return body
+
+    def _failed(self, context: dict, start: float, error: Exception) -> dict:
+        log_event({
+            'eventType': 'agent.tool.failure',
+            **context,
+            'error': str(error),
+            'durationMs': round((time.perf_counter() - start) * 1000, 2),
+            'timestamp': time.time(),
+        })
+        return {'error': f"Lambda invocation failed: {str(error)}"}
+
+    def _handle(self, context: dict, start: float, payload: dict, lambda_request_id, result: dict, body: dict) -> dict:
+        status_code = result.get('statusCode')
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        if status_code == 200:
+            cache_fields = {}
+            if self._cacheable(context):
+                self.cache.set(context['toolName'], context['functionArn'], payload, body)
+                cache_fields['cacheHit'] = False
+            log_event({
+                'eventType': 'agent.tool.success',
+                **context,
+                **cache_fields,
+                'lambdaInvokeRequestId': lambda_request_id,
+                'requestId': body.get('requestId'),
+                'durationMs': duration_ms,
+                'timestamp': time.time(),
+            })
+            return body
+
+        error_msg = body.get('error') or body.get('message') or 'Unknown error'
+        log_event({
+            'eventType': 'agent.tool.failure',
+            **context,
+            'lambdaInvokeRequestId': lambda_request_id,
+            'requestId': body.get('requestId'),
+            'statusCode': status_code,
+            'error': error_msg,
+            'durationMs': duration_ms,
+            'timestamp': time.time(),
+        })
+        return {'error': error_msg, 'requestId': body.get('requestId'), 'statusCode': status_code}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+# Shared by every agent module: one connection pool, and the concurrency bound applies process-wide
+transport = LambdaTransport(
+    boto3.client('lambda', config=build_lambda_config()),
+    max_concurrency=LAMBDA_MAX_CONCURRENCY,
+    timeout_seconds=LAMBDA_TIMEOUT_SECONDS,
+    cache=create_tool_cache(),
+)
@@ -0,0 +1 @@
+# Benchmarks for the agent runtime (not shipped with the runtime image)
@@ -0,0 +1,105 @@
+"""Cold-start benchmark: import time and time until /ping is healthy.
+
+Starts fresh interpreters so nothing is cached between runs, and prints the
+agent.startup phase report emitted by the entry module. Run from the agent directory:
+
+    python -m benchmarks.bench_cold_start --runs 5
+    python -m benchmarks.bench_cold_start --runs 3 --serve --output cold-start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+AGENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def parse_startup_event(output: str):
+    for line in output.splitlines():
+        if '"agent.startup"' in line:
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+def measure_import(module: str) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-c', f'import {module}'],
+        cwd=AGENT_DIR, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    return {'wallMs': round(wall_ms, 2), 'startup': parse_startup_event(proc.stdout)}
+
+
+def measure_ping(module: str, port: int, timeout_s: float) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', module],
+        cwd=AGENT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout_s:
+            try:
+                with urllib.request.urlopen(f'http://localhost:{port}/ping', timeout=1) as response:
+                    if response.status == 200:
+                        return {'pingHealthyMs': round((time.perf_counter() - start) * 1000, 2)}
+            except OSError:
+                time.sleep(0.05)
+        return {'pingHealthyMs': None}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def summarise(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {'min': round(min(values), 2), 'median': round(statistics.median(values), 2), 'max': round(max(values), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='strands_agent', help='Entry module to measure')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--serve', action='store_true', help='Also start the server and time /ping')
+    parser.add_argument('--port', type=int, default=8080, help='Port the AgentCore app listens on')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Seconds to wait for /ping')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    imports = [measure_import(args.module) for _ in range(args.runs)]
+    phases = {}
+    for run in imports:
+        for phase, ms in ((run['startup'] or {}).get('phasesMs') or {}).items():
+            phases.setdefault(phase, []).append(ms)
+
+    report = {
+        'module': args.module,
+        'runs': args.runs,
+        'python': sys.version.split()[0],
+        'importWallMs': summarise([r['wallMs'] for r in imports]),
+        'moduleTotalMs': summarise([(r['startup'] or {}).get('totalMs') for r in imports]),
+        'phasesMs': {phase: summarise(values) for phase, values in phases.items()},
+        'agentsBuiltAtImport': (imports[-1]['startup'] or {}).get('agentsBuilt'),
+    }
+    if args.serve:
+        report['pingHealthyMs'] = summarise([
+            measure_ping(args.module, args.port, args.timeout)['pingHealthyMs'] for _ in range(args.runs)
+        ])
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
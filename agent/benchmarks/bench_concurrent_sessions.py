@@ -0,0 +1,91 @@
+"""Concurrency benchmark for agent_invocation with the session-keyed coordinator pool.
+
+Drives N simultaneous agent_invocation generators against a stub model and reports
+throughput, latency and process RSS. Run from the agent directory:
+
+    python -m benchmarks.bench_concurrent_sessions --sessions 50 --turns 3 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import strands_agent  # noqa: E402
+from agent_router import AgentRouter  # noqa: E402
+from benchmarks.stub_model import StubModel  # noqa: E402
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+async def run_session(session_id: str, turns: int, latencies: list):
+    for turn in range(turns):
+        payload = {'input': {'prompt': f'Turn {turn}: which bonds suit a cautious investor?', 'sessionId': session_id}}
+        start = time.perf_counter()
+        async for _ in strands_agent.agent_invocation(payload):
+            pass
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(sessions: int, turns: int, shared: bool):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_session('shared' if shared else f'bench-{i}', turns, latencies)
+        for i in range(sessions)
+    ])
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50, help='Concurrent sessions')
+    parser.add_argument('--turns', type=int, default=3, help='Turns per session')
+    parser.add_argument('--latency', type=float, default=0.2, help='Stub model latency per call (seconds)')
+    parser.add_argument('--shared', action='store_true', help='Send every invocation on one session (old behaviour)')
+    args = parser.parse_args()
+
+    stub = StubModel(latency_s=args.latency)
+    strands_agent.agent_router = AgentRouter(None, None, None, None, None, model=stub)
+    # Silence per-chunk prints from the entrypoint
+    strands_agent.print = lambda *a, **k: None
+
+    rss_before = current_rss_mb()
+    elapsed, latencies = asyncio.run(run(args.sessions, args.turns, args.shared))
+    rss_after = current_rss_mb()
+
+    total = len(latencies)
+    latencies.sort()
+    p99 = latencies[min(total - 1, int(total * 0.99))]
+    print("=" * 60)
+    print(f"Sessions: {args.sessions}  Turns/session: {args.turns}  Model latency: {args.latency}s  Shared: {args.shared}")
+    print(f"Invocations:      {total}")
+    print(f"Wall time:        {elapsed:.2f}s")
+    print(f"Throughput:       {total / elapsed:.1f} invocations/s")
+    print(f"Latency p50/p99:  {statistics.median(latencies) * 1000:.0f}ms / {p99 * 1000:.0f}ms")
+    print(f"Model calls:      {stub.calls}")
+    print(f"RSS before/after: {rss_before:.1f}MB / {rss_after:.1f}MB (peak {peak_rss_mb():.1f}MB)")
+    print(f"Coordinator pool: {strands_agent.agent_router.sessions.snapshot()}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
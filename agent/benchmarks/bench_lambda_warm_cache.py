@@ -0,0 +1,101 @@
+"""Benchmark: tool Lambda latency in a cold container vs a warm one holding its data cache.
+
+Generates a synthetic client-details/ tree (``--customers`` customers as JSON plus the
+NDJSON store and index, ``--bonds`` bond files, market data), puts it in the local S3
+stand-in with ``--latency`` seconds per request and ``--bandwidth`` MB/s for downloads,
+and times each Lambda handler three ways:
+
+  cold        first call in a fresh container: everything is downloaded and parsed
+  warm        later calls within the cache TTL: served from the container, no requests
+  revalidate  warm calls past the TTL: a listing or conditional GET confirms the cache
+
+Before the container cache every call paid roughly the cold cost. Run from the agent
+directory (needs boto3 importable, as the Lambdas do):
+
+    python -m benchmarks.bench_lambda_warm_cache --customers 100000 --bonds 500
+    python -m benchmarks.bench_lambda_warm_cache --customers 20000 --bonds 2000 --latency 0.03
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_local_data import write_data_dir
+from benchmarks.fake_s3 import FakeS3, lambda_data, load_lambda
+from utils.customer_store import convert
+
+
+class FakeContext:
+    aws_request_id = request_id = 'bench'
+    function_name = 'bench'
+
+
+def timed_calls(handler, events, context):
+    """Median ms per call; every call must succeed."""
+    durations = []
+    for event in events:
+        start = time.perf_counter()
+        response = handler(event, context)
+        durations.append((time.perf_counter() - start) * 1000)
+        assert response['statusCode'] == 200, response['body'][:300]
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=100_000)
+    parser.add_argument('--bonds', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.015, help='Seconds per S3 request')
+    parser.add_argument('--bandwidth', type=float, default=100.0, help='Download MB/s')
+    parser.add_argument('--calls', type=int, default=10, help='Warm calls timed per Lambda')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        write_data_dir(root, args.customers, args.bonds, args.seed)
+        convert(os.path.join(root, 'customers', 'bank-x-customers.json'))
+        s3 = FakeS3.from_directory(root, latency_s=args.latency, bandwidth=args.bandwidth * 1_000_000)
+        # The same data without the NDJSON store: get-customer falls back to the JSON database
+        s3_json_only = FakeS3({key: data for key, data in s3.objects.items() if '.ndjson' not in key},
+                              latency_s=args.latency, bandwidth=args.bandwidth * 1_000_000)
+
+    rng = random.Random(args.seed)
+    customer_events = [{'customer_id': f'CUST-{rng.randrange(args.customers):07d}'} for _ in range(args.calls + 1)]
+    page_events = [{'limit': 50, 'sort_by': 'portfolioValue', 'descending': True}] * (args.calls + 1)
+    lambdas = (
+        ('get-customer (store)', 'get-customer', s3, customer_events),
+        ('get-customer (json)', 'get-customer', s3_json_only, customer_events),
+        ('list-customers', 'list-customers', s3, page_events),
+        ('list-bonds', 'list-bonds', s3, [{'limit': 50}] * (args.calls + 1)),
+        ('search-market', 'search-market', s3, [{'product_type': 'bond'}] * (args.calls + 1)),
+    )
+
+    print("=" * 72)
+    print(f"{args.customers:,} customers, {args.bonds:,} bonds, S3 stand-in {args.latency * 1000:.0f}ms/request, "
+          f"{args.bandwidth:g} MB/s")
+    print(f"{'lambda':<22}{'cold ms':>10}{'reqs':>6}{'warm ms':>10}{'reqs':>6}{'revalidate ms':>15}{'reqs':>6}")
+    print("-" * 72)
+    for label, name, bucket, events in lambdas:
+        module = load_lambda(name)
+        module.log = lambda *args, **meta: None
+        with lambda_data(s3=bucket) as data_access:
+            cells = []
+            bucket.requests.clear()
+            cells.append((timed_calls(module.lambda_handler, events[:1], FakeContext()), len(bucket.requests)))
+            bucket.requests.clear()
+            warm_ms = timed_calls(module.lambda_handler, events[1:], FakeContext())
+            cells.append((warm_ms, len(bucket.requests) / args.calls))
+            data_access.DEFAULT_MAX_AGE_SECONDS = 0
+            module.INDEX_TTL_SECONDS = module.MARKET_DATA_TTL_SECONDS = 0
+            bucket.requests.clear()
+            revalidate_ms = timed_calls(module.lambda_handler, events[1:], FakeContext())
+            cells.append((revalidate_ms, len(bucket.requests) / args.calls))
+        print(f"{label:<22}{cells[0][0]:10.1f}{cells[0][1]:6.0f}{cells[1][0]:10.2f}{cells[1][1]:6.1f}"
+              f"{cells[2][0]:15.2f}{cells[2][1]:6.1f}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
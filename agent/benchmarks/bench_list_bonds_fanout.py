@@ -0,0 +1,104 @@
+"""Benchmark: lambda/list-bonds reading its bond files serially vs with a bounded thread pool.
+
+Runs the list-bonds handler against a fake Lambda client: list-files returns ``--bonds``
+file names and every read-file call sleeps ``--latency`` seconds (plus jitter), with
+``--failure-rate`` of them failing. Each concurrency level runs with a fake context
+holding ``--timeout`` seconds, like the function's configured timeout, so reads still
+running at the deadline are reported as unread. Concurrency 1 is the old serial loop.
+Run from the agent directory (needs boto3 importable, as the Lambda does):
+
+    python -m benchmarks.bench_list_bonds_fanout --bonds 300 --latency 0.05
+    python -m benchmarks.bench_list_bonds_fanout --bonds 2000 --latency 0.08 --failure-rate 0.01
+"""
+import argparse
+import io
+import json
+import os
+import random
+import threading
+import time
+
+from benchmarks.fake_s3 import lambda_data, load_lambda
+
+
+class FakeFileFunctions:
+    """list-files and read-file with injected latency and failures; tracks peak concurrency."""
+
+    def __init__(self, bonds: int, latency_s: float, failure_rate: float, seed: int):
+        self.files = [f'bond-{i:05d}.json' for i in range(bonds)]
+        self.latency_s = latency_s
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, FunctionName, InvocationType='RequestResponse', Payload='{}'):
+        filename = json.loads(Payload)['filename']
+        if FunctionName == 'list-files':
+            result = {'statusCode': 200, 'body': json.dumps({'files': self.files})}
+            return {'Payload': io.BytesIO(json.dumps(result).encode('utf-8'))}
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            delay = self.latency_s * self.rng.uniform(0.5, 1.5)
+            failed = self.rng.random() < self.failure_rate
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if failed:
+            result = {'statusCode': 500, 'body': json.dumps({'error': 'injected failure'})}
+        else:
+            name = os.path.basename(filename)
+            bond = {'productId': f'BOND-{name[5:10]}', 'name': name, 'yield': '4.5%'}
+            result = {'statusCode': 200, 'body': json.dumps({'content': json.dumps(bond)})}
+        return {'Payload': io.BytesIO(json.dumps(result).encode('utf-8'))}
+
+
+class FakeContext:
+    aws_request_id = 'bench'
+
+    def __init__(self, timeout_s: float):
+        self.deadline = time.monotonic() + timeout_s
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self.deadline - time.monotonic()) * 1000))
+
+
+def load_list_bonds():
+    module = load_lambda('list-bonds')
+    module.logger.disabled = True
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bonds', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean read-file latency (seconds)')
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=15.0, help='Lambda timeout the deadline is taken from (seconds)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    module = load_list_bonds()
+
+    print("=" * 72)
+    print(f"{args.bonds:,} bond files, read-file {args.latency * 1000:.0f}ms +/-50%, "
+          f"{args.failure_rate:.1%} failures, {args.timeout:g}s timeout")
+    for concurrency in args.concurrency:
+        module.READ_CONCURRENCY = concurrency
+        fake = FakeFileFunctions(args.bonds, args.latency, args.failure_rate, args.seed)
+        with lambda_data(lambda_client=fake):
+            start = time.perf_counter()
+            response = module.lambda_handler({'limit': 1}, FakeContext(args.timeout))
+            elapsed = time.perf_counter() - start
+        body = json.loads(response['body'])
+        print(f"concurrency {concurrency:>3}   {elapsed * 1000:8.0f}ms   status {response['statusCode']}   "
+              f"read {body.get('total', 0):>5}   unread {body.get('unreadCount', 0):>5}   peak in flight {fake.peak_in_flight}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Benchmark: local tool reads from per-call JSON parsing, the NDJSON store and SQLite.
+
+Writes a synthetic local_data/ directory (customers as one JSON array, one file per
+bond, seeded so runs are comparable) to a temporary directory, then times the reads
+the local tools make: a customer profile, a page of bonds, one product's details, the
+inputs of a recommendation (customer + every bond) and the most sellable bond.
+
+"parse" re-reads and parses the files on every call, as the local tools did before
+utils.local_data; "files" and "sqlite" are its two backends, which re-check the files
+for changes at most every LOCAL_DATA_CHECK_SECONDS. The SQLite build (once, then only
+the files that change) is reported separately. Run from the agent directory:
+
+    python -m benchmarks.bench_local_data --customers 1000000 --bonds 10000
+    python -m benchmarks.bench_local_data --customers 100000 --bonds 2000 --queries 200
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.local_data import FileDataSource, SqliteDataSource  # noqa: E402
+from utils.pagination import paginate  # noqa: E402
+
+LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+BOND_TYPES = ('government', 'corporate', 'municipal', 'green', 'high-yield', 'inflation-linked')
+RATINGS = ('AAA', 'AA+', 'AA', 'A', 'BBB', 'BB', 'B')
+
+
+def load_samples():
+    with open(os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json'), 'r', encoding='utf-8') as f:
+        customers = json.load(f)
+    bonds = []
+    for path in sorted(glob.glob(os.path.join(LOCAL_DATA_DIR, 'bonds', '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            bonds.append(json.load(f))
+    return customers, bonds
+
+
+def write_data_dir(root: str, customers: int, bonds: int, seed: int):
+    """A local_data/ layout with ``customers`` customers and ``bonds`` bond files."""
+    sample_customers, sample_bonds = load_samples()
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, 'customers'))
+    with open(os.path.join(root, 'customers', 'bank-x-customers.json'), 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(customers):
+            customer = {**rng.choice(sample_customers), 'customerId': f'CUST-{i:07d}',
+                        'portfolioValue': rng.randint(20, 2000) * 1000}
+            f.write((',' if i else '') + json.dumps(customer))
+        f.write(']')
+    os.makedirs(os.path.join(root, 'bonds'))
+    for j in range(bonds):
+        bond = {**rng.choice(sample_bonds), 'productId': f'BOND-{j:05d}', 'type': rng.choice(BOND_TYPES),
+                'creditRating': rng.choice(RATINGS), 'sellabilityRank': rng.randint(1, bonds)}
+        with open(os.path.join(root, 'bonds', f'bond-{j:05d}.json'), 'w', encoding='utf-8') as f:
+            json.dump(bond, f)
+    os.makedirs(os.path.join(root, 'market-data'))
+    with open(os.path.join(LOCAL_DATA_DIR, 'market-data', 'bond-market-data.json'), 'r', encoding='utf-8') as src, \
+            open(os.path.join(root, 'market-data', 'bond-market-data.json'), 'w', encoding='utf-8') as dst:
+        dst.write(src.read())
+
+
+class ParseEveryCall:
+    """The reads as the local tools made them before utils.local_data."""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+
+    def customer(self, customer_id):
+        with open(os.path.join(self.data_dir, 'customers', 'bank-x-customers.json'), 'r', encoding='utf-8') as f:
+            customers = json.load(f)
+        return next((c for c in customers if c.get('customerId') == customer_id), None)
+
+    def bonds(self):
+        bonds_dir = os.path.join(self.data_dir, 'bonds')
+        bonds = []
+        for filename in [f for f in os.listdir(bonds_dir) if f.endswith('.json')]:
+            with open(os.path.join(bonds_dir, filename), 'r', encoding='utf-8') as f:
+                bonds.append(json.load(f))
+        return bonds
+
+    def bond_file(self, filename):
+        with open(os.path.join(self.data_dir, 'bonds', filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def most_sellable_bond(self):
+        return min(self.bonds(), key=lambda b: b.get('sellabilityRank', 999))
+
+
+def timed(fn, repeat: int):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=1_000_000)
+    parser.add_argument('--bonds', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=50, help='Calls timed per read for files and sqlite')
+    parser.add_argument('--parse-queries', type=int, default=3, help='Calls timed per read for parse (slow)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        write_data_dir(root, args.customers, args.bonds, args.seed)
+        print("=" * 72)
+        print(f"{args.customers:,} customers, {args.bonds:,} bonds "
+              f"(generated in {time.perf_counter() - start:.1f}s)")
+
+        files = FileDataSource(root)
+        start = time.perf_counter()
+        files.customer_count()
+        print(f"files  store convert   {(time.perf_counter() - start) * 1000:10.0f}ms   (once per customer file change)")
+        sqlite = SqliteDataSource(root)
+        start = time.perf_counter()
+        sqlite.refresh(force=True)
+        print(f"sqlite build           {(time.perf_counter() - start) * 1000:10.0f}ms   (once per data change)")
+        sqlite._checked = float('-inf')
+        start = time.perf_counter()
+        sqlite.refresh()
+        print(f"sqlite change check    {(time.perf_counter() - start) * 1000:10.2f}ms   "
+              f"(stat every file, at most every {sqlite.check_seconds:g}s)")
+
+        rng = random.Random(args.seed + 1)
+        customer_ids = [f'CUST-{rng.randrange(args.customers):07d}' for _ in range(args.queries)]
+        bond_files = [f'bond-{rng.randrange(args.bonds):05d}.json' for _ in range(args.queries)]
+        reads = {
+            'customer profile': lambda s, i: s.customer(customer_ids[i]),
+            'bonds page (50)': lambda s, i: paginate(s.bonds(), 'productId', ['name', 'yield'], limit=50),
+            'product details': lambda s, i: s.bond_file(bond_files[i]),
+            'recommendation inputs': lambda s, i: (s.customer(customer_ids[i]), s.bonds()),
+            'most sellable bond': lambda s, i: s.most_sellable_bond(),
+        }
+        backends = (('parse', ParseEveryCall(root), args.parse_queries), ('files', files, args.queries),
+                    ('sqlite', sqlite, args.queries))
+
+        print("-" * 72)
+        print(f"{'read':<24}" + ''.join(f"{name:>14}" for name, _, _ in backends) + "   (median ms per call)")
+        for read, fn in reads.items():
+            cells = []
+            for _, source, repeat in backends:
+                calls = iter(range(repeat))
+                cells.append(timed(lambda: fn(source, next(calls)), repeat))
+            print(f"{read:<24}" + ''.join(f"{ms:14.2f}" for ms in cells))
+        sqlite.close()
+        print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
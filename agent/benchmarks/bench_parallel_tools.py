@@ -0,0 +1,60 @@
+"""Benchmark: a "compare 5 customers" turn with sequential vs concurrent tool execution.
+
+The stub coordinator asks for customer_get_profile on five customers in one turn; each
+call goes to a fake Lambda client with injected latency. Runs the turn once with the
+tool capped at one call at a time (the old sequential behaviour) and once with the
+router's default limits. Run from the agent directory:
+
+    python -m benchmarks.bench_parallel_tools --latency 0.3 --customers 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents import customer_agent, tool_transport  # noqa: E402
+from agent_router import AgentRouter  # noqa: E402
+from benchmarks.fake_lambda import FakeLambdaClient  # noqa: E402
+from benchmarks.stub_model import StubModel  # noqa: E402
+from utils.tool_concurrency import ToolConcurrencyLimiter  # noqa: E402
+
+
+async def run_turn(router: AgentRouter, session_id: str) -> float:
+    start = time.perf_counter()
+    async for _ in router.stream_async('Compare these customers for me', session_id=session_id):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.3, help='Injected Lambda latency per call (seconds)')
+    parser.add_argument('--customers', type=int, default=5, help='Customer profiles requested in the turn')
+    parser.add_argument('--model-latency', type=float, default=0.05, help='Stub model latency per call (seconds)')
+    args = parser.parse_args()
+
+    customer_ids = [f'CUST-{i:03d}' for i in range(1, args.customers + 1)]
+    tool_calls = [('customer_get_profile', {'customer_id': cid}) for cid in customer_ids]
+
+    customer_agent.GET_CUSTOMER_ARN = 'arn:aws:lambda:fake:000000000000:function:get-customer'
+    tool_transport.print = lambda *a, **k: None
+
+    print("=" * 70)
+    print(f"{args.customers} x customer_get_profile, Lambda latency {args.latency}s, model latency {args.model_latency}s")
+    for label, limit in (('sequential', 1), ('concurrent', None)):
+        fake = FakeLambdaClient(latency_s=args.latency)
+        tool_transport.transport.client = fake
+        router = AgentRouter(None, None, None, None, None,
+                             model=StubModel(latency_s=args.model_latency, tool_calls=tool_calls))
+        if limit is not None:
+            router.tool_limiter = ToolConcurrencyLimiter(default_limit=limit, limits={'customer_get_profile': limit})
+        elapsed = asyncio.run(run_turn(router, f'bench-{label}'))
+        print(f"{label:<11} turn {elapsed * 1000:7.0f}ms   lambda calls {fake.calls}   peak in flight {fake.peak_in_flight}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
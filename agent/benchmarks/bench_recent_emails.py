@@ -0,0 +1,115 @@
+"""Benchmark: get-recent-emails over a large sent-emails/ archive on the local S3 stand-in.
+
+Puts ``--emails`` synthetic keys, spread over ``--days`` date prefixes the way send-email
+writes them, into the S3 stand-in with ``--latency`` seconds per request, and times the
+``--limit`` most recent emails three ways:
+
+  single page   the old query: one 100-key listing, oldest dates first (stale past 100 emails)
+  full listing  every page of sent-emails/, then the newest ``--limit``: O(archive) requests
+  newest-first  the Lambda: date prefixes newest-first, stopping once ``--limit`` are certain
+
+Run from the agent directory (needs boto3 importable, as the Lambdas do):
+
+    python -m benchmarks.bench_recent_emails --emails 1000000 --days 730
+    python -m benchmarks.bench_recent_emails --emails 200000 --days 30 --limit 100 --latency 0.03
+"""
+import argparse
+import heapq
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fake_s3 import FakeS3, lambda_data, load_lambda
+
+
+def synthetic_keys(emails: int, days: int, seed: int):
+    """{key: b''} for ``emails`` emails sent at random over ``days`` days, and their timestamps."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    objects, sent = {}, []
+    for n in range(emails):
+        when = start + timedelta(seconds=rng.randrange(days * 86400))
+        stamp = when.strftime('%Y%m%dT%H%M%S')
+        key = f"sent-emails/{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}/{stamp}_customer{n}@example.com_bond-offer.txt"
+        objects[key] = b''
+        sent.append((stamp, key))
+    return objects, sent
+
+
+def single_page(s3, module, limit):
+    response = s3.list_objects_v2(Bucket='fake', Prefix='sent-emails/', MaxKeys=100)
+    emails = [module.parse_email_key(obj['Key']) for obj in response.get('Contents', [])]
+    emails = sorted((e for e in emails if e), key=lambda e: e['timestamp'], reverse=True)
+    return [e['timestamp'] for e in emails[:limit]]
+
+
+def full_listing(s3, module, limit):
+    newest = []
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket='fake', Prefix='sent-emails/'):
+        for obj in page.get('Contents', []):
+            email = module.parse_email_key(obj['Key'])
+            if email:
+                newest.append((email['timestamp'], obj['Key']))
+    return [when for when, _ in heapq.nlargest(limit, newest)]
+
+
+def newest_first(s3, module, limit):
+    response = module.lambda_handler({'limit': limit}, None)
+    assert response['statusCode'] == 200, response['body'][:300]
+    return [datetime.strptime(e['timestamp'], '%Y-%m-%d %H:%M:%S') for e in json.loads(response['body'])['emails']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--emails', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.015, help='Seconds per S3 request')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    objects, sent = synthetic_keys(args.emails, args.days, args.seed)
+    s3 = FakeS3(objects)
+    del objects
+    s3.list_objects_v2(Bucket='fake', MaxKeys=1)  # the stand-in sorts its keys once, outside the timings
+    expected = [datetime.strptime(stamp, '%Y%m%dT%H%M%S') for stamp, _ in heapq.nlargest(args.limit, sent)]
+    setup_s = time.perf_counter() - start
+
+    module = load_lambda('get-recent-emails')
+    module.log = lambda *args, **meta: None
+
+    print("=" * 72)
+    print(f"{args.emails:,} emails over {args.days} days, newest {args.limit}, "
+          f"S3 stand-in {args.latency * 1000:.0f}ms/request (setup {setup_s:.1f}s)")
+    print(f"{'query':<16}{'ms':>12}{'requests':>12}{'keys listed':>14}{'correct':>10}")
+    print("-" * 72)
+    for label, query in (('single page', single_page), ('full listing', full_listing),
+                         ('newest-first', newest_first)):
+        with lambda_data(s3=s3):
+            s3.latency_s = args.latency
+            s3.requests.clear()
+            listed = [0]
+            list_page = s3.list_objects_v2
+
+            def counting(**kwargs):
+                page = list_page(**kwargs)
+                listed[0] += page['KeyCount']
+                return page
+
+            s3.list_objects_v2 = counting
+            try:
+                begin = time.perf_counter()
+                result = query(s3, module, args.limit)
+                elapsed_ms = (time.perf_counter() - begin) * 1000
+            finally:
+                del s3.list_objects_v2
+                s3.latency_s = 0
+        print(f"{label:<16}{elapsed_ms:12.1f}{len(s3.requests):12,}{listed[0]:14,}"
+              f"{'yes' if result == expected else 'NO':>10}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Load test: do suggestion requests inflate p99 latency of concurrent chat streams?
+
+Runs chat streams and suggestion requests side by side through agent_invocation with
+stub models, once with the legacy blocking suggestion call and once with the async
+runner, and reports chat-stream latency percentiles. Run from the agent directory:
+
+    python -m benchmarks.bench_suggestion_latency --chats 40 --suggestions 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import strands_agent  # noqa: E402
+from agent_router import AgentRouter  # noqa: E402
+from benchmarks.stub_model import StubModel  # noqa: E402
+from suggestion_handler import AsyncSuggestionRunner, clean_suggestion_response  # noqa: E402
+
+SUGGESTION_REPLY = '["Show me available bonds", "View customer profiles", "Search market data"]'
+
+
+class StubSuggestionAgent:
+    """Suggestion agent whose synchronous call blocks like a real Agent.__call__."""
+
+    def __init__(self, latency_s: float):
+        self.model = StubModel(latency_s=latency_s, reply=SUGGESTION_REPLY)
+        self.system_prompt = "stub"
+        self.latency_s = latency_s
+
+    def __call__(self, prompt):
+        time.sleep(self.latency_s)
+        return SUGGESTION_REPLY
+
+
+class BlockingSuggestionRunner:
+    """The pre-async behaviour: a synchronous agent call inside the async entrypoint."""
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    async def run(self, prompt):
+        return clean_suggestion_response(self.agent(prompt))
+
+
+async def timed_invocation(prompt: str, latencies: list):
+    start = time.perf_counter()
+    async for _ in strands_agent.agent_invocation({'prompt': prompt}):
+        pass
+    latencies.append(time.perf_counter() - start)
+
+
+async def run_load(chats: int, suggestions: int):
+    chat_latencies, suggestion_latencies = [], []
+    tasks = [timed_invocation('Which bonds suit a cautious investor?', chat_latencies) for _ in range(chats)]
+    tasks += [timed_invocation('Suggest 4 brief, actionable prompts', suggestion_latencies) for _ in range(suggestions)]
+    await asyncio.gather(*tasks)
+    return chat_latencies, suggestion_latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def report(label, chat_latencies, suggestion_latencies):
+    print(f"{label:<10} chat p50 {statistics.median(chat_latencies) * 1000:7.0f}ms   "
+          f"chat p99 {percentile(chat_latencies, 0.99) * 1000:7.0f}ms   "
+          f"suggestion p50 {statistics.median(suggestion_latencies) * 1000:7.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chats', type=int, default=40, help='Concurrent chat streams')
+    parser.add_argument('--suggestions', type=int, default=20, help='Concurrent suggestion requests')
+    parser.add_argument('--chat-latency', type=float, default=0.2, help='Stub coordinator latency (seconds)')
+    parser.add_argument('--suggestion-latency', type=float, default=0.5, help='Stub suggestion model latency (seconds)')
+    args = parser.parse_args()
+
+    strands_agent.print = lambda *a, **k: None
+    strands_agent.agent_router = AgentRouter(None, None, None, None, None, model=StubModel(latency_s=args.chat_latency))
+    suggestion_agent = StubSuggestionAgent(args.suggestion_latency)
+
+    print("=" * 80)
+    print(f"{args.chats} chat streams + {args.suggestions} suggestion requests")
+    for label, runner in (
+        ('blocking', BlockingSuggestionRunner(suggestion_agent)),
+        ('async', AsyncSuggestionRunner(suggestion_agent, max_concurrency=args.suggestions)),
+    ):
+        strands_agent.suggestion_runner = runner
+        chat_latencies, suggestion_latencies = asyncio.run(run_load(args.chats, args.suggestions))
+        report(label, chat_latencies, suggestion_latencies)
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
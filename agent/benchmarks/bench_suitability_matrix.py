@@ -0,0 +1,144 @@
+"""Benchmark: build, update and query a customer × bond suitability matrix at scale.
+
+Generates a synthetic book by varying the local_data customers and bonds (seeded, so
+runs are comparable), then times encoding, the full vectorised scoring pass, one-row
+and one-column updates, and the "best bonds for customer X" / "best customers for
+bond Y" queries. A sample of pairs is checked against bond_scoring.score_bond. The
+default 1M × 1k matrix takes ~2 GB in float16. Run from the agent directory:
+
+    python -m benchmarks.bench_suitability_matrix --customers 1000000 --bonds 1000
+    python -m benchmarks.bench_suitability_matrix --customers 100000 --bonds 200 --dtype float32
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np  # noqa: E402
+
+from utils import suitability_matrix  # noqa: E402
+from utils.bond_scoring import ineligibility_reason, score_bond  # noqa: E402
+from utils.suitability_matrix import INELIGIBLE, SuitabilityMatrix  # noqa: E402
+
+LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+SECTORS = ('government', 'infrastructure', 'utilities', 'technology', 'healthcare', 'green', 'financial', 'energy')
+
+
+def load_samples():
+    with open(os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json'), 'r', encoding='utf-8') as f:
+        customers = json.load(f)
+    bonds = []
+    for path in sorted(glob.glob(os.path.join(LOCAL_DATA_DIR, 'bonds', '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            bonds.append(json.load(f))
+    return customers, bonds
+
+
+def synthetic_customers(samples, count: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            **rng.choice(samples),
+            'customerId': f'CUST-{i:07d}',
+            'portfolioValue': rng.randint(20, 2000) * 1000,
+            'riskTolerance': rng.choice(('low', 'medium', 'high')),
+            'investmentHorizon': rng.randint(1, 30),
+            'liquidityNeeds': rng.choice(('low', 'medium', 'high')),
+            'preferredSectors': rng.sample(SECTORS, rng.randint(0, 3)),
+        }
+
+
+def synthetic_bonds(samples, count: int, seed: int):
+    rng = random.Random(seed + 1)
+    return [
+        {
+            **rng.choice(samples),
+            'productId': f'BOND-{j:05d}',
+            'riskRating': rng.randint(1, 10),
+            'maturity': f'{rng.randint(1, 30)} years',
+            'minInvestment': rng.randint(1, 200) * 1000,
+            'liquidityRating': rng.randint(1, 5),
+            'esgScore': rng.randint(20, 95),
+        }
+        for j in range(count)
+    ]
+
+
+def timed(fn, repeat: int = 1):
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=1_000_000)
+    parser.add_argument('--bonds', type=int, default=1000)
+    parser.add_argument('--dtype', choices=('float16', 'float32'), default='float16')
+    parser.add_argument('--block-rows', type=int, default=suitability_matrix.BLOCK_ROWS, help='Customers scored per vectorised block')
+    parser.add_argument('--queries', type=int, default=100, help='Random top-k queries of each kind')
+    parser.add_argument('--verify', type=int, default=2000, help='Random pairs checked against score_bond')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    suitability_matrix.BLOCK_ROWS = args.block_rows
+
+    sample_customers, sample_bonds = load_samples()
+    bonds = synthetic_bonds(sample_bonds, args.bonds, args.seed)
+
+    print("=" * 72)
+    print(f"{args.customers:,} customers x {args.bonds:,} bonds, {args.dtype}, block {args.block_rows} rows")
+    matrix, load_ms = timed(lambda: SuitabilityMatrix(
+        synthetic_customers(sample_customers, args.customers, args.seed), bonds, dtype=args.dtype))
+    _, build_ms = timed(matrix.rebuild)
+    pairs = args.customers * args.bonds
+    print(f"load        {load_ms:10.0f}ms   (generate + encode + score all)")
+    print(f"score all   {build_ms:10.0f}ms   {pairs / (build_ms / 1000) / 1e6:,.0f}M pairs/s   "
+          f"matrix {matrix.scores.nbytes / 2**20:,.0f} MiB")
+
+    rng = random.Random(args.seed + 2)
+    customer_ids = [rng.choice(matrix.customer_ids) for _ in range(args.queries)]
+    product_ids = [rng.choice(matrix.product_ids) for _ in range(args.queries)]
+    by_id = {bond['productId']: bond for bond in bonds}
+
+    _, row_ms = timed(lambda: matrix.upsert_customer({**sample_customers[0], 'customerId': customer_ids[0]}), repeat=5)
+    _, column_ms = timed(lambda: matrix.upsert_bond({**by_id[product_ids[0]], 'riskRating': 5}), repeat=3)
+    _, new_bond_ms = timed(lambda: matrix.upsert_bond({**sample_bonds[0], 'productId': 'BOND-NEW'}))
+    print(f"update row  {row_ms:10.2f}ms   (one customer changed)")
+    print(f"update col  {column_ms:10.2f}ms   (one bond changed)")
+    print(f"add bond    {new_bond_ms:10.2f}ms")
+
+    _, bonds_ms = timed(lambda: [matrix.top_bonds(cid, 10) for cid in customer_ids])
+    _, customers_ms = timed(lambda: [matrix.top_customers(pid, 50) for pid in product_ids])
+    print(f"top 10 bonds for a customer    {bonds_ms / args.queries:8.3f}ms")
+    print(f"top 50 customers for a bond    {customers_ms / args.queries:8.3f}ms")
+
+    # Regenerate the sampled customers (the generator is deterministic) to check them against score_bond
+    checked = sorted(rng.sample(range(args.customers), min(args.verify, args.customers)))
+    wanted = set(checked)
+    worst = 0.0
+    for i, customer in enumerate(synthetic_customers(sample_customers, checked[-1] + 1 if checked else 0, args.seed)):
+        if i not in wanted or customer['customerId'] == customer_ids[0]:
+            continue
+        bond = rng.choice(bonds)
+        if bond['productId'] == product_ids[0]:
+            continue
+        actual = matrix.score(customer['customerId'], bond['productId'])
+        expected = INELIGIBLE if ineligibility_reason(customer, bond) else score_bond(customer, bond)['score']
+        worst = max(worst, abs(actual - expected))
+    print(f"verified {len(checked):,} pairs against score_bond: max |diff| {worst:.3f}")
+    print(f"eligible pairs {np.count_nonzero(matrix.scores > INELIGIBLE) / matrix.scores.size:.1%}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: prompt tokens and model latency per tool, indented vs compact output.
+
+Calls each local tool (local_data, no AWS needed) in both TOOL_OUTPUT_MODE settings and
+reports the output size in estimated tokens. With --bedrock each output is also sent to
+the model once (Converse API) to report real input tokens and latency. Run from the
+agent directory:
+
+    python -m benchmarks.bench_tool_output
+    python -m benchmarks.bench_tool_output --bedrock --model-id global.anthropic.claude-haiku-4-5-20251001-v1:0
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.customer_agent_local import list_customers, get_customer_profile  # noqa: E402
+from agents.product_agent_local import list_available_bonds, get_product_details, search_market_data  # noqa: E402
+from agents.recommendation_agent_local import (  # noqa: E402
+    get_bond_recommendations_for_customer, get_most_sellable_bond_with_customers,
+)
+from utils import tool_output  # noqa: E402
+from utils.history_compactor import estimate_tokens  # noqa: E402
+
+TOOL_CALLS = [
+    ('list_available_bonds', lambda: list_available_bonds()),
+    ('get_product_details', lambda: get_product_details('corporate-bond-a')),
+    ('search_market_data', lambda: search_market_data('bond')),
+    ('list_customers', lambda: list_customers()),
+    ('get_customer_profile', lambda: get_customer_profile('CUST-001')),
+    ('get_bond_recommendations', lambda: get_bond_recommendations_for_customer('CUST-001')),
+    ('get_most_sellable_bond', lambda: get_most_sellable_bond_with_customers()),
+]
+MODES = ('indented', 'compact')
+
+
+def measure_model(client, model_id: str, output: str) -> dict:
+    response = client.converse(
+        modelId=model_id,
+        messages=[{'role': 'user', 'content': [{'text': f"Tool result:\n{output}\n\nSummarise it in one sentence."}]}],
+        inferenceConfig={'maxTokens': 64},
+    )
+    return {'inputTokens': response['usage']['inputTokens'], 'latencyMs': response['metrics']['latencyMs']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bedrock', action='store_true', help='Also measure real input tokens and latency on Bedrock')
+    parser.add_argument('--model-id', default=os.environ.get('BEDROCK_MODEL_ID', 'global.anthropic.claude-haiku-4-5-20251001-v1:0'))
+    args = parser.parse_args()
+
+    client = None
+    if args.bedrock:
+        import boto3
+        client = boto3.client('bedrock-runtime')
+
+    print("=" * 96)
+    print(f"{'tool':<26}{'mode':<10}{'chars':>8}{'est. tokens':>13}{'input tokens':>14}{'latency':>10}{'saved':>9}")
+    totals = {mode: 0 for mode in MODES}
+    for name, call in TOOL_CALLS:
+        baseline = None
+        for mode in MODES:
+            tool_output.TOOL_OUTPUT_MODE = mode
+            output = str(call())
+            tokens = estimate_tokens(output)
+            totals[mode] += tokens
+            baseline = baseline or tokens
+            model = measure_model(client, args.model_id, output) if client else {}
+            saved = f"{(1 - tokens / baseline) * 100:.0f}%" if mode != MODES[0] else ''
+            latency = f"{model['latencyMs']}ms" if model else '-'
+            print(f"{name:<26}{mode:<10}{len(output):>8}{tokens:>13}{model.get('inputTokens', '-'):>14}{latency:>10}{saved:>9}")
+    print("-" * 96)
+    print(f"Total estimated tokens: indented {totals['indented']}, compact {totals['compact']} "
+          f"({(1 - totals['compact'] / totals['indented']) * 100:.0f}% fewer)")
+    print("=" * 96)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Fake boto3 Lambda client for benchmarks - answers tool Lambdas from local_data with injected latency"""
+import io
+import json
+import os
+import threading
+import time
+
+from utils.customer_index import CustomerIndex
+from utils.customer_matching import BondMatchCriteria, match_customers
+from utils.pagination import DEFAULT_PAGE_SIZE, paginate
+
+LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+
+
+class FakeLambdaClient:
+    """Stands in for ``boto3.client('lambda')``; ``invoke`` sleeps ``latency_s`` then answers.
+
+    Payloads are routed by the ``customer_id``/``product_name``/``match_bond``/``filters``
+    fields the tool Lambdas take. Tracks peak concurrency so benchmarks can show calls overlapping.
+    """
+
+    def __init__(self, latency_s: float = 0.3):
+        self.latency_s = latency_s
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        with open(os.path.join(LOCAL_DATA_DIR, 'customers', 'bank-x-customers.json'), 'r', encoding='utf-8') as f:
+            self.customers = {c['customerId']: c for c in json.load(f)}
+        self.customer_index = CustomerIndex(self.customers.values())
+
+    def _body(self, payload: dict) -> dict:
+        if 'customer_id' in payload:
+            customer = self.customers.get(payload['customer_id'])
+            if customer is None:
+                return {'statusCode': 404, 'body': json.dumps({'message': 'Customer not found'})}
+            return {'statusCode': 200, 'body': json.dumps({'requestId': 'fake', 'customer': customer})}
+        if 'filters' in payload:
+            result = self.customer_index.query(
+                payload['filters'], fields=payload.get('fields'), sort_by=payload.get('sort_by'),
+                descending=bool(payload.get('descending')), limit=payload.get('limit', 20), offset=payload.get('offset', 0),
+            )
+            return {'statusCode': 200, 'body': json.dumps({'requestId': 'fake', **result})}
+        if 'match_bond' in payload:
+            criteria = BondMatchCriteria.from_payload(payload['match_bond'])
+            result = match_customers(self.customers.values(), criteria, payload.get('limit', 50))
+            return {'statusCode': 200, 'body': json.dumps({'requestId': 'fake', **result})}
+        page, next_cursor = paginate(
+            self.customers.values(), 'customerId', payload.get('fields') or ('customerId', 'name', 'email'),
+            sort_by=payload.get('sort_by'), descending=bool(payload.get('descending')),
+            limit=payload.get('limit') or DEFAULT_PAGE_SIZE, cursor=payload.get('cursor'),
+        )
+        return {'statusCode': 200, 'body': json.dumps(
+            {'requestId': 'fake', 'customers': page, 'total': len(self.customers), 'nextCursor': next_cursor})}
+
+    def invoke(self, FunctionName, InvocationType='RequestResponse', Payload='{}'):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency_s)
+            body = self._body(json.loads(Payload or '{}'))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return {
+            'Payload': io.BytesIO(json.dumps(body).encode('utf-8')),
+            'ResponseMetadata': {'RequestId': f'fake-{self.calls}'},
+        }
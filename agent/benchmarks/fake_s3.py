@@ -0,0 +1,206 @@
+"""Local S3 stand-in for the tool Lambdas - an in-memory bucket behind the boto3 S3 client calls they make
+
+``FakeS3`` answers get_object (Range, IfNoneMatch), list_objects_v2 (Prefix, Delimiter,
+MaxKeys, ContinuationToken, StartAfter) and its paginator, and put_object, with errors
+raised as botocore ClientErrors carrying the codes S3 returns. Listings bisect a sorted
+copy of the keys, so a page costs the same in a bucket of millions. ``lambda_data`` loads a
+tool Lambda with its data-access layer pointed at a stand-in (needs boto3 importable,
+as the Lambdas do).
+"""
+import bisect
+import contextlib
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'lambda')
+DATA_ACCESS_LAYER = os.path.join(LAMBDA_DIR, 'layers', 'data-access', 'python')
+LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+
+
+class FakeBody(io.BytesIO):
+    """A StreamingBody look-alike."""
+
+    def iter_lines(self):
+        for line in self:
+            line = line.rstrip(b'\r\n')
+            if line:
+                yield line
+
+
+def _error(code: str, operation: str, message: str = ''):
+    from botocore.exceptions import ClientError
+    return ClientError({'Error': {'Code': code, 'Message': message or code}}, operation)
+
+
+class FakeS3:
+    """An in-memory bucket; every request sleeps ``latency_s`` (plus the object's size over
+    ``bandwidth`` bytes/s for GETs) and is counted in ``requests``."""
+
+    def __init__(self, objects: Optional[Dict[str, bytes]] = None, latency_s: float = 0.0,
+                 bandwidth: Optional[float] = None):
+        self.objects: Dict[str, bytes] = {}
+        self.etags: Dict[str, str] = {}
+        self._sorted: Optional[List[str]] = None  # the keys in order, rebuilt after a change
+        self.latency_s = latency_s
+        self.bandwidth = bandwidth
+        self.requests = []
+        self._lock = threading.Lock()
+        for key, data in (objects or {}).items():
+            self.put_object(Bucket='fake', Key=key, Body=data)
+        self.requests.clear()
+
+    @classmethod
+    def from_directory(cls, root: str = LOCAL_DATA_DIR, prefix: str = 'client-details/', **kwargs) -> 'FakeS3':
+        """Every file under ``root`` as ``prefix`` + its relative path, like the data upload."""
+        objects = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                key = prefix + os.path.relpath(path, root).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    objects[key] = f.read()
+        return cls(objects, **kwargs)
+
+    def _request(self, operation: str, key: str):
+        with self._lock:
+            self.requests.append((operation, key))
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def count(self, operation: str) -> int:
+        return sum(1 for op, _ in self.requests if op == operation)
+
+    def put_object(self, Bucket, Key, Body):
+        self._request('PutObject', Key)
+        data = Body.encode('utf-8') if isinstance(Body, str) else bytes(Body)
+        with self._lock:
+            if Key not in self.objects:
+                self._sorted = None
+            self.objects[Key] = data
+            self.etags[Key] = '"' + hashlib.md5(data).hexdigest() + '"'
+        return {'ETag': self.etags[Key]}
+
+    def delete_object(self, Bucket, Key):
+        self._request('DeleteObject', Key)
+        with self._lock:
+            self.objects.pop(Key, None)
+            self.etags.pop(Key, None)
+            self._sorted = None
+        return {}
+
+    def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None):
+        self._request('GetObject', Key)
+        with self._lock:
+            data, etag = self.objects.get(Key), self.etags.get(Key)
+        if data is None:
+            raise _error('NoSuchKey', 'GetObject', 'The specified key does not exist.')
+        if IfNoneMatch is not None and IfNoneMatch == etag:
+            raise _error('304', 'GetObject', 'Not Modified')
+        if Range:
+            start, end = Range[len('bytes='):].split('-')
+            data = data[int(start):int(end) + 1]
+        if self.bandwidth:
+            time.sleep(len(data) / self.bandwidth)
+        return {'Body': FakeBody(data), 'ETag': etag, 'ContentLength': len(data)}
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter=None, MaxKeys=1000, ContinuationToken=None,
+                        StartAfter=None):
+        self._request('ListObjectsV2', Prefix)
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self.objects)
+            keys = self._sorted
+        after = ContinuationToken or StartAfter
+        entries = []  # (name, is_common_prefix) in key order, one past MaxKeys
+        i = bisect.bisect_left(keys, Prefix)
+        if after is not None:
+            i = max(i, bisect.bisect_right(keys, after))
+        while i < len(keys) and len(entries) <= MaxKeys and keys[i].startswith(Prefix):
+            rest = keys[i][len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                common = Prefix + rest[:rest.index(Delimiter) + len(Delimiter)]
+                if after is None or common > after:
+                    entries.append((common, True))
+                # Skip the rest of the keys under the common prefix
+                i = bisect.bisect_left(keys, common[:-1] + chr(ord(common[-1]) + 1), i)
+                continue
+            entries.append((keys[i], False))
+            i += 1
+        truncated = len(entries) > MaxKeys
+        entries = entries[:MaxKeys]
+        page = {
+            'Contents': [{'Key': key, 'ETag': self.etags[key], 'Size': len(self.objects[key])}
+                         for key, common in entries if not common],
+            'KeyCount': len(entries),
+            'IsTruncated': truncated,
+        }
+        if any(common for _, common in entries):
+            page['CommonPrefixes'] = [{'Prefix': name} for name, common in entries if common]
+        if truncated:
+            page['NextContinuationToken'] = entries[-1][0]
+        return page
+
+    def get_paginator(self, operation: str):
+        assert operation == 'list_objects_v2', operation
+        return _ListPaginator(self)
+
+
+class _ListPaginator:
+    def __init__(self, s3: FakeS3):
+        self.s3 = s3
+
+    def paginate(self, **kwargs):
+        token = None
+        while True:
+            page = self.s3.list_objects_v2(**kwargs, **({'ContinuationToken': token} if token else {}))
+            yield page
+            if not page['IsTruncated']:
+                return
+            token = page['NextContinuationToken']
+
+
+def load_lambda(name: str):
+    """A fresh copy of lambda/<name>/index.py, importing the data-access layer as Lambda does from /opt/python."""
+    if DATA_ACCESS_LAYER not in sys.path:
+        sys.path.insert(0, DATA_ACCESS_LAYER)
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_') + '_lambda',
+                                                  os.path.join(LAMBDA_DIR, name, 'index.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def lambda_data(s3=None, lambda_client=None):
+    """Point the data-access layer at ``s3`` (direct reads) or, without it, at ``lambda_client``'s
+    read-file and list-files functions; the container cache (and held bond manifest) starts empty
+    and settings (including DEFAULT_MAX_AGE_SECONDS) are restored after."""
+    if DATA_ACCESS_LAYER not in sys.path:
+        sys.path.insert(0, DATA_ACCESS_LAYER)
+    import bond_manifest
+    import data_access
+    saved = (data_access.S3_DATA_BUCKET, data_access.READ_FILE_FUNCTION_ARN, data_access.LIST_FILES_FUNCTION_ARN,
+             data_access.DEFAULT_MAX_AGE_SECONDS, dict(data_access._clients))
+    data_access.S3_DATA_BUCKET = 'fake-bucket' if s3 is not None else ''
+    data_access.READ_FILE_FUNCTION_ARN, data_access.LIST_FILES_FUNCTION_ARN = 'read-file', 'list-files'
+    if s3 is not None:
+        data_access.use_client('s3', s3)
+    if lambda_client is not None:
+        data_access.use_client('lambda', lambda_client)
+    data_access.clear_cache()
+    bond_manifest.clear()
+    try:
+        yield data_access
+    finally:
+        (data_access.S3_DATA_BUCKET, data_access.READ_FILE_FUNCTION_ARN, data_access.LIST_FILES_FUNCTION_ARN,
+         data_access.DEFAULT_MAX_AGE_SECONDS, clients) = saved
+        data_access._clients.clear()
+        data_access._clients.update(clients)
+        data_access.clear_cache()
+        bond_manifest.clear()
@@ -0,0 +1,63 @@
+"""Stub Strands model for benchmarks - streams canned text after a fixed latency"""
+import asyncio
+import json
+from strands.models import Model
+
+
+class StubModel(Model):
+    """Model that never calls Bedrock.
+
+    Each turn sleeps ``latency_s`` (simulating time to first token) and then streams
+    ``reply`` in ``chunk_count`` text deltas. If ``tool_calls`` is given - a list of
+    ``(tool_name, input_dict)`` - the first turn of each invocation requests all of them
+    at once, and the turn after the tool results streams ``reply``.
+    """
+
+    def __init__(self, latency_s: float = 0.05, reply: str = "Stub response from the coordinator.", chunk_count: int = 5,
+                 tool_calls=None):
+        self.config = {'model_id': 'stub', 'latency_s': latency_s}
+        self.latency_s = latency_s
+        self.reply = reply
+        self.chunk_count = max(1, chunk_count)
+        self.tool_calls = list(tool_calls or [])
+        self.calls = 0
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    def get_config(self):
+        return self.config
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError('StubModel does not support structured output')
+        yield  # pragma: no cover - makes this an async generator
+
+    @staticmethod
+    def _has_tool_results(messages) -> bool:
+        last = messages[-1] if messages else {}
+        return any('toolResult' in block for block in last.get('content', []))
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+
+        yield {'messageStart': {'role': 'assistant'}}
+        if self.tool_calls and not self._has_tool_results(messages):
+            for index, (name, tool_input) in enumerate(self.tool_calls):
+                yield {'contentBlockStart': {'start': {'toolUse': {'toolUseId': f'stub-{self.calls}-{index}', 'name': name}}}}
+                yield {'contentBlockDelta': {'delta': {'toolUse': {'input': json.dumps(tool_input)}}}}
+                yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'tool_use'}}
+            return
+
+        size = max(1, len(self.reply) // self.chunk_count)
+        chunks = [self.reply[i:i + size] for i in range(0, len(self.reply), size)]
+        yield {'contentBlockStart': {'start': {}}}
+        for chunk in chunks:
+            yield {'contentBlockDelta': {'delta': {'text': chunk}}}
+        yield {'contentBlockStop': {}}
+        yield {'messageStop': {'stopReason': 'end_turn'}}
+        yield {'metadata': {
+            'usage': {'inputTokens': 0, 'outputTokens': len(chunks), 'totalTokens': len(chunks)},
+            'metrics': {'latencyMs': int(self.latency_s * 1000)},
+        }}
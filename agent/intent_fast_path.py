@@ -0,0 +1,183 @@
+"""Intent fast path - answers canonical read-only prompts without the coordinator model"""
+import asyncio
+import json
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+from utils.tool_output import decode_tool_output
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+# Canonical phrasings per intent; anything else goes to the coordinator model
+BOND_LIST_PHRASES = {
+    "show me available bonds", "show available bonds", "show me all bonds", "show all bonds",
+    "show all available bonds", "show bonds", "list bonds", "list all bonds", "list available bonds",
+    "what bonds are available", "view available bonds",
+}
+CUSTOMER_LIST_PHRASES = {
+    "view customer profiles", "show customer profiles", "list customers", "list all customers",
+    "show customers", "show all customers", "view customers", "view all customers",
+}
+MARKET_DATA_PHRASES = {
+    "search market data", "show market data", "show market trends", "search bond market data",
+    "show bond market data", "show bond market trends", "view market data",
+}
+
+
+def log_event(event: dict):
+    print(json.dumps(event))
+
+
+def normalise_prompt(prompt: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", prompt.lower()).split())
+
+
+def _format_money(value) -> str:
+    return f"£{value:,}" if isinstance(value, (int, float)) else str(value or "-")
+
+
+def _format_type(value) -> str:
+    return str(value or "-").replace("_", " ").capitalize()
+
+
+def _page(result, key: str):
+    """(records, total) from a list tool result: a page ``{key: [...], "total": n}`` or a plain list."""
+    if isinstance(result, dict):
+        records = result.get(key) or []
+        return records, result.get("total") or len(records)
+    return result, len(result)
+
+
+def _count_heading(shown: int, total: int, noun: str) -> str:
+    if shown < total:
+        return f"Here are {shown} of the {total} {noun}:"
+    return f"Here are the {shown} {noun}:"
+
+
+def render_bonds(result) -> str:
+    bonds, total = _page(result, "bonds")
+    if not bonds:
+        return "There are no bond products available right now."
+    lines = [
+        _count_heading(len(bonds), total, "available bond products"),
+        "",
+        "| Bond | Type | Yield | Maturity | Min. Investment | Credit Rating |",
+        "|---|---|---|---|---|---|",
+    ]
+    for bond in bonds:
+        lines.append(
+            f"| {bond.get('name', '-')} | {_format_type(bond.get('type'))} | {bond.get('yield', '-')} | "
+            f"{bond.get('maturity', '-')} | {_format_money(bond.get('minInvestment'))} | {bond.get('creditRating', '-')} |"
+        )
+    lines += ["", "Ask for details on any of these bonds, or for recommendations for a specific customer."]
+    return "\n".join(lines)
+
+
+def render_customers(result) -> str:
+    customers, total = _page(result, "customers")
+    if not customers:
+        return "No customers were found."
+    lines = [
+        _count_heading(len(customers), total, "Bank X customers"),
+        "",
+        "| Customer ID | Name | Email |",
+        "|---|---|---|",
+    ]
+    for customer in customers:
+        lines.append(f"| {customer.get('customerId', '-')} | {customer.get('name', '-')} | {customer.get('email', '-')} |")
+    lines += ["", "Ask to view any customer's full profile or get bond recommendations for them."]
+    return "\n".join(lines)
+
+
+def render_market_data(market: dict) -> str:
+    lines = ["## Bond Market Overview", ""]
+    if market.get("marketSummary"):
+        lines += [market["marketSummary"], ""]
+    trends = market.get("yieldTrends") or {}
+    if trends:
+        lines.append("**Yield trends**")
+        labels = (("current", "Current"), ("3MonthAvg", "3-month average"), ("6MonthAvg", "6-month average"),
+                  ("1YearAvg", "1-year average"), ("trend", "Trend"))
+        lines += [f"- {label}: {trends[key]}" for key, label in labels if trends.get(key)]
+        lines.append("")
+    comparables = market.get("comparableProducts") or []
+    if comparables:
+        lines += ["**Comparable products**", "", "| Product | Yield | Maturity | Credit Rating |", "|---|---|---|---|"]
+        lines += [
+            f"| {p.get('name', '-')} | {p.get('yield', '-')} | {p.get('maturity', '-')} | {p.get('creditRating', '-')} |"
+            for p in comparables
+        ]
+        lines.append("")
+    if market.get("description"):
+        lines.append(market["description"])
+    return "\n".join(lines).strip()
+
+
+class FastPathIntent:
+    """A read-only intent: the phrases that trigger it, the tool call and its renderer."""
+
+    def __init__(self, name: str, phrases, call: Callable[[], str], render: Callable[[object], str]):
+        self.name = name
+        self.phrases = frozenset(phrases)
+        self.call = call
+        self.render = render
+
+
+class IntentFastPath:
+    """Recognises canonical read-only prompts and answers them from a direct tool call.
+
+    Matching is exact on the normalised prompt so ambiguous requests always fall back to
+    the coordinator. A tool error or unexpected output also falls back (``respond``
+    returns None).
+    """
+
+    def __init__(self, intents: List[FastPathIntent]):
+        self.intents = intents
+        self._by_phrase: Dict[str, FastPathIntent] = {}
+        for intent in intents:
+            for phrase in intent.phrases:
+                self._by_phrase[normalise_prompt(phrase)] = intent
+        self.stats = {"hits": 0, "fallbacks": 0}
+
+    def match(self, prompt: str) -> Optional[FastPathIntent]:
+        return self._by_phrase.get(normalise_prompt(prompt or ""))
+
+    async def respond(self, prompt: str) -> Optional[str]:
+        intent = self.match(prompt)
+        if intent is None:
+            return None
+
+        start = time.perf_counter()
+        try:
+            # Tools are blocking (file or Lambda I/O), so keep them off the event loop
+            raw = await asyncio.to_thread(intent.call)
+            text = intent.render(decode_tool_output(raw))
+        except Exception as e:  # noqa: BLE001
+            self.stats["fallbacks"] += 1
+            log_event({'eventType': 'agent.fastpath.fallback', 'intent': intent.name, 'error': str(e), 'timestamp': time.time()})
+            return None
+
+        self.stats["hits"] += 1
+        log_event({
+            'eventType': 'agent.fastpath.hit',
+            'intent': intent.name,
+            'durationMs': round((time.perf_counter() - start) * 1000, 2),
+            'timestamp': time.time(),
+        })
+        return text
+
+
+async def stream_text_events(text: str):
+    """Yield text in the same event shape as the coordinator's stream, one line at a time."""
+    for line in text.splitlines(keepends=True):
+        yield {'event': {'contentBlockDelta': {'delta': {'text': line}}}}
+
+
+def create_intent_fast_path(list_available_bonds, list_customers, search_market_data) -> IntentFastPath:
+    """Build the fast path over the given tool functions (Lambda-backed or local)."""
+    return IntentFastPath([
+        FastPathIntent("list_bonds", BOND_LIST_PHRASES, lambda: list_available_bonds(), render_bonds),
+        FastPathIntent("list_customers", CUSTOMER_LIST_PHRASES, lambda: list_customers(), render_customers),
+        FastPathIntent("search_market_data", MARKET_DATA_PHRASES, lambda: search_market_data("bond"), render_market_data),
+    ])
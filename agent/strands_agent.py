@@ -1,23 +1,69 @@
 """Multi-agent Bank X Financial Assistant - Production Version"""
+from utils.startup_timing import StartupTimer
+
+startup_timer = StartupTimer('strands_agent')
+
 import json
+import os
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from agents import create_customer_agent, create_product_agent, create_marketing_agent, create_suggestion_agent, create_recommendation_agent
+from agents.registry import AgentRegistry
 from agent_router import create_agent_router
-from suggestion_handler import is_suggestion_prompt, clean_suggestion_response
+from suggestion_handler import is_suggestion_prompt, AsyncSuggestionRunner
+from suggestion_service import SuggestionService
+from intent_fast_path import create_intent_fast_path, stream_text_events
+from agents.customer_agent import list_customers
+from agents.product_agent import list_available_bonds, search_market_data
 from utils.id_sanitizer import sanitize_text_and_collect_metadata
+from utils.history_compactor import HistoryCompactor
+
+startup_timer.mark('imports')
 
 # Create the AgentCore app
 app = BedrockAgentCoreApp()
 
-# Initialize specialized agents
-customer_agent = create_customer_agent()
-product_agent = create_product_agent()
-marketing_agent = create_marketing_agent()
-suggestion_agent = create_suggestion_agent()
-recommendation_agent = create_recommendation_agent()
-
-# Create the agent router that orchestrates the specialized agents
-agent_router = create_agent_router(customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent)
+# Older turns are summarised so prompt size stays bounded as conversations grow; a
+# larger budget bounds the messages a session coordinator retains between turns
+history_compactor = HistoryCompactor(
+    token_budget=int(os.environ.get('HISTORY_TOKEN_BUDGET', '2000')),
+    keep_last_turns=int(os.environ.get('HISTORY_KEEP_TURNS', '3')),
+    retained_token_budget=int(os.environ.get('HISTORY_RETAINED_TOKEN_BUDGET', '8000')),
+)
+
+# Specialized agents and the router are built on first use, so /ping is healthy
+# as soon as the app is up instead of after every BedrockModel has been created
+SPECIALIZED_AGENTS = ('customer', 'product', 'marketing', 'suggestion', 'recommendation')
+agent_registry = AgentRegistry({
+    'customer': create_customer_agent,
+    'product': create_product_agent,
+    'marketing': create_marketing_agent,
+    'suggestion': create_suggestion_agent,
+    'recommendation': create_recommendation_agent,
+    'router': lambda: create_agent_router(*(agent_registry.lazy(name) for name in SPECIALIZED_AGENTS),
+                                          history_compactor=history_compactor),
+})
+suggestion_agent = agent_registry.lazy('suggestion')
+
+# Suggestion requests stream on the event loop with their own concurrency cap and timeout
+suggestion_runner = AsyncSuggestionRunner(
+    suggestion_agent,
+    max_concurrency=int(os.environ.get('SUGGESTION_MAX_CONCURRENCY', '4')),
+    timeout_seconds=float(os.environ.get('SUGGESTION_TIMEOUT_SECONDS', '20')),
+)
+
+# Initial suggestions are served without a model call; follow-ups are cached by fingerprint
+suggestion_service = SuggestionService(
+    suggestion_runner,
+    ttl_seconds=float(os.environ.get('SUGGESTION_CACHE_TTL_SECONDS', '600')),
+    max_entries=int(os.environ.get('SUGGESTION_CACHE_MAX_ENTRIES', '512')),
+)
+
+# Canonical read-only prompts (the starter suggestions) skip the coordinator model
+intent_fast_path = create_intent_fast_path(list_available_bonds, list_customers, search_market_data)
+INTENT_FAST_PATH_ENABLED = os.environ.get('INTENT_FAST_PATH_ENABLED', 'true').lower() != 'false'
+
+# The agent router that orchestrates the specialized agents
+agent_router = agent_registry.lazy('router')
 
 
 def extract_text_response(response):
@@ -41,9 +87,24 @@ def extract_text_response(response):
         return str(response)
 
 
+def extract_session_id(payload, context=None):
+    """Resolve the session key for the coordinator pool.
+
+    Prefers the AgentCore runtime session id (X-Amzn-Bedrock-AgentCore-Runtime-Session-Id),
+    falling back to a "sessionId" field in either payload format.
+    """
+    session_id = getattr(context, 'session_id', None)
+    if session_id:
+        return session_id
+    if isinstance(payload, dict):
+        if "input" in payload and isinstance(payload["input"], dict):
+            return payload["input"].get("sessionId")
+        return payload.get("sessionId")
+    return None
+
 
 @app.entrypoint
-async def agent_invocation(payload):
+async def agent_invocation(payload, context=None):
     """
     Invoke the multi-agent system with a payload
 
@@ -75,30 +136,29 @@ async def agent_invocation(payload):
     if not user_input:
         raise ValueError(f"No prompt found in payload. Expected {{'prompt': '...'}} or {{'input': {{'prompt': '...'}}}}. Received: {payload}")
 
-    # Build context string from conversation history
-    context_str = ""
-    if conversation_history:
-        context_lines = []
-        for msg in conversation_history:
-            role = msg.get("role", "unknown").capitalize()
-            content = msg.get("content", "")
-            context_lines.append(f"{role}: {content}")
-        context_str = "Previous conversation:\n" + "\n".join(context_lines) + "\n\n"
+    # Build context string from conversation history, compacted to the token budget
+    context_str = history_compactor.build_context(conversation_history)
 
     # Prepend conversation context to the user input for the agent
     enriched_input = context_str + user_input if context_str else user_input
 
-    # Short-circuit suggestion prompts to the suggestion agent instead of the router
+    # Short-circuit suggestion prompts to the suggestion service instead of the router
     if is_suggestion_prompt(user_input):
-        response = suggestion_agent(enriched_input)
-        text = extract_text_response(response)
-        cleaned = clean_suggestion_response(text)
+        cleaned = await suggestion_service.get_suggestions(user_input, conversation_history, enriched_input)
         sanitized_text, _ = sanitize_text_and_collect_metadata(cleaned)
         yield sanitized_text
         return
 
-    # Stream response from the agent router (coordinator)
-    stream = agent_router.stream_async(enriched_input)
+    # Answer canonical read-only intents directly from their tool; otherwise stream
+    # the response from the agent router (coordinator)
+    fast_path_text = await intent_fast_path.respond(user_input) if INTENT_FAST_PATH_ENABLED else None
+    if fast_path_text is not None:
+        stream = stream_text_events(fast_path_text)
+    else:
+        # The router decides whether the session coordinator needs the history injected
+        stream = agent_router.stream_async(user_input, session_id=extract_session_id(payload, context),
+                                           history_context=context_str,
+                                           history_turns=history_compactor.count_turns(conversation_history))
     collected_metadata = {"previewIds": [], "customerIds": [], "requestIds": []}
 
     async for event in stream:
@@ -116,6 +176,10 @@ async def agent_invocation(payload):
             yield sanitized_text
 
 
+startup_timer.mark('app_setup')
+startup_timer.report(agentsBuilt=agent_registry.built())
+
+
 if __name__ == "__main__":
     app.run()
 
@@ -1,26 +1,43 @@
 """Multi-agent Bank X Financial Assistant - Local Development Version"""
+from utils.startup_timing import StartupTimer
+
+startup_timer = StartupTimer('strands_agent_local')
+
 import json
+import os
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from agents.customer_agent_local import create_customer_agent
-from agents.product_agent_local import create_product_agent
+from agents.customer_agent_local import create_customer_agent, list_customers
+from agents.product_agent_local import create_product_agent, list_available_bonds, search_market_data
 from agents.marketing_agent_local import create_marketing_agent
 from agents.suggestion_agent_local import create_suggestion_agent
 from agents.recommendation_agent_local import create_recommendation_agent
+from agents.registry import AgentRegistry
 from agent_router import create_agent_router
+from intent_fast_path import create_intent_fast_path, stream_text_events
 from utils.id_sanitizer import sanitize_text_and_collect_metadata
 
+startup_timer.mark('imports')
+
 # Create the AgentCore app
 app = BedrockAgentCoreApp()
 
-# Initialize specialized agents (local versions)
-customer_agent = create_customer_agent()
-product_agent = create_product_agent()
-marketing_agent = create_marketing_agent()
-suggestion_agent = create_suggestion_agent()
-recommendation_agent = create_recommendation_agent()
+# Specialized agents (local versions) and the router are built on first use
+SPECIALIZED_AGENTS = ('customer', 'product', 'marketing', 'suggestion', 'recommendation')
+agent_registry = AgentRegistry({
+    'customer': create_customer_agent,
+    'product': create_product_agent,
+    'marketing': create_marketing_agent,
+    'suggestion': create_suggestion_agent,
+    'recommendation': create_recommendation_agent,
+    'router': lambda: create_agent_router(*(agent_registry.lazy(name) for name in SPECIALIZED_AGENTS)),
+})
 
-# Create the agent router that orchestrates the specialized agents
-agent_router = create_agent_router(customer_agent, product_agent, marketing_agent, suggestion_agent, recommendation_agent)
+# The agent router that orchestrates the specialized agents
+agent_router = agent_registry.lazy('router')
+
+# Canonical read-only prompts (the starter suggestions) skip the coordinator model
+intent_fast_path = create_intent_fast_path(list_available_bonds, list_customers, search_market_data)
+INTENT_FAST_PATH_ENABLED = os.environ.get('INTENT_FAST_PATH_ENABLED', 'true').lower() != 'false'
 
 
 def extract_text_response(response):
@@ -46,8 +63,24 @@ def extract_text_response(response):
         return str(response)
 
 
+def extract_session_id(payload, context=None):
+    """Resolve the session key for the coordinator pool.
+
+    Prefers the AgentCore runtime session id (X-Amzn-Bedrock-AgentCore-Runtime-Session-Id),
+    falling back to a "sessionId" field in either payload format.
+    """
+    session_id = getattr(context, 'session_id', None)
+    if session_id:
+        return session_id
+    if isinstance(payload, dict):
+        if "input" in payload and isinstance(payload["input"], dict):
+            return payload["input"].get("sessionId")
+        return payload.get("sessionId")
+    return None
+
+
 @app.entrypoint
-async def agent_invocation(payload):
+async def agent_invocation(payload, context=None):
     """
     Invoke the multi-agent system with a payload
 
@@ -75,8 +108,13 @@ async def agent_invocation(payload):
     if not user_input:
         raise ValueError(f"No prompt found in payload. Expected {{'prompt': '...'}} or {{'input': {{'prompt': '...'}}}}. Received: {payload}")
 
-    # Stream response from the agent router (coordinator)
-    stream = agent_router.stream_async(user_input)
+    # Answer canonical read-only intents directly from their tool; otherwise stream
+    # the response from the agent router (coordinator)
+    fast_path_text = await intent_fast_path.respond(user_input) if INTENT_FAST_PATH_ENABLED else None
+    if fast_path_text is not None:
+        stream = stream_text_events(fast_path_text)
+    else:
+        stream = agent_router.stream_async(user_input, session_id=extract_session_id(payload, context))
     collected_metadata = {"previewIds": [], "customerIds": [], "requestIds": []}
 
     async for event in stream:
@@ -93,5 +131,9 @@ async def agent_invocation(payload):
             yield sanitized_text
 
 
+startup_timer.mark('app_setup')
+startup_timer.report(agentsBuilt=agent_registry.built())
+
+
 if __name__ == "__main__":
     app.run()
\ No newline at end of file
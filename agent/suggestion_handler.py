@@ -1,7 +1,17 @@
 """Suggestion prompt handler - bypasses multi-agent router for suggestion meta-prompts"""
+import asyncio
+import json
 import re
+import time
 from utils.id_sanitizer import sanitize_text_and_collect_metadata
 
+# Returned when the suggestion model times out; the frontend treats it as "no suggestions"
+EMPTY_SUGGESTIONS = "[]"
+
+
+def log_event(event: dict):
+    print(json.dumps(event))
+
 
 def is_suggestion_prompt(prompt: str) -> bool:
     """
@@ -39,3 +49,47 @@ def clean_suggestion_response(response: str) -> str:
     cleaned, _ = sanitize_text_and_collect_metadata(cleaned)
     
     return cleaned
+
+
+class AsyncSuggestionRunner:
+    """Generate suggestions without blocking the event loop.
+
+    Streams straight from the suggestion agent's model rather than calling the agent,
+    so concurrent requests neither block other streams nor share message history.
+    A semaphore caps in-flight suggestion calls and each call has its own timeout,
+    which covers the wait for a slot as well as the model stream.
+    """
+
+    def __init__(self, suggestion_agent, max_concurrency: int = 4, timeout_seconds: float = 20.0):
+        self.suggestion_agent = suggestion_agent
+        self.timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _generate(self, prompt: str) -> str:
+        model = self.suggestion_agent.model
+        messages = [{"role": "user", "content": [{"text": prompt}]}]
+        chunks = []
+        async for event in model.stream(messages, None, self.suggestion_agent.system_prompt):
+            text = event.get('contentBlockDelta', {}).get('delta', {}).get('text')
+            if text:
+                chunks.append(text)
+        return "".join(chunks)
+
+    async def _generate_limited(self, prompt: str) -> str:
+        async with self._semaphore:
+            return await self._generate(prompt)
+
+    async def run(self, prompt: str) -> str:
+        """Return the cleaned JSON array of suggestions for a suggestion prompt."""
+        start = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(self._generate_limited(prompt), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            log_event({
+                'eventType': 'agent.suggestion.timeout',
+                'timeoutSeconds': self.timeout_seconds,
+                'durationMs': round((time.perf_counter() - start) * 1000, 2),
+                'timestamp': time.time(),
+            })
+            return EMPTY_SUGGESTIONS
+        return clean_suggestion_response(text)
@@ -0,0 +1,89 @@
+"""Suggestion service - fixed initial suggestions and a fingerprinted follow-up cache"""
+import hashlib
+import json
+import time
+from typing import List
+
+from suggestion_handler import EMPTY_SUGGESTIONS
+from utils.history_compactor import collect_entities, ENTITY_LABELS
+from utils.ttl_cache import TTLCache
+
+# Mirrors the fixed starter set in the suggestion agent's system prompt
+INITIAL_SUGGESTIONS = ["Show me available bonds", "View customer profiles", "Search market data", "Email customers about bonds"]
+
+
+def log_event(event: dict):
+    print(json.dumps(event))
+
+
+def suggestion_fingerprint(prompt: str, conversation_history: List[dict], last_messages: int = 4) -> str:
+    """Stable key for a follow-up request: the prompt, the last turns and the entities they mention."""
+    recent = [msg for msg in (conversation_history or []) if isinstance(msg, dict)][-last_messages:]
+    digest = hashlib.sha256()
+    digest.update(" ".join(prompt.lower().split()).encode("utf-8"))
+    for msg in recent:
+        content = " ".join(str(msg.get("content", "")).lower().split())
+        digest.update(b"\x1e")
+        digest.update(str(msg.get("role", "")).encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update(content.encode("utf-8"))
+
+    entities = collect_entities("\n".join(str(msg.get("content", "")) for msg in recent))
+    for key, _ in ENTITY_LABELS:
+        digest.update(b"\x1d")
+        digest.update(",".join(sorted(entities.get(key, []))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SuggestionService:
+    """Answers suggestion prompts with as few model calls as possible.
+
+    - Initial suggestions (no conversation yet) are the fixed starter set: no model call.
+    - Follow-up suggestions are cached under ``suggestion_fingerprint`` with a TTL and
+      LRU bound; only misses reach the suggestion runner.
+    """
+
+    def __init__(self, runner, ttl_seconds: float = 600.0, max_entries: int = 512):
+        self.runner = runner
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.stats = {'initialServed': 0, 'cacheHits': 0, 'cacheMisses': 0, 'modelCalls': 0}
+
+    async def get_suggestions(self, prompt: str, conversation_history: List[dict], enriched_input: str) -> str:
+        """Return the cleaned JSON array of suggestions for a suggestion prompt."""
+        start = time.perf_counter()
+
+        if not conversation_history:
+            self.stats['initialServed'] += 1
+            return self._served(json.dumps(INITIAL_SUGGESTIONS), 'initial', start)
+
+        key = suggestion_fingerprint(prompt, conversation_history)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cacheHits'] += 1
+            return self._served(cached, 'cache', start)
+
+        self.stats['cacheMisses'] += 1
+        self.stats['modelCalls'] += 1
+        suggestions = await self.runner.run(enriched_input)
+        # Timeouts and empty answers are not worth remembering
+        if suggestions and suggestions.strip() != EMPTY_SUGGESTIONS:
+            self.cache.set(key, suggestions)
+        return self._served(suggestions, 'model', start)
+
+    def snapshot(self) -> dict:
+        served = self.stats['initialServed'] + self.stats['cacheHits'] + self.stats['cacheMisses']
+        return {
+            **self.stats,
+            'modelCallsSaved': served - self.stats['modelCalls'],
+            'cache': self.cache.snapshot(),
+        }
+
+    def _served(self, suggestions: str, source: str, start: float) -> str:
+        log_event({
+            'eventType': 'agent.suggestion.served',
+            'source': source,
+            'durationMs': round((time.perf_counter() - start) * 1000, 2),
+            'modelCallsSaved': self.stats['initialServed'] + self.stats['cacheHits'],
+            'timestamp': time.time(),
+        })
+        return suggestions
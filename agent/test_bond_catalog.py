@@ -0,0 +1,115 @@
+"""Test the bond catalog alias index behind get_product_details"""
+import glob
+import io
+import json
+import os
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import DATA_ACCESS_LAYER, lambda_data, load_lambda
+import utils.bond_catalog
+from utils.bond_catalog import BondCatalog, normalize
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+ENTRIES = [(os.path.basename(path), json.load(open(path, encoding='utf-8')))
+           for path in sorted(glob.glob(os.path.join(DATA_DIR, 'bonds', '*.json')))]
+CATALOG = BondCatalog(ENTRIES)
+
+NAMES = {
+    'BOND-GB-2025-Y': ['BOND-GB-2025-Y', 'bond-gb-2025-y', 'government-bond-y', 'government-bond-y.json',
+                       'UK Government Bond Series Y', 'uk government bond series y', 'Government Bond Y'],
+    'BOND-CORP-2025-A': ['Premium Corporate Bond Series A', 'corporate-bond-a', 'corporate bond a', 'premium corp'],
+    'BOND-INFLATION-2025-I': ['UK Index-Linked Gilts Series I', 'gilts', 'index linked'],
+}
+
+
+def test_every_bond_is_found_by_id_file_and_name():
+    for filename, bond in ENTRIES:
+        for name in (bond['productId'], filename, filename[:-len('.json')], bond['name']):
+            assert CATALOG.get(name) is bond, name
+
+
+def test_aliases_and_partial_names_resolve():
+    for product_id, names in NAMES.items():
+        for name in names:
+            bond, suggestions = CATALOG.resolve(name)
+            assert bond is not None and bond['productId'] == product_id, name
+            assert suggestions == []
+
+
+def test_misspelt_words_still_match():
+    bond, _ = CATALOG.resolve('goverment bond y')
+    assert bond['productId'] == 'BOND-GB-2025-Y'
+
+
+def test_ambiguous_names_suggest_the_nearest_products():
+    bond, suggestions = CATALOG.resolve('government bond')
+    assert bond is None
+    assert suggestions[:2] == ['Emerging Markets Government Bond Series E', 'UK Government Bond Series Y']
+    assert CATALOG.resolve('zzzz') == (None, [])
+
+
+def test_normalize():
+    assert normalize(' UK Government Bond, Series Y.json') == 'uk-government-bond-series-y'
+
+
+def test_the_lambdas_ship_this_catalog():
+    layer_copy = os.path.join(DATA_ACCESS_LAYER, 'bond_catalog.py')
+    assert open(layer_copy, encoding='utf-8').read() == open(utils.bond_catalog.__file__, encoding='utf-8').read()
+
+
+class FakeFileLambda:
+    """list-files and read-file over the local bond files."""
+
+    def __init__(self):
+        self.reads = []
+
+    def invoke(self, FunctionName, InvocationType, Payload):
+        filename = json.loads(Payload)['filename']
+        if FunctionName == 'list-files':
+            body, status = {'files': [name for name, _ in ENTRIES]}, 200
+        else:
+            self.reads.append(filename)
+            path = os.path.join(DATA_DIR, filename)
+            status = 200 if os.path.exists(path) else 404
+            body = {'content': open(path, encoding='utf-8').read()} if status == 200 else {'error': 'not found'}
+        return {'Payload': io.BytesIO(json.dumps({'statusCode': status, 'body': json.dumps(body)}).encode())}
+
+
+def test_lambda_resolves_like_the_local_catalog():
+    pytest.importorskip('boto3')
+    module = load_lambda('get-product')
+    client = FakeFileLambda()
+
+    def call(name):
+        with lambda_data(lambda_client=client):
+            response = module.lambda_handler({'product_name': name}, None)
+        return response['statusCode'], json.loads(response['body'])
+
+    # A cold container reads just the file a legacy name maps to
+    status, body = call('UK Government Bond Series Y')
+    assert status == 200 and body['product']['productId'] == 'BOND-GB-2025-Y' and len(client.reads) == 1
+    # A miss loads the catalog once; warm calls read nothing
+    status, body = call('BOND-CORP-2025-A')
+    assert status == 200 and body['product']['productId'] == 'BOND-CORP-2025-A'
+    reads = len(client.reads)
+    for product_id, names in NAMES.items():
+        for name in names:
+            assert call(name)[1]['product']['productId'] == product_id
+    status, body = call('government bond')
+    assert status == 404 and body['details']['suggestions'] == CATALOG.resolve('government bond')[1]
+    assert 'UK Government Bond Series Y' in body['message']
+    assert len(client.reads) == reads
+
+
+if __name__ == '__main__':
+    print("Testing bond catalog:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,131 @@
+"""Test the bond catalog manifest and the readers that use it"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import FakeS3, lambda_data, load_lambda
+from utils.bond_manifest import BOND_SUMMARY_FIELDS, MANIFEST_FILE, build_manifest, load_manifest, write_manifest
+from utils.local_data import FileDataSource, SqliteDataSource
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+BONDS = {name: json.load(open(os.path.join(DATA_DIR, 'bonds', name), encoding='utf-8'))
+         for name in sorted(os.listdir(os.path.join(DATA_DIR, 'bonds')))}
+MANIFEST_KEY = 'client-details/catalog/bond-catalog.json'
+
+
+def copy_bonds(tmp):
+    os.makedirs(os.path.join(tmp, 'customers'))
+    shutil.copy(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), os.path.join(tmp, 'customers'))
+    shutil.copytree(os.path.join(DATA_DIR, 'bonds'), os.path.join(tmp, 'bonds'))
+
+
+def test_manifest_holds_the_whole_catalog():
+    manifest = build_manifest(DATA_DIR)
+    assert manifest['count'] == len(BONDS) and set(manifest['files']) == set(BONDS)
+    assert {p: manifest['bonds'][p] for p in manifest['files'].values()} == {b['productId']: b for b in BONDS.values()}
+    assert [s['productId'] for s in manifest['summaries']] == sorted(b['productId'] for b in BONDS.values())
+    assert all(set(s) <= set(BOND_SUMMARY_FIELDS) for s in manifest['summaries'])
+    ranks = [manifest['bonds'][p]['sellabilityRank'] for p in manifest['sellability']]
+    assert ranks == sorted(ranks) and len(ranks) == len(BONDS)
+    # The checked-in manifest is current
+    assert load_manifest(os.path.join(DATA_DIR, MANIFEST_FILE))['contentHash'] == manifest['contentHash']
+
+
+def test_hash_follows_content_and_duplicates_are_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        copy_bonds(tmp)
+        path, changed = write_manifest(tmp)
+        assert changed and write_manifest(tmp) == (path, False)
+        before = load_manifest(path)['contentHash']
+        with open(os.path.join(tmp, 'bonds', 'government-bond-y.json'), 'a', encoding='utf-8') as f:
+            f.write('\n')
+        assert write_manifest(tmp) == (path, True) and load_manifest(path)['contentHash'] != before
+
+        shutil.copy(os.path.join(tmp, 'bonds', 'government-bond-y.json'), os.path.join(tmp, 'bonds', 'copy.json'))
+        with pytest.raises(ValueError, match='is also in'):
+            build_manifest(tmp)
+
+
+def test_local_tools_read_the_manifest_until_a_bond_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        copy_bonds(tmp)
+        sqlite = SqliteDataSource(tmp, check_seconds=0)
+        write_manifest(tmp)
+        files = FileDataSource(tmp, check_seconds=0)
+        try:
+            assert files.bonds() == sqlite.bonds() and files.bond_count() == len(BONDS)
+            assert files.most_sellable_bond() == sqlite.most_sellable_bond()
+            assert files.bond_file('government-bond-y.json') == BONDS['government-bond-y.json']
+            assert files.bond_catalog().get('corporate bond a')['productId'] == 'BOND-CORP-2025-A'
+            assert files.files.parses == 1
+
+            # A bond edited after the manifest was built is read from its file
+            path = os.path.join(tmp, 'bonds', 'government-bond-y.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({**BONDS['government-bond-y.json'], 'sellabilityRank': -1}, f)
+            future = time.time() + 5
+            os.utime(path, (future, future))
+            assert files.manifest() is None
+            assert files.most_sellable_bond()['productId'] == 'BOND-GB-2025-Y'
+            assert files.bond_file('government-bond-y.json')['sellabilityRank'] == -1
+
+            os.remove(os.path.join(tmp, MANIFEST_FILE))
+            assert files.manifest() is None and files.bond_count() == len(BONDS)
+        finally:
+            sqlite.close()
+
+
+def call(module, event):
+    response = module.lambda_handler(event, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_lambdas_read_one_manifest_instead_of_every_bond():
+    pytest.importorskip('boto3')
+    s3 = FakeS3.from_directory()
+    without = FakeS3({k: v for k, v in s3.objects.items() if k != MANIFEST_KEY})
+    events = ({'limit': 500, 'sort_by': 'productId'}, {'limit': 3, 'sort_by': 'yield', 'descending': True},
+              {'details': True, 'sort_by': 'sellabilityRank', 'limit': 1}, {'fields': ['issuer']})
+    for event in events:
+        with lambda_data(s3=without):
+            expected = call(load_lambda('list-bonds'), event)
+        with lambda_data(s3=s3):
+            s3.requests.clear()
+            assert call(load_lambda('list-bonds'), event) == expected
+            assert s3.requests == [('ListObjectsV2', 'client-details/bonds/'), ('GetObject', MANIFEST_KEY)]
+
+    with lambda_data(s3=s3):
+        get_product = load_lambda('get-product')
+        s3.requests.clear()
+        # A name that does not map to its file loads the catalog: one listing and one read
+        status, body = call(get_product, {'product_name': 'BOND-CORP-2025-A'})
+        assert status == 200 and body['product']['productId'] == 'BOND-CORP-2025-A'
+        assert [k for _, k in s3.requests][-2:] == ['client-details/bonds/', MANIFEST_KEY]
+
+    # A bond missing from the manifest sends both back to the bond files, under a new catalog version
+    version = expected[1]['catalogVersion']
+    s3.put_object(Bucket='fake', Key='client-details/bonds/new-bond.json',
+                  Body=json.dumps({'productId': 'BOND-NEW', 'name': 'New Bond', 'sellabilityRank': 0}))
+    with lambda_data(s3=s3):
+        status, body = call(load_lambda('list-bonds'), {'sort_by': 'sellabilityRank', 'limit': 1})
+        assert status == 200 and body['bonds'][0]['productId'] == 'BOND-NEW' and body['total'] == len(BONDS) + 1
+        assert body['catalogVersion'] != version
+        status, body = call(load_lambda('get-product'), {'product_name': 'BOND-NEW'})
+        assert status == 200 and body['product']['name'] == 'New Bond'
+
+
+if __name__ == '__main__':
+    print("Testing bond catalog manifest:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,133 @@
+"""Test the customer segment indexes behind customer_query"""
+import json
+import os
+import random
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import DATA_ACCESS_LAYER, FakeS3, lambda_data, load_lambda
+import utils.customer_index
+from utils.customer_index import CustomerIndex
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+CUSTOMERS = json.load(open(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), encoding='utf-8'))
+
+
+def brute_force(customers, filters):
+    """The matching customer IDs by scanning every record."""
+    def matches(customer, field, condition):
+        value = customer.get(field)
+        if isinstance(condition, dict):
+            return value is not None and condition.get('min', value) <= value <= condition.get('max', value)
+        wanted = {str(v).lower() for v in (condition if isinstance(condition, list) else [condition])}
+        values = value if isinstance(value, list) else [value]
+        return bool(wanted & {str(v).lower() for v in values if v is not None})
+    return [c['customerId'] for c in customers if all(matches(c, f, cond) for f, cond in filters.items())]
+
+
+def test_categorical_filters_and_projection():
+    index = CustomerIndex(CUSTOMERS)
+    result = index.query({'riskTolerance': 'high', 'interestedInBonds': True}, fields=['riskTolerance'])
+    assert result['total'] == len(result['customerIds']) > 0
+    for customer in result['customers']:
+        assert set(customer) == {'customerId', 'riskTolerance'}
+        assert customer['riskTolerance'] == 'high'
+
+
+def test_multi_valued_fields_match_any_listed_value():
+    index = CustomerIndex(CUSTOMERS)
+    filters = {'preferredSectors': ['green', 'government']}
+    assert index.query(filters)['customerIds'] == brute_force(CUSTOMERS, filters)
+
+
+def test_range_filters_and_sorting():
+    index = CustomerIndex(CUSTOMERS)
+    result = index.query({'portfolioValue': {'min': 100000}}, sort_by='portfolioValue', descending=True,
+                         fields=['portfolioValue'])
+    values = [c['portfolioValue'] for c in result['customers']]
+    assert values == sorted(values, reverse=True) and min(values) >= 100000
+    recent = index.query({'lastContact': {'min': '2025-11-01'}})
+    assert recent['customerIds'] == brute_force(CUSTOMERS, {'lastContact': {'min': '2025-11-01'}})
+
+
+def test_pagination_walks_every_match_once():
+    index = CustomerIndex(CUSTOMERS)
+    seen, offset = [], 0
+    while offset is not None:
+        page = index.query({}, limit=3, offset=offset)
+        seen += [c['customerId'] for c in page['customers']]
+        offset = page['nextOffset']
+    assert seen == [c['customerId'] for c in CUSTOMERS]
+
+
+def test_unknown_fields_are_rejected():
+    index = CustomerIndex(CUSTOMERS)
+    with pytest.raises(ValueError):
+        index.query({'favouriteColour': 'blue'})
+    with pytest.raises(ValueError):
+        index.query({}, sort_by='name')
+
+
+def test_large_book_matches_a_full_scan():
+    rng = random.Random(3)
+    book = [
+        {**rng.choice(CUSTOMERS), 'customerId': f'C{i}', 'portfolioValue': rng.randint(1, 10**6),
+         'lastContact': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        for i in range(20000)
+    ]
+    for customer in book[::11]:
+        customer.pop('annualIncome', None)
+    index = CustomerIndex(book)
+    for filters in (
+        {'riskTolerance': ['high', 'medium'], 'portfolioValue': {'min': 250000, 'max': 750000}},
+        {'interestedInBonds': True, 'lastContact': {'max': '2025-03-15'}},
+        {'annualIncome': {'min': 100000}, 'preferredSectors': 'green'},
+    ):
+        expected = brute_force(book, filters)
+        result = index.query(filters, limit=5, max_ids=len(book))
+        assert result['total'] == len(expected)
+        assert result['customerIds'] == expected
+
+
+def test_the_lambdas_ship_this_module():
+    layer_copy = os.path.join(DATA_ACCESS_LAYER, 'customer_index.py')
+    assert open(layer_copy, encoding='utf-8').read() == open(utils.customer_index.__file__, encoding='utf-8').read()
+
+
+def test_lambda_keeps_its_index_until_the_customer_file_changes():
+    pytest.importorskip('boto3')
+    module = load_lambda('customer-query')
+    s3 = FakeS3.from_directory()
+    event = {'filters': {'riskTolerance': 'low'}, 'limit': 500}
+
+    def query():
+        response = module.lambda_handler(event, None)
+        return response['statusCode'], json.loads(response['body'])
+
+    with lambda_data(s3=s3) as data_access:
+        data_access.DEFAULT_MAX_AGE_SECONDS = 0
+        status, body = query()
+        assert status == 200 and body['total'] == len(brute_force(CUSTOMERS, event['filters']))
+        s3.requests.clear()
+        assert query() == (status, body)
+        # The listing's unchanged ETag confirms the cached index without reading the file
+        assert s3.requests == [('ListObjectsV2', 'client-details/customers/')]
+
+        s3.put_object(Bucket='fake', Key='client-details/customers/bank-x-customers.json',
+                      Body=json.dumps([{**c, 'riskTolerance': 'low'} for c in CUSTOMERS]))
+        assert query()[1]['total'] == len(CUSTOMERS)
+
+    with lambda_data(s3=FakeS3()):
+        assert query()[0] == 404
+
+if __name__ == '__main__':
+    print("Testing customer index:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
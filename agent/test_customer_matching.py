@@ -0,0 +1,92 @@
+"""Test server-side customer matching for the most sellable bond on the local sample data"""
+import copy
+import glob
+import json
+import os
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import DATA_ACCESS_LAYER, FakeS3, lambda_data, load_lambda
+import utils.customer_matching
+from utils.customer_matching import BondMatchCriteria, match_customers, match_reasons
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+BONDS = [json.load(open(path, encoding='utf-8')) for path in sorted(glob.glob(os.path.join(DATA_DIR, 'bonds', '*.json')))]
+CUSTOMERS = json.load(open(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), encoding='utf-8'))
+MOST_SELLABLE = min(BONDS, key=lambda b: b.get('sellabilityRank', 999))
+CRITERIA = BondMatchCriteria.from_bond(MOST_SELLABLE)
+
+
+def test_matches_are_ranked_by_portfolio_with_reasons():
+    result = match_customers(CUSTOMERS, CRITERIA)
+    assert result['scannedCount'] == len(CUSTOMERS)
+    assert result['matchedCount'] == len(result['matchedCustomers']) > 0
+    portfolios = [c['portfolioValue'] for c in result['matchedCustomers']]
+    assert portfolios == sorted(portfolios, reverse=True)
+    for customer in result['matchedCustomers']:
+        assert customer['email'] and customer['reasons'][0] == 'interested in bonds'
+
+
+def test_every_match_passes_the_hard_rules():
+    by_id = {c['customerId']: c for c in CUSTOMERS}
+    for match in match_customers(CUSTOMERS, CRITERIA)['matchedCustomers']:
+        customer = by_id[match['customerId']]
+        assert customer['interestedInBonds'] is True
+        assert customer['portfolioValue'] >= MOST_SELLABLE['minInvestment']
+
+
+def test_each_rule_can_reject():
+    customer = copy.deepcopy(next(c for c in CUSTOMERS if match_reasons(c, CRITERIA)))
+    for field, value in (('interestedInBonds', False), ('portfolioValue', 0), ('riskTolerance', 'unknown')):
+        assert match_reasons({**customer, field: value}, CRITERIA) is None
+    assert match_reasons({**customer, 'investmentGoals': [], 'preferredSectors': []}, CRITERIA) is None
+
+
+def test_limit_caps_the_list_not_the_count():
+    full = match_customers(CUSTOMERS, CRITERIA)
+    capped = match_customers(CUSTOMERS, CRITERIA, limit=1)
+    assert capped['matchedCustomers'] == full['matchedCustomers'][:1]
+    assert capped['matchedCount'] == full['matchedCount']
+    assert match_customers(CUSTOMERS, CRITERIA, limit=0)['matchedCount'] == full['matchedCount']
+
+
+def test_scales_to_a_large_book_in_one_pass():
+    book = [{**c, 'customerId': f"{c['customerId']}-{i}"} for i in range(15000) for c in CUSTOMERS]
+    result = match_customers(iter(book), CRITERIA, limit=10)
+    assert result['scannedCount'] == len(book)
+    assert len(result['matchedCustomers']) == 10
+
+
+def test_criteria_round_trip_through_the_lambda_payload():
+    payload = json.loads(json.dumps(CRITERIA.to_payload()))
+    restored = BondMatchCriteria.from_payload(payload)
+    assert match_customers(CUSTOMERS, restored) == match_customers(CUSTOMERS, CRITERIA)
+
+
+def test_lambda_matches_like_the_agent():
+    pytest.importorskip('boto3')
+    module = load_lambda('list-customers')
+    with lambda_data(s3=FakeS3.from_directory()):
+        for bond in BONDS:
+            criteria = BondMatchCriteria.from_bond(bond)
+            body = json.loads(module.lambda_handler({'match_bond': criteria.to_payload()}, None)['body'])
+            assert {key: body[key] for key in ('matchedCustomers', 'matchedCount', 'scannedCount')} == \
+                json.loads(json.dumps(match_customers(CUSTOMERS, criteria)))
+
+
+def test_the_lambdas_ship_this_module():
+    layer_copy = os.path.join(DATA_ACCESS_LAYER, 'customer_matching.py')
+    assert open(layer_copy, encoding='utf-8').read() == open(utils.customer_matching.__file__, encoding='utf-8').read()
+
+
+if __name__ == '__main__':
+    print("Testing customer matching:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,161 @@
+"""Test the offset-indexed NDJSON customer store"""
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import FakeS3, lambda_data, load_lambda
+from utils.customer_store import CustomerStore, convert, is_stale, store_paths
+from utils.pagination import paginate
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+CUSTOMERS_JSON = os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json')
+CUSTOMERS = json.load(open(CUSTOMERS_JSON, encoding='utf-8'))
+
+
+@contextlib.contextmanager
+def customer_json(customers=None):
+    """A scratch copy of the customer array (or ``customers``) to convert."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bank-x-customers.json')
+        if customers is None:
+            shutil.copy(CUSTOMERS_JSON, path)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(customers, f)
+        yield path
+
+
+def test_lookup_reads_only_the_indexed_record():
+    with customer_json() as json_path:
+        with CustomerStore.from_json(json_path) as store:
+            assert len(store) == len(CUSTOMERS)
+            for customer in CUSTOMERS:
+                assert store.get(customer['customerId']) == customer
+            assert store.get('CUST-999') is None
+            offset, length = store.offsets[CUSTOMERS[1]['customerId']]
+            assert json.loads(open(store_paths(json_path)[0], 'rb').read()[offset:offset + length]) == CUSTOMERS[1]
+
+
+def test_iteration_streams_every_record_in_file_order():
+    with customer_json() as json_path:
+        with CustomerStore.from_json(json_path) as store:
+            assert list(store) == CUSTOMERS
+
+
+def test_pages_match_paginating_the_full_array():
+    with customer_json() as json_path:
+        with CustomerStore.from_json(json_path) as store:
+            for sort_by, descending in ((None, False), (None, True), ('portfolioValue', True)):
+                cursor = None
+                while True:
+                    expected = paginate(CUSTOMERS, 'customerId', ['name'], sort_by=sort_by, descending=descending,
+                                        limit=3, cursor=cursor)
+                    assert store.page(['name'], sort_by=sort_by, descending=descending, limit=3, cursor=cursor) == expected
+                    cursor = expected[1]
+                    if cursor is None:
+                        break
+
+
+def test_store_is_rebuilt_when_the_array_changes():
+    with customer_json() as json_path:
+        assert is_stale(json_path)
+        convert(json_path)
+        assert not is_stale(json_path)
+        changed = CUSTOMERS + [{'customerId': 'CUST-100', 'name': 'Zoë Ångström'}]
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(changed, f, ensure_ascii=False)
+        future = time.time() + 5
+        os.utime(json_path, (future, future))
+        assert is_stale(json_path)
+        with CustomerStore.from_json(json_path) as store:
+            assert store.get('CUST-100')['name'] == 'Zoë Ångström'
+
+
+def test_empty_array_gives_an_empty_store():
+    with customer_json([]) as json_path, CustomerStore.from_json(json_path) as store:
+        assert len(store) == 0 and list(store) == [] and store.page() == ([], None)
+
+
+def test_lambda_reads_one_record_by_byte_range():
+    pytest.importorskip('boto3')
+    with customer_json() as json_path:
+        module = load_lambda('get-customer')
+        store_path, index_path = convert(json_path)
+        s3 = FakeS3({
+            'client-details/' + module.CUSTOMER_STORE_PATH: open(store_path, 'rb').read(),
+            'client-details/' + module.CUSTOMER_INDEX_PATH: open(index_path, 'rb').read(),
+        })
+        with lambda_data(s3=s3):
+            response = module.lambda_handler({'customer_id': CUSTOMERS[2]['customerId']}, None)
+            assert json.loads(response['body'])['customer'] == CUSTOMERS[2]
+            offset, length = json.load(open(index_path))['offsets'][CUSTOMERS[2]['customerId']]
+            assert ('GetObject', 'client-details/' + module.CUSTOMER_STORE_PATH) in s3.requests
+            assert module.read_store_record('CUST-999') is None
+            response = module.lambda_handler({'customer_id': 'CUST-999'}, None)
+            assert response['statusCode'] == 404 and json.loads(response['body'])['errorCode'] == 'NOT_FOUND'
+            # The index stays cached in the container: one GET for it in all
+            assert s3.requests.count(('GetObject', 'client-details/' + module.CUSTOMER_INDEX_PATH)) == 1
+            assert s3.requests.count(('GetObject', 'client-details/' + module.CUSTOMER_STORE_PATH)) == 1
+
+
+def test_lambda_falls_back_to_the_database_when_the_store_lags():
+    pytest.importorskip('boto3')
+    added = {**CUSTOMERS[0], 'customerId': 'CUST-9001', 'name': 'Added Later'}
+    with customer_json() as json_path:
+        module = load_lambda('get-customer')
+        store_path, index_path = convert(json_path)
+        store, index = open(store_path, 'rb').read(), open(index_path, 'rb').read()
+    s3 = FakeS3({
+        'client-details/' + module.CUSTOMER_STORE_PATH: store,
+        'client-details/' + module.CUSTOMER_INDEX_PATH: index,
+        'client-details/' + module.CUSTOMER_DB_PATH: json.dumps(CUSTOMERS + [added]),
+    })
+
+    def get(customer_id):
+        response = module.lambda_handler({'customer_id': customer_id}, None)
+        return response['statusCode'], json.loads(response['body']).get('customer')
+
+    with lambda_data(s3=s3):
+        # Added to the database after the store was built
+        assert get('CUST-9001') == (200, added)
+        # The store rewritten under an index that was not: still mismatched after the refresh
+        s3.put_object(Bucket='fake', Key='client-details/' + module.CUSTOMER_STORE_PATH, Body=b' ' + store)
+        assert get(CUSTOMERS[2]['customerId']) == (200, CUSTOMERS[2])
+        assert get('CUST-9999') == (404, None)
+
+
+def test_lambda_answers_misses_from_a_current_store():
+    pytest.importorskip('boto3')
+    with customer_json() as json_path:
+        module = load_lambda('get-customer')
+        store_path, index_path = convert(json_path)
+        s3 = FakeS3({
+            'client-details/' + module.CUSTOMER_STORE_PATH: open(store_path, 'rb').read(),
+            'client-details/' + module.CUSTOMER_INDEX_PATH: open(index_path, 'rb').read(),
+            'client-details/' + module.CUSTOMER_DB_PATH: open(json_path, 'rb').read(),
+        })
+    with lambda_data(s3=s3):
+        for _ in range(3):
+            response = module.lambda_handler({'customer_id': 'CUST-9999'}, None)
+            assert response['statusCode'] == 404 and json.loads(response['body'])['errorCode'] == 'NOT_FOUND'
+        # The store was built from this database: its index is the answer, and the database is never read
+        assert ('GetObject', 'client-details/' + module.CUSTOMER_DB_PATH) not in s3.requests
+        assert s3.count('ListObjectsV2') == 1
+
+
+if __name__ == '__main__':
+    print("Testing customer store:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,94 @@
+"""Test token-budgeted conversation history compaction"""
+import sys
+sys.path.insert(0, '.')
+
+from utils.history_compactor import HistoryCompactor, estimate_tokens
+
+
+def make_history(turns: int, filler: int = 400):
+    history = []
+    for i in range(turns):
+        customer_id = f"CUST-{i % 7 + 1:03d}"
+        history.append({"role": "user", "content": f"Show me {customer_id}. Thanks."})
+        history.append({"role": "assistant", "content": f"Profile for {customer_id} suits BOND-CORP-2025-A. " + "x" * filler})
+    return history
+
+
+def test_short_history_is_verbatim():
+    history = make_history(2, filler=10)
+    context = HistoryCompactor(token_budget=2000, keep_last_turns=3).build_context(history)
+    assert context.startswith("Previous conversation:\n")
+    assert "Summary of" not in context
+    assert "User: Show me CUST-001. Thanks." in context
+
+
+def test_empty_history_produces_no_context():
+    assert HistoryCompactor().build_context([]) == ""
+
+
+def test_count_turns_counts_user_messages():
+    assert HistoryCompactor.count_turns(make_history(4)) == 4
+    assert HistoryCompactor.count_turns([]) == HistoryCompactor.count_turns(None) == 0
+
+
+def test_long_history_fits_budget_and_keeps_ids():
+    compactor = HistoryCompactor(token_budget=800, keep_last_turns=3)
+    context = compactor.build_context(make_history(30))
+    assert estimate_tokens(context) <= 800 + 10
+    assert "Referenced IDs:" in context
+    for n in range(1, 8):
+        assert f"CUST-{n:03d}" in context
+    assert "BOND-CORP-2025-A" in context
+
+
+def test_summary_is_incremental():
+    compactor = HistoryCompactor(token_budget=800, keep_last_turns=2)
+    history = make_history(20)
+    compactor.build_context(history)
+    summarized = compactor.stats["summarizedMessages"]
+    compactor.build_context(history + make_history(1))
+    # Only the turn that slid out of the verbatim window is summarised again
+    assert compactor.stats["summarizedMessages"] - summarized <= 2
+
+
+def tool_turn(i: int, result_chars: int = 200, reply: str = "is fine."):
+    return [
+        {"role": "user", "content": [{"text": f"Show me CUST-00{i}"}]},
+        {"role": "assistant", "content": [{"toolUse": {"toolUseId": f"t{i}", "name": "customer_get_profile"}}]},
+        {"role": "user", "content": [{"toolResult": {"toolUseId": f"t{i}", "content": [{"text": "x" * result_chars}]}}]},
+        {"role": "assistant", "content": [{"text": f"CUST-00{i} {reply}"}]},
+    ]
+
+
+def test_retained_messages_are_trimmed_by_whole_turns():
+    compactor = HistoryCompactor(token_budget=150, retained_token_budget=150)
+    messages = [msg for i in range(5) for msg in tool_turn(i)]
+    assert not compactor.fits(messages)
+    assert compactor.trim_messages(messages) % 4 == 0 and compactor.fits(messages)
+    assert messages[0]["content"][0]["text"] == "Show me CUST-004" and len(messages) == 4
+
+
+def test_large_tool_results_count_at_most_tool_block_chars():
+    compactor = HistoryCompactor(token_budget=2000)
+    assert compactor.retained_token_budget == 8000
+    messages = [msg for i in range(3) for msg in tool_turn(i, result_chars=100000)]
+    # Each listing counts as 800 characters, not its full size, so one tool turn does not force a reset
+    assert compactor.retained_tokens(messages) < 1000 and compactor.fits(messages)
+
+
+def test_the_latest_turn_is_kept_even_over_the_budget():
+    compactor = HistoryCompactor(token_budget=10, retained_token_budget=10)
+    messages = tool_turn(0) + tool_turn(1, reply="y" * 400)
+    assert compactor.trim_messages(messages) == 4
+    assert messages == tool_turn(1, reply="y" * 400) and not compactor.fits(messages)
+
+
+if __name__ == '__main__':
+    print("Testing history compaction:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,67 @@
+"""Test the read-only intent fast path"""
+import asyncio
+import json
+import sys
+sys.path.insert(0, '.')
+
+from intent_fast_path import create_intent_fast_path
+
+BONDS = [{"productId": "BOND-GB-2025-Y", "name": "UK Government Bond Series Y", "type": "government_bond",
+          "yield": "4.75%", "maturity": "10 years", "minInvestment": 100000, "creditRating": "AA"}]
+CUSTOMERS = [{"customerId": "CUST-001", "name": "Michael Thompson", "email": "michael.thompson@example.com"}]
+MARKET = {"productType": "bond", "marketSummary": "Yields have stabilised.", "yieldTrends": {"current": "4.75%"},
+          "comparableProducts": [{"name": "US Treasury Bond", "yield": "4.90%", "maturity": "10 years", "creditRating": "AA+"}]}
+
+fast_path = create_intent_fast_path(
+    lambda: json.dumps(BONDS),
+    lambda: json.dumps(CUSTOMERS),
+    lambda product_type: json.dumps(MARKET),
+)
+
+
+def test_canonical_prompts_match():
+    assert fast_path.match("Show me available bonds").name == "list_bonds"
+    assert fast_path.match("  view customer PROFILES! ").name == "list_customers"
+    assert fast_path.match("Search market data").name == "search_market_data"
+
+
+def test_ambiguous_prompts_fall_back():
+    assert fast_path.match("Show me available bonds for Sarah Chen") is None
+    assert fast_path.match("Email customers about bonds") is None
+    assert asyncio.run(fast_path.respond("Which bonds suit a cautious investor?")) is None
+
+
+def test_rendered_responses_include_tool_data():
+    bonds = asyncio.run(fast_path.respond("Show me available bonds"))
+    assert "UK Government Bond Series Y" in bonds and "£100,000" in bonds
+    customers = asyncio.run(fast_path.respond("List customers"))
+    assert "CUST-001" in customers and "Michael Thompson" in customers
+    market = asyncio.run(fast_path.respond("Search market data"))
+    assert "Yields have stabilised." in market and "US Treasury Bond" in market
+
+
+def test_paged_results_show_the_total():
+    paged = create_intent_fast_path(
+        lambda: json.dumps({"bonds": BONDS, "total": 8, "nextCursor": "abc"}),
+        lambda: json.dumps({"customers": CUSTOMERS, "total": 1, "nextCursor": None}),
+        lambda product_type: json.dumps(MARKET),
+    )
+    assert "Here are 1 of the 8 available bond products" in asyncio.run(paged.respond("List bonds"))
+    assert "Here are the 1 Bank X customers" in asyncio.run(paged.respond("List customers"))
+
+
+def test_tool_errors_fall_back():
+    failing = create_intent_fast_path(lambda: "Error: Lambda function ARN not configured", lambda: "[]", lambda t: "{}")
+    assert asyncio.run(failing.respond("Show me available bonds")) is None
+    assert failing.stats["fallbacks"] == 1
+
+
+if __name__ == '__main__':
+    print("Testing intent fast path:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,128 @@
+"""Test the bounded parallel bond file reads in lambda/list-bonds"""
+import asyncio
+import json
+import sys
+import threading
+import time
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.bench_list_bonds_fanout import FakeContext, FakeFileFunctions
+from benchmarks.fake_s3 import FakeS3, lambda_data, load_lambda
+
+
+def load_list_bonds():
+    pytest.importorskip('boto3')
+    return load_lambda('list-bonds')
+
+
+def list_bonds(module, fake, event=None, context=None):
+    with lambda_data(lambda_client=fake):
+        response = module.lambda_handler(event or {'limit': 500}, context)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_reads_run_in_parallel_up_to_the_limit():
+    module = load_list_bonds()
+    module.READ_CONCURRENCY = 8
+    fake = FakeFileFunctions(40, latency_s=0.02, failure_rate=0, seed=1)
+    start = time.perf_counter()
+    status, body = list_bonds(module, fake)
+    assert status == 200 and body['total'] == 40 and 'unreadCount' not in body
+    assert [b['name'] for b in body['bonds']] == fake.files
+    assert 1 < fake.peak_in_flight <= 8
+    assert time.perf_counter() - start < 40 * 0.02
+
+
+def test_failed_reads_are_reported():
+    module = load_list_bonds()
+    fake = FakeFileFunctions(30, latency_s=0, failure_rate=0.3, seed=2)
+    status, body = list_bonds(module, fake)
+    assert status == 200 and body['total'] + body['unreadCount'] == 30 and body['unreadCount'] > 0
+    assert all(entry['reason'] == 'read failed' for entry in body['unreadFiles'])
+
+
+def test_reads_stop_at_the_lambda_deadline():
+    module = load_list_bonds()
+    module.READ_CONCURRENCY, module.RESPONSE_RESERVE_MS = 2, 100
+    fake = FakeFileFunctions(20, latency_s=0.1, failure_rate=0, seed=3)
+    start = time.perf_counter()
+    with lambda_data(lambda_client=fake):
+        response = module.lambda_handler({'limit': 500}, FakeContext(0.35))
+        elapsed = time.perf_counter() - start
+        # Reads still in flight finish in the background; wait for them while the fake
+        # client is installed, so none lands in the data cache after this test
+        for thread in threading.enumerate():
+            if thread.name.startswith('read-bond'):
+                thread.join()
+    status, body = response['statusCode'], json.loads(response['body'])
+    assert elapsed < 0.35
+    assert status == 200 and 0 < body['total'] < 20
+    assert body['unreadCount'] == 20 - body['total']
+    assert body['unreadFiles'][-1]['reason'] == 'deadline exceeded'
+
+
+def test_nothing_read_is_an_error():
+    module = load_list_bonds()
+    status, body = list_bonds(module, FakeFileFunctions(5, latency_s=0, failure_rate=1, seed=4))
+    assert status == 502 and body['errorCode'] == 'BOND_READ_FAILED'
+
+
+def test_bonds_are_read_straight_from_s3():
+    module = load_list_bonds()
+    s3 = FakeS3.from_directory()
+    s3.put_object(Bucket='fake', Key='client-details/bonds/broken.json', Body='{not json')
+    with lambda_data(s3=s3):
+        response = module.lambda_handler({'limit': 500, 'sort_by': 'productId'}, None)
+    status, body = response['statusCode'], json.loads(response['body'])
+    bond_keys = [key for key in s3.objects if key.startswith('client-details/bonds/')]
+    assert status == 200 and body['total'] == len(bond_keys) - 1
+    assert body['unreadFiles'] == [{'filename': 'bonds/broken.json', 'reason': 'invalid JSON'}]
+    # broken.json is not in the bond catalog manifest, so every bond file is read
+    assert s3.count('ListObjectsV2') == 1 and s3.count('GetObject') == 1 + len(bond_keys)
+
+
+def test_recommendation_tools_follow_every_page():
+    module = load_list_bonds()
+    pytest.importorskip('strands')
+    from agents import recommendation_agent
+    template = json.loads(FakeS3.from_directory().objects['client-details/bonds/government-bond-y.json'])
+    bonds = {f'client-details/bonds/bond-{i:04d}.json': json.dumps({**template, 'productId': f'BOND-{i:04d}'})
+             for i in range(1200)}
+    customer = {'customerId': 'CUST-001', 'portfolioValue': 1, 'riskTolerance': 'low'}
+    pages = []
+
+    def invoke(function_arn, payload=None, tool_name=None):
+        if tool_name == 'get_customer_profile':
+            return {'customer': customer}
+        pages.append(payload)
+        return json.loads(module.lambda_handler(payload, None)['body'])
+
+    async def invoke_async(function_arn, payload=None, tool_name=None):
+        return invoke(function_arn, payload, tool_name)
+
+    saved = recommendation_agent.invoke_lambda, recommendation_agent.invoke_lambda_async
+    recommendation_agent.invoke_lambda, recommendation_agent.invoke_lambda_async = invoke, invoke_async
+    try:
+        with lambda_data(s3=FakeS3(bonds)):
+            result = recommendation_agent.fetch_all_bonds()
+            assert sorted(b['productId'] for b in result['bonds']) == [f'BOND-{i:04d}' for i in range(1200)]
+            assert len(pages) == 3 and result['nextCursor'] is None
+            assert len(asyncio.run(recommendation_agent.fetch_all_bonds_async())['bonds']) == 1200
+            # Every bond is scored (here all excluded: none is affordable on a portfolio of 1)
+            output = recommendation_agent.get_bond_recommendations_for_customer('CUST-001')
+            assert 'BOND-1199' in output and '"bondCount":1200' in output.replace(' ', '')
+    finally:
+        recommendation_agent.invoke_lambda, recommendation_agent.invoke_lambda_async = saved
+
+
+if __name__ == '__main__':
+    print("Testing list-bonds fan-out:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
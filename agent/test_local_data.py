@@ -0,0 +1,173 @@
+"""Test the file and SQLite local data sources"""
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, '.')
+
+from utils.local_data import FileDataSource, SqliteDataSource
+from utils.pagination import paginate
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+CUSTOMERS = json.load(open(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), encoding='utf-8'))
+
+
+@contextlib.contextmanager
+def data_dir():
+    """A scratch copy of local_data/ (customers, bonds and market data)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'customers'))
+        shutil.copy(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), os.path.join(tmp, 'customers'))
+        for name in ('bonds', 'market-data'):
+            shutil.copytree(os.path.join(DATA_DIR, name), os.path.join(tmp, name))
+        yield tmp
+
+
+@contextlib.contextmanager
+def sources():
+    with data_dir() as tmp:
+        sqlite = SqliteDataSource(tmp, check_seconds=0)
+        try:
+            yield FileDataSource(tmp, check_seconds=0), sqlite, tmp
+        finally:
+            sqlite.close()
+
+
+def test_sources_answer_every_read_alike():
+    with sources() as (files, sqlite, _):
+        for customer in CUSTOMERS:
+            assert sqlite.customer(customer['customerId']) == files.customer(customer['customerId']) == customer
+        assert sqlite.customer('CUST-999') is None
+        assert sqlite.customer_count() == files.customer_count() == len(CUSTOMERS)
+        assert sorted(c['customerId'] for c in sqlite.customers()) == sorted(c['customerId'] for c in CUSTOMERS)
+        assert sqlite.bonds() == files.bonds() and sqlite.bond_count() == files.bond_count() > 0
+        assert sqlite.bond_file('government-bond-y.json') == files.bond_file('government-bond-y.json') is not None
+        assert sqlite.bond_file('missing.json') is None
+        assert sqlite.most_sellable_bond() == files.most_sellable_bond()
+        assert sqlite.most_sellable_bond()['sellabilityRank'] == min(b['sellabilityRank'] for b in files.bonds())
+        assert sqlite.market_data('bond-market-data.json') == files.market_data('bond-market-data.json') is not None
+        assert sqlite.bond_catalog().resolve('corporate bond a') == files.bond_catalog().resolve('corporate bond a')
+
+
+def test_customer_pages_match_paginate():
+    with sources() as (files, sqlite, _):
+        for sort_by, descending in ((None, False), (None, True), ('portfolioValue', True)):
+            cursor = None
+            while True:
+                expected = paginate(CUSTOMERS, 'customerId', ['name'], sort_by=sort_by, descending=descending,
+                                    limit=3, cursor=cursor)
+                for source in (files, sqlite):
+                    assert source.customer_page(['name'], sort_by=sort_by, descending=descending,
+                                                limit=3, cursor=cursor) == expected
+                cursor = expected[1]
+                if cursor is None:
+                    break
+
+
+def edit_bond(tmp, filename, **changes):
+    """Rewrite a bond file with ``changes``, moving its mtime forward so the edit is seen."""
+    path = os.path.join(tmp, 'bonds', filename)
+    bond = json.load(open(path, encoding='utf-8'))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**bond, **changes}, f)
+    future = time.time() + 5
+    os.utime(path, (future, future))
+    return bond
+
+
+def test_files_are_parsed_once_until_they_change():
+    with sources() as (files, _, tmp):
+        bonds = files.bonds()
+        files.bonds(), files.bond_catalog(), files.most_sellable_bond(), files.bond_file('government-bond-y.json')
+        assert files.files.parses == len(bonds)
+        catalog = files.bond_catalog()
+
+        bond = edit_bond(tmp, 'government-bond-y.json', sellabilityRank=-1, name='Renamed Gilt')
+        assert files.most_sellable_bond()['productId'] == bond['productId']
+        assert files.files.parses == len(bonds) + 1
+        assert files.bond_catalog() is not catalog and files.bond_catalog().get('Renamed Gilt')['productId'] == bond['productId']
+
+        os.remove(os.path.join(tmp, 'bonds', 'government-bond-y.json'))
+        assert files.bond_file('government-bond-y.json') is None and files.bond_count() == len(bonds) - 1
+
+
+def test_concurrent_reads_survive_the_data_changing():
+    with sources() as (files, _, tmp):
+        customers_path = os.path.join(tmp, 'customers', 'bank-x-customers.json')
+        customer_id = CUSTOMERS[0]['customerId']
+
+        def read(n):
+            if n % 10 == 0:
+                # Rewrite the customers (renaming one) and a bond while other calls read
+                renamed = [{**c, 'name': f"Renamed {n}"} if c['customerId'] == customer_id else c for c in CUSTOMERS]
+                with open(customers_path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump(renamed, f)
+                future = time.time() + n
+                os.utime(customers_path + '.tmp', (future, future))
+                os.replace(customers_path + '.tmp', customers_path)
+                bond_path = os.path.join(tmp, 'bonds', 'government-bond-y.json')
+                with open(bond_path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump({**json.load(open(bond_path, encoding='utf-8')), 'sellabilityRank': -n}, f)
+                os.utime(bond_path + '.tmp', (future, future))
+                os.replace(bond_path + '.tmp', bond_path)
+            return (files.customer(customer_id)['customerId'], len(list(files.customers())),
+                    files.bond_catalog().get('corporate bond a')['productId'], files.bond_count())
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(read, range(80)))
+        assert set(results) == {(customer_id, len(CUSTOMERS), 'BOND-CORP-2025-A', files.bond_count())}
+        assert files.customer(customer_id)['name'].startswith('Renamed')
+        assert files.most_sellable_bond()['productId'] == 'BOND-GB-2025-Y'
+
+
+def test_directories_are_rechecked_at_most_every_check_interval():
+    with data_dir() as tmp:
+        files = FileDataSource(tmp, check_seconds=60)
+        before = files.most_sellable_bond()
+        edit_bond(tmp, 'government-bond-y.json', sellabilityRank=-1)
+        assert files.most_sellable_bond() is before
+        files.files.check_seconds = 0
+        assert files.most_sellable_bond()['productId'] == 'BOND-GB-2025-Y'
+
+
+def test_sqlite_reloads_only_the_files_that_changed():
+    with sources() as (_, sqlite, tmp):
+        sqlite.customer_count()
+        assert sqlite.builds == 1
+        customers_version = sqlite.customers_version()
+        sqlite.bonds()
+        assert sqlite.builds == 1 and not sqlite.refresh()
+
+        bond = edit_bond(tmp, 'government-bond-y.json', sellabilityRank=-1)
+        assert sqlite.most_sellable_bond()['productId'] == bond['productId']
+        assert sqlite.builds == 2 and sqlite.last_loaded == [os.path.join('bonds', 'government-bond-y.json')]
+        assert sqlite.customers_version() == customers_version
+
+        os.remove(os.path.join(tmp, 'bonds', 'government-bond-y.json'))
+        assert sqlite.bond_file('government-bond-y.json') is None and sqlite.builds == 3
+        assert sqlite.bond_catalog().get('BOND-GB-2025-Y') is None
+
+
+def test_sqlite_database_is_reused_across_processes():
+    with data_dir() as tmp:
+        first = SqliteDataSource(tmp, check_seconds=0)
+        first.customer_count()
+        first.close()
+        second = SqliteDataSource(tmp, check_seconds=0)
+        assert second.customer_count() == len(CUSTOMERS) and second.builds == 0
+        second.close()
+
+
+if __name__ == '__main__':
+    print("Testing local data sources:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,94 @@
+"""Test keyset pagination, projection and sort keys for the list tools"""
+import glob
+import json
+import os
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import DATA_ACCESS_LAYER, load_lambda
+import utils.pagination
+from utils.pagination import MAX_PAGE_SIZE, decode_cursor, paginate
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+BONDS = [json.load(open(path, encoding='utf-8')) for path in sorted(glob.glob(os.path.join(DATA_DIR, 'bonds', '*.json')))]
+CUSTOMERS = json.load(open(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), encoding='utf-8'))
+
+
+def walk(records, id_field, limit, **kwargs):
+    """Every page from the first, following nextCursor."""
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate(records, id_field, limit=limit, cursor=cursor, **kwargs)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_record_once_in_id_order():
+    pages = walk(CUSTOMERS, 'customerId', 3, fields=['name'])
+    ids = [c['customerId'] for page in pages for c in page]
+    assert ids == sorted(c['customerId'] for c in CUSTOMERS)
+    assert all(len(page) == 3 for page in pages[:-1])
+    assert set(pages[0][0]) == {'customerId', 'name'}
+
+
+def test_numeric_text_sorts_by_number():
+    pages = walk(BONDS, 'productId', 3, fields=['yield'], sort_by='yield', descending=True)
+    yields = [float(b['yield'].rstrip('%')) for page in pages for b in page]
+    assert yields == sorted((float(b['yield'].rstrip('%')) for b in BONDS), reverse=True)
+
+
+def test_records_without_the_sort_field_come_last():
+    records = [{'id': 'a', 'v': 2}, {'id': 'b'}, {'id': 'c', 'v': 9}, {'id': 'd', 'v': 2}, {'id': 'e', 'v': None}]
+    for descending, expected in ((False, ['a', 'd', 'c', 'b', 'e']), (True, ['c', 'd', 'a', 'b', 'e'])):
+        pages = walk(records, 'id', 2, sort_by='v', descending=descending)
+        assert [r['id'] for page in pages for r in page] == expected
+
+
+def test_cursor_survives_inserts_before_it():
+    _, cursor = paginate(CUSTOMERS, 'customerId', limit=2)
+    grown = [{'customerId': 'CUST-000', 'name': 'New'}] + CUSTOMERS
+    second, _ = paginate(grown, 'customerId', limit=1, cursor=cursor)
+    assert second[0]['customerId'] == sorted(c['customerId'] for c in CUSTOMERS)[2]
+
+
+def test_limit_is_clamped_and_none_keeps_whole_records():
+    page, _ = paginate(BONDS, 'productId', limit=MAX_PAGE_SIZE * 10)
+    assert len(page) == len(BONDS) and page[0] is min(BONDS, key=lambda b: b['productId'])
+
+
+def test_bad_and_mismatched_cursors_are_rejected():
+    _, cursor = paginate(BONDS, 'productId', sort_by='yield', limit=2)
+    with pytest.raises(ValueError):
+        paginate(BONDS, 'productId', sort_by='maturity', limit=2, cursor=cursor)
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor', 'yield', False)
+
+
+def test_lambda_cursors_continue_across_backends():
+    pytest.importorskip('boto3')
+    for name in ('list-customers', 'list-bonds'):
+        module = load_lambda(name)
+        page, cursor = module.paginate(BONDS, 'productId', ['yield'], sort_by='yield', limit=3)
+        assert (page, cursor) == paginate(BONDS, 'productId', ['yield'], sort_by='yield', limit=3)
+        assert module.paginate(BONDS, 'productId', sort_by='yield', limit=3, cursor=cursor) == \
+            paginate(BONDS, 'productId', sort_by='yield', limit=3, cursor=cursor)
+
+
+
+def test_the_lambdas_ship_this_module():
+    layer_copy = os.path.join(DATA_ACCESS_LAYER, 'pagination.py')
+    assert open(layer_copy, encoding='utf-8').read() == open(utils.pagination.__file__, encoding='utf-8').read()
+
+
+if __name__ == '__main__':
+    print("Testing pagination:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,83 @@
+"""Test the get-recent-emails Lambda's newest-first walk over the sent-emails/ date prefixes"""
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks.fake_s3 import FakeS3, lambda_data, load_lambda
+
+
+def email_key(sent: datetime, n: int, day: datetime = None) -> str:
+    """The key send-email writes; ``day`` overrides the date prefix."""
+    return (f"sent-emails/{(day or sent).strftime('%Y-%m-%d')}/"
+            f"{sent.strftime('%Y%m%dT%H%M%S')}_customer{n}@example.com_bond-offer-{n}.txt")
+
+
+def synthetic_emails(count: int, days: int, seed: int = 3):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    sent = sorted(start + timedelta(seconds=rng.randrange(days * 86400)) for _ in range(count))
+    return {email_key(when, n): b'' for n, when in enumerate(sent)}, sent
+
+
+def recent(s3, limit):
+    module = load_lambda('get-recent-emails')
+    with lambda_data(s3=s3):
+        response = module.lambda_handler({'limit': limit}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_newest_emails_come_first_beyond_one_listing_page():
+    pytest.importorskip('boto3')
+    objects, sent = synthetic_emails(5000, days=60)
+    s3 = FakeS3(objects)
+    status, body = recent(s3, 25)
+    expected = [when.strftime('%Y-%m-%d %H:%M:%S') for when in sorted(sent, reverse=True)[:25]]
+    assert status == 200 and [email['timestamp'] for email in body['emails']] == expected
+    assert body['emails'][0]['subject'] == 'Bond Offer 4999'
+    # One listing of the date prefixes, then only the newest days
+    day_listings = [key for op, key in s3.requests if op == 'ListObjectsV2' and key != 'sent-emails/']
+    assert 1 <= len(day_listings) <= 2 and day_listings[0] == email_key(sent[-1], 0).rsplit('/', 1)[0] + '/'
+
+
+def test_an_email_sent_at_midnight_is_not_missed():
+    pytest.importorskip('boto3')
+    day = datetime(2025, 3, 1)
+    objects = {email_key(day + timedelta(hours=h), h): b'' for h in range(1, 4)}
+    # Written to the previous day's prefix with the next day's timestamp
+    objects[email_key(day + timedelta(seconds=1), 99, day=day - timedelta(days=1))] = b''
+    objects[email_key(day - timedelta(hours=2), 98)] = b''
+    status, body = recent(FakeS3(objects), 4)
+    assert status == 200
+    assert [email['timestamp'] for email in body['emails']] == [
+        '2025-03-01 03:00:00', '2025-03-01 02:00:00', '2025-03-01 01:00:00', '2025-03-01 00:00:01']
+
+
+def test_other_keys_and_bad_limits():
+    pytest.importorskip('boto3')
+    s3 = FakeS3({
+        'sent-emails/2025-03-01/20250301T101500_a@example.com_hello.txt': b'',
+        'sent-emails/2025-03-01/notes.txt': b'',
+        'sent-emails/2025-03-01/20250301T101600_b@example.com_draft.eml': b'',
+        'sent-emails/readme.txt': b'',
+        'sent-emails/archive/20250302T000000_c@example.com_old.txt': b'',
+    })
+    status, body = recent(s3, 10)
+    assert status == 200 and body['emails'] == [
+        {'timestamp': '2025-03-01 10:15:00', 'recipient': 'a@example.com', 'subject': 'Hello'}]
+    assert recent(FakeS3(), 5) == (200, {'requestId': 'unknown', 'emails': []})
+    assert recent(s3, 0)[0] == recent(s3, 101)[0] == recent(s3, 'ten')[0] == 400
+
+
+if __name__ == '__main__':
+    print("Testing get-recent-emails:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,148 @@
+"""Test the session-keyed coordinator pool"""
+import asyncio
+import sys
+import time
+sys.path.insert(0, '.')
+
+import pytest
+
+from utils.session_pool import SessionAgentPool
+
+
+def make_pool(**kwargs):
+    counter = {'n': 0}
+
+    def factory():
+        counter['n'] += 1
+        return object()
+
+    return SessionAgentPool(factory, **kwargs), counter
+
+
+def test_same_session_reuses_agent():
+    pool, counter = make_pool(max_agents=4)
+    assert pool.get('a') is pool.get('a')
+    assert counter['n'] == 1
+
+
+def test_distinct_sessions_get_distinct_agents():
+    pool, _ = make_pool(max_agents=4)
+    assert pool.get('a') is not pool.get('b')
+    assert len(pool) == 2
+
+
+def test_lru_eviction_caps_live_agents():
+    pool, _ = make_pool(max_agents=2)
+    pool.get('a')
+    pool.get('b')
+    pool.get('a')  # 'b' is now least recently used
+    pool.get('c')
+    assert len(pool) == 2
+    assert 'a' in pool and 'c' in pool and 'b' not in pool
+    assert pool.snapshot()['evictedLru'] == 1
+
+
+def test_idle_ttl_eviction():
+    pool, _ = make_pool(max_agents=4, idle_ttl_seconds=0.05)
+    pool.get('a')
+    time.sleep(0.1)
+    pool.get('b')
+    assert 'a' not in pool
+    assert pool.snapshot()['evictedIdle'] == 1
+
+
+def make_router(history_compactor=None):
+    """An AgentRouter whose model records the messages of every request."""
+    pytest.importorskip('strands')
+    from strands.models import Model
+    from agent_router import AgentRouter
+
+    class RecordingModel(Model):
+        def __init__(self):
+            self.requests = []
+
+        def get_config(self):
+            return {}
+
+        def update_config(self, **config):
+            pass
+
+        async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+            raise NotImplementedError
+            yield
+
+        async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+            self.requests.append([block['text'] for msg in messages for block in msg['content'] if 'text' in block])
+            for event in ({'messageStart': {'role': 'assistant'}}, {'contentBlockStart': {'start': {}}},
+                          {'contentBlockDelta': {'delta': {'text': f'answer {len(self.requests)}'}}},
+                          {'contentBlockStop': {}}, {'messageStop': {'stopReason': 'end_turn'}}):
+                yield event
+
+    model = RecordingModel()
+    return AgentRouter(None, None, None, None, None, model=model, history_compactor=history_compactor), model
+
+
+def run_turn(router, user_input, session_id, history_context, history_turns=0):
+    async def drain():
+        async for _ in router.stream_async(user_input, session_id=session_id, history_context=history_context,
+                                           history_turns=history_turns):
+            pass
+    asyncio.run(drain())
+
+
+def test_session_turns_reach_the_model_once():
+    router, model = make_router()
+    history = 'Previous conversation:\nUser: first question\nAssistant: answer 1\n\n'
+    run_turn(router, 'first question', 's1', '')
+    run_turn(router, 'second question', 's1', history, 1)
+    # The pooled coordinator carries turn one itself; the client's copy is not prepended again
+    assert model.requests[-1] == ['first question', 'answer 1', 'second question']
+
+    # A session the pool does not hold starts from the injected history
+    run_turn(router, 'second question', 's2', history, 1)
+    assert model.requests[-1] == [history + 'second question']
+    run_turn(router, 'second question', None, history)
+    assert model.requests[-1] == [history + 'second question']
+
+
+def test_turns_answered_elsewhere_reach_the_coordinator():
+    router, model = make_router()
+    run_turn(router, 'first question', 's1', '')
+    # Turn two was answered by the intent fast path, so the coordinator never saw it
+    history = ('Previous conversation:\nUser: first question\nAssistant: answer 1\n'
+               'User: show me the bonds\nAssistant: fast path answer\n\n')
+    run_turn(router, 'third question', 's1', history, 2)
+    assert model.requests[-1] == [history + 'third question']
+    # In step again: the next turn carries on from the coordinator's own messages
+    run_turn(router, 'fourth question', 's1', history + '...', 3)
+    assert model.requests[-1] == [history + 'third question', 'answer 2', 'fourth question']
+
+
+def test_retained_session_history_stays_within_the_budget():
+    from utils.history_compactor import HistoryCompactor
+    router, model = make_router(HistoryCompactor(token_budget=100, retained_token_budget=50))
+    history = 'Previous conversation:\nSummary of 4 earlier message(s):\n...\n\n'
+    run_turn(router, 'a' * 200, 's1', '')
+    run_turn(router, 'b' * 200, 's1', history, 1)
+    # Turn one no longer fits, so the compacted history replaces it
+    assert model.requests[-1] == [history + 'b' * 200]
+    # Without client history the oldest retained turns are dropped instead, but never the latest
+    run_turn(router, 'c' * 200, 's2', '')
+    run_turn(router, 'd' * 200, 's2', '')
+    assert model.requests[-1] == ['c' * 200, 'answer 3', 'd' * 200]
+    run_turn(router, 'e', 's2', '')
+    assert model.requests[-1] == ['d' * 200, 'answer 4', 'e']
+    run_turn(router, 'f', 's3', '')
+    run_turn(router, 'g', 's3', '')
+    assert model.requests[-1] == ['f', 'answer 6', 'g']
+
+
+if __name__ == '__main__':
+    print("Testing session agent pool:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
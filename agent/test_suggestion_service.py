@@ -0,0 +1,101 @@
+"""Test the suggestion service: fixed initial set and fingerprinted follow-up cache"""
+import asyncio
+import json
+import sys
+sys.path.insert(0, '.')
+
+from suggestion_handler import AsyncSuggestionRunner, EMPTY_SUGGESTIONS
+from suggestion_service import SuggestionService, INITIAL_SUGGESTIONS, suggestion_fingerprint
+
+
+class CountingRunner:
+    def __init__(self, reply='["View Sarah Chen\'s profile"]'):
+        self.reply = reply
+        self.calls = 0
+
+    async def run(self, prompt):
+        self.calls += 1
+        return self.reply
+
+
+HISTORY = [
+    {"role": "user", "content": "Show me CUST-002"},
+    {"role": "assistant", "content": "Sarah Chen (CUST-002) prefers BOND-GREEN-2025-G."},
+]
+
+
+def test_initial_suggestions_skip_the_model():
+    runner = CountingRunner()
+    service = SuggestionService(runner)
+    result = asyncio.run(service.get_suggestions("Suggest 4 prompts", [], "Suggest 4 prompts"))
+    assert json.loads(result) == INITIAL_SUGGESTIONS
+    assert runner.calls == 0
+
+
+def test_followups_are_cached_by_fingerprint():
+    runner = CountingRunner()
+    service = SuggestionService(runner)
+    for _ in range(3):
+        asyncio.run(service.get_suggestions("Suggest follow-up prompts", HISTORY, "ctx"))
+    assert runner.calls == 1
+    assert service.snapshot()['cacheHits'] == 2
+
+
+def test_fingerprint_changes_with_entities():
+    other = [dict(HISTORY[0]), {"role": "assistant", "content": "Sarah Chen (CUST-002) prefers BOND-CORP-2025-A."}]
+    assert suggestion_fingerprint("p", HISTORY) != suggestion_fingerprint("p", other)
+    assert suggestion_fingerprint("p", HISTORY) == suggestion_fingerprint("p", [dict(m) for m in HISTORY])
+
+
+def test_empty_results_are_not_cached():
+    runner = CountingRunner(reply="[]")
+    service = SuggestionService(runner)
+    asyncio.run(service.get_suggestions("Suggest", HISTORY, "ctx"))
+    asyncio.run(service.get_suggestions("Suggest", HISTORY, "ctx"))
+    assert runner.calls == 2
+
+
+class SlowModel:
+    def __init__(self, latency_s):
+        self.latency_s = latency_s
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None):
+        await asyncio.sleep(self.latency_s)
+        yield {'contentBlockDelta': {'delta': {'text': '["Show me available bonds"]'}}}
+
+
+class SlowAgent:
+    system_prompt = ''
+
+    def __init__(self, latency_s):
+        self.model = SlowModel(latency_s)
+
+
+def test_waiting_for_a_slot_counts_against_the_timeout():
+    runner = AsyncSuggestionRunner(SlowAgent(0.3), max_concurrency=1, timeout_seconds=0.2)
+
+    async def two_at_once():
+        runner.timeout_seconds = 1.0
+        first = asyncio.ensure_future(runner.run('Suggest'))
+        await asyncio.sleep(0)
+        # Queued behind the first call for longer than its own timeout
+        runner.timeout_seconds = 0.2
+        start = asyncio.get_running_loop().time()
+        second = await runner.run('Suggest')
+        waited = asyncio.get_running_loop().time() - start
+        return await first, second, waited
+
+    first, second, waited = asyncio.run(two_at_once())
+    assert json.loads(first) == ['Show me available bonds']
+    assert second == EMPTY_SUGGESTIONS and waited < 0.3
+
+
+if __name__ == '__main__':
+    print("Testing suggestion service:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
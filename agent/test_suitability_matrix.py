@@ -0,0 +1,92 @@
+"""Test the vectorised customer × bond suitability matrix against the scoring engine"""
+import glob
+import json
+import os
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+# The matrix is a benchmarking tool; numpy comes from requirements-dev.txt
+np = pytest.importorskip('numpy')
+
+from utils.bond_scoring import ineligibility_reason, rank_bonds, score_bond
+from utils.suitability_matrix import INELIGIBLE, SuitabilityMatrix
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'local_data')
+BONDS = [json.load(open(path, encoding='utf-8')) for path in sorted(glob.glob(os.path.join(DATA_DIR, 'bonds', '*.json')))]
+CUSTOMERS = json.load(open(os.path.join(DATA_DIR, 'customers', 'bank-x-customers.json'), encoding='utf-8'))
+
+
+def test_every_pair_matches_score_bond():
+    matrix = SuitabilityMatrix.from_local_data(DATA_DIR)
+    assert matrix.scores.shape == (len(CUSTOMERS), len(BONDS))
+    for customer in CUSTOMERS:
+        for bond in BONDS:
+            score = matrix.score(customer['customerId'], bond['productId'])
+            if ineligibility_reason(customer, bond):
+                assert score == INELIGIBLE
+            else:
+                assert abs(score - score_bond(customer, bond)['score']) <= 0.05
+
+
+def test_top_bonds_matches_rank_bonds():
+    matrix = SuitabilityMatrix(CUSTOMERS, BONDS)
+    for customer in CUSTOMERS:
+        expected = rank_bonds(customer, BONDS, top_k=3)['recommendations']
+        assert [r['productId'] for r in matrix.top_bonds(customer['customerId'], 3)] == [r['productId'] for r in expected]
+
+
+def test_top_customers_are_sorted_and_eligible():
+    matrix = SuitabilityMatrix(CUSTOMERS, BONDS)
+    top = matrix.top_customers(BONDS[0]['productId'], k=4)
+    assert len(top) == 4
+    assert [c['score'] for c in top] == sorted((c['score'] for c in top), reverse=True)
+    assert all(c['score'] >= 0 for c in top)
+
+
+def test_incremental_updates_match_a_rebuild():
+    matrix = SuitabilityMatrix(CUSTOMERS[:-1], BONDS[:-1])
+    matrix.upsert_customer(CUSTOMERS[-1])
+    matrix.upsert_bond(BONDS[-1])
+    changed = {**CUSTOMERS[0], 'riskTolerance': 'high', 'preferredSectors': ['green', 'shipping']}
+    matrix.upsert_customer(changed)
+    matrix.upsert_bond({**BONDS[1], 'riskRating': 9})
+
+    rebuilt = SuitabilityMatrix([changed] + CUSTOMERS[1:], [BONDS[0], {**BONDS[1], 'riskRating': 9}] + BONDS[2:])
+    assert matrix.customer_ids == rebuilt.customer_ids
+    assert matrix.product_ids == rebuilt.product_ids
+    assert np.array_equal(matrix.scores, rebuilt.scores)
+
+
+def test_remove_moves_the_last_entry_into_place():
+    matrix = SuitabilityMatrix(CUSTOMERS, BONDS)
+    removed_customer, removed_bond = CUSTOMERS[1]['customerId'], BONDS[2]['productId']
+    assert matrix.remove_customer(removed_customer)
+    assert matrix.remove_bond(removed_bond)
+    assert not matrix.remove_customer(removed_customer)
+
+    rebuilt = SuitabilityMatrix(CUSTOMERS, BONDS)
+    assert matrix.scores.shape == (len(CUSTOMERS) - 1, len(BONDS) - 1)
+    assert matrix.score(removed_customer, BONDS[0]['productId']) is None
+    for customer_id in matrix.customer_ids:
+        for product_id in matrix.product_ids:
+            assert matrix.score(customer_id, product_id) == rebuilt.score(customer_id, product_id)
+
+
+def test_float16_storage_stays_within_rounding():
+    full = SuitabilityMatrix(CUSTOMERS, BONDS)
+    half = SuitabilityMatrix(CUSTOMERS, BONDS, dtype=np.float16)
+    assert half.scores.dtype == np.float16
+    assert np.max(np.abs(full.scores - half.scores.astype(np.float32))) < 0.1
+
+
+if __name__ == '__main__':
+    print("Testing suitability matrix:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
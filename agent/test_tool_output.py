@@ -0,0 +1,57 @@
+"""Test the tool output encoder: compact tables, projection and round-tripping"""
+import json
+import sys
+sys.path.insert(0, '.')
+
+from utils.tool_output import encode_tool_output, decode_tool_output
+
+BONDS = [
+    {"productId": "BOND-CORP-2025-A", "name": "Premium Corporate Bond Series A", "yield": "5.25%", "description": "Long prose"},
+    {"productId": "BOND-GOV-2025-Y", "name": "UK Government Bond Series Y", "yield": "4.10%"},
+]
+
+
+def test_indented_mode_is_the_original_format():
+    assert encode_tool_output(BONDS, mode='indented') == json.dumps(BONDS, indent=2)
+
+
+def test_compact_mode_tabulates_record_lists():
+    encoded = json.loads(encode_tool_output(BONDS, mode='compact'))
+    assert encoded['columns'] == ["productId", "name", "yield", "description"]
+    assert encoded['rows'][1] == ["BOND-GOV-2025-Y", "UK Government Bond Series Y", "4.10%", None]
+
+
+def test_compact_mode_is_smaller_and_round_trips():
+    compact = encode_tool_output({'bonds': BONDS, 'count': 2}, mode='compact')
+    assert len(compact) < len(encode_tool_output({'bonds': BONDS, 'count': 2}, mode='indented'))
+    assert decode_tool_output(compact) == {'bonds': BONDS, 'count': 2}
+
+
+def test_single_records_and_scalars_stay_as_json():
+    assert decode_tool_output(encode_tool_output(BONDS[:1], mode='compact')) == BONDS[:1]
+    assert encode_tool_output({'customerId': 'CUST-001'}, mode='compact') == '{"customerId":"CUST-001"}'
+
+
+def test_field_projection():
+    top = decode_tool_output(encode_tool_output(BONDS, fields=['productId'], mode='compact'))
+    assert top == [{"productId": "BOND-CORP-2025-A"}, {"productId": "BOND-GOV-2025-Y"}]
+    nested = decode_tool_output(encode_tool_output(
+        {'customer': {'customerId': 'CUST-001'}, 'availableBonds': BONDS},
+        nested_fields={'availableBonds': ['productId', 'yield']}, mode='compact'))
+    assert nested['customer'] == {'customerId': 'CUST-001'}
+    assert nested['availableBonds'][0] == {"productId": "BOND-CORP-2025-A", "yield": "5.25%"}
+
+
+def test_projection_is_ignored_in_indented_mode():
+    assert json.loads(encode_tool_output(BONDS, fields=['productId'], mode='indented')) == BONDS
+
+
+if __name__ == '__main__':
+    print("Testing tool output encoder:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,162 @@
+"""Test the shared Lambda transport: events, timeouts and the catalog read-through cache"""
+import asyncio
+import io
+import json
+import sys
+import time
+sys.path.insert(0, '.')
+
+from agents import tool_transport
+from agents.tool_cache import ToolResultCache
+from agents.tool_transport import LambdaTransport
+
+
+class FakeClient:
+    def __init__(self, status=200, body=None, delay=0.0, error=None):
+        self.status = status
+        self.body = body if body is not None else {'requestId': 'req-1', 'customers': []}
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def invoke(self, FunctionName, InvocationType, Payload):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        payload = {'statusCode': self.status, 'body': json.dumps(self.body)}
+        return {'Payload': io.BytesIO(json.dumps(payload).encode()), 'ResponseMetadata': {'RequestId': 'inv-1'}}
+
+
+def invoke(client, timeout=1.0, arn='arn:fake'):
+    events = []
+    tool_transport.log_event = events.append
+    transport = LambdaTransport(client, max_concurrency=2, timeout_seconds=timeout)
+    result = asyncio.run(transport.invoke_async(arn, {'x': 1}, agent_name='customer_agent', tool_name='list_customers'))
+    transport.shutdown()
+    return result, events
+
+
+def test_success_returns_body_and_logs():
+    result, events = invoke(FakeClient())
+    assert result == {'requestId': 'req-1', 'customers': []}
+    assert events[0]['eventType'] == 'agent.tool.success'
+    assert events[0]['lambdaInvokeRequestId'] == 'inv-1'
+
+
+def test_sync_and_async_paths_log_the_same_event():
+    events = []
+    tool_transport.log_event = events.append
+    transport = LambdaTransport(FakeClient())
+    assert transport.invoke('arn:fake', tool_name='list_customers') == {'requestId': 'req-1', 'customers': []}
+    _, async_events = invoke(FakeClient())
+    assert set(events[0]) == set(async_events[0])
+    transport.shutdown()
+
+
+def test_error_status_logs_failure():
+    result, events = invoke(FakeClient(status=404, body={'message': 'Customer not found'}))
+    assert result['error'] == 'Customer not found'
+    assert result['statusCode'] == 404
+    assert events[0]['eventType'] == 'agent.tool.failure'
+
+
+def test_exception_logs_failure():
+    result, events = invoke(FakeClient(error=RuntimeError('boom')))
+    assert result == {'error': 'Lambda invocation failed: boom'}
+    assert events[0]['eventType'] == 'agent.tool.failure'
+
+
+def test_slow_lambda_times_out():
+    result, events = invoke(FakeClient(delay=0.3), timeout=0.05)
+    assert 'timed out' in result['error']
+    assert events[0]['eventType'] == 'agent.tool.timeout'
+
+
+def test_missing_arn_is_an_error():
+    result, events = invoke(FakeClient(), arn='')
+    assert result == {'error': 'Lambda function ARN not configured'}
+    assert events == []
+
+
+def cached_transport(client, data_version='v1'):
+    cache = ToolResultCache({'list_customers': (60, 4)}, aliases={'list_all_customers': 'list_customers'}, data_version=data_version)
+    return LambdaTransport(client, cache=cache)
+
+
+def test_cache_hits_skip_the_lambda():
+    events = []
+    tool_transport.log_event = events.append
+    client = FakeClient()
+    transport = cached_transport(client)
+    first = transport.invoke('arn:fake', tool_name='list_customers')
+    second = asyncio.run(transport.invoke_async('arn:fake', tool_name='list_all_customers'))
+    assert first == second
+    assert client.calls == 1
+    assert [e['cacheHit'] for e in events] == [False, True]
+    transport.shutdown()
+
+
+def test_uncached_tools_and_errors_always_reach_the_lambda():
+    client = FakeClient(status=500, body={'error': 'S3 unavailable'})
+    transport = cached_transport(client)
+    transport.invoke('arn:fake', tool_name='list_customers')
+    transport.invoke('arn:fake', tool_name='list_customers')
+    transport.invoke('arn:fake', {'customer_id': 'CUST-001'}, tool_name='get_customer_profile')
+    assert client.calls == 3
+    transport.shutdown()
+
+
+def test_data_version_change_invalidates_everything():
+    client = FakeClient()
+    transport = cached_transport(client)
+    transport.invoke('arn:fake', tool_name='list_customers')
+    assert transport.cache.set_data_version('v1') is False
+    transport.invoke('arn:fake', tool_name='list_customers')
+    assert transport.cache.set_data_version('v2') is True
+    transport.invoke('arn:fake', tool_name='list_customers')
+    assert client.calls == 2
+    transport.cache.invalidate('list_customers')
+    transport.invoke('arn:fake', tool_name='list_customers')
+    assert client.calls == 3
+    transport.shutdown()
+
+
+def test_list_bonds_reports_the_catalog_version():
+    client = FakeClient()
+    cache = ToolResultCache({'list_customers': (60, 4), 'list_available_bonds': (60, 4)})
+    transport = LambdaTransport(client, cache=cache)
+    transport.invoke('arn:fake', tool_name='list_customers')
+    client.body = {'bonds': [], 'catalogVersion': 'abc'}
+    transport.invoke('arn:bonds', tool_name='list_available_bonds')
+    # A new catalog drops the customer list cached under the old version
+    assert cache.data_version == 'abc'
+    transport.invoke('arn:fake', tool_name='list_customers')
+    transport.invoke('arn:bonds', tool_name='list_available_bonds')
+    assert client.calls == 3
+    transport.shutdown()
+
+
+def test_partial_bond_listings_are_not_cached():
+    client = FakeClient(body={'bonds': [], 'catalogVersion': 'abc', 'unreadCount': 3, 'unreadFiles': ['a.json']})
+    cache = ToolResultCache({'list_available_bonds': (60, 4)})
+    transport = LambdaTransport(client, cache=cache)
+    transport.invoke('arn:bonds', tool_name='list_available_bonds')
+    # The listing's catalog version still counts, but the next call asks again for the whole page
+    assert cache.data_version == 'abc'
+    client.body = {'bonds': [], 'catalogVersion': 'abc'}
+    transport.invoke('arn:bonds', tool_name='list_available_bonds')
+    transport.invoke('arn:bonds', tool_name='list_available_bonds')
+    assert client.calls == 2
+    transport.shutdown()
+
+
+if __name__ == '__main__':
+    print("Testing tool transport:")
+    print("=" * 50)
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✓ {name}")
+    print("=" * 50)
+    print("All tests completed!")
@@ -0,0 +1,110 @@
+"""Bond catalog - resolves a product ID, file name, product name or alias to the bond
+
+Every bond is indexed under its productId, its file slug, its full name and the forms
+the old filename normalisation produced ("government-bond-y" for "UK Government Bond
+Series Y"), all normalised to lowercase hyphenated text, so those lookups are one dict
+probe. Anything else falls back to token matching ("corporate bond a", "premium corp"):
+a unique bond matching every token is returned, otherwise the nearest names are
+suggested.
+
+The Lambdas import this module from the data-access layer
+(lambda/layers/data-access/python/bond_catalog.py), which must stay an exact copy.
+"""
+import bisect
+import difflib
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SUGGESTIONS = 3
+# Query tokens at least this long also match catalog tokens they prefix ("corp" -> "corporate")
+MIN_PREFIX = 3
+# Words that say nothing about which bond is meant
+STOPWORDS = frozenset({'the', 'uk', 'series', 'of', 'json'})
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text: str) -> str:
+    """Lowercase, hyphen-separated alphanumerics: 'UK Government Bond Series Y' -> 'uk-government-bond-series-y'."""
+    text = str(text).strip().lower()
+    if text.endswith('.json'):
+        text = text[:-len('.json')]
+    return _NON_ALNUM.sub('-', text).strip('-')
+
+
+def _tokens(text: str) -> List[str]:
+    return [token for token in normalize(text).split('-') if token]
+
+
+def legacy_slug(name: str) -> str:
+    """The file name get_product_details used to derive from a product name."""
+    return normalize(name.lower().replace(' ', '-').replace('uk-', '').replace('series-', ''))
+
+
+class BondCatalog:
+    """In-memory alias and token index over the bond documents."""
+
+    def __init__(self, entries: Iterable[Tuple[str, dict]]):
+        """``entries`` are (file name, bond document) pairs."""
+        self.bonds: List[dict] = []
+        self.names: List[str] = []
+        self.aliases: Dict[str, int] = {}
+        token_rows: Dict[str, Set[int]] = {}
+        for filename, bond in entries:
+            row = len(self.bonds)
+            self.bonds.append(bond)
+            name = str(bond.get('name') or bond.get('productId') or filename)
+            self.names.append(name)
+            keys = [bond.get('productId'), filename, bond.get('name')]
+            if bond.get('name'):
+                keys += [legacy_slug(bond['name']), ' '.join(t for t in _tokens(bond['name']) if t not in STOPWORDS)]
+            for key in keys:
+                if key:
+                    # First bond wins an alias two bonds share, as the first file did before
+                    self.aliases.setdefault(normalize(key), row)
+            for key in (bond.get('productId'), filename, bond.get('name')):
+                for token in _tokens(key or ''):
+                    token_rows.setdefault(token, set()).add(row)
+        self.token_rows = token_rows
+        self.vocabulary = sorted(token_rows)
+
+    def __len__(self) -> int:
+        return len(self.bonds)
+
+    def get(self, query: str) -> Optional[dict]:
+        """The bond ``query`` names exactly (ID, file, name or alias), else None."""
+        row = self.aliases.get(normalize(query))
+        return None if row is None else self.bonds[row]
+
+    def _token_matches(self, token: str) -> Set[int]:
+        rows = set(self.token_rows.get(token, ()))
+        if len(token) >= MIN_PREFIX:
+            start = bisect.bisect_left(self.vocabulary, token)
+            for candidate in self.vocabulary[start:]:
+                if not candidate.startswith(token):
+                    break
+                rows |= self.token_rows[candidate]
+        if not rows:
+            # A misspelt word ("goverment") counts as the closest catalog words
+            for candidate in difflib.get_close_matches(token, self.vocabulary, n=3, cutoff=0.8):
+                rows |= self.token_rows[candidate]
+        return rows
+
+    def resolve(self, query: str) -> Tuple[Optional[dict], List[str]]:
+        """(bond, []) when ``query`` identifies one bond, else (None, the nearest product names)."""
+        bond = self.get(query)
+        if bond is not None:
+            return bond, []
+        tokens = [t for t in dict.fromkeys(_tokens(query)) if t not in STOPWORDS] or _tokens(query)
+        scores: Dict[int, int] = {}
+        for token in tokens:
+            for row in self._token_matches(token):
+                scores[row] = scores.get(row, 0) + 1
+        complete = [row for row, score in scores.items() if score == len(tokens)]
+        if tokens and len(complete) == 1:
+            return self.bonds[complete[0]], []
+        ranked = sorted(scores, key=lambda row: (-scores[row], self.names[row]))
+        if not ranked:
+            ranked = [self.names.index(name) for name in
+                      difflib.get_close_matches(str(query), self.names, n=SUGGESTIONS, cutoff=0.4)]
+        return None, [self.names[row] for row in ranked[:SUGGESTIONS]]
@@ -0,0 +1,148 @@
+"""Bond catalog manifest - every bond file compiled into one document at publish time
+
+``catalog/bond-catalog.json`` sits beside ``bonds/`` and holds the catalog summary of
+every bond, the full documents keyed by productId, the file each came from with its S3
+ETag (the MD5 of its bytes), the sellability ranking and a hash of the bond files'
+content, so readers load the whole catalog with one read instead of reading every file.
+lambda/list-bonds and lambda/get-product read the copy deployed with cdk/assets through
+the data-access layer's bond_manifest.py (keep in step with it) and trust it while the
+bonds/ listing shows the same ETags; the local
+tools read the one in local_data while no bond file is newer. Both fall back to the bond
+files otherwise. deploy-all and dev-local rebuild it; by hand, from the agent directory:
+
+    python -m utils.bond_manifest            # cdk/assets and local_data
+    python -m utils.bond_manifest --check    # exit 1 if a manifest is out of date
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from utils.pagination import project_records, sort_position
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = os.path.join('catalog', 'bond-catalog.json')
+BONDS_DIR = 'bonds'
+BOND_SUMMARY_FIELDS = ('productId', 'name', 'type', 'yield', 'maturity', 'minInvestment', 'creditRating')
+SELLABILITY_FIELD = 'sellabilityRank'
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIRS = (os.path.join(REPO_ROOT, 'cdk', 'assets'), os.path.join(REPO_ROOT, 'agent', 'local_data'))
+
+
+def bond_files(bonds_dir: str) -> List[str]:
+    """The bond file names in ``bonds_dir``, sorted."""
+    if not os.path.isdir(bonds_dir):
+        return []
+    return sorted(name for name in os.listdir(bonds_dir) if name.endswith('.json'))
+
+
+def build_manifest(data_dir: str) -> dict:
+    """The manifest of ``data_dir``/bonds. Raises ValueError on unreadable files or duplicate productIds."""
+    bonds_dir = os.path.join(data_dir, BONDS_DIR)
+    digest = hashlib.sha256()
+    files: Dict[str, str] = {}
+    etags: Dict[str, str] = {}
+    bonds: Dict[str, dict] = {}
+    for name in bond_files(bonds_dir):
+        with open(os.path.join(bonds_dir, name), 'rb') as f:
+            raw = f.read()
+        digest.update(name.encode('utf-8') + b'\0' + raw + b'\0')
+        try:
+            bond = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from e
+        product_id = str(bond.get('productId') or name[:-len('.json')])
+        if product_id in bonds:
+            other = next(f for f, p in files.items() if p == product_id)
+            raise ValueError(f"{name}: productId {product_id} is also in {other}")
+        files[name] = product_id
+        etags[name] = '"' + hashlib.md5(raw).hexdigest() + '"'
+        bonds[product_id] = bond
+
+    ordered = sorted(bonds)
+    return {
+        'version': MANIFEST_VERSION,
+        'contentHash': digest.hexdigest(),
+        'count': len(bonds),
+        'files': files,
+        'etags': etags,
+        'summaries': project_records((bonds[p] for p in ordered), 'productId', BOND_SUMMARY_FIELDS),
+        'bonds': bonds,
+        # The order list-bonds pages by sellabilityRank: ranked bonds first, then by productId
+        'sellability': sorted(ordered, key=lambda p: sort_position(bonds[p], 'productId', SELLABILITY_FIELD)),
+    }
+
+
+def load_manifest(path: str) -> Optional[dict]:
+    """The manifest at ``path``, or None if it is missing or from another version."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) and manifest.get('version') == MANIFEST_VERSION else None
+
+
+def write_manifest(data_dir: str) -> Tuple[str, bool]:
+    """Rebuild ``data_dir``'s manifest. Returns its path and whether the content changed.
+
+    An unchanged manifest is only touched, so its mtime again postdates the bond files.
+    """
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    manifest = build_manifest(data_dir)
+    current = load_manifest(path)
+    if current is not None and current.get('contentHash') == manifest['contentHash']:
+        os.utime(path)
+        return path, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as out:
+        json.dump(manifest, out, separators=(',', ':'), ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+    return path, True
+
+
+def is_stale(manifest: dict, manifest_path: str, bonds_dir: str) -> bool:
+    """True when a bond file was added or removed, or changed after the manifest was written.
+
+    Costs a directory listing and a stat per file; no bond file is read.
+    """
+    names = bond_files(bonds_dir)
+    if set(names) != set(manifest.get('files', {})):
+        return True
+    try:
+        built = os.stat(manifest_path).st_mtime_ns
+        return any(os.stat(os.path.join(bonds_dir, name)).st_mtime_ns > built for name in names)
+    except OSError:
+        return True
+
+
+def manifest_entries(manifest: dict) -> List[Tuple[str, dict]]:
+    """(filename, bond) for every bond, in file name order, as the per-file readers give them."""
+    return [(name, manifest['bonds'][product_id]) for name, product_id in sorted(manifest['files'].items())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('data_dirs', nargs='*', help='Directories holding bonds/ (default: cdk/assets and local_data)')
+    parser.add_argument('--check', action='store_true', help='Report out-of-date manifests without writing')
+    args = parser.parse_args()
+
+    stale = []
+    for data_dir in args.data_dirs or DATA_DIRS:
+        path = os.path.join(data_dir, MANIFEST_FILE)
+        if args.check:
+            current = load_manifest(path)
+            if current is None or current.get('contentHash') != build_manifest(data_dir)['contentHash']:
+                stale.append(path)
+                print(f"{os.path.relpath(path)}: out of date")
+            continue
+        path, changed = write_manifest(data_dir)
+        print(f"{os.path.relpath(path)}: {'rebuilt' if changed else 'up to date'}")
+    return 1 if stale else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Deterministic bond suitability scoring - ranks bonds for a customer with a per-factor breakdown"""
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils.customer_matching import SECTOR_ALIASES
+
+# Bond riskRating (1-10) band that suits each riskTolerance
+RISK_BANDS = {'low': (1, 3), 'medium': (3, 6), 'high': (5, 10)}
+# Lowest bond liquidityRating (1-5) that meets each liquidityNeeds
+LIQUIDITY_REQUIRED = {'high': 4, 'medium': 3, 'low': 1}
+
+FACTOR_WEIGHTS = {
+    'risk': 0.30,
+    'sector': 0.20,
+    'horizon': 0.15,
+    'affordability': 0.15,
+    'liquidity': 0.10,
+    'esg': 0.10,
+}
+# Customer fields the scores depend on, echoed back with the recommendations
+CUSTOMER_SCORING_FIELDS = (
+    'customerId', 'name', 'riskTolerance', 'investmentHorizon', 'portfolioValue', 'annualIncome',
+    'investmentGoals', 'preferredSectors', 'liquidityNeeds', 'interestedInBonds',
+)
+
+_YEARS = re.compile(r'(\d+(?:\.\d+)?)')
+NEUTRAL = 0.5
+
+
+def parse_years(value) -> Optional[float]:
+    """Years from a maturity such as "5 years" (or a bare number)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _YEARS.search(str(value or ''))
+    return float(match.group(1)) if match else None
+
+
+def _number(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _lower_set(values) -> set:
+    return {str(v).lower() for v in values or []}
+
+
+def score_risk(customer: dict, bond: dict) -> Tuple[float, str]:
+    tolerance = str(customer.get('riskTolerance') or '').lower()
+    rating = _number(bond.get('riskRating'))
+    band = RISK_BANDS.get(tolerance)
+    if band is None or rating is None:
+        return NEUTRAL, 'risk tolerance or rating unknown'
+    low, high = band
+    if low <= rating <= high:
+        return 1.0, f"riskRating {rating:g} within {tolerance} band {low}-{high}"
+    distance = low - rating if rating < low else rating - high
+    return max(0.0, 1 - distance / 3), f"riskRating {rating:g} outside {tolerance} band {low}-{high}"
+
+
+def score_affordability(customer: dict, bond: dict) -> Tuple[float, str]:
+    minimum = _number(bond.get('minInvestment'))
+    portfolio = _number(customer.get('portfolioValue'))
+    if not minimum or not portfolio:
+        return NEUTRAL, 'minimum investment or portfolio value unknown'
+    share = minimum / portfolio
+    score = 1.0 if share <= 0.1 else max(0.0, 1 - (share - 0.1) / 0.9)
+    return score, f"minimum £{minimum:,.0f} is {share:.0%} of £{portfolio:,.0f} portfolio"
+
+
+def score_sector(customer: dict, bond: dict) -> Tuple[float, str]:
+    preferred = _lower_set(customer.get('preferredSectors'))
+    if not preferred:
+        return NEUTRAL, 'no sector preference'
+    exposure = _lower_set(bond.get('sectorExposure'))
+    bond_type = str(bond.get('type') or '').lower()
+    exposure.add(bond_type.replace('_bond', '').replace('_', ' '))
+    matches = sorted(
+        sector for sector in preferred
+        if exposure & SECTOR_ALIASES.get(sector, {sector})
+    )
+    if not matches:
+        return 0.0, 'no preferred sector exposure'
+    return min(1.0, len(matches) / min(2, len(preferred))), f"matches preferred sectors: {', '.join(matches)}"
+
+
+def score_liquidity(customer: dict, bond: dict) -> Tuple[float, str]:
+    needs = str(customer.get('liquidityNeeds') or '').lower()
+    rating = _number(bond.get('liquidityRating'))
+    required = LIQUIDITY_REQUIRED.get(needs)
+    if required is None or rating is None:
+        return NEUTRAL, 'liquidity needs or rating unknown'
+    if rating >= required:
+        return 1.0, f"liquidityRating {rating:g} meets {needs} liquidity needs"
+    return max(0.0, 1 - (required - rating) / 3), f"liquidityRating {rating:g} below {required} for {needs} liquidity needs"
+
+
+def score_horizon(customer: dict, bond: dict) -> Tuple[float, str]:
+    horizon = _number(customer.get('investmentHorizon'))
+    maturity = parse_years(bond.get('maturity'))
+    if not horizon or maturity is None:
+        return NEUTRAL, 'investment horizon or maturity unknown'
+    if maturity <= horizon:
+        return 1.0, f"{maturity:g}-year maturity within {horizon:g}-year horizon"
+    return max(0.0, 1 - (maturity - horizon) / horizon), f"{maturity:g}-year maturity exceeds {horizon:g}-year horizon"
+
+
+def score_esg(customer: dict, bond: dict) -> Tuple[float, str]:
+    esg = _number(bond.get('esgScore'))
+    if esg is None:
+        return NEUTRAL, 'ESG score unknown'
+    return max(0.0, min(1.0, esg / 100)), f"esgScore {esg:g}/100"
+
+
+FACTORS = {
+    'risk': score_risk,
+    'sector': score_sector,
+    'horizon': score_horizon,
+    'affordability': score_affordability,
+    'liquidity': score_liquidity,
+    'esg': score_esg,
+}
+
+
+def ineligibility_reason(customer: dict, bond: dict) -> Optional[str]:
+    """Hard constraints: a bond the customer cannot buy is never recommended."""
+    minimum = _number(bond.get('minInvestment'))
+    portfolio = _number(customer.get('portfolioValue'))
+    if minimum is not None and portfolio is not None and minimum > portfolio:
+        return f"minimum investment £{minimum:,.0f} exceeds portfolio value £{portfolio:,.0f}"
+    return None
+
+
+def score_bond(customer: dict, bond: dict) -> dict:
+    """Weighted score (0-100) of one bond for one customer, with each factor's contribution."""
+    factors = {}
+    total = 0.0
+    for name, scorer in FACTORS.items():
+        score, detail = scorer(customer, bond)
+        weight = FACTOR_WEIGHTS[name]
+        total += weight * score
+        factors[name] = {'score': round(score, 3), 'weight': weight, 'detail': detail}
+    return {
+        'productId': bond.get('productId'),
+        'name': bond.get('name'),
+        'score': round(total * 100, 1),
+        'factors': factors,
+    }
+
+
+def rank_bonds(customer: dict, bonds: List[dict], top_k: int = 3) -> Dict[str, list]:
+    """Top ``top_k`` eligible bonds by score (ties broken by productId), plus the excluded ones."""
+    ranked, excluded = [], []
+    for bond in bonds:
+        reason = ineligibility_reason(customer, bond)
+        if reason:
+            excluded.append({'productId': bond.get('productId'), 'name': bond.get('name'), 'reason': reason})
+        else:
+            ranked.append(score_bond(customer, bond))
+    ranked.sort(key=lambda item: (-item['score'], str(item['productId'])))
+    for rank, item in enumerate(ranked, start=1):
+        item['rank'] = rank
+    return {'recommendations': ranked[:max(0, top_k)], 'excluded': excluded}
+
+
+def build_recommendations(customer: dict, bonds: List[dict], top_k: int = 3) -> dict:
+    """The recommendation tool result: the customer's scoring inputs and the ranked bonds."""
+    ranking = rank_bonds(customer, bonds, top_k)
+    return {
+        'customer': {field: customer[field] for field in CUSTOMER_SCORING_FIELDS if field in customer},
+        'recommendations': ranking['recommendations'],
+        'excluded': ranking['excluded'],
+        'recommendationContext': {
+            'timestamp': time.time(),
+            'customerId': customer.get('customerId'),
+            'bondCount': len(bonds),
+            'factorWeights': FACTOR_WEIGHTS,
+        },
+    }
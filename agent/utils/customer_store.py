@@ -0,0 +1,154 @@
+"""Customer store - newline-delimited customer records with a sidecar offset index
+
+``bank-x-customers.ndjson`` holds one compact JSON record per line, and
+``bank-x-customers.ndjson.idx`` maps each customerId to the byte offset and length
+of its line. Reads go through ``mmap``, so a profile lookup parses only its own
+record and listing streams records one line at a time. Convert the JSON array with:
+
+    python -m utils.customer_store local_data/customers/bank-x-customers.json
+"""
+import hashlib
+import json
+import mmap
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.pagination import DEFAULT_PAGE_SIZE, paginate, paginate_ids, project_records, sorted_id_positions
+
+STORE_SUFFIX = '.ndjson'
+INDEX_SUFFIX = '.ndjson.idx'
+INDEX_VERSION = 1
+ID_FIELD = 'customerId'
+
+
+def store_paths(json_path: str) -> Tuple[str, str]:
+    """The (records, index) paths of the store converted from ``json_path``."""
+    base = json_path[:-len('.json')] if json_path.endswith('.json') else json_path
+    return base + STORE_SUFFIX, base + INDEX_SUFFIX
+
+
+def convert(json_path: str) -> Tuple[str, str]:
+    """Write the NDJSON store and offset index beside a JSON array of customers.
+
+    Both files are written to temporary names and renamed into place, so readers never
+    see a store without its index. The index records the array's S3 ETag (the MD5 of its
+    bytes, as for a single-part upload), so the get-customer Lambda can tell whether the
+    deployed database has changed since. Returns the (records, index) paths.
+    """
+    store_path, index_path = store_paths(json_path)
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    customers = json.loads(raw)
+    source_etag = '"' + hashlib.md5(raw).hexdigest() + '"'
+
+    offsets: Dict[str, List[int]] = {}
+    with open(store_path + '.tmp', 'wb') as out:
+        for customer in customers:
+            line = json.dumps(customer, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            customer_id = customer.get(ID_FIELD)
+            if customer_id is not None:
+                offsets[str(customer_id)] = [out.tell(), len(line)]
+            out.write(line + b'\n')
+    with open(index_path + '.tmp', 'w', encoding='utf-8') as out:
+        json.dump({'version': INDEX_VERSION, 'count': len(customers), 'sourceEtag': source_etag, 'offsets': offsets},
+                  out, separators=(',', ':'))
+    os.replace(store_path + '.tmp', store_path)
+    os.replace(index_path + '.tmp', index_path)
+    return store_path, index_path
+
+
+def is_stale(json_path: str) -> bool:
+    """True when the store is missing or older than the JSON array it was converted from."""
+    store_path, index_path = store_paths(json_path)
+    if not (os.path.exists(store_path) and os.path.exists(index_path)):
+        return True
+    if not os.path.exists(json_path):
+        return False
+    return os.path.getmtime(json_path) > min(os.path.getmtime(store_path), os.path.getmtime(index_path))
+
+
+class CustomerStore:
+    """Read-only view of an NDJSON customer store, memory-mapped.
+
+    ``get`` is a dict lookup plus one slice of the map; iteration parses one line at a
+    time. Only the offset index is held in memory.
+    """
+
+    def __init__(self, store_path: str, index_path: str):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported customer store index version: {index.get('version')}")
+        self.offsets: Dict[str, List[int]] = index['offsets']
+        self.count: int = index['count']
+        self._id_positions: Optional[list] = None
+        self._file = open(store_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    @classmethod
+    def from_json(cls, json_path: str) -> 'CustomerStore':
+        """Open the store beside ``json_path``, converting the array first if the store is missing or stale."""
+        if is_stale(json_path):
+            convert(json_path)
+        return cls(*store_paths(json_path))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, customer_id: str) -> bool:
+        return customer_id in self.offsets
+
+    def get(self, customer_id: str) -> Optional[dict]:
+        """The customer's record, or None if the ID is not in the index."""
+        location = self.offsets.get(customer_id)
+        if location is None:
+            return None
+        offset, length = location
+        return json.loads(self._map[offset:offset + length])
+
+    def ids(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Every record in file order, parsed one line at a time."""
+        start, size = 0, len(self._map)
+        while start < size:
+            end = self._map.find(b'\n', start)
+            if end < 0:
+                end = size
+            if end > start:
+                yield json.loads(self._map[start:end])
+            start = end + 1
+
+    def page(self, fields=None, sort_by: Optional[str] = None, descending: bool = False,
+             limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """``pagination.paginate`` over the store.
+
+        Pages in customerId order are found by bisecting the sorted IDs, so only the
+        records on the page are read; any other sort streams every record once.
+        """
+        if (sort_by or ID_FIELD) != ID_FIELD:
+            return paginate(self, ID_FIELD, fields, sort_by=sort_by, descending=descending, limit=limit, cursor=cursor)
+        if self._id_positions is None:
+            self._id_positions = sorted_id_positions(self.offsets, ID_FIELD)
+        ids, next_cursor = paginate_ids(self._id_positions, ID_FIELD, descending=descending, limit=limit, cursor=cursor)
+        return project_records((self.get(customer_id) for customer_id in ids), ID_FIELD, fields), next_cursor
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        records, index = convert(path)
+        print(f"{path} -> {records}, {index}")
@@ -0,0 +1,256 @@
+"""Token-budgeted compaction of conversation history for the coordinator prompt"""
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.id_sanitizer import sanitize_text_and_collect_metadata
+
+_BOND_PATTERN = re.compile(r"\bBOND-[A-Z0-9]+(?:-[A-Z0-9]+)*\b")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# Entity kinds carried forward from summarised turns, in display order
+ENTITY_LABELS = (
+    ("customerIds", "customers"),
+    ("bondIds", "bonds"),
+    ("previewIds", "previews"),
+    ("requestIds", "requests"),
+)
+
+Summarizer = Callable[[str, List[Dict[str, str]]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def collect_entities(text: str) -> Dict[str, List[str]]:
+    """Collect the IDs the tools depend on: customer, bond product, preview and request IDs."""
+    _, metadata = sanitize_text_and_collect_metadata(text)
+    metadata["bondIds"] = list(dict.fromkeys(_BOND_PATTERN.findall(text)))
+    return metadata
+
+
+def _merge_entities(target: Dict[str, List[str]], source: Dict[str, List[str]]):
+    for key, _ in ENTITY_LABELS:
+        values = target.setdefault(key, [])
+        for value in source.get(key, []):
+            if value not in values:
+                values.append(value)
+
+
+def _clip(text: str, max_chars: int) -> str:
+    """Clip text to max_chars keeping its head and tail."""
+    if len(text) <= max_chars:
+        return text
+    marker = " ... [truncated] ... "
+    keep = max(0, max_chars - len(marker))
+    head = keep * 2 // 3
+    return text[:head] + marker + text[len(text) - (keep - head):]
+
+
+def summarize_message(message: Dict[str, str], max_chars: int = 160) -> str:
+    """Extractive one-line summary: the first sentence of the message, clipped."""
+    content = " ".join(message["content"].split())
+    first = _SENTENCE_END.split(content, maxsplit=1)[0]
+    if len(first) > max_chars:
+        first = first[:max_chars - 3].rstrip() + "..."
+    return f"- {message['role'].capitalize()}: {first}"
+
+
+class HistoryCompactor:
+    """Render conversation history within a token budget.
+
+    The last ``keep_last_turns`` turns (a user message plus the replies that follow it)
+    are kept verbatim; everything older is folded into a summary. Summaries are cached
+    under a hash of the history prefix they cover, so each new turn only summarises the
+    messages added since the previous call. IDs referenced anywhere in the summarised
+    prefix are always listed so tools can still be called with them.
+
+    ``summarizer`` may be supplied to replace the default extractive summary (for example
+    with a model call); it receives the previous summary and the newly summarised
+    messages and returns the new summary text.
+
+    ``retained_token_budget`` (default four times ``token_budget``) bounds the messages a
+    session agent keeps between turns, in which each tool use and tool result counts at
+    most ``tool_block_chars`` characters.
+    """
+
+    def __init__(self, token_budget: int = 2000, keep_last_turns: int = 3, summary_line_chars: int = 160,
+                 cache_size: int = 256, summarizer: Optional[Summarizer] = None,
+                 retained_token_budget: Optional[int] = None, tool_block_chars: int = 800):
+        self.token_budget = token_budget
+        self.retained_token_budget = retained_token_budget or 4 * token_budget
+        self.tool_block_chars = tool_block_chars
+        self.keep_last_turns = max(1, keep_last_turns)
+        self.summary_line_chars = summary_line_chars
+        self.summarizer = summarizer
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[str, Dict[str, List[str]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "summarizedMessages": 0}
+
+    def build_context(self, history: List[dict]) -> str:
+        """Return the "Previous conversation:" block for a prompt, or "" without history."""
+        messages = self._normalise(history)
+        if not messages:
+            return ""
+
+        turn_starts = self._turn_starts(messages)
+        keep_turns = min(self.keep_last_turns, len(turn_starts))
+
+        # Fold the oldest verbatim turns into the summary until the rest fits the budget
+        while True:
+            split = turn_starts[-keep_turns]
+            summary_block = self._summary_block(messages, split)
+            verbatim = messages[split:]
+            remaining = self.token_budget - estimate_tokens(summary_block)
+            if keep_turns <= 1 or estimate_tokens(self._render_verbatim(verbatim)) <= remaining:
+                break
+            keep_turns -= 1
+
+        # A single oversized turn is clipped rather than dropped
+        verbatim_text = self._render_verbatim(verbatim, remaining)
+
+        lines = [block for block in (summary_block, verbatim_text) if block]
+        return "Previous conversation:\n" + "\n".join(lines) + "\n\n"
+
+    @classmethod
+    def count_turns(cls, history: List[dict]) -> int:
+        """The number of user turns in a client's conversation history."""
+        return sum(1 for msg in cls._normalise(history) if msg["role"] == "user")
+
+    def retained_tokens(self, messages: List[dict]) -> int:
+        """Token estimate of an agent's retained ``messages`` (Converse format).
+
+        Text blocks count in full. Tool uses and results count at most ``tool_block_chars``
+        each, so a turn with a large tool result does not exhaust the budget on its own.
+        """
+        chars = 0
+        for msg in messages:
+            for block in msg.get("content", []):
+                if "text" in block:
+                    chars += len(block["text"])
+                else:
+                    chars += min(len(json.dumps(block, default=str)), self.tool_block_chars)
+        return math.ceil(chars / 4)
+
+    def fits(self, messages: List[dict]) -> bool:
+        """Whether an agent's retained ``messages`` fit the retained token budget."""
+        return self.retained_tokens(messages) <= self.retained_token_budget
+
+    def trim_messages(self, messages: List[dict]) -> int:
+        """Drop the oldest whole turns of an agent's ``messages`` until they fit the budget.
+
+        A turn starts at a user message carrying text (tool results are user messages
+        too and stay with their tool use). The most recent turn is always kept, even
+        when it alone is over the budget. Returns the number of messages dropped.
+        """
+        dropped = 0
+        while not self.fits(messages):
+            starts = [i for i, msg in enumerate(messages) if msg.get("role") == "user"
+                      and any("text" in block for block in msg.get("content", []))]
+            cut = next((i for i in starts if i > 0), None)
+            if cut is None:
+                break
+            del messages[:cut]
+            dropped += cut
+        return dropped
+
+    @staticmethod
+    def _normalise(history: List[dict]) -> List[Dict[str, str]]:
+        messages = []
+        for msg in history or []:
+            if not isinstance(msg, dict):
+                continue
+            content = msg.get("content", "")
+            if not isinstance(content, str):
+                content = str(content)
+            messages.append({"role": msg.get("role", "unknown"), "content": content})
+        return messages
+
+    @staticmethod
+    def _turn_starts(messages: List[Dict[str, str]]) -> List[int]:
+        starts = [i for i, msg in enumerate(messages) if msg["role"] == "user"]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        return starts
+
+    @staticmethod
+    def _prefix_hashes(messages: List[Dict[str, str]], end: int) -> List[str]:
+        hashes = [""]
+        for msg in messages[:end]:
+            digest = hashlib.sha256()
+            digest.update(hashes[-1].encode("ascii"))
+            digest.update(msg["role"].encode("utf-8"))
+            digest.update(b"\x00")
+            digest.update(msg["content"].encode("utf-8"))
+            hashes.append(digest.hexdigest())
+        return hashes
+
+    def _summarize_prefix(self, messages: List[Dict[str, str]], end: int) -> Tuple[str, Dict[str, List[str]]]:
+        hashes = self._prefix_hashes(messages, end)
+
+        # Resume from the longest prefix summarised before
+        start, summary, entities = 0, "", {}
+        with self._lock:
+            for i in range(end, 0, -1):
+                cached = self._cache.get(hashes[i])
+                if cached is not None:
+                    self._cache.move_to_end(hashes[i])
+                    start, (summary, entities) = i, cached
+                    break
+            self.stats["hits" if start == end else "misses"] += 1
+
+        if start < end:
+            new_messages = messages[start:end]
+            entities = {key: list(values) for key, values in entities.items()}
+            for msg in new_messages:
+                _merge_entities(entities, collect_entities(msg["content"]))
+            if self.summarizer:
+                summary = self.summarizer(summary, new_messages)
+            else:
+                new_lines = "\n".join(summarize_message(m, self.summary_line_chars) for m in new_messages)
+                summary = f"{summary}\n{new_lines}" if summary else new_lines
+
+            with self._lock:
+                self._cache[hashes[end]] = (summary, entities)
+                self._cache.move_to_end(hashes[end])
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+                self.stats["summarizedMessages"] += len(new_messages)
+
+        return summary, entities
+
+    def _summary_block(self, messages: List[Dict[str, str]], end: int) -> str:
+        if end <= 0:
+            return ""
+        summary, entities = self._summarize_prefix(messages, end)
+
+        id_parts = [f"{label} {', '.join(entities[key])}" for key, label in ENTITY_LABELS if entities.get(key)]
+        id_line = f"Referenced IDs: {'; '.join(id_parts)}" if id_parts else ""
+
+        # The summary may use at most half the budget; drop its oldest lines first
+        allowance = self.token_budget // 2 - estimate_tokens(id_line)
+        summary_lines = summary.split("\n")
+        while len(summary_lines) > 1 and estimate_tokens("\n".join(summary_lines)) > allowance:
+            summary_lines.pop(0)
+        summary = "\n".join(summary_lines)
+        if estimate_tokens(summary) > allowance:
+            summary = _clip(summary, max(0, allowance * 4))
+
+        header = f"Summary of {end} earlier message(s):"
+        return "\n".join(part for part in (header, summary, id_line) if part)
+
+    @staticmethod
+    def _render_verbatim(messages: List[Dict[str, str]], token_allowance: Optional[int] = None) -> str:
+        lines = [f"{msg['role'].capitalize()}: {msg['content']}" for msg in messages]
+        text = "\n".join(lines)
+        if token_allowance is None or estimate_tokens(text) <= token_allowance:
+            return text
+        share = max(64, (token_allowance * 4) // len(lines))
+        return "\n".join(_clip(line, share) for line in lines)
@@ -0,0 +1,463 @@
+"""Local data sources - the files under local_data/, or an embedded SQLite copy of them
+
+The local tools read through ``local_data_source()``. With ``LOCAL_DATA_BACKEND=files``
+(the default) each JSON file is parsed once and again only after its mtime or size
+changes; a directory's files are re-checked at most every ``LOCAL_DATA_CHECK_SECONDS``,
+so repeated calls are nearly free and edits show up within that interval.
+With ``sqlite`` the files are loaded into an embedded database on first use, the files
+that changed are reloaded when any of them does, and calls are answered from its indexes.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.bond_catalog import BondCatalog
+from utils.bond_manifest import MANIFEST_FILE, MANIFEST_VERSION, is_stale as manifest_is_stale, manifest_entries
+from utils.customer_store import CustomerStore, is_stale
+from utils.pagination import DEFAULT_PAGE_SIZE, paginate, paginate_ids, project_records, sorted_id_positions
+
+LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+LOCAL_DATA_BACKEND = os.environ.get('LOCAL_DATA_BACKEND', 'files').lower()
+LOCAL_DB_PATH = os.environ.get('LOCAL_DB_PATH', '')
+# How often a directory's files are re-checked for changes (0 checks on every call)
+LOCAL_DATA_CHECK_SECONDS = float(os.environ.get('LOCAL_DATA_CHECK_SECONDS', '1'))
+
+CUSTOMERS_FILE = os.path.join('customers', 'bank-x-customers.json')
+BONDS_DIR = 'bonds'
+MARKET_DATA_DIR = 'market-data'
+# Bonds without a sellabilityRank rank last, as in the recommendation tools
+NO_SELLABILITY_RANK = 999
+
+
+def _read_json(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _json_files(directory: str) -> List[str]:
+    """The .json files in ``directory`` by name; empty if it does not exist."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def _sellability_rank(bond: dict) -> float:
+    rank = bond.get('sellabilityRank')
+    return float(rank) if isinstance(rank, (int, float)) and not isinstance(rank, bool) else NO_SELLABILITY_RANK
+
+
+class JsonFileCache:
+    """Parsed JSON files, each parsed once and again only after its mtime or size changes.
+
+    Documents are shared by every caller and must be treated as read-only. Tool calls
+    run concurrently, so each revalidate-and-swap holds the cache's lock.
+    """
+
+    def __init__(self, check_seconds: float = LOCAL_DATA_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self._files: Dict[str, Tuple[Tuple[int, int], object]] = {}
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
+        self._directories: Dict[str, Tuple[float, tuple, list]] = {}
+        self.parses = 0
+        self._lock = threading.RLock()
+
+    def load(self, path: str):
+        """The parsed file, or None if it does not exist."""
+        with self._lock:
+            return self._load(path)
+
+    def _load(self, path: str):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._files.pop(path, None)
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        document = _read_json(path)
+        self.parses += 1
+        self._files[path] = (stamp, document)
+        return document
+
+    def listing(self, directory: str) -> List[str]:
+        """The .json file names in ``directory``, listed again only when the directory's mtime changes."""
+        with self._lock:
+            return self._listing(directory)
+
+    def _listing(self, directory: str) -> List[str]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        cached = self._listings.get(directory)
+        if cached is None or cached[0] != mtime:
+            names = _json_files(directory)
+            if cached is not None:
+                for removed in set(cached[1]) - set(names):
+                    self._files.pop(os.path.join(directory, removed), None)
+            cached = self._listings[directory] = (mtime, names)
+        return cached[1]
+
+    def directory(self, directory: str) -> Tuple[tuple, List[Tuple[str, object]]]:
+        """(version, [(name, document)]) for the directory's .json files; the version changes with any file.
+
+        The files are re-checked at most every ``check_seconds``; in between the last answer is reused.
+        """
+        with self._lock:
+            return self._directory(directory)
+
+    def _directory(self, directory: str) -> Tuple[tuple, List[Tuple[str, object]]]:
+        now = time.monotonic()
+        cached = self._directories.get(directory)
+        if cached is not None and now - cached[0] < self.check_seconds:
+            return cached[1], cached[2]
+        entries, stamps = [], []
+        for name in self._listing(directory):
+            path = os.path.join(directory, name)
+            document = self._load(path)
+            if document is not None:
+                entries.append((name, document))
+                stamps.append((name, self._files[path][0]))
+        self._directories[directory] = (now, tuple(stamps), entries)
+        return tuple(stamps), entries
+
+
+class FileDataSource:
+    """Serves the JSON files through a ``JsonFileCache``; customers come from the NDJSON store.
+
+    Bonds come from the catalog manifest (utils.bond_manifest) while it is newer than
+    every bond file, else from the bond files themselves. Derived data (the bond catalog,
+    the most sellable bond) is rebuilt only when a bond file changes. Tool calls run
+    concurrently, so revalidating and swapping any of these holds a lock.
+    """
+
+    def __init__(self, data_dir: str = LOCAL_DATA_DIR, check_seconds: float = LOCAL_DATA_CHECK_SECONDS):
+        self.data_dir = data_dir
+        self.customers_path = os.path.join(data_dir, CUSTOMERS_FILE)
+        self.bonds_dir = os.path.join(data_dir, BONDS_DIR)
+        self.manifest_path = os.path.join(data_dir, MANIFEST_FILE)
+        self.files = JsonFileCache(check_seconds)
+        self._store: Optional[CustomerStore] = None
+        self._derived: Dict[str, Tuple[object, object]] = {}
+        self._manifest_checked = float('-inf')
+        self._current_manifest: Optional[dict] = None
+        self._lock = threading.RLock()
+        self._store_lock = threading.Lock()
+
+    def _customer_store(self) -> CustomerStore:
+        with self._store_lock:
+            if self._store is None or is_stale(self.customers_path):
+                # The replaced store is not closed here: another call may still be reading
+                # its map, which stays valid (the files are renamed into place) until the
+                # last reference to it goes
+                self._store = CustomerStore.from_json(self.customers_path)
+            return self._store
+
+    def customers_version(self):
+        """Changes whenever the customer data does."""
+        return os.stat(self.customers_path).st_mtime_ns
+
+    def customer(self, customer_id: str) -> Optional[dict]:
+        return self._customer_store().get(customer_id)
+
+    def customers(self) -> Iterator[dict]:
+        return iter(self._customer_store())
+
+    def customer_count(self) -> int:
+        return len(self._customer_store())
+
+    def customer_page(self, fields=None, sort_by: Optional[str] = None, descending: bool = False,
+                      limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        return self._customer_store().page(fields, sort_by=sort_by, descending=descending, limit=limit, cursor=cursor)
+
+    def manifest(self) -> Optional[dict]:
+        """The bond catalog manifest if it is current, re-checked at most every check interval."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._manifest_checked < self.files.check_seconds:
+                return self._current_manifest
+            manifest = self.files.load(self.manifest_path)
+            if manifest is not None and (manifest.get('version') != MANIFEST_VERSION or
+                                         manifest_is_stale(manifest, self.manifest_path, self.bonds_dir)):
+                manifest = None
+            self._manifest_checked, self._current_manifest = now, manifest
+            return manifest
+
+    def _from_bonds(self, name: str, build: Callable[[List[Tuple[str, dict]]], object]):
+        """``build(bond entries)``, cached until a bond file is added, removed or changed."""
+        with self._lock:
+            manifest = self.manifest()
+            if manifest is not None:
+                version, entries = manifest['contentHash'], None
+            else:
+                version, entries = self.files.directory(self.bonds_dir)
+            cached = self._derived.get(name)
+            if cached is None or cached[0] != version:
+                cached = self._derived[name] = (version, build(manifest_entries(manifest) if entries is None else entries))
+            return cached[1]
+
+    def bonds(self) -> List[dict]:
+        return list(self._from_bonds('bonds', lambda entries: [bond for _, bond in entries]))
+
+    def bond_catalog(self) -> BondCatalog:
+        return self._from_bonds('catalog', BondCatalog)
+
+    def bond_count(self) -> int:
+        manifest = self.manifest()
+        return manifest['count'] if manifest is not None else len(self.files.listing(self.bonds_dir))
+
+    def bond_file(self, filename: str) -> Optional[dict]:
+        manifest = self.manifest()
+        if manifest is not None:
+            product_id = manifest['files'].get(filename)
+            return manifest['bonds'][product_id] if product_id is not None else None
+        return self.files.load(os.path.join(self.bonds_dir, filename))
+
+    def most_sellable_bond(self) -> Optional[dict]:
+        manifest = self.manifest()
+        if manifest is not None:
+            ranking = manifest['sellability']
+            return manifest['bonds'][ranking[0]] if ranking else None
+        return self._from_bonds('most_sellable', lambda entries: min(
+            (bond for _, bond in entries), key=_sellability_rank, default=None))
+
+    def market_data(self, filename: str) -> Optional[dict]:
+        return self.files.load(os.path.join(self.data_dir, MARKET_DATA_DIR, filename))
+
+
+class SqliteDataSource:
+    """An embedded SQLite copy of local_data/, kept in step with the source files.
+
+    Customers are keyed by customerId (a clustered WITHOUT ROWID table); bonds are keyed
+    by file name with indexes on productId, type, creditRating and sellabilityRank. The
+    source files are re-checked at most every ``LOCAL_DATA_CHECK_SECONDS``, and only the
+    files whose size or mtime changed are reloaded.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS customers (customerId TEXT PRIMARY KEY, doc TEXT NOT NULL) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS bonds (
+            filename TEXT PRIMARY KEY, productId TEXT, type TEXT, creditRating TEXT,
+            sellabilityRank REAL NOT NULL, doc TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS bonds_product_id ON bonds (productId);
+        CREATE INDEX IF NOT EXISTS bonds_type ON bonds (type);
+        CREATE INDEX IF NOT EXISTS bonds_credit_rating ON bonds (creditRating);
+        CREATE INDEX IF NOT EXISTS bonds_sellability_rank ON bonds (sellabilityRank, filename);
+        CREATE TABLE IF NOT EXISTS market_data (filename TEXT PRIMARY KEY, doc TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL);
+    """
+
+    def __init__(self, data_dir: str = LOCAL_DATA_DIR, db_path: Optional[str] = None,
+                 check_seconds: float = LOCAL_DATA_CHECK_SECONDS):
+        self.data_dir = data_dir
+        self.db_path = db_path or os.path.join(data_dir, 'local-data.sqlite3')
+        self.check_seconds = check_seconds
+        self.customers_path = os.path.join(data_dir, CUSTOMERS_FILE)
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        self._conn.executescript(self.SCHEMA)
+        self._checked = float('-inf')
+        self._id_positions: Optional[list] = None
+        self._catalog: Optional[BondCatalog] = None
+        self._bond_rows: Optional[List[Tuple[str, dict]]] = None
+        self.builds = 0
+        self.last_loaded: List[str] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _source_files(self) -> Dict[str, Tuple[int, int]]:
+        """Relative path -> (size, mtime) of every source file."""
+        stats = {}
+        for directory in (os.path.dirname(CUSTOMERS_FILE), BONDS_DIR, MARKET_DATA_DIR):
+            for name in _json_files(os.path.join(self.data_dir, directory)):
+                stat = os.stat(os.path.join(self.data_dir, directory, name))
+                stats[os.path.join(directory, name)] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the source files that changed since the last check. Returns True if any did."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked < self.check_seconds:
+                return False
+            self._checked = now
+            current = self._source_files()
+            stored = {} if force else {path: (size, mtime) for path, size, mtime in
+                                       self._conn.execute('SELECT path, size, mtime_ns FROM files')}
+            if current == stored:
+                return False
+            self._sync(current, stored)
+            return True
+
+    def _sync(self, current: Dict[str, Tuple[int, int]], stored: Dict[str, Tuple[int, int]]):
+        if CUSTOMERS_FILE not in current:
+            raise FileNotFoundError(self.customers_path)
+        changed = [path for path, stamp in current.items() if stored.get(path) != stamp]
+        removed = [path for path in stored if path not in current]
+        conn = self._conn
+        with conn:
+            if not stored:
+                # New database or a forced reload: nothing in it can be trusted
+                for table in ('bonds', 'market_data', 'files'):
+                    conn.execute(f'DELETE FROM {table}')
+            if CUSTOMERS_FILE in changed:
+                self._load_customers()
+            for path in removed:
+                directory, name = os.path.split(path)
+                table = 'bonds' if directory == BONDS_DIR else 'market_data'
+                conn.execute(f'DELETE FROM {table} WHERE filename = ?', (name,))
+                conn.execute('DELETE FROM files WHERE path = ?', (path,))
+            for path in changed:
+                directory, name = os.path.split(path)
+                if directory == BONDS_DIR:
+                    bond = _read_json(os.path.join(self.data_dir, path))
+                    conn.execute(
+                        'INSERT OR REPLACE INTO bonds (filename, productId, type, creditRating, sellabilityRank, doc) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        (name, bond.get('productId'), bond.get('type'), bond.get('creditRating'),
+                         _sellability_rank(bond), json.dumps(bond, separators=(',', ':'), ensure_ascii=False)),
+                    )
+                elif directory == MARKET_DATA_DIR:
+                    with open(os.path.join(self.data_dir, path), 'r', encoding='utf-8') as f:
+                        conn.execute('INSERT OR REPLACE INTO market_data (filename, doc) VALUES (?, ?)', (name, f.read()))
+                conn.execute('INSERT OR REPLACE INTO files (path, size, mtime_ns) VALUES (?, ?, ?)', (path, *current[path]))
+        if CUSTOMERS_FILE in changed:
+            self._id_positions = None
+        if any(os.path.dirname(path) == BONDS_DIR for path in changed + removed):
+            self._catalog = self._bond_rows = None
+        self.last_loaded = sorted(changed + removed)
+        self.builds += 1
+
+    def _load_customers(self):
+        conn = self._conn
+        conn.execute('DELETE FROM customers')
+        customers = _read_json(self.customers_path)
+        conn.executemany(
+            'INSERT OR REPLACE INTO customers (customerId, doc) VALUES (?, ?)',
+            ((str(c['customerId']), json.dumps(c, separators=(',', ':'), ensure_ascii=False))
+             for c in customers if c.get('customerId') is not None),
+        )
+        del customers
+        count = conn.execute('SELECT COUNT(*) FROM customers').fetchone()[0]
+        conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                         [('customerCount', str(count)), ('customersLoadedAt', str(time.time()))])
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        self.refresh()
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def customers_version(self):
+        """Changes whenever the customer data does."""
+        self.refresh()
+        with self._lock:
+            return self._meta('customersLoadedAt')
+
+    def customer(self, customer_id: str) -> Optional[dict]:
+        rows = self._query('SELECT doc FROM customers WHERE customerId = ?', (customer_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def customers(self) -> Iterator[dict]:
+        """Every customer in customerId order, streamed on a connection of its own."""
+        self.refresh()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for (doc,) in conn.execute('SELECT doc FROM customers'):
+                yield json.loads(doc)
+        finally:
+            conn.close()
+
+    def customer_count(self) -> int:
+        self.refresh()
+        with self._lock:
+            return int(self._meta('customerCount') or 0)
+
+    def customer_page(self, fields=None, sort_by: Optional[str] = None, descending: bool = False,
+                      limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """A page in the same order and with the same cursors as ``pagination.paginate``."""
+        if (sort_by or 'customerId') != 'customerId':
+            return paginate(self.customers(), 'customerId', fields, sort_by=sort_by, descending=descending,
+                            limit=limit, cursor=cursor)
+        self.refresh()
+        with self._lock:
+            if self._id_positions is None:
+                ids = (row[0] for row in self._conn.execute('SELECT customerId FROM customers'))
+                self._id_positions = sorted_id_positions(ids, 'customerId')
+            positions = self._id_positions
+        ids, next_cursor = paginate_ids(positions, 'customerId', descending=descending, limit=limit, cursor=cursor)
+        if not ids:
+            return [], next_cursor
+        rows = self._query(f"SELECT customerId, doc FROM customers WHERE customerId IN ({','.join('?' * len(ids))})",
+                           tuple(ids))
+        docs = dict(rows)
+        return project_records((json.loads(docs[customer_id]) for customer_id in ids), 'customerId', fields), next_cursor
+
+    def _bond_entries(self) -> List[Tuple[str, dict]]:
+        """(file name, bond) for every bond, parsed once per change to the bond files."""
+        self.refresh()
+        with self._lock:
+            if self._bond_rows is None:
+                rows = self._conn.execute('SELECT filename, doc FROM bonds ORDER BY filename')
+                self._bond_rows = [(filename, json.loads(doc)) for filename, doc in rows]
+            return self._bond_rows
+
+    def bonds(self) -> List[dict]:
+        return [bond for _, bond in self._bond_entries()]
+
+    def bond_count(self) -> int:
+        return self._query('SELECT COUNT(*) FROM bonds')[0][0]
+
+    def bond_catalog(self) -> BondCatalog:
+        """The catalog index, rebuilt with the database."""
+        entries = self._bond_entries()
+        with self._lock:
+            if self._catalog is None:
+                self._catalog = BondCatalog(entries)
+            return self._catalog
+
+    def bond_file(self, filename: str) -> Optional[dict]:
+        rows = self._query('SELECT doc FROM bonds WHERE filename = ?', (filename,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def most_sellable_bond(self) -> Optional[dict]:
+        rows = self._query('SELECT doc FROM bonds ORDER BY sellabilityRank, filename LIMIT 1')
+        return json.loads(rows[0][0]) if rows else None
+
+    def market_data(self, filename: str) -> Optional[dict]:
+        rows = self._query('SELECT doc FROM market_data WHERE filename = ?', (filename,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_source = None
+_source_lock = threading.Lock()
+
+
+def local_data_source():
+    """The process-wide data source for the local tools, chosen by ``LOCAL_DATA_BACKEND``."""
+    global _source
+    with _source_lock:
+        if _source is None:
+            if LOCAL_DATA_BACKEND == 'sqlite':
+                _source = SqliteDataSource(LOCAL_DATA_DIR, LOCAL_DB_PATH or None)
+            else:
+                _source = FileDataSource(LOCAL_DATA_DIR)
+        return _source
@@ -0,0 +1,144 @@
+"""Pagination - keyset cursors, field projection and sort keys for the list tools
+
+The list Lambdas import this module from the data-access layer
+(lambda/layers/data-access/python/pagination.py), which must stay an exact copy.
+"""
+import base64
+import bisect
+import heapq
+import json
+import re
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+CURSOR_VERSION = 1
+
+# "4.75%", "10 years", "1,250" sort by their number; dates and other strings sort as text
+_NUMERIC_TEXT = re.compile(r'\s*([-+]?\d[\d,]*(?:\.\d+)?)\s*(?:%|[A-Za-z][A-Za-z ]*)?\s*$')
+
+
+def _sort_value(value) -> Optional[Tuple[int, object]]:
+    """(rank, value) for ordering: numbers first, then text case-insensitively; None if unsortable."""
+    if isinstance(value, bool):
+        return 0, float(value)
+    if isinstance(value, (int, float)):
+        return 0, float(value)
+    if isinstance(value, str):
+        numeric = _NUMERIC_TEXT.match(value)
+        if numeric:
+            return 0, float(numeric.group(1).replace(',', ''))
+        return 1, value.lower()
+    return None
+
+
+def sort_position(record: dict, id_field: str, sort_by: str) -> tuple:
+    """A record's place in the listing: (group, rank, value, id). Records without the sort field form group 1."""
+    record_id = str(record.get(id_field))
+    sort_value = _sort_value(record.get(sort_by))
+    if sort_value is None:
+        return 1, 0, 0.0, record_id
+    return (0, *sort_value, record_id)
+
+
+class _Descending:
+    """Inverts the ordering of a key, for descending sorts over mixed-type keys."""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def _order_key(position: tuple, descending: bool):
+    # Records without the sort field come last in both directions, by ID
+    if descending and position[0] == 0:
+        return 0, _Descending(position[1:])
+    return position
+
+
+def encode_cursor(sort_by: str, descending: bool, position: tuple) -> str:
+    """Opaque cursor for the page after ``position``: URL-safe base64 of a small JSON document."""
+    document = {'v': CURSOR_VERSION, 'by': sort_by, 'desc': bool(descending), 'after': list(position)}
+    raw = json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> tuple:
+    """The position a cursor continues after. Raises ValueError for malformed or mismatched cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        document = json.loads(raw)
+        position = tuple(document['after'])
+        version, cursor_sort, cursor_descending = document['v'], document['by'], document['desc']
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if version != CURSOR_VERSION or len(position) != 4:
+        raise ValueError("Invalid cursor: unsupported format")
+    if cursor_sort != sort_by or bool(cursor_descending) != bool(descending):
+        raise ValueError(f"Cursor was issued for sort_by={cursor_sort!r}, descending={cursor_descending}; "
+                         "repeat the sort_by and descending of the first page")
+    return position
+
+
+def paginate(records: Iterable[dict], id_field: str, fields: Optional[Iterable[str]] = None,
+             sort_by: Optional[str] = None, descending: bool = False, limit: int = DEFAULT_PAGE_SIZE,
+             cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of ``records`` ordered by ``sort_by`` (default ``id_field``), then ID.
+
+    Keyset pagination: the cursor carries the sort key and ID of the last record
+    returned, so pages stay consistent when records are added or removed between calls,
+    and a cursor from one backend continues on another that holds the same data.
+    ``fields`` projects each record (``id_field`` always included); None keeps it whole.
+    Returns the page and the cursor for the next one (None on the last page).
+    """
+    sort_by = sort_by or id_field
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    keyed = ((_order_key(sort_position(record, id_field, sort_by), descending), record) for record in records)
+    if cursor:
+        after = _order_key(decode_cursor(cursor, sort_by, descending), descending)
+        keyed = (item for item in keyed if after < item[0])
+    page = heapq.nsmallest(limit + 1, keyed, key=lambda item: item[0])
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(sort_by, descending, sort_position(page[-1][1], id_field, sort_by))
+    return project_records((record for _, record in page), id_field, fields), next_cursor
+
+
+def sorted_id_positions(ids: Iterable[str], id_field: str) -> list:
+    """Sort positions for a listing ordered by ID alone, for ``paginate_ids``."""
+    return sorted(sort_position({id_field: record_id}, id_field, id_field) for record_id in ids)
+
+
+def paginate_ids(positions: list, id_field: str, descending: bool = False, limit: int = DEFAULT_PAGE_SIZE,
+                 cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+    """The IDs on one page in ID order, by bisecting ``sorted_id_positions``.
+
+    Same pages and cursors as ``paginate`` with the default sort, without reading the
+    records; the caller fetches only the records on the page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    after = decode_cursor(cursor, id_field, descending) if cursor else None
+    if descending:
+        end = bisect.bisect_left(positions, after) if after else len(positions)
+        chosen, more = positions[max(0, end - limit):end][::-1], end > limit
+    else:
+        start = bisect.bisect_right(positions, after) if after else 0
+        chosen, more = positions[start:start + limit], start + limit < len(positions)
+    next_cursor = encode_cursor(id_field, descending, chosen[-1]) if more and chosen else None
+    return [position[-1] for position in chosen], next_cursor
+
+
+def project_records(records: Iterable[dict], id_field: str, fields: Optional[Iterable[str]]) -> List[dict]:
+    """``records`` with only ``fields`` (and ``id_field``); all fields when ``fields`` is None."""
+    if fields is None:
+        return list(records)
+    fields = list(dict.fromkeys([id_field, *fields]))
+    return [{field: record[field] for field in fields if field in record} for record in records]
@@ -0,0 +1,121 @@
+"""Session-keyed pool of coordinator agents with LRU and idle-TTL eviction"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class _PoolEntry:
+    __slots__ = ('agent', 'last_used', 'lock')
+
+    def __init__(self, agent: Any, lock: Any):
+        self.agent = agent
+        self.last_used = time.monotonic()
+        self.lock = lock
+
+
+class SessionAgentPool:
+    """Keeps one agent per session so concurrent sessions never share message history.
+
+    Agents are created on first use by ``factory`` and evicted when the pool holds
+    more than ``max_agents`` (least recently used first) or when a session has been
+    idle for longer than ``idle_ttl_seconds``.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_agents: int = 64, idle_ttl_seconds: float = 900.0,
+                 lock_factory: Optional[Callable[[], Any]] = None):
+        if max_agents < 1:
+            raise ValueError('max_agents must be at least 1')
+        self._factory = factory
+        self._max_agents = max_agents
+        self._idle_ttl_seconds = idle_ttl_seconds
+        self._lock_factory = lock_factory or threading.Lock
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._mutex = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'evictedLru': 0, 'evictedIdle': 0}
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._mutex:
+            return session_id in self._entries
+
+    def acquire(self, session_id: str):
+        """Return ``(agent, lock)`` for a session, creating the agent if needed.
+
+        The lock serialises invocations that share a session; callers hold it for the
+        duration of a turn. Distinct sessions never contend on it.
+        """
+        now = time.monotonic()
+        with self._mutex:
+            self._evict_idle(now)
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                self._entries.move_to_end(session_id)
+                entry.last_used = now
+                self.stats['reused'] += 1
+                return entry.agent, entry.lock
+
+        # Build outside the mutex; agent construction can be slow and must not
+        # block lookups for other sessions.
+        agent = self._factory()
+
+        with self._mutex:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                entry = _PoolEntry(agent, self._lock_factory())
+                self._entries[session_id] = entry
+                self.stats['created'] += 1
+                while len(self._entries) > self._max_agents:
+                    self._entries.popitem(last=False)
+                    self.stats['evictedLru'] += 1
+            else:
+                # Another caller won the race for this session
+                self._entries.move_to_end(session_id)
+                self.stats['reused'] += 1
+            entry.last_used = time.monotonic()
+            return entry.agent, entry.lock
+
+    def get(self, session_id: str) -> Any:
+        """Return the agent for a session, creating it if needed."""
+        agent, _ = self.acquire(session_id)
+        return agent
+
+    def evict(self, session_id: str) -> bool:
+        """Drop a session's agent. Returns True if it was pooled."""
+        with self._mutex:
+            return self._entries.pop(session_id, None) is not None
+
+    def evict_idle(self) -> int:
+        """Drop every session idle longer than the TTL. Returns the number evicted."""
+        with self._mutex:
+            return self._evict_idle(time.monotonic())
+
+    def clear(self):
+        with self._mutex:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._mutex:
+            return {
+                'liveAgents': len(self._entries),
+                'maxAgents': self._max_agents,
+                'idleTtlSeconds': self._idle_ttl_seconds,
+                **self.stats,
+            }
+
+    def _evict_idle(self, now: float) -> int:
+        if self._idle_ttl_seconds <= 0:
+            return 0
+        evicted = 0
+        # Entries are kept in recency order, so the idle ones sit at the front
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self._idle_ttl_seconds:
+                break
+            del self._entries[session_id]
+            evicted += 1
+        self.stats['evictedIdle'] += evicted
+        return evicted
@@ -0,0 +1,56 @@
+"""Startup timing report for tracking cold-start time across releases"""
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+def _process_start_time() -> Optional[float]:
+    """Wall-clock time the interpreter process started (Linux only)."""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            # Field 22 is start time in clock ticks since boot; the command name may contain spaces
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    """Records named phases relative to when the timer was created.
+
+    Create it as the first statement of the entry module, call ``mark`` after each
+    phase, then ``report`` once the app is ready to serve.
+    """
+
+    def __init__(self, component: str):
+        self.component = component
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._wall_start = time.time()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        duration_ms = round((now - self._last) * 1000, 2)
+        self.phases[phase] = duration_ms
+        self._last = now
+        return duration_ms
+
+    def report(self, **extra) -> dict:
+        total_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        process_start = _process_start_time()
+        event = {
+            'eventType': 'agent.startup',
+            'component': self.component,
+            'phasesMs': self.phases,
+            'totalMs': total_ms,
+            # Interpreter boot and site imports happen before the timer exists
+            'sinceProcessStartMs': round((time.time() - process_start) * 1000, 2) if process_start else None,
+            'timestamp': self._wall_start,
+            **extra,
+        }
+        print(json.dumps(event))
+        return event
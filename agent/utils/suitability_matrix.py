@@ -0,0 +1,387 @@
+"""Suitability matrix - every customer × bond score at once (the vectorised form of bond_scoring)
+
+Used by its benchmark and tests, not by the agent at runtime: numpy is in
+requirements-dev.txt, not in the image's requirements.txt.
+"""
+import glob
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.bond_scoring import FACTOR_WEIGHTS, LIQUIDITY_REQUIRED, NEUTRAL, RISK_BANDS, SECTOR_ALIASES, parse_years
+
+LOCAL_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'local_data')
+S3_DATA_PREFIX = 'client-details/'
+
+# Score of a pair the customer cannot buy (minimum investment above the portfolio value)
+INELIGIBLE = -1.0
+# Customers scored per vectorised block: keeps the BLOCK_ROWS × bonds temporaries in cache
+BLOCK_ROWS = 256
+# Spare score rows/columns kept for new customers and bonds. The score array can be GBs,
+# so it grows by a little at a time rather than doubling (a copy needs old + new memory)
+SPARE_CUSTOMERS_FRACTION = 1 / 64
+SPARE_BONDS = 64
+
+# Columns of the encoded attribute arrays; NaN marks an unknown value
+PROFILE, HORIZON, PORTFOLIO = range(3)
+RISK, MATURITY, MINIMUM, LIQUIDITY, ESG = range(5)
+
+# A customer's risk and liquidity factors depend only on their (riskTolerance,
+# liquidityNeeds) pair, so each bond gets one precomputed score per pair ("profile");
+# the last index of each is "unknown"
+TOLERANCES = tuple(RISK_BANDS)
+NEEDS = tuple(LIQUIDITY_REQUIRED)
+PROFILES = (len(TOLERANCES) + 1) * (len(NEEDS) + 1)
+
+# Factor weights on the 0-100 scale the scores are reported in
+WEIGHTS = {name: 100 * weight for name, weight in FACTOR_WEIGHTS.items()}
+
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+
+def _index(options: tuple, value) -> int:
+    value = str(value or '').lower()
+    return options.index(value) if value in options else len(options)
+
+
+def _encode_customer(customer: dict) -> np.ndarray:
+    profile = _index(TOLERANCES, customer.get('riskTolerance')) * (len(NEEDS) + 1) + _index(NEEDS, customer.get('liquidityNeeds'))
+    return np.array([
+        profile,
+        _number(customer.get('investmentHorizon')),
+        _number(customer.get('portfolioValue')),
+    ], dtype=np.float32)
+
+
+def _encode_bond(bond: dict) -> np.ndarray:
+    maturity = parse_years(bond.get('maturity'))
+    return np.array([
+        _number(bond.get('riskRating')),
+        np.nan if maturity is None else maturity,
+        _number(bond.get('minInvestment')),
+        _number(bond.get('liquidityRating')),
+        _number(bond.get('esgScore')),
+    ], dtype=np.float32)
+
+
+def _exposure(bond: dict) -> set:
+    exposure = {str(s).lower() for s in bond.get('sectorExposure') or []}
+    exposure.add(str(bond.get('type') or '').lower().replace('_bond', '').replace('_', ' '))
+    return exposure
+
+
+def _known(values: np.ndarray) -> np.ndarray:
+    """Present and non-zero: bond_scoring treats a zero minimum, portfolio or horizon as unknown."""
+    return ~np.isnan(values) & (values != 0)
+
+
+def _spare_rows(customers: int) -> int:
+    return max(16, int(customers * SPARE_CUSTOMERS_FRACTION))
+
+
+def _grown(array: np.ndarray, size: int, axis: int = 0, spare: Optional[int] = None) -> np.ndarray:
+    """``array`` with room for ``size`` entries along ``axis``: ``size + spare`` if given, else doubled."""
+    if array.shape[axis] >= size:
+        return array
+    shape = list(array.shape)
+    shape[axis] = size + spare if spare is not None else max(size, 2 * array.shape[axis], 16)
+    grown = np.zeros(shape, dtype=array.dtype)
+    index = [slice(None)] * array.ndim
+    index[axis] = slice(0, array.shape[axis])
+    grown[tuple(index)] = array
+    return grown
+
+
+class SuitabilityMatrix:
+    """Scores of every customer against every bond, held as one array.
+
+    Customer and bond attributes are encoded once into float arrays (plus boolean
+    sector matrices), and the six bond_scoring factors are computed for all pairs by
+    broadcasting, a block of customers at a time. ``scores[i, j]`` equals
+    ``score_bond(customer i, bond j)['score']`` (unrounded), or ``INELIGIBLE``.
+
+    ``upsert_customer`` / ``upsert_bond`` rescore just one row / column, and
+    ``top_bonds`` / ``top_customers`` are a slice plus a partial sort, so the matrix
+    stays current as the book changes without a full rebuild. Memory is
+    customers × bonds × ``dtype`` size: float16 halves it at ~0.05-point precision.
+    """
+
+    def __init__(self, customers: Iterable[dict] = (), bonds: Iterable[dict] = (), dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.customer_ids: List[str] = []
+        self.product_ids: List[str] = []
+        self._customer_index: Dict[str, int] = {}
+        self._bond_index: Dict[str, int] = {}
+        # Sector vocabulary: every term some customer prefers
+        self._terms: Dict[str, int] = {}
+        self._exposures: List[set] = []
+        self._customers = np.zeros((0, 3), dtype=np.float32)
+        self._bonds = np.zeros((0, 5), dtype=np.float32)
+        self._preferred = np.zeros((0, 0), dtype=bool)
+        self._hits = np.zeros((0, 0), dtype=bool)
+        self._scores = np.zeros((0, 0), dtype=self.dtype)
+        for bond in bonds:
+            self._put_bond(bond)
+        for customer in customers:
+            self._put_customer(customer)
+        self.rebuild()
+
+    @classmethod
+    def from_local_data(cls, data_dir: str = LOCAL_DATA_DIR, **kwargs) -> 'SuitabilityMatrix':
+        """Matrix over local_data/customers/*.json (lists of customers) and local_data/bonds/*.json."""
+        def customers():
+            for path in sorted(glob.glob(os.path.join(data_dir, 'customers', '*.json'))):
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield from json.load(f)
+
+        def bonds():
+            for path in sorted(glob.glob(os.path.join(data_dir, 'bonds', '*.json'))):
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield json.load(f)
+
+        return cls(customers(), bonds(), **kwargs)
+
+    @classmethod
+    def from_s3(cls, s3_client, bucket: str, prefix: str = S3_DATA_PREFIX, **kwargs) -> 'SuitabilityMatrix':
+        """Matrix over the same layout under ``s3://bucket/client-details/``."""
+        def documents(folder: str):
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=f'{prefix}{folder}/'):
+                for item in sorted(page.get('Contents', []), key=lambda obj: obj['Key']):
+                    if item['Key'].endswith('.json'):
+                        yield json.loads(s3_client.get_object(Bucket=bucket, Key=item['Key'])['Body'].read())
+
+        def customers():
+            for document in documents('customers'):
+                yield from document
+
+        return cls(customers(), documents('bonds'), **kwargs)
+
+    @property
+    def n_customers(self) -> int:
+        return len(self.customer_ids)
+
+    @property
+    def n_bonds(self) -> int:
+        return len(self.product_ids)
+
+    @property
+    def scores(self) -> np.ndarray:
+        """customers × bonds view of the scores (rows follow ``customer_ids``, columns ``product_ids``)."""
+        return self._scores[:self.n_customers, :self.n_bonds]
+
+    # Encoding
+
+    def _term(self, term: str) -> int:
+        """Column of a sector term, adding it (and scoring every bond against it) when new."""
+        column = self._terms.get(term)
+        if column is None:
+            column = self._terms[term] = len(self._terms)
+            self._preferred = _grown(self._preferred, column + 1, axis=1)
+            self._hits = _grown(self._hits, column + 1, axis=1)
+            aliases = SECTOR_ALIASES.get(term, {term})
+            for j, exposure in enumerate(self._exposures):
+                self._hits[j, column] = bool(exposure & aliases)
+        return column
+
+    def _put_customer(self, customer: dict) -> int:
+        customer_id = customer.get('customerId')
+        i = self._customer_index.get(customer_id)
+        if i is None:
+            i = self._customer_index[customer_id] = self.n_customers
+            self.customer_ids.append(customer_id)
+            self._customers = _grown(self._customers, i + 1)
+            self._preferred = _grown(self._preferred, i + 1)
+        self._customers[i] = _encode_customer(customer)
+        self._preferred[i] = False
+        # _term may grow the sector matrices, so resolve the column first
+        for column in [self._term(str(s).lower()) for s in customer.get('preferredSectors') or []]:
+            self._preferred[i, column] = True
+        return i
+
+    def _put_bond(self, bond: dict) -> int:
+        product_id = bond.get('productId')
+        j = self._bond_index.get(product_id)
+        exposure = _exposure(bond)
+        if j is None:
+            j = self._bond_index[product_id] = self.n_bonds
+            self.product_ids.append(product_id)
+            self._exposures.append(exposure)
+            self._bonds = _grown(self._bonds, j + 1)
+            self._hits = _grown(self._hits, j + 1)
+        self._exposures[j] = exposure
+        self._bonds[j] = _encode_bond(bond)
+        for term, column in self._terms.items():
+            self._hits[j, column] = bool(exposure & SECTOR_ALIASES.get(term, {term}))
+        return j
+
+    # Scoring
+
+    @staticmethod
+    def _profile_scores(bonds: np.ndarray) -> np.ndarray:
+        """Weighted risk + liquidity + ESG score of each bond for each profile: PROFILES × bonds."""
+        rating, liquidity, esg = bonds[:, RISK], bonds[:, LIQUIDITY], bonds[:, ESG]
+        with np.errstate(invalid='ignore'):
+            risk = np.full((len(TOLERANCES) + 1, len(bonds)), NEUTRAL, dtype=np.float32)
+            for t, (low, high) in enumerate(RISK_BANDS.values()):
+                distance = np.maximum(low - rating, rating - high)
+                risk[t] = np.where(np.isnan(rating), NEUTRAL, np.where(distance <= 0, 1.0, np.maximum(0.0, 1 - distance / 3)))
+            liquid = np.full((len(NEEDS) + 1, len(bonds)), NEUTRAL, dtype=np.float32)
+            for n, required in enumerate(LIQUIDITY_REQUIRED.values()):
+                liquid[n] = np.where(np.isnan(liquidity), NEUTRAL,
+                                     np.where(liquidity >= required, 1.0, np.maximum(0.0, 1 - (required - liquidity) / 3)))
+            esg_score = np.where(np.isnan(esg), NEUTRAL, np.clip(esg / 100, 0.0, 1.0))
+        table = (WEIGHTS['risk'] * risk[:, None, :] + WEIGHTS['liquidity'] * liquid[None, :, :]
+                 + WEIGHTS['esg'] * esg_score[None, None, :])
+        return table.reshape(PROFILES, len(bonds)).astype(np.float32)
+
+    def _compute(self, rows, columns, profile_scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scores of customers ``rows`` against bonds ``columns`` (slices or index arrays).
+
+        Besides the profile lookup, each factor is one clipped linear term with its weight
+        folded in, e.g. horizon = clip(2 - maturity / horizon, 0, 1), which is 1 within the
+        horizon and 1 - (maturity - horizon) / horizon beyond it, as in bond_scoring.
+        """
+        c = self._customers[rows]
+        b = self._bonds[columns]
+        horizon, portfolio = c[:, HORIZON], c[:, PORTFOLIO]
+        maturity, minimum = b[:, MATURITY], b[:, MINIMUM]
+        unknown_maturity = np.flatnonzero(np.isnan(maturity))
+        unknown_minimum = np.flatnonzero(~_known(minimum))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if profile_scores is None:
+                profile_scores = self._profile_scores(b)
+            total = profile_scores[c[:, PROFILE].astype(np.intp)]
+
+            preferred = self._preferred[rows, :len(self._terms)]
+            count = preferred.sum(axis=1)
+            matches = preferred.astype(np.float32) @ self._hits[columns, :len(self._terms)].T.astype(np.float32)
+            per_match = np.where(count > 0, WEIGHTS['sector'] / np.minimum(2, np.maximum(count, 1)), 0).astype(np.float32)
+            total += np.minimum(matches * per_match[:, None], WEIGHTS['sector'])
+            total += np.where(count == 0, WEIGHTS['sector'] * NEUTRAL, 0).astype(np.float32)[:, None]
+
+            w = WEIGHTS['horizon']
+            known = _known(horizon)
+            base = np.where(known, 2 * w, NEUTRAL * w).astype(np.float32)
+            slope = np.where(known, w / horizon, 0).astype(np.float32)
+            fits = base[:, None] - np.nan_to_num(maturity)[None, :] * slope[:, None]
+            np.clip(fits, 0, w, out=fits)
+            fits[:, unknown_maturity] = NEUTRAL * w
+            total += fits
+
+            # Affordability: 1 up to a 10% share of the portfolio, then (1 - share) / 0.9
+            w = WEIGHTS['affordability']
+            known = _known(portfolio)
+            base = np.where(known, w / 0.9, NEUTRAL * w).astype(np.float32)
+            slope = np.where(known, w / (0.9 * portfolio), 0).astype(np.float32)
+            affordable = base[:, None] - np.nan_to_num(minimum)[None, :] * slope[:, None]
+            np.clip(affordable, 0, w, out=affordable)
+            affordable[:, unknown_minimum] = NEUTRAL * w
+            total += affordable
+
+            # NaN comparisons are False, so unknown values never make a pair ineligible
+            return np.where(minimum[None, :] > portfolio[:, None], INELIGIBLE, total).astype(self.dtype, copy=False)
+
+    def rebuild(self):
+        """Score every pair, BLOCK_ROWS customers at a time."""
+        # Release the old scores first: two copies of a large matrix may not fit
+        self._scores = None
+        shape = (self.n_customers + _spare_rows(self.n_customers), self.n_bonds + SPARE_BONDS)
+        self._scores = np.empty(shape, dtype=self.dtype)
+        columns = slice(0, self.n_bonds)
+        profile_scores = self._profile_scores(self._bonds[columns])
+        for start in range(0, self.n_customers, BLOCK_ROWS):
+            rows = slice(start, min(start + BLOCK_ROWS, self.n_customers))
+            self._scores[rows, columns] = self._compute(rows, columns, profile_scores)
+
+    def upsert_customer(self, customer: dict):
+        """Add or update one customer and rescore their row."""
+        i = self._put_customer(customer)
+        self._scores = _grown(self._scores, i + 1, spare=_spare_rows(i + 1))
+        self._scores[i, :self.n_bonds] = self._compute(slice(i, i + 1), slice(0, self.n_bonds))[0]
+
+    def upsert_bond(self, bond: dict):
+        """Add or update one bond and rescore its column."""
+        j = self._put_bond(bond)
+        self._scores = _grown(self._scores, j + 1, axis=1, spare=SPARE_BONDS)
+        column = slice(j, j + 1)
+        profile_scores = self._profile_scores(self._bonds[column])
+        # A single column needs no cache blocking, so take large blocks
+        for start in range(0, self.n_customers, BLOCK_ROWS * 256):
+            rows = slice(start, min(start + BLOCK_ROWS * 256, self.n_customers))
+            self._scores[rows, j] = self._compute(rows, column, profile_scores)[:, 0]
+
+    def remove_customer(self, customer_id: str) -> bool:
+        """Drop a customer's row (the last row moves into its place)."""
+        i = self._customer_index.pop(customer_id, None)
+        if i is None:
+            return False
+        last = self.n_customers - 1
+        if i != last:
+            moved = self.customer_ids[last]
+            self.customer_ids[i] = moved
+            self._customer_index[moved] = i
+            for array in (self._customers, self._preferred, self._scores):
+                array[i] = array[last]
+        self.customer_ids.pop()
+        return True
+
+    def remove_bond(self, product_id: str) -> bool:
+        """Drop a bond's column (the last column moves into its place)."""
+        j = self._bond_index.pop(product_id, None)
+        if j is None:
+            return False
+        last = self.n_bonds - 1
+        if j != last:
+            moved = self.product_ids[last]
+            self.product_ids[j] = moved
+            self._bond_index[moved] = j
+            self._exposures[j] = self._exposures[last]
+            self._bonds[j] = self._bonds[last]
+            self._hits[j] = self._hits[last]
+            self._scores[:, j] = self._scores[:, last]
+        self.product_ids.pop()
+        self._exposures.pop()
+        return True
+
+    # Queries
+
+    def score(self, customer_id: str, product_id: str) -> Optional[float]:
+        i, j = self._customer_index.get(customer_id), self._bond_index.get(product_id)
+        if i is None or j is None:
+            return None
+        return float(self._scores[i, j])
+
+    @staticmethod
+    def _top(values: np.ndarray, ids: List[str], k: int) -> List[tuple]:
+        """The ``k`` best eligible (id, score) pairs, ties broken by id."""
+        if k <= 0 or not len(values):
+            return []
+        eligible = np.flatnonzero(values > INELIGIBLE)
+        if len(eligible) > k:
+            # Keep everything tied with the k-th best so the id tie-break is exact
+            kth = np.partition(values[eligible], len(eligible) - k)[len(eligible) - k]
+            eligible = eligible[values[eligible] >= kth]
+        ranked = sorted(((ids[index], float(values[index])) for index in eligible), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+    def top_bonds(self, customer_id: str, k: int = 3) -> List[dict]:
+        """Best ``k`` eligible bonds for a customer: a row slice plus top-k selection."""
+        i = self._customer_index.get(customer_id)
+        if i is None:
+            return []
+        return [{'productId': product_id, 'score': round(score, 1)}
+                for product_id, score in self._top(self._scores[i, :self.n_bonds], self.product_ids, k)]
+
+    def top_customers(self, product_id: str, k: int = 50) -> List[dict]:
+        """Best ``k`` eligible customers for a bond: a column slice plus top-k selection."""
+        j = self._bond_index.get(product_id)
+        if j is None:
+            return []
+        return [{'customerId': customer_id, 'score': round(score, 1)}
+                for customer_id, score in self._top(self._scores[:self.n_customers, j], self.customer_ids, k)]
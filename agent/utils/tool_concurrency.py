@@ -0,0 +1,38 @@
+"""Per-tool concurrency limits for async tool functions"""
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class ToolConcurrencyLimiter:
+    """Caps how many calls of each tool run at once.
+
+    Tools requested in the same model turn run concurrently; each tool has its own cap
+    on simultaneous calls (``limits``, falling back to ``default_limit``). Semaphores are
+    kept per event loop because the router serves both the async stream and the
+    synchronous call path, which Strands runs on a separate loop.
+    """
+
+    def __init__(self, default_limit: int = 4, limits: Optional[Dict[str, int]] = None):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._semaphores.setdefault(loop, {})
+            semaphore = per_loop.get(tool_name)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.limits.get(tool_name, self.default_limit))
+                per_loop[tool_name] = semaphore
+            return semaphore
+
+    async def run(self, tool_name: str, fn: Callable[..., Awaitable], *args, **kwargs):
+        """Await ``fn(*args, **kwargs)`` within the tool's concurrency limit."""
+        async with self._semaphore(tool_name):
+            return await fn(*args, **kwargs)
@@ -0,0 +1,97 @@
+"""Tool output encoding - compact forms of tool results for the model's context"""
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+# 'compact' (default) or 'indented' (the original pretty-printed JSON)
+TOOL_OUTPUT_MODE = os.environ.get('TOOL_OUTPUT_MODE', 'compact').lower()
+
+# Lists of at least this many records are sent as a column header plus rows
+TABLE_MIN_ROWS = 2
+
+TABLE_KEYS = ('columns', 'rows')
+
+# Bond fields the recommendation tools send in compact mode: the attributes suitability is
+# judged on, without the long prose (description, features, risks, target investors),
+# which the model can still fetch per bond with get_product_details
+BOND_ANALYSIS_FIELDS = (
+    'productId', 'name', 'type', 'issuer', 'yield', 'maturity', 'maturityDate', 'minInvestment', 'currency',
+    'creditRating', 'couponRate', 'couponFrequency', 'riskRating', 'esgScore', 'volatilityIndex',
+    'sectorExposure', 'liquidityRating', 'taxEfficiency', 'defaultProbability', 'demandScore', 'sellabilityRank',
+)
+
+
+def project(record: dict, fields: Iterable[str]) -> dict:
+    """Keep only ``fields`` of ``record``, in the order given."""
+    return {field: record[field] for field in fields if field in record}
+
+
+def _is_record_list(value: Any) -> bool:
+    return isinstance(value, list) and len(value) >= TABLE_MIN_ROWS and all(isinstance(item, dict) for item in value)
+
+
+def tabulate(records: List[dict]) -> dict:
+    """``{"columns": [...], "rows": [[...], ...]}`` for a list of records; missing fields are null."""
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    return {'columns': columns, 'rows': [[compact(record.get(column)) for column in columns] for record in records]}
+
+
+def compact(value: Any) -> Any:
+    """Recursively replace lists of records with tables."""
+    if isinstance(value, dict):
+        return {key: compact(item) for key, item in value.items()}
+    if _is_record_list(value):
+        return tabulate(value)
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
+
+
+def _apply_fields(value: Any, fields: Iterable[str]) -> Any:
+    if isinstance(value, list):
+        return [project(item, fields) if isinstance(item, dict) else item for item in value]
+    if isinstance(value, dict):
+        return project(value, fields)
+    return value
+
+
+def encode_tool_output(data: Any, fields: Optional[Iterable[str]] = None,
+                       nested_fields: Optional[Dict[str, Iterable[str]]] = None, mode: Optional[str] = None) -> str:
+    """Serialise a tool result for the model.
+
+    In compact mode the JSON is minified, lists of records become a column header plus
+    rows, and the optional projections are applied: ``fields`` to the result itself (a
+    record or list of records), ``nested_fields`` to the named top-level entries. In
+    indented mode the result is pretty-printed in full, as before.
+    """
+    mode = (mode or TOOL_OUTPUT_MODE).lower()
+    if mode == 'indented':
+        return json.dumps(data, indent=2)
+
+    if fields is not None:
+        data = _apply_fields(data, list(fields))
+    if nested_fields and isinstance(data, dict):
+        data = {
+            key: _apply_fields(value, list(nested_fields[key])) if key in nested_fields else value
+            for key, value in data.items()
+        }
+    return json.dumps(compact(data), separators=(',', ':'), ensure_ascii=False)
+
+
+def expand(value: Any) -> Any:
+    """Inverse of ``compact``: turn tables back into lists of records (null cells are dropped)."""
+    if isinstance(value, dict):
+        if tuple(value) == TABLE_KEYS and isinstance(value['columns'], list) and isinstance(value['rows'], list):
+            return [
+                {column: expand(cell) for column, cell in zip(value['columns'], row) if cell is not None}
+                for row in value['rows']
+            ]
+        return {key: expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    return value
+
+
+def decode_tool_output(text: str) -> Any:
+    """Parse a tool result produced by ``encode_tool_output`` in either mode."""
+    return expand(json.loads(text))
@@ -47,6 +47,7 @@ const runtimeStack = new RuntimeStack(app, 'AgentCoreRuntime', {
   listBondsArn: mcpStack.listBondsFunction.functionArn,
   listCustomersArn: mcpStack.listCustomersFunction.functionArn,
   getCustomerArn: mcpStack.getCustomerFunction.functionArn,
+  customerQueryArn: mcpStack.customerQueryFunction.functionArn,
   getProductArn: mcpStack.getProductFunction.functionArn,
   searchMarketArn: mcpStack.searchMarketFunction.functionArn,
   sendEmailArn: mcpStack.sendEmailFunction.functionArn,
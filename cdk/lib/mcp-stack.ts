@@ -16,6 +16,7 @@ export class McpStack extends cdk.Stack {
   public readonly listBondsFunction: lambda.Function;
   public readonly listCustomersFunction: lambda.Function;
   public readonly getCustomerFunction: lambda.Function;
+  public readonly customerQueryFunction: lambda.Function;
   public readonly getProductFunction: lambda.Function;
   public readonly searchMarketFunction: lambda.Function;
   public readonly sendEmailFunction: lambda.Function;
@@ -84,12 +85,21 @@ export class McpStack extends cdk.Stack {
     this.clientDetailsBucket.grantRead(this.listFilesFunction, 'client-details/*');
     this.clientDetailsBucket.grantRead(this.readFileFunction, 'client-details/*');
 
+    // Shared data access for the Python tools: client-details/ read straight from S3,
+    // cached per container (read-file and list-files remain the fallback)
+    const dataAccessLayer = new lambda.LayerVersion(this, 'DataAccessLayer', {
+      code: lambda.Code.fromAsset('../lambda/layers/data-access'),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_13],
+      description: 'client-details/ data access for the tool Lambdas',
+    });
+
     // Create Lambda functions for all tools
     // List Bonds
     this.listBondsFunction = new lambda.Function(this, 'ListBondsFunction', {
       runtime: lambda.Runtime.PYTHON_3_13,
       handler: 'index.lambda_handler',
       code: lambda.Code.fromAsset('../lambda/list-bonds'),
+      layers: [dataAccessLayer],
       timeout: cdk.Duration.seconds(15),
       memorySize: 256,
       tracing: lambda.Tracing.ACTIVE,
@@ -110,8 +120,10 @@ export class McpStack extends cdk.Stack {
       runtime: lambda.Runtime.PYTHON_3_13,
       handler: 'index.lambda_handler',
       code: lambda.Code.fromAsset('../lambda/list-customers'),
-      timeout: cdk.Duration.seconds(10),
-      memorySize: 256,
+      layers: [dataAccessLayer],
+      // Bond matching parses the full customer book in one call
+      timeout: cdk.Duration.seconds(30),
+      memorySize: 1024,
       tracing: lambda.Tracing.ACTIVE,
       logGroup: new logs.LogGroup(this, 'ListCustomersLogGroup', {
         retention: logs.RetentionDays.ONE_WEEK,
@@ -120,6 +132,7 @@ export class McpStack extends cdk.Stack {
       environment: {
         READ_FILE_FUNCTION_ARN: this.readFileFunction.functionArn,
         LIST_FILES_FUNCTION_ARN: this.listFilesFunction.functionArn,
+        S3_DATA_BUCKET: this.clientDetailsBucket.bucketName,
         LOG_LEVEL: 'INFO',
       },
     });
@@ -129,6 +142,7 @@ export class McpStack extends cdk.Stack {
       runtime: lambda.Runtime.PYTHON_3_13,
       handler: 'index.lambda_handler',
       code: lambda.Code.fromAsset('../lambda/get-customer'),
+      layers: [dataAccessLayer],
       timeout: cdk.Duration.seconds(10),
       memorySize: 256,
       tracing: lambda.Tracing.ACTIVE,
@@ -138,6 +152,28 @@ export class McpStack extends cdk.Stack {
       }),
       environment: {
         READ_FILE_FUNCTION_ARN: this.readFileFunction.functionArn,
+        S3_DATA_BUCKET: this.clientDetailsBucket.bucketName,
+        LOG_LEVEL: 'INFO',
+      },
+    });
+
+    // Customer Query (segment search over an in-memory index, rebuilt when the customer file changes)
+    this.customerQueryFunction = new lambda.Function(this, 'CustomerQueryFunction', {
+      runtime: lambda.Runtime.PYTHON_3_13,
+      handler: 'index.lambda_handler',
+      code: lambda.Code.fromAsset('../lambda/customer-query'),
+      layers: [dataAccessLayer],
+      timeout: cdk.Duration.seconds(60),
+      memorySize: 3008,
+      tracing: lambda.Tracing.ACTIVE,
+      logGroup: new logs.LogGroup(this, 'CustomerQueryLogGroup', {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      environment: {
+        S3_DATA_BUCKET: this.clientDetailsBucket.bucketName,
+        // The parsed customer file (and the index kept with it) must fit the container cache
+        DATA_CACHE_MAX_BYTES: String(1024 * 1024 * 1024),
         LOG_LEVEL: 'INFO',
       },
     });
@@ -147,7 +183,9 @@ export class McpStack extends cdk.Stack {
       runtime: lambda.Runtime.PYTHON_3_13,
       handler: 'index.lambda_handler',
       code: lambda.Code.fromAsset('../lambda/get-product'),
-      timeout: cdk.Duration.seconds(10),
+      layers: [dataAccessLayer],
+      // A cold container reads every bond file into its catalog on the first name that misses
+      timeout: cdk.Duration.seconds(30),
       memorySize: 256,
       tracing: lambda.Tracing.ACTIVE,
       logGroup: new logs.LogGroup(this, 'GetProductLogGroup', {
@@ -155,7 +193,9 @@ export class McpStack extends cdk.Stack {
         removalPolicy: cdk.RemovalPolicy.DESTROY,
       }),
       environment: {
+        S3_DATA_BUCKET: this.clientDetailsBucket.bucketName,
         READ_FILE_FUNCTION_ARN: this.readFileFunction.functionArn,
+        LIST_FILES_FUNCTION_ARN: this.listFilesFunction.functionArn,
         LOG_LEVEL: 'INFO',
       },
     });
@@ -165,6 +205,7 @@ export class McpStack extends cdk.Stack {
       runtime: lambda.Runtime.PYTHON_3_13,
       handler: 'index.lambda_handler',
       code: lambda.Code.fromAsset('../lambda/search-market'),
+      layers: [dataAccessLayer],
       timeout: cdk.Duration.seconds(10),
       memorySize: 256,
       tracing: lambda.Tracing.ACTIVE,
@@ -201,6 +242,7 @@ export class McpStack extends cdk.Stack {
       runtime: lambda.Runtime.PYTHON_3_13,
       handler: 'index.lambda_handler',
       code: lambda.Code.fromAsset('../lambda/get-recent-emails'),
+      layers: [dataAccessLayer],
       timeout: cdk.Duration.seconds(10),
       memorySize: 256,
       tracing: lambda.Tracing.ACTIVE,
@@ -215,7 +257,7 @@ export class McpStack extends cdk.Stack {
     });
 
     // Grant permissions
-    // Allow list-bonds to invoke list-files and read-file
+    // Allow list-bonds to invoke list-files and read-file (fallback without S3_DATA_BUCKET)
     this.listFilesFunction.grantInvoke(this.listBondsFunction);
     this.readFileFunction.grantInvoke(this.listBondsFunction);
     
@@ -226,9 +268,20 @@ export class McpStack extends cdk.Stack {
     // Allow get-customer to invoke read-file
     this.readFileFunction.grantInvoke(this.getCustomerFunction);
     
-    // Allow get-product to invoke read-file
+    // Allow get-product to invoke list-files and read-file (the bond catalog)
+    this.listFilesFunction.grantInvoke(this.getProductFunction);
     this.readFileFunction.grantInvoke(this.getProductFunction);
     
+    // The data-access layer lists and reads client-details/ directly
+    this.clientDetailsBucket.grantRead(this.listBondsFunction, 'client-details/bonds/*');
+    this.clientDetailsBucket.grantRead(this.getProductFunction, 'client-details/bonds/*');
+    // ...and the bond catalog manifest built from the bond files at deploy time
+    this.clientDetailsBucket.grantRead(this.listBondsFunction, 'client-details/catalog/*');
+    this.clientDetailsBucket.grantRead(this.getProductFunction, 'client-details/catalog/*');
+    this.clientDetailsBucket.grantRead(this.listCustomersFunction, 'client-details/customers/*');
+    this.clientDetailsBucket.grantRead(this.customerQueryFunction, 'client-details/customers/*');
+    // get-customer reads one record by byte range from the NDJSON customer store
+    this.clientDetailsBucket.grantRead(this.getCustomerFunction, 'client-details/customers/*');
     this.clientDetailsBucket.grantRead(this.searchMarketFunction, 'client-details/market-data/*');
     this.clientDetailsBucket.grantWrite(this.sendEmailFunction, 'sent-emails/*');
     this.clientDetailsBucket.grantRead(this.getRecentEmailsFunction, 'sent-emails/*');
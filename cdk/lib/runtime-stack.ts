@@ -20,6 +20,7 @@ export interface RuntimeStackProps extends cdk.StackProps {
   listBondsArn: string;
   listCustomersArn: string;
   getCustomerArn: string;
+  customerQueryArn: string;
   getProductArn: string;
   searchMarketArn: string;
   sendEmailArn: string;
@@ -35,7 +36,7 @@ export class RuntimeStack extends cdk.Stack {
     // Upload agent source code to S3
     const sourceUpload = new s3deploy.BucketDeployment(this, 'UploadAgentSource', {
       sources: [s3deploy.Source.asset('../agent', {
-        exclude: ['__pycache__', '*.pyc', 'venv', 'local_data', 'test_*.py'],
+        exclude: ['__pycache__', '*.pyc', 'venv', 'local_data', 'test_*.py', 'benchmarks'],
       })],
       destinationBucket: props.sourceBucket,
       destinationKeyPrefix: 'agent/',
@@ -52,6 +53,7 @@ export class RuntimeStack extends cdk.Stack {
       props.listBondsArn,
       props.listCustomersArn,
       props.getCustomerArn,
+      props.customerQueryArn,
       props.getProductArn,
       props.searchMarketArn,
       props.sendEmailArn,
@@ -87,6 +89,7 @@ export class RuntimeStack extends cdk.Stack {
           LIST_BONDS_FUNCTION_ARN: props.listBondsArn,
           LIST_CUSTOMERS_FUNCTION_ARN: props.listCustomersArn,
           GET_CUSTOMER_FUNCTION_ARN: props.getCustomerArn,
+          CUSTOMER_QUERY_FUNCTION_ARN: props.customerQueryArn,
           GET_PRODUCT_FUNCTION_ARN: props.getProductArn,
           SEARCH_MARKET_FUNCTION_ARN: props.searchMarketArn,
           SEND_EMAIL_FUNCTION_ARN: props.sendEmailArn,
@@ -163,6 +163,26 @@ if (-not (Test-Path "frontend/dist")) {
 } else {
     Write-Host "      Placeholder already exists, skipping..." -ForegroundColor Gray
 }
+# The bond catalog manifest is uploaded with cdk/assets; rebuild it from the bond files
+Write-Host "      (Building bond catalog manifest from cdk/assets/bonds)" -ForegroundColor Gray
+Push-Location agent
+python -m utils.bond_manifest
+if ($LASTEXITCODE -ne 0) {
+    Pop-Location
+    Write-Host "      [ERROR] Failed to build the bond catalog manifest" -ForegroundColor Red
+    exit 1
+}
+Pop-Location
+# So is the customer store (NDJSON records + offset index); rebuild it from the customer database
+Write-Host "      (Building customer store from cdk/assets/customers)" -ForegroundColor Gray
+Push-Location agent
+python -m utils.customer_store ../cdk/assets/customers/bank-x-customers.json
+if ($LASTEXITCODE -ne 0) {
+    Pop-Location
+    Write-Host "      [ERROR] Failed to build the customer store" -ForegroundColor Red
+    exit 1
+}
+Pop-Location
 
 # Step 7: Bootstrap CDK (if needed)
 Write-Host "`n[7/10] Bootstrapping CDK environment..." -ForegroundColor Yellow
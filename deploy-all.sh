@@ -114,6 +114,12 @@ if [ ! -d "frontend/dist" ]; then
 else
     echo -e "\033[0;90m      Placeholder already exists, skipping...\033[0m"
 fi
+# The bond catalog manifest is uploaded with cdk/assets; rebuild it from the bond files
+echo -e "\033[0;90m      (Building bond catalog manifest from cdk/assets/bonds)\033[0m"
+(cd agent && python3 -m utils.bond_manifest)
+# So is the customer store (NDJSON records + offset index); rebuild it from the customer database
+echo -e "\033[0;90m      (Building customer store from cdk/assets/customers)\033[0m"
+(cd agent && python3 -m utils.customer_store ../cdk/assets/customers/bank-x-customers.json)
 
 # Step 7: Bootstrap CDK (if needed)
 echo -e "\n\033[0;33m[7/10] Bootstrapping CDK environment...\033[0m"
@@ -136,6 +136,16 @@ if ($LASTEXITCODE -eq 0) {
     Write-Host "      [ERROR] Failed to install agent dependencies" -ForegroundColor Red
     Write-Host "      Trying to continue anyway..." -ForegroundColor Yellow
 }
+# Rebuild the bond catalog manifest the local tools read (no-op when the bonds are unchanged)
+py -m utils.bond_manifest
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "      [WARNING] Failed to build the bond catalog manifest" -ForegroundColor Yellow
+}
+# Rebuild the customer store the local profile and listing tools read
+py -m utils.customer_store local_data/customers/bank-x-customers.json
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "      [WARNING] Failed to build the customer store" -ForegroundColor Yellow
+}
 Pop-Location
 
 # Install frontend dependencies if needed
@@ -89,6 +89,11 @@ if ! aws sts get-caller-identity > /dev/null 2>&1; then
     read
 fi
 
+# Rebuild the bond catalog manifest the local tools read (no-op when the bonds are unchanged)
+python -m utils.bond_manifest
+# Rebuild the customer store the local profile and listing tools read
+python -m utils.customer_store local_data/customers/bank-x-customers.json
+
 python strands_agent.py &
 BACKEND_PID=$!
 cd ..
@@ -0,0 +1,109 @@
+import json
+import os
+import logging
+import time
+from typing import Optional
+
+import data_access
+from customer_index import DEFAULT_PAGE_SIZE, CustomerIndex
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+
+def log(level: str, message: str, **meta):
+    logger.log(
+        logging.getLevelName(level.upper()),
+        json.dumps({**meta, 'level': level, 'message': message, 'timestamp': time.time()}),
+    )
+
+
+def build_response(status_code: int, request_id: str, payload: dict):
+    return {
+        'statusCode': status_code,
+        'body': json.dumps({'requestId': request_id, **payload})
+    }
+
+
+def load_index(request_id: str) -> Optional[CustomerIndex]:
+    """The index over the customer file, or None when there is none.
+
+    Built once per version of the file and kept with it in the data-access cache for the
+    life of the warm container; the customers/ listing's ETag confirms it is current.
+    """
+    try:
+        listing = dict(data_access.list_objects('customers'))
+    except data_access.DataNotFound:
+        return None
+    customer_file = next((name for name in listing if name.endswith('.json')), None)
+    if customer_file is None:
+        return None
+
+    def build(customers) -> CustomerIndex:
+        start = time.perf_counter()
+        index = CustomerIndex(customers)
+        log('info', 'customer-query index built', requestId=request_id, file=customer_file,
+            rows=index.size, durationMs=round((time.perf_counter() - start) * 1000, 2))
+        return index
+
+    return data_access.derived(f'customers/{customer_file}', 'query_index', build, etag=listing[customer_file])
+
+
+def lambda_handler(event, context):
+    request_id = getattr(context, 'aws_request_id', 'unknown')
+    event = event or {}
+    log('info', 'customer-query start', requestId=request_id)
+
+    if not data_access.direct():
+        return build_response(500, request_id, {
+            'errorCode': 'CONFIG_ERROR',
+            'message': 'S3_DATA_BUCKET is not configured',
+            'details': {},
+        })
+
+    filters = event.get('filters') or {}
+    if not isinstance(filters, dict):
+        return build_response(400, request_id, {
+            'errorCode': 'INVALID_FILTERS',
+            'message': 'filters must be an object mapping field names to conditions',
+            'details': {},
+        })
+
+    try:
+        index = load_index(request_id)
+        if index is None:
+            return build_response(404, request_id, {
+                'errorCode': 'CUSTOMER_DB_NOT_FOUND',
+                'message': 'No customer database file found',
+                'details': {},
+            })
+        result = index.query(
+            filters,
+            fields=event.get('fields'),
+            sort_by=event.get('sort_by'),
+            descending=bool(event.get('descending')),
+            limit=event.get('limit', DEFAULT_PAGE_SIZE),
+            offset=event.get('offset', 0),
+        )
+    except data_access.DataNotFound:
+        return build_response(404, request_id, {
+            'errorCode': 'CUSTOMER_DB_NOT_FOUND',
+            'message': 'Customer database not found',
+            'details': {},
+        })
+    except (ValueError, TypeError) as e:
+        return build_response(400, request_id, {
+            'errorCode': 'INVALID_QUERY',
+            'message': str(e),
+            'details': {'filters': filters},
+        })
+    except Exception as e:  # noqa: BLE001
+        log('error', 'customer-query failed', requestId=request_id, error=str(e))
+        return build_response(500, request_id, {
+            'errorCode': 'CUSTOMER_QUERY_ERROR',
+            'message': 'Failed to query customers',
+            'details': {'error': str(e)},
+        })
+
+    log('info', 'customer-query success', requestId=request_id, total=result['total'], returned=len(result['customers']))
+    return build_response(200, request_id, result)
@@ -1,21 +1,20 @@
 import json
-import boto3
 import os
 import logging
 import re
 import time
-from botocore.config import Config
+
+import data_access
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-READ_FILE_FUNCTION_ARN = os.environ.get('READ_FILE_FUNCTION_ARN', '')
-
-boto_config = Config(
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=5,
-    read_timeout=10,
-)
+# NDJSON customer store and its offset index - keep in step with agent/utils/customer_store.py
+CUSTOMER_STORE_PATH = 'customers/bank-x-customers.ndjson'
+CUSTOMER_INDEX_PATH = 'customers/bank-x-customers.ndjson.idx'
+CUSTOMER_DB_PATH = 'customers/bank-x-customers.json'
+# How long a warm container trusts its copy of the index before revalidating the ETag
+INDEX_TTL_SECONDS = float(os.environ.get('CUSTOMER_INDEX_TTL_SECONDS', '60'))
 
 
 def log(level: str, message: str, **meta):
@@ -36,14 +35,62 @@ def is_valid_customer_id(customer_id: str) -> bool:
     return bool(customer_id) and re.match(r'^CUST-[0-9]{3,}$', customer_id)
 
 
+def read_store_record(customer_id: str, force_index: bool = False):
+    """The customer's record via one ranged GET on the store, or None if the ID is not indexed."""
+    index = data_access.read_json(CUSTOMER_INDEX_PATH, max_age=0 if force_index else INDEX_TTL_SECONDS)
+    location = index['offsets'].get(customer_id)
+    if location is None:
+        return None
+    offset, length = location
+    try:
+        customer = json.loads(data_access.read_range(CUSTOMER_STORE_PATH, offset, length))
+    except ValueError:
+        customer = None
+    if not isinstance(customer, dict) or customer.get('customerId') != customer_id:
+        # The store was rewritten since the index was cached: revalidate it once
+        return None if force_index else read_store_record(customer_id, force_index=True)
+    return customer
+
+
+def store_lags() -> bool:
+    """True when the customer database has changed since the store was built from it.
+
+    The index records the database's ETag as S3 computes it for single-part uploads (the
+    MD5 of its bytes). An index without one, or a listing without ETags, cannot rule a
+    change out. Without a database there is nothing newer to read.
+    """
+    try:
+        listing = dict(data_access.list_objects('customers'))
+    except data_access.DataNotFound:
+        return False
+    db_name = CUSTOMER_DB_PATH[len('customers/'):]
+    if db_name not in listing:
+        return False
+    index = data_access.read_json(CUSTOMER_INDEX_PATH, max_age=INDEX_TTL_SECONDS)
+    return listing[db_name] is None or listing[db_name] != index.get('sourceEtag')
+
+
+def customers_by_id(customers) -> dict:
+    return {customer.get('customerId'): customer for customer in customers}
+
+
+def read_customer_db(customer_id: str):
+    """The customer from the JSON customer database, for deployments without the store.
+
+    The parsed database and its customerId -> record dict stay cached in the warm
+    container until the object changes.
+    """
+    return data_access.derived(CUSTOMER_DB_PATH, 'by_id', customers_by_id).get(customer_id)
+
+
 def lambda_handler(event, context):
     request_id = getattr(context, 'aws_request_id', 'unknown')
     customer_id = event.get('customer_id')
 
-    if not READ_FILE_FUNCTION_ARN:
+    if not data_access.configured():
         return build_response(500, request_id, {
             'errorCode': 'CONFIG_ERROR',
-            'message': 'READ_FILE_FUNCTION_ARN is not configured',
+            'message': 'S3_DATA_BUCKET or READ_FILE_FUNCTION_ARN must be configured',
             'details': {},
         })
 
@@ -57,36 +104,39 @@ def lambda_handler(event, context):
     log('info', 'get-customer start', requestId=request_id, customerId=customer_id)
 
     try:
-        lambda_client = boto3.client('lambda', config=boto_config)
-
-        response = lambda_client.invoke(
-            FunctionName=READ_FILE_FUNCTION_ARN,
-            InvocationType='RequestResponse',
-            Payload=json.dumps({'filename': 'customers/bank-x-customers.json'})
-        )
-
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-
-        if result.get('statusCode') != 200:
-            return build_response(404, request_id, {
-                'errorCode': 'CUSTOMER_DB_NOT_FOUND',
-                'message': 'Customer database not found',
-                'details': {},
-            })
-
-        customers = body.get('content', [])
-
-        for customer in customers:
-            if customer.get("customerId") == customer_id:
-                log('info', 'get-customer success', requestId=request_id, customerId=customer_id)
-                return build_response(200, request_id, {'customer': customer})
-
+        customer, source, store_read = None, 'store', False
+        if data_access.direct():
+            try:
+                customer, store_read = read_store_record(customer_id), True
+            except data_access.DataNotFound:
+                log('warning', 'customer store not found, reading the database', requestId=request_id)
+        if customer is None and (not store_read or store_lags()):
+            # Not in the store's index, or still mismatched after refreshing it, and the
+            # database has changed since the store was built: the database has the last word.
+            # While the store is current its index answers NOT_FOUND on its own.
+            if store_read:
+                log('warning', 'customer not in the store, which lags the database; reading the database',
+                    requestId=request_id, customerId=customer_id)
+            source = 'database'
+            try:
+                customer = read_customer_db(customer_id)
+            except data_access.DataNotFound:
+                if not store_read:
+                    raise
+        if customer is not None:
+            log('info', 'get-customer success', requestId=request_id, customerId=customer_id, source=source)
+            return build_response(200, request_id, {'customer': customer})
         return build_response(404, request_id, {
             'errorCode': 'NOT_FOUND',
             'message': f'Customer {customer_id} not found',
             'details': {'customer_id': customer_id},
         })
+    except data_access.DataNotFound:
+        return build_response(404, request_id, {
+            'errorCode': 'CUSTOMER_DB_NOT_FOUND',
+            'message': 'Customer database not found',
+            'details': {},
+        })
     except Exception as e:  # noqa: BLE001
         log('error', 'get-customer failed', requestId=request_id, customerId=customer_id, error=str(e))
         return build_response(500, request_id, {
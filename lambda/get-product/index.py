@@ -1,64 +1,125 @@
 import json
-import boto3
 import os
 import logging
-from botocore.config import Config
+import time
+from typing import Optional
+
+import data_access
+from bond_catalog import BondCatalog, legacy_slug
+from bond_manifest import read_manifest
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-READ_FILE_FUNCTION_ARN = os.environ.get('READ_FILE_FUNCTION_ARN', '')
+# How long a warm container answers from its catalog before reloading the bond files
+CATALOG_TTL_SECONDS = float(os.environ.get('CATALOG_TTL_SECONDS', '300'))
+
+
+def log(level: str, message: str, **meta):
+    logger.log(
+        logging.getLevelName(level.upper()),
+        json.dumps({**meta, 'level': level, 'message': message, 'timestamp': time.time()}),
+    )
+
+
+def build_response(status_code: int, request_id: str, payload: dict):
+    return {
+        'statusCode': status_code,
+        'body': json.dumps({'requestId': request_id, **payload})
+    }
+
+
+def read_bond_file(filename: str, request_id: str, etag: Optional[str] = None) -> Optional[dict]:
+    try:
+        bond = data_access.read_json(filename, etag=etag)
+    except data_access.DataNotFound:
+        return None
+    except ValueError as e:
+        log('warning', 'bond parse failed', requestId=request_id, filename=filename, error=str(e))
+        return None
+    return bond if isinstance(bond, dict) else None
+
+
+_catalog_cache = {'catalog': None, 'loaded': 0.0}
+
+
+def cached_catalog() -> Optional[BondCatalog]:
+    """The catalog this container loaded, while it is younger than CATALOG_TTL_SECONDS."""
+    if _catalog_cache['catalog'] is not None and time.time() - _catalog_cache['loaded'] < CATALOG_TTL_SECONDS:
+        return _catalog_cache['catalog']
+    return None
+
+
+def load_catalog(request_id: str) -> BondCatalog:
+    """Read the bond manifest, or every bond file, into a catalog kept for the warm invocations that follow."""
+    try:
+        objects = data_access.list_objects('bonds')
+    except data_access.DataNotFound:
+        objects = []
+    listing = {name: etag for name, etag in objects if name.endswith('.json')}
+    manifest = read_manifest(listing, request_id) if listing else None
+    if manifest is not None:
+        entries = [(name, manifest['bonds'][product_id]) for name, product_id in sorted(manifest['files'].items())]
+    else:
+        entries = []
+        for name, etag in listing.items():
+            # Files unchanged since the last load are confirmed by the listing's ETag, not re-read
+            bond = read_bond_file(f'bonds/{name}', request_id, etag)
+            if bond:
+                entries.append((name, bond))
+    catalog = BondCatalog(entries)
+    _catalog_cache.update(catalog=catalog, loaded=time.time())
+    log('info', 'bond catalog loaded', requestId=request_id, bonds=len(catalog), manifest=manifest is not None)
+    return catalog
 
-# Boto3 config with retries
-boto_config = Config(
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=5,
-    read_timeout=10
-)
 
 def lambda_handler(event, context):
     """Get detailed product information."""
+    request_id = getattr(context, 'aws_request_id', 'unknown')
+    product_name = (event or {}).get('product_name')
+
+    log('info', 'get-product start', requestId=request_id, productName=product_name)
+
+    if not product_name:
+        return build_response(400, request_id, {
+            'errorCode': 'MISSING_PRODUCT_NAME',
+            'message': 'product_name is required',
+            'details': {},
+        })
+
+    if not data_access.configured(listing=True):
+        return build_response(500, request_id, {
+            'errorCode': 'CONFIG_ERROR',
+            'message': 'S3_DATA_BUCKET, or READ_FILE_FUNCTION_ARN and LIST_FILES_FUNCTION_ARN, must be configured',
+            'details': {},
+        })
+
     try:
-        product_name = event.get('product_name')
-        
-        logger.info(f"Fetching product details: {product_name}")
-        
-        if not product_name:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'product_name is required'})
-            }
-        
-        lambda_client = boto3.client('lambda', config=boto_config)
-        
-        # Normalize product name to filename
-        filename = product_name.lower().replace(' ', '-').replace('uk-', '').replace('series-', '')
-        if not filename.endswith('.json'):
-            filename += '.json'
-        
-        # Read product file
-        response = lambda_client.invoke(
-            FunctionName=READ_FILE_FUNCTION_ARN,
-            InvocationType='RequestResponse',
-            Payload=json.dumps({'filename': filename})
-        )
-        
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-        
-        if result.get('statusCode') == 200:
-            return {
-                'statusCode': 200,
-                'body': json.dumps({'product': body.get('content')})
-            }
-        else:
-            return {
-                'statusCode': 404,
-                'body': json.dumps({'error': f'Product {product_name} not found'})
-            }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
-        }
+        catalog = cached_catalog()
+        if catalog is None:
+            # Cold container: a name that maps straight to its file needs one read, not the whole catalog
+            product = read_bond_file(f'bonds/{legacy_slug(product_name)}.json', request_id)
+            if product is not None:
+                return build_response(200, request_id, {'product': product})
+            catalog = load_catalog(request_id)
+
+        product, suggestions = catalog.resolve(product_name)
+        if product is None:
+            closest = f" Closest products: {', '.join(suggestions)}" if suggestions else ""
+            log('info', 'get-product not found', requestId=request_id, productName=product_name, suggestions=suggestions)
+            return build_response(404, request_id, {
+                'errorCode': 'PRODUCT_NOT_FOUND',
+                'message': f"Product '{product_name}' not found.{closest}",
+                'details': {'suggestions': suggestions},
+            })
+
+        log('info', 'get-product success', requestId=request_id, productId=product.get('productId'))
+        return build_response(200, request_id, {'product': product})
+    except Exception as e:  # noqa: BLE001
+        log('error', 'get-product failed', requestId=request_id, error=str(e))
+        return build_response(500, request_id, {
+            'errorCode': 'GET_PRODUCT_ERROR',
+            'message': 'Failed to read product details',
+            'details': {'error': str(e)},
+        })
@@ -1,21 +1,24 @@
+import heapq
 import json
-import boto3
 import os
 import logging
+import re
 import time
-from datetime import datetime
-from botocore.config import Config
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+import data_access
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-S3_BUCKET = os.environ.get('S3_DATA_BUCKET', '')
-
-boto_config = Config(
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=5,
-    read_timeout=10
-)
+# send-email writes sent-emails/YYYY-MM-DD/{timestamp}_{email}_{subject}.txt
+EMAILS_PREFIX = 'sent-emails/'
+_DATE_PREFIX = re.compile(r'^' + EMAILS_PREFIX + r'(\d{4}-\d{2}-\d{2})/$')
+# send-email reads the clock twice, so an email sent at midnight can carry the next day's
+# timestamp in the previous day's prefix
+PREFIX_SLACK = timedelta(minutes=5)
+LIST_PAGE_SIZE = 1000
 
 
 def log(level: str, message: str, **meta):
@@ -32,6 +35,75 @@ def build_response(status_code: int, request_id: str, payload: dict):
     }
 
 
+def list_pages(**kwargs) -> Iterator[dict]:
+    """Every page of a ListObjectsV2 listing of the data bucket."""
+    paginator = data_access.client('s3').get_paginator('list_objects_v2')
+    yield from paginator.paginate(Bucket=data_access.S3_DATA_BUCKET, MaxKeys=LIST_PAGE_SIZE, **kwargs)
+
+
+def date_prefixes() -> List[Tuple[datetime, str]]:
+    """(day, prefix) for every sent-emails/YYYY-MM-DD/ prefix, newest first: one request per 1,000 days."""
+    days = []
+    for page in list_pages(Prefix=EMAILS_PREFIX, Delimiter='/'):
+        for common in page.get('CommonPrefixes', []):
+            match = _DATE_PREFIX.match(common.get('Prefix', ''))
+            if match:
+                try:
+                    days.append((datetime.strptime(match.group(1), '%Y-%m-%d'), common['Prefix']))
+                except ValueError:
+                    continue
+    days.sort(reverse=True)
+    return days
+
+
+def parse_email_key(key: str) -> Optional[dict]:
+    """The email a sent-emails key records, or None if the key is not one send-email writes."""
+    parts = key.split('/')
+    if len(parts) < 3 or not parts[-1].endswith('.txt'):
+        return None
+    file_parts = parts[-1][:-4].split('_', 2)
+    if len(file_parts) < 3:
+        return None
+    timestamp_str, email, subject_slug = file_parts
+    try:
+        timestamp = datetime.strptime(timestamp_str, '%Y%m%dT%H%M%S')
+    except ValueError:
+        return None
+    return {'timestamp': timestamp, 'recipient': email, 'subject': subject_slug.replace('-', ' ').title()}
+
+
+def recent_emails(limit: int) -> Tuple[List[dict], int]:
+    """The ``limit`` most recent emails, newest first, and the number of day prefixes read.
+
+    Walks the date prefixes newest-first, keeping the newest ``limit`` emails seen in a
+    min-heap, and stops once every email left in older prefixes is older than all of them,
+    so the cost follows the days needed rather than the size of the archive.
+    """
+    newest: List[tuple] = []  # (timestamp, key, email), oldest on top
+    days = date_prefixes()
+    read = 0
+    for index, (_, prefix) in enumerate(days):
+        read += 1
+        for page in list_pages(Prefix=prefix):
+            for obj in page.get('Contents', []):
+                key = obj.get('Key', '')
+                email = parse_email_key(key)
+                if email is None:
+                    continue
+                item = (email['timestamp'], key, email)
+                if len(newest) < limit:
+                    heapq.heappush(newest, item)
+                elif item[:2] > newest[0][:2]:
+                    heapq.heapreplace(newest, item)
+        if len(newest) == limit and index + 1 < len(days):
+            # Emails in the next (older) prefix are timestamped before the end of its day
+            older_than = days[index + 1][0] + timedelta(days=1) + PREFIX_SLACK
+            if newest[0][0] >= older_than:
+                break
+    ordered = sorted(newest, key=lambda item: item[:2], reverse=True)
+    return [email for _, _, email in ordered], read
+
+
 def lambda_handler(event, context):
     request_id = getattr(context, 'aws_request_id', 'unknown')
     raw_limit = event.get('limit', 10)
@@ -52,7 +124,7 @@ def lambda_handler(event, context):
             'details': {'limit': raw_limit},
         })
 
-    if not S3_BUCKET:
+    if not data_access.direct():
         return build_response(500, request_id, {
             'errorCode': 'CONFIG_ERROR',
             'message': 'S3 bucket not configured',
@@ -62,37 +134,8 @@ def lambda_handler(event, context):
     log('info', 'get-recent-emails start', requestId=request_id, limit=limit)
 
     try:
-        s3_client = boto3.client('s3', config=boto_config)
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET,
-            Prefix='sent-emails/',
-            MaxKeys=100
-        )
-
-        email_files = []
-
-        for obj in response.get('Contents', []):
-            key = obj.get('Key', '')
-            parts = key.split('/')
-            if len(parts) < 3 or not parts[-1].endswith('.txt'):
-                continue
-            filename = parts[-1][:-4]
-            file_parts = filename.split('_', 2)
-            if len(file_parts) < 3:
-                continue
-            timestamp_str, email, subject_slug = file_parts
-            try:
-                timestamp = datetime.strptime(timestamp_str, '%Y%m%dT%H%M%S')
-                email_files.append({
-                    'timestamp': timestamp,
-                    'recipient': email,
-                    'subject': subject_slug.replace('-', ' ').title(),
-                })
-            except ValueError:
-                continue
-
-        email_files.sort(key=lambda x: x['timestamp'], reverse=True)
-        recent = email_files[:limit]
+        start = time.time()
+        recent, days_read = recent_emails(limit)
 
         result = [
             {
@@ -103,7 +146,8 @@ def lambda_handler(event, context):
             for item in recent
         ]
 
-        log('info', 'get-recent-emails success', requestId=request_id, count=len(result))
+        log('info', 'get-recent-emails success', requestId=request_id, count=len(result), daysRead=days_read,
+            durationMs=round((time.time() - start) * 1000))
         return build_response(200, request_id, {'emails': result})
     except Exception as e:  # noqa: BLE001
         log('error', 'get-recent-emails failed', requestId=request_id, error=str(e))
@@ -0,0 +1,62 @@
+"""Bond catalog manifest reader for the bond Lambdas (list-bonds, get-product)
+
+agent/utils/bond_manifest.py compiles every bond file into ``catalog/bond-catalog.json``
+at deploy time (keep the path and version in step with it). The manifest is trusted
+only while the bonds/ listing shows the files it was built from; otherwise callers read
+the bond files themselves.
+"""
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+import data_access
+
+BOND_MANIFEST_PATH = 'catalog/bond-catalog.json'
+BOND_MANIFEST_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+# The manifest this container last confirmed against the bonds/ listing
+_held = {'manifest': None}
+
+
+def _warn(message: str, **meta):
+    logger.warning(json.dumps({**meta, 'level': 'warning', 'message': message, 'timestamp': time.time()}))
+
+
+def read_manifest(listing: Dict[str, Optional[str]], request_id: str = 'unknown') -> Optional[dict]:
+    """The bond catalog manifest when it is deployed and matches ``listing`` (bond file -> ETag), else None.
+
+    The manifest records each file's ETag as S3 computes it for single-part uploads (the MD5
+    of the bytes), so a bond edited or replaced after the manifest was built shows in the
+    listing. Listings without ETags (through list-files) can only confirm the file names.
+    """
+    held = _held['manifest']
+    if held is not None and None not in listing.values() and listing == held.get('etags'):
+        # The bond files are still byte for byte those the held manifest was built from
+        return held
+    _held['manifest'] = None
+    try:
+        manifest = data_access.read_json(BOND_MANIFEST_PATH)
+    except data_access.DataNotFound:
+        return None
+    except Exception as e:  # noqa: BLE001
+        _warn('bond manifest unreadable', requestId=request_id, error=str(e))
+        return None
+    if not isinstance(manifest, dict) or manifest.get('version') != BOND_MANIFEST_VERSION:
+        return None
+    if listing and None not in listing.values():
+        current = listing == manifest.get('etags')
+    else:
+        current = set(listing) == set(manifest.get('files', ()))
+    if not current:
+        _warn('bond manifest out of date', requestId=request_id)
+        return None
+    _held['manifest'] = manifest
+    return manifest
+
+
+def clear():
+    """Forget the held manifest (tests and benchmarks, alongside data_access.clear_cache)."""
+    _held['manifest'] = None
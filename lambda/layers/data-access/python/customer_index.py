@@ -0,0 +1,195 @@
+"""Customer index - inverted and sorted indexes for segment queries over the customer book
+
+The customer-query Lambda imports this module from the data-access layer
+(lambda/layers/data-access/python/customer_index.py), which must stay an exact copy.
+"""
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Matched by value, one row bitmap per value; multi-valued fields match on any value
+CATEGORICAL_FIELDS = ('riskTolerance', 'preferredSectors', 'investmentGoals', 'interestedInBonds', 'accountStatus', 'liquidityNeeds')
+# Matched by inclusive range ({"min": ..., "max": ...}); lastContact is an ISO date
+RANGE_FIELDS = ('portfolioValue', 'annualIncome', 'investmentHorizon', 'lastContact')
+DATE_FIELDS = ('lastContact',)
+
+# Fields of each customer in the returned page unless ``fields`` is given
+QUERY_SUMMARY_FIELDS = ('customerId', 'name', 'email')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+MAX_IDS = 1000
+# Each range index keeps a bitmap per 1/RANGE_BUCKETS of its sorted rows, so a range
+# query only walks the rows of its two partial buckets
+RANGE_BUCKETS = 64
+
+_NONZERO_BYTE = re.compile(b'[^\x00]')
+
+
+def _term(value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value).lower()
+
+
+def _bitmap(rows: Iterable[int], size: int) -> int:
+    """Bitmap (bit r set for each row r) built in a bytearray: O(rows), not O(rows × size)."""
+    buffer = bytearray((size + 7) // 8)
+    for row in rows:
+        buffer[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _flags_bitmap(flags: List[bool]) -> int:
+    """Bitmap from one flag per row, via a binary string (row 0 is the last digit)."""
+    return int(''.join(['1' if flag else '0' for flag in reversed(flags)]) or '0', 2)
+
+
+class _RangeIndex:
+    """Rows sorted by one field's value, plus prefix bitmaps at every bucket boundary."""
+
+    def __init__(self, keys: list, rows: List[int], size: int):
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.rows = [rows[i] for i in order]
+        self.step = max(1, -(-len(keys) // RANGE_BUCKETS))
+        buffer = bytearray((size + 7) // 8)
+        self.prefixes = [0]
+        for start in range(0, len(self.rows), self.step):
+            for row in self.rows[start:start + self.step]:
+                buffer[row >> 3] |= 1 << (row & 7)
+            if start + self.step <= len(self.rows):
+                self.prefixes.append(int.from_bytes(buffer, 'little'))
+        # Every row that has a value for the field
+        self.covered = int.from_bytes(buffer, 'little')
+        self.size = size
+
+    def between(self, low=None, high=None) -> int:
+        start = 0 if low is None else bisect.bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect.bisect_right(self.keys, high)
+        if start >= end:
+            return 0
+        first, last = -(-start // self.step), end // self.step
+        if first >= last:
+            return _bitmap(self.rows[start:end], self.size)
+        full = self.prefixes[last] ^ self.prefixes[first]
+        edges = self.rows[start:first * self.step] + self.rows[last * self.step:end]
+        return full | _bitmap(edges, self.size) if edges else full
+
+
+class CustomerIndex:
+    """Inverted indexes on the categorical fields and sorted indexes on the range fields.
+
+    Row sets are Python ints used as bitmaps, so AND/OR across filters and the match
+    count run in C: at a million customers each bitmap is 125 KB. A query returns the
+    total count, the matching IDs (up to ``MAX_IDS``) and a projected page of records.
+    """
+
+    def __init__(self, customers: Iterable[dict]):
+        self.records: List[dict] = list(customers)
+        self.size = len(self.records)
+        # Built a column at a time: list comprehensions and int(binary, 2) keep the per-row
+        # work in C, which matters at a million rows
+        self.inverted: Dict[str, Dict[str, int]] = {}
+        for field in CATEGORICAL_FIELDS:
+            column = [customer.get(field) for customer in self.records]
+            terms = self.inverted[field] = {}
+            if any(value.__class__ is list for value in column):
+                by_value: Dict[object, List[int]] = {}
+                for row, value in enumerate(column):
+                    for item in value if value.__class__ is list else () if value is None else (value,):
+                        by_value.setdefault(item, []).append(row)
+                for value, rows in by_value.items():
+                    term = _term(value)
+                    terms[term] = terms.get(term, 0) | _bitmap(rows, self.size)
+            else:
+                for value in set(column) - {None}:
+                    term = _term(value)
+                    terms[term] = terms.get(term, 0) | _flags_bitmap([item == value for item in column])
+        self.ranges: Dict[str, _RangeIndex] = {}
+        for field in RANGE_FIELDS:
+            column = [customer.get(field) for customer in self.records]
+            types = (str,) if field in DATE_FIELDS else (int, float)
+            rows = [row for row, value in enumerate(column) if value.__class__ in types]
+            self.ranges[field] = _RangeIndex([column[row] for row in rows], rows, self.size)
+        self.all_rows = (1 << self.size) - 1
+
+    def values(self, field: str) -> List[str]:
+        """The indexed values of a categorical field."""
+        return sorted(self.inverted.get(field, {}))
+
+    def _match(self, field: str, condition) -> int:
+        if field in CATEGORICAL_FIELDS:
+            wanted = condition if isinstance(condition, list) else [condition]
+            terms = self.inverted[field]
+            matched = 0
+            for value in wanted:
+                matched |= terms.get(_term(value), 0)
+            return matched
+        if field in RANGE_FIELDS:
+            cast = str if field in DATE_FIELDS else float
+            if isinstance(condition, dict):
+                low, high = condition.get('min'), condition.get('max')
+            else:
+                low = high = condition
+            return self.ranges[field].between(
+                None if low is None else cast(low), None if high is None else cast(high),
+            )
+        raise ValueError(f"Unknown filter field '{field}'. Filterable fields: {', '.join(CATEGORICAL_FIELDS + RANGE_FIELDS)}")
+
+    def _ordered_rows(self, matched: int, sort_by: Optional[str], descending: bool):
+        bits = matched.to_bytes((self.size + 7) // 8, 'little')
+        if sort_by is None:
+            # Skip empty bytes at C speed, then expand each set bit
+            for found in _NONZERO_BYTE.finditer(bits):
+                base, byte = found.start() * 8, bits[found.start()]
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + bit
+            return
+        if sort_by not in self.ranges:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Sortable fields: {', '.join(RANGE_FIELDS)}")
+        index = self.ranges[sort_by]
+        rows = reversed(index.rows) if descending else index.rows
+        for row in rows:
+            if bits[row >> 3] >> (row & 7) & 1:
+                yield row
+        # Customers without the field come last
+        unsorted = matched & ~index.covered
+        if unsorted:
+            yield from self._ordered_rows(unsorted, None, False)
+
+    def query(self, filters: Optional[dict] = None, fields: Optional[Iterable[str]] = None, sort_by: Optional[str] = None,
+              descending: bool = False, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0, max_ids: int = MAX_IDS) -> dict:
+        """Customers matching every filter (AND across fields, any listed value within one).
+
+        ``filters`` maps a field to a value or list of values (categorical fields) or to a
+        value or ``{"min": ..., "max": ...}`` (range fields). Returns the total count, the
+        matching IDs from ``offset`` (at most ``max_ids``), a page of ``limit`` records
+        projected to ``fields``, and the offset of the next page (None on the last page).
+        """
+        matched = self.all_rows
+        for field, condition in (filters or {}).items():
+            matched &= self._match(field, condition)
+            if not matched:
+                break
+        total = matched.bit_count()
+        limit = max(0, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+        fields = list(dict.fromkeys(['customerId', *(fields or QUERY_SUMMARY_FIELDS)]))
+
+        wanted = max(limit, max_ids)
+        rows = []
+        if matched and offset < total:
+            for position, row in enumerate(self._ordered_rows(matched, sort_by, descending)):
+                if position >= offset:
+                    rows.append(row)
+                    if len(rows) >= wanted:
+                        break
+        records = [self.records[row] for row in rows]
+        next_offset = offset + limit
+        return {
+            'total': total,
+            'customerIds': [record.get('customerId') for record in records[:max_ids]],
+            'customers': [{field: record[field] for field in fields if field in record} for record in records[:limit]],
+            'nextOffset': next_offset if next_offset < total else None,
+        }
@@ -0,0 +1,148 @@
+"""Customer matching - which customers suit a bond, and why (one pass over the customer book)
+
+The list-customers Lambda imports this module from the data-access layer
+(lambda/layers/data-access/python/customer_matching.py), which must stay an exact copy,
+so it imports nothing from the rest of utils.
+"""
+import heapq
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# Highest bond riskRating (1-10) each riskTolerance accepts
+RISK_CEILINGS = {'low': 3, 'medium': 6, 'high': 10}
+# Customer sector preferences that bonds describe with other words
+SECTOR_ALIASES = {'green': {'green', 'renewable energy'}}
+# Customer fields returned for each match
+MATCH_SUMMARY_FIELDS = ('customerId', 'name', 'email', 'portfolioValue', 'riskTolerance')
+
+_PERCENT = re.compile(r'(\d+(?:\.\d+)?)')
+
+
+def _percent(value) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _PERCENT.search(str(value or ''))
+    return float(match.group(1)) if match else None
+
+
+class BondMatchCriteria:
+    """The bond-side facts the matching rules need, computed once per bond.
+
+    ``to_payload``/``from_payload`` carry them to the list-customers Lambda, which applies
+    these rules server-side.
+    """
+
+    def __init__(self, product_id: str, min_investment: float, risk_rating: float, goals: Iterable[str], sectors: Iterable[str]):
+        self.product_id = product_id
+        self.min_investment = min_investment
+        self.risk_rating = risk_rating
+        self.goals = frozenset(goals)
+        self.sectors = frozenset(sectors)
+
+    @classmethod
+    def from_bond(cls, bond: dict) -> 'BondMatchCriteria':
+        risk = float(bond.get('riskRating') or 0)
+        bond_yield = _percent(bond.get('yield')) or 0.0
+        goals = set()
+        if risk <= 3:
+            goals.add('capital preservation')
+        if bond.get('couponRate') or bond.get('couponFrequency'):
+            goals.add('income generation')
+        if risk >= 4 or bond_yield >= 5.0:
+            goals.update(('growth', 'capital appreciation'))
+        sectors = {str(s).lower() for s in bond.get('sectorExposure') or []}
+        sectors.add(str(bond.get('type') or '').lower().replace('_bond', '').replace('_', ' '))
+        return cls(bond.get('productId'), float(bond.get('minInvestment') or 0), risk, goals, sectors)
+
+    def to_payload(self) -> dict:
+        return {
+            'productId': self.product_id,
+            'minInvestment': self.min_investment,
+            'riskRating': self.risk_rating,
+            'goals': sorted(self.goals),
+            'sectors': sorted(self.sectors),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> 'BondMatchCriteria':
+        return cls(payload.get('productId'), float(payload.get('minInvestment') or 0), float(payload.get('riskRating') or 0),
+                   payload.get('goals') or [], payload.get('sectors') or [])
+
+
+def _alignment(customer: dict, criteria: BondMatchCriteria) -> Optional[Tuple[List[str], List[str]]]:
+    """The aligned (goals, sectors) if ``customer`` suits the bond, else None.
+
+    Required: interested in bonds, portfolio covers the minimum investment, and risk
+    tolerance allows the bond's risk rating. Then at least one investment goal or
+    preferred sector must align with the bond.
+    """
+    if customer.get('interestedInBonds') is not True:
+        return None
+    portfolio = customer.get('portfolioValue') or 0
+    if portfolio < criteria.min_investment:
+        return None
+    tolerance = str(customer.get('riskTolerance') or '').lower()
+    if criteria.risk_rating > RISK_CEILINGS.get(tolerance, 0):
+        return None
+
+    goals = sorted({str(g).lower() for g in customer.get('investmentGoals') or []} & criteria.goals)
+    sectors = sorted(
+        sector for sector in {str(s).lower() for s in customer.get('preferredSectors') or []}
+        if criteria.sectors & SECTOR_ALIASES.get(sector, {sector})
+    )
+    if not goals and not sectors:
+        return None
+    return goals, sectors
+
+
+def _reasons(customer: dict, criteria: BondMatchCriteria, goals: List[str], sectors: List[str]) -> List[str]:
+    portfolio = customer.get('portfolioValue') or 0
+    tolerance = str(customer.get('riskTolerance') or '').lower()
+    reasons = [
+        'interested in bonds',
+        f"portfolio £{portfolio:,.0f} covers £{criteria.min_investment:,.0f} minimum",
+        f"{tolerance} risk tolerance allows riskRating {criteria.risk_rating:g}",
+    ]
+    if goals:
+        reasons.append(f"goals: {', '.join(goals)}")
+    if sectors:
+        reasons.append(f"sectors: {', '.join(sectors)}")
+    return reasons
+
+
+def match_reasons(customer: dict, criteria: BondMatchCriteria) -> Optional[List[str]]:
+    """Why ``customer`` suits the bond, or None if they do not."""
+    aligned = _alignment(customer, criteria)
+    return None if aligned is None else _reasons(customer, criteria, *aligned)
+
+
+def match_customers(customers: Iterable[dict], criteria: BondMatchCriteria, limit: int = 50) -> dict:
+    """Single pass over ``customers``: the matches with reasons (largest portfolios first, at most ``limit``) and counts."""
+    counts = {'scanned': 0, 'matched': 0}
+
+    def matches():
+        for customer in customers:
+            counts['scanned'] += 1
+            aligned = _alignment(customer, criteria)
+            if aligned is not None:
+                counts['matched'] += 1
+                yield customer, aligned
+
+    # Bounded heap: memory stays O(limit) however large the book is, and reasons are
+    # only written for the customers returned
+    top = heapq.nsmallest(
+        max(0, limit), matches(),
+        key=lambda item: (-(item[0].get('portfolioValue') or 0), str(item[0].get('customerId'))),
+    )
+    if limit <= 0:
+        # nsmallest does not consume the iterator for n=0; the counts still need a full pass
+        for _ in matches():
+            pass
+    return {
+        'matchedCustomers': [
+            {**{field: customer.get(field) for field in MATCH_SUMMARY_FIELDS}, 'reasons': _reasons(customer, criteria, *aligned)}
+            for customer, aligned in top
+        ],
+        'matchedCount': counts['matched'],
+        'scannedCount': counts['scanned'],
+    }
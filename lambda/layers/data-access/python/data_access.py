@@ -0,0 +1,297 @@
+"""Data access for the Python tool Lambdas - client-details/ objects straight from S3
+
+Shipped as a Lambda layer (lambda/layers/data-access, mounted at /opt/python), so the
+tool Lambdas share one implementation. Paths are relative to ``client-details/``, as
+for the read-file Lambda: ``customers/bank-x-customers.json``, ``bonds/<file>.json``.
+
+With ``S3_DATA_BUCKET`` set, reads go straight to S3 through one pooled client per
+container: parsed objects are cached for as long as the container stays warm and
+revalidated with a conditional GET (If-None-Match), or against the ETags of a directory
+listing, once they are older than the caller's ``max_age``; ranged reads and line
+streaming read only what they need. Without it, reads fall back to the read-file and
+list-files Lambdas, cached for ``max_age``.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+S3_DATA_BUCKET = os.environ.get('S3_DATA_BUCKET', '')
+READ_FILE_FUNCTION_ARN = os.environ.get('READ_FILE_FUNCTION_ARN', '')
+LIST_FILES_FUNCTION_ARN = os.environ.get('LIST_FILES_FUNCTION_ARN', '')
+DATA_PREFIX = 'client-details/'
+# How long a cached object is served before it is revalidated with its ETag
+DEFAULT_MAX_AGE_SECONDS = float(os.environ.get('DATA_CACHE_TTL_SECONDS', '60'))
+# Parsed objects kept per container, least recently used evicted first (by object size)
+MAX_CACHED_BYTES = int(os.environ.get('DATA_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+boto_config = Config(
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=10,
+    max_pool_connections=int(os.environ.get('DATA_POOL_CONNECTIONS', '32')),
+)
+
+_NOT_FOUND_CODES = ('NoSuchKey', '404', 'NotFound')
+_NOT_MODIFIED_CODES = ('304', 'NotModified')
+
+
+class DataNotFound(Exception):
+    """The object does not exist (or read-file could not return it)."""
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def client(service: str):
+    """The container's boto3 client for ``service``, created once and shared by every invocation."""
+    with _clients_lock:
+        if service not in _clients:
+            _clients[service] = boto3.client(service, config=boto_config)
+        return _clients[service]
+
+
+def use_client(service: str, stand_in):
+    """Replace the shared client for ``service``, e.g. with a local S3 stand-in in tests and benchmarks."""
+    with _clients_lock:
+        _clients[service] = stand_in
+
+
+def direct() -> bool:
+    """True when reads go straight to S3 rather than through read-file."""
+    return bool(S3_DATA_BUCKET)
+
+
+def configured(listing: bool = False) -> bool:
+    """True when reads (and with ``listing``, directory listings) have somewhere to go."""
+    return direct() or (bool(READ_FILE_FUNCTION_ARN) and (not listing or bool(LIST_FILES_FUNCTION_ARN)))
+
+
+def s3_key(path: str) -> str:
+    return DATA_PREFIX + path.lstrip('/')
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get('Error', {}).get('Code'))
+
+
+def _get_object(path: str, **kwargs) -> dict:
+    try:
+        return client('s3').get_object(Bucket=S3_DATA_BUCKET, Key=s3_key(path), **kwargs)
+    except ClientError as e:
+        if _error_code(e) in _NOT_FOUND_CODES:
+            raise DataNotFound(path) from e
+        raise
+
+
+def _invoke(function_arn: str, path: str) -> str:
+    """The body of a read-file or list-files response, still serialized."""
+    response = client('lambda').invoke(
+        FunctionName=function_arn,
+        InvocationType='RequestResponse',
+        Payload=json.dumps({'filename': path}),
+    )
+    result = json.loads(response['Payload'].read())
+    if result.get('statusCode') != 200:
+        raise DataNotFound(path)
+    return result.get('body', '{}')
+
+
+_listings = {}
+
+
+def list_objects(directory: str, max_age: Optional[float] = None) -> List[Tuple[str, Optional[str]]]:
+    """(name, ETag) of the objects directly under ``directory`` (e.g. 'bonds').
+
+    Listings are cached for ``max_age`` like objects. Their ETags let callers revalidate
+    every cached object in the directory with this one request (see read_json); through
+    list-files there are none, and the ETag is None.
+    """
+    max_age = DEFAULT_MAX_AGE_SECONDS if max_age is None else max_age
+    cached = _listings.get(directory)
+    if cached is not None and time.time() - cached[0] < max_age:
+        return cached[1]
+    if not direct():
+        objects = [(name, None) for name in json.loads(_invoke(LIST_FILES_FUNCTION_ARN, directory)).get('files', [])]
+    else:
+        prefix = s3_key(directory.rstrip('/') + '/')
+        objects = []
+        for page in client('s3').get_paginator('list_objects_v2').paginate(
+                Bucket=S3_DATA_BUCKET, Prefix=prefix, Delimiter='/'):
+            objects.extend((obj['Key'][len(prefix):], obj.get('ETag'))
+                           for obj in page.get('Contents', []) if obj['Key'] != prefix)
+    _listings[directory] = (time.time(), objects)
+    return objects
+
+
+def list_files(directory: str, max_age: Optional[float] = None) -> List[str]:
+    """Names of the objects directly under ``directory``."""
+    return [name for name, _ in list_objects(directory, max_age)]
+
+
+class _ObjectCache:
+    """Parsed objects by path with their ETag, size, values derived from them and when
+    they were last confirmed current."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[str, dict]' = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[dict]:
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None:
+                self.entries.move_to_end(path)
+            return entry
+
+    def put(self, path: str, etag: Optional[str], value, size: int) -> dict:
+        """A new entry for ``value``, kept unless it alone exceeds the budget."""
+        entry = {'etag': etag, 'value': value, 'size': size, 'checked': time.time(), 'derived': {}}
+        self.discard(path)
+        with self.lock:
+            if size > self.max_bytes:
+                return entry
+            self.entries[path] = entry
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted['size']
+        return entry
+
+    def discard(self, path: str):
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old is not None:
+                self.size -= old['size']
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+_cache = _ObjectCache(MAX_CACHED_BYTES)
+# When paths were last found missing, so absent optional objects are not asked for on every call
+_missing = {}
+stats = {'gets': 0, 'notModified': 0, 'hits': 0}
+
+
+def _parse_lines(data: bytes) -> List[dict]:
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def _load(path: str, max_age: Optional[float], etag: Optional[str] = None, lines: bool = False) -> dict:
+    """The cache entry for ``path``, fetched or revalidated when it is older than ``max_age``."""
+    max_age = DEFAULT_MAX_AGE_SECONDS if max_age is None else max_age
+    entry = _cache.get(path)
+    now = time.time()
+    if entry is None and etag is None and now - _missing.get(path, float('-inf')) < max_age:
+        stats['hits'] += 1
+        raise DataNotFound(path)
+    if entry is not None and ((etag is not None and etag == entry['etag']) or now - entry['checked'] < max_age):
+        # A listing that shows the ETag unchanged confirms the copy as well as a 304 would
+        stats['hits'] += 1
+        entry['checked'] = now
+        return entry
+
+    if not direct():
+        if lines:
+            raise RuntimeError('NDJSON reads need S3_DATA_BUCKET')
+        # read-file has no conditional reads: a stale copy is fetched again in full
+        stats['gets'] += 1
+        _missing.pop(path, None)
+        try:
+            body = _invoke(READ_FILE_FUNCTION_ARN, path)
+        except DataNotFound:
+            _missing[path] = now
+            raise
+        content = json.loads(body).get('content')
+        value = json.loads(content) if isinstance(content, (str, bytes)) else content
+        return _cache.put(path, None, value, len(body))
+
+    _missing.pop(path, None)
+    request = {'IfNoneMatch': entry['etag']} if entry is not None and entry['etag'] else {}
+    stats['gets'] += 1
+    try:
+        obj = _get_object(path, **request)
+    except ClientError as e:
+        if entry is None or _error_code(e) not in _NOT_MODIFIED_CODES:
+            raise
+        stats['notModified'] += 1
+        entry['checked'] = now
+        return entry
+    except DataNotFound:
+        _cache.discard(path)
+        _missing[path] = now
+        raise
+    if lines and obj.get('ContentLength', 0) > _cache.max_bytes:
+        # Too large to keep: stream it instead of holding it all
+        _cache.discard(path)
+        return {'etag': obj.get('ETag'), 'value': (json.loads(line) for line in obj['Body'].iter_lines() if line),
+                'derived': {}}
+    body = obj['Body'].read()
+    value = _parse_lines(body) if lines else json.loads(body)
+    return _cache.put(path, obj.get('ETag'), value, len(body))
+
+
+def read_json(path: str, max_age: Optional[float] = None, etag: Optional[str] = None):
+    """The parsed JSON object at ``path``, from the container cache when it is current.
+
+    A cached copy younger than ``max_age`` seconds (default DATA_CACHE_TTL_SECONDS), or
+    whose ETag is ``etag`` (from list_objects), is returned without a request; an older
+    one is revalidated with If-None-Match, so an unchanged object costs one empty 304
+    response. Through read-file, stale copies are read again in full. Cached values are
+    shared across invocations and must be treated as read-only.
+    Raises DataNotFound when the object does not exist.
+    """
+    return _load(path, max_age, etag)['value']
+
+
+def read_records(path: str, max_age: Optional[float] = None, etag: Optional[str] = None) -> Iterable[dict]:
+    """The records of an NDJSON object, cached like read_json (direct S3 only).
+
+    An object larger than the whole cache is streamed a line at a time instead.
+    """
+    return _load(path, max_age, etag, lines=True)['value']
+
+
+def derived(path: str, name: str, build: Callable, max_age: Optional[float] = None, etag: Optional[str] = None):
+    """``build(read_json(path))``, computed once per version of the object and kept with it.
+
+    For lookups over a cached object, e.g. a dict by ID over a JSON array of records.
+    ``max_age`` and ``etag`` revalidate the object as for read_json.
+    """
+    entry = _load(path, max_age, etag)
+    if name not in entry['derived']:
+        entry['derived'][name] = build(entry['value'])
+    return entry['derived'][name]
+
+
+def read_range(path: str, offset: int, length: int) -> bytes:
+    """``length`` bytes from ``offset`` with one ranged GET (direct S3 only)."""
+    if not direct():
+        raise RuntimeError('Ranged reads need S3_DATA_BUCKET')
+    return _get_object(path, Range=f'bytes={offset}-{offset + length - 1}')['Body'].read()
+
+
+def read_lines(path: str) -> Iterator[dict]:
+    """The records of an NDJSON object, streamed a line at a time (direct S3 only)."""
+    if not direct():
+        raise RuntimeError('Streaming reads need S3_DATA_BUCKET')
+    body = _get_object(path)['Body']
+    return (json.loads(line) for line in body.iter_lines() if line)
+
+
+def clear_cache():
+    _cache.clear()
+    _listings.clear()
+    _missing.clear()
@@ -1,21 +1,25 @@
+import hashlib
 import json
-import boto3
 import os
 import logging
 import time
-from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import data_access
+from bond_manifest import read_manifest
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-READ_FILE_FUNCTION_ARN = os.environ.get('READ_FILE_FUNCTION_ARN', '')
-LIST_FILES_FUNCTION_ARN = os.environ.get('LIST_FILES_FUNCTION_ARN', '')
-
-boto_config = Config(
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=5,
-    read_timeout=10
-)
+BOND_SUMMARY_FIELDS = ('productId', 'name', 'type', 'yield', 'maturity', 'minInvestment', 'creditRating')
+# Bond files read at once; each read is an S3 GET (or a read-file invocation)
+READ_CONCURRENCY = int(os.environ.get('BOND_READ_CONCURRENCY', '16'))
+# Time kept back from the Lambda deadline to page the bonds and respond
+RESPONSE_RESERVE_MS = int(os.environ.get('RESPONSE_RESERVE_MS', '1500'))
+# Unread files listed in the response; the count covers the rest
+MAX_UNREAD_REPORTED = 20
 
 
 def log(level: str, message: str, **meta):
@@ -32,97 +36,170 @@ def build_response(status_code: int, request_id: str, payload: dict):
     }
 
 
-def get_lambda_client():
-    return boto3.client('lambda', config=boto_config)
+def read_bond(filename: str, request_id: str, etag: Optional[str] = None) -> Tuple[Optional[dict], Optional[str]]:
+    """(bond, None), or (None, why it could not be read). A cached bond whose ETag is ``etag`` costs no request."""
+    try:
+        bond = data_access.read_json(filename, etag=etag)
+    except data_access.DataNotFound:
+        log('warning', 'bond file not readable', requestId=request_id, filename=filename)
+        return None, 'read failed'
+    except ValueError as parse_err:
+        log('warning', 'bond parse failed', requestId=request_id, filename=filename, error=str(parse_err))
+        return None, 'invalid JSON'
+    except Exception as e:  # noqa: BLE001
+        log('error', 'bond read failed', requestId=request_id, filename=filename, error=str(e))
+        return None, 'read failed'
+    if not isinstance(bond, dict) or not bond:
+        return None, 'read failed'
+    return bond, None
+
+
+def read_bonds(bond_files: List[str], request_id: str, timeout_s: Optional[float] = None,
+               etags: Optional[dict] = None) -> Tuple[List[dict], List[dict]]:
+    """Read the bond files ``READ_CONCURRENCY`` at a time, giving up on any still running after ``timeout_s``.
+
+    ``etags`` (filename -> ETag, from the listing) lets unchanged cached bonds skip their GET.
+    Returns the bonds in file order and the files that could not be read, each with the reason.
+    """
+    etags = etags or {}
+    executor = ThreadPoolExecutor(max_workers=max(1, READ_CONCURRENCY), thread_name_prefix='read-bond')
+    try:
+        futures = [executor.submit(read_bond, filename, request_id, etags.get(filename))
+                   for filename in bond_files]
+        wait(futures, timeout=timeout_s)
+    finally:
+        # Reads still queued when the deadline passes are dropped rather than waited for
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    bonds, unread = [], []
+    for filename, future in zip(bond_files, futures):
+        if not future.done() or future.cancelled():
+            unread.append({'filename': filename, 'reason': 'deadline exceeded'})
+            continue
+        bond, reason = future.result()
+        if bond is None:
+            unread.append({'filename': filename, 'reason': reason})
+        else:
+            bonds.append(bond)
+    return bonds, unread
 
 
-def get_file_content(lambda_client, filename, request_id: str):
-    try:
-        response = lambda_client.invoke(
-            FunctionName=READ_FILE_FUNCTION_ARN,
-            InvocationType='RequestResponse',
-            Payload=json.dumps({'filename': filename})
-        )
+def manifest_records(manifest: dict, event: dict, fields) -> List[dict]:
+    """The manifest's bonds for this request: the prebuilt summaries when the page needs no other
+    field, only the top of the sellability ranking for a first page by sellabilityRank."""
+    sort_by = event.get('sort_by')
+    if sort_by == 'sellabilityRank' and not event.get('descending') and not event.get('cursor'):
+        limit = max(1, min(int(event.get('limit') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        return [manifest['bonds'][product_id] for product_id in manifest['sellability'][:limit + 1]]
+    if fields == BOND_SUMMARY_FIELDS and (sort_by is None or sort_by in BOND_SUMMARY_FIELDS):
+        return manifest['summaries']
+    return list(manifest['bonds'].values())
 
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
 
-        if result.get('statusCode') == 200:
-            return body.get('content', {})
+# The bonds as last read by this container, with the listing (file -> ETag) they were read at
+_bonds_cache = {'listing': None, 'bonds': None}
 
-        log('warning', 'read-file returned non-200', requestId=request_id, filename=filename, statusCode=result.get('statusCode'), error=body.get('error'))
-        return None
-    except Exception as e:  # noqa: BLE001
-        log('error', 'read-file invocation failed', requestId=request_id, filename=filename, error=str(e))
+
+def cached_bonds(listing: dict) -> Optional[List[dict]]:
+    """The bonds this container read, if the listing shows no bond file added, removed or changed."""
+    if _bonds_cache['listing'] == listing and all(etag is not None for etag in listing.values()):
+        return _bonds_cache['bonds']
+    return None
+
+
+def catalog_version(listing: Dict[str, Optional[str]]) -> str:
+    """A digest of the bonds/ listing (file -> ETag) that changes whenever a bond file does.
+
+    The agent's tool cache switches to it, so callers cannot choose when that cache is
+    flushed. Listings without ETags (through list-files) only follow the file names.
+    """
+    digest = hashlib.sha256()
+    for name, etag in sorted(listing.items()):
+        digest.update(f'{name}\x00{etag or ""}\n'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def read_timeout_seconds(context) -> Optional[float]:
+    """Time left for the reads: the Lambda's remaining time less RESPONSE_RESERVE_MS."""
+    remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if remaining is None:
         return None
+    return max(0.0, (remaining() - RESPONSE_RESERVE_MS) / 1000)
 
 
 def lambda_handler(event, context):
     request_id = getattr(context, 'aws_request_id', 'unknown')
 
-    if not READ_FILE_FUNCTION_ARN:
+    if not data_access.configured(listing=True):
         return build_response(500, request_id, {
             'errorCode': 'CONFIG_ERROR',
-            'message': 'READ_FILE_FUNCTION_ARN is not configured',
+            'message': 'S3_DATA_BUCKET, or READ_FILE_FUNCTION_ARN and LIST_FILES_FUNCTION_ARN, must be configured',
             'details': {},
         })
 
-    if not LIST_FILES_FUNCTION_ARN:
-        return build_response(500, request_id, {
-            'errorCode': 'CONFIG_ERROR',
-            'message': 'LIST_FILES_FUNCTION_ARN is not configured',
-            'details': {},
-        })
+    # details=true returns the full bond documents (risk, ESG, sector, liquidity and
+    # demand fields) for scoring; fields projects them; the default is the catalog summary
+    event = event or {}
+    include_details = bool(event.get('details'))
+    fields = None if include_details else event.get('fields') or BOND_SUMMARY_FIELDS
 
-    log('info', 'list-bonds start', requestId=request_id)
+    log('info', 'list-bonds start', requestId=request_id, details=include_details)
 
     try:
-        lambda_client = get_lambda_client()
-
         # Dynamically discover all bond files in the bonds/ directory
-        list_response = lambda_client.invoke(
-            FunctionName=LIST_FILES_FUNCTION_ARN,
-            InvocationType='RequestResponse',
-            Payload=json.dumps({'filename': 'bonds'})
-        )
-        
-        list_result = json.loads(list_response['Payload'].read())
-        list_body = json.loads(list_result.get('body', '{}'))
-        
-        if list_result.get('statusCode') != 200:
-            log('warning', 'list-files failed for bonds directory', requestId=request_id)
-            bond_files = []
-        else:
-            # Extract .json files from the directory listing
-            files = list_body.get('files', [])
-            bond_files = [f'bonds/{f}' for f in files if f.endswith('.json')]
-        
+        try:
+            objects = data_access.list_objects('bonds')
+        except data_access.DataNotFound:
+            log('warning', 'listing failed for bonds directory', requestId=request_id)
+            objects = []
+        listing = {f'bonds/{name}': etag for name, etag in objects if name.endswith('.json')}
+        bond_files = list(listing)
+
         if not bond_files:
             log('warning', 'no bond files found', requestId=request_id)
-            return build_response(200, request_id, {'bonds': []})
-
-        bonds_summary = []
-        for filename in bond_files:
-            content = get_file_content(lambda_client, filename, request_id)
-            if not content:
-                continue
-            try:
-                bond = content if isinstance(content, dict) else json.loads(content)
-                bonds_summary.append({
-                    "productId": bond.get("productId"),
-                    "name": bond.get("name"),
-                    "type": bond.get("type"),
-                    "yield": bond.get("yield"),
-                    "maturity": bond.get("maturity"),
-                    "minInvestment": bond.get("minInvestment"),
-                    "creditRating": bond.get("creditRating"),
-                })
-            except Exception as parse_err:  # noqa: BLE001
-                log('warning', 'bond parse failed', requestId=request_id, filename=filename, error=str(parse_err))
-                continue
-
-        log('info', 'list-bonds success', requestId=request_id, count=len(bonds_summary))
-        return build_response(200, request_id, {'bonds': bonds_summary})
+            return build_response(200, request_id, {'bonds': [], 'total': 0, 'nextCursor': None})
+
+        # One read of the published manifest replaces a read per bond file
+        manifest = read_manifest({name[len('bonds/'):]: etag for name, etag in listing.items()}, request_id)
+        bonds, unread = (None, []) if manifest is not None else (cached_bonds(listing), [])
+        if manifest is None and bonds is None:
+            read_start = time.time()
+            bonds, unread = read_bonds(bond_files, request_id, read_timeout_seconds(context), etags=listing)
+            log('info' if not unread else 'warning', 'bond files read', requestId=request_id, files=len(bond_files),
+                read=len(bonds), unread=len(unread), durationMs=round((time.time() - read_start) * 1000))
+            if not unread:
+                _bonds_cache.update(listing=listing, bonds=bonds)
+        total = manifest['count'] if manifest is not None else len(bonds)
+        if not total:
+            return build_response(502, request_id, {
+                'errorCode': 'BOND_READ_FAILED',
+                'message': f'None of the {len(bond_files)} bond files could be read',
+                'details': {'unreadFiles': unread[:MAX_UNREAD_REPORTED]},
+            })
+
+        try:
+            if manifest is not None:
+                bonds = manifest_records(manifest, event, fields)
+            page, next_cursor = paginate(
+                bonds, 'productId', fields, sort_by=event.get('sort_by'), descending=bool(event.get('descending')),
+                limit=event.get('limit') or DEFAULT_PAGE_SIZE, cursor=event.get('cursor'),
+            )
+        except (ValueError, TypeError) as e:
+            return build_response(400, request_id, {
+                'errorCode': 'INVALID_PAGE_REQUEST',
+                'message': str(e),
+                'details': {},
+            })
+
+        payload = {'bonds': page, 'total': total, 'nextCursor': next_cursor,
+                   'catalogVersion': catalog_version(listing)}
+        if unread:
+            # A partial catalog says so, rather than passing for the whole one
+            payload['unreadFiles'] = unread[:MAX_UNREAD_REPORTED]
+            payload['unreadCount'] = len(unread)
+        log('info', 'list-bonds success', requestId=request_id, count=len(page), total=total,
+            sortBy=event.get('sort_by'), more=next_cursor is not None, manifest=manifest is not None)
+        return build_response(200, request_id, payload)
     except Exception as e:  # noqa: BLE001
         log('error', 'list-bonds failed', requestId=request_id, error=str(e))
         return build_response(500, request_id, {
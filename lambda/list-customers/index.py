@@ -1,21 +1,18 @@
 import json
-import boto3
 import os
 import logging
 import time
-from botocore.config import Config
+
+import data_access
+from customer_matching import BondMatchCriteria, match_customers
+from pagination import DEFAULT_PAGE_SIZE, paginate
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-READ_FILE_FUNCTION_ARN = os.environ.get('READ_FILE_FUNCTION_ARN', '')
-LIST_FILES_FUNCTION_ARN = os.environ.get('LIST_FILES_FUNCTION_ARN', '')
-
-boto_config = Config(
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=5,
-    read_timeout=10,
-)
+CUSTOMER_SUMMARY_FIELDS = ('customerId', 'name', 'email')
+CUSTOMER_STORE_SUFFIX = '.ndjson'
+MAX_MATCH_LIMIT = 500
 
 
 def log(level: str, message: str, **meta):
@@ -32,84 +29,104 @@ def build_response(status_code: int, request_id: str, payload: dict):
     }
 
 
+class CountedRecords:
+    """Iterates records once, counting them, so a streamed listing can report its total."""
+
+    def __init__(self, records):
+        self.records = records
+        self.count = 0
+
+    def __iter__(self):
+        for record in self.records:
+            self.count += 1
+            yield record
+
+
+def read_customers(customer_file: str, listing: dict):
+    """Customer records from the NDJSON store when it exists (keep in step with
+    agent/utils/customer_store.py), else from the JSON array.
+
+    Either stays parsed in the warm container; ``listing`` (name -> ETag) confirms it is
+    current without another request. A store too large for the cache is streamed instead.
+    """
+    store_file = f"{customer_file[:-len('.json')]}{CUSTOMER_STORE_SUFFIX}"
+    if data_access.direct() and store_file in listing:
+        return data_access.read_records(f'customers/{store_file}', etag=listing[store_file])
+    return data_access.read_json(f'customers/{customer_file}', etag=listing.get(customer_file))
+
+
 def lambda_handler(event, context):
     request_id = getattr(context, 'aws_request_id', 'unknown')
     log('info', 'list-customers start', requestId=request_id)
 
-    if not READ_FILE_FUNCTION_ARN:
+    if not data_access.configured(listing=True):
         return build_response(500, request_id, {
             'errorCode': 'CONFIG_ERROR',
-            'message': 'READ_FILE_FUNCTION_ARN is not configured',
+            'message': 'S3_DATA_BUCKET, or READ_FILE_FUNCTION_ARN and LIST_FILES_FUNCTION_ARN, must be configured',
             'details': {},
         })
 
-    if not LIST_FILES_FUNCTION_ARN:
+    event = event or {}
+    match_bond = event.get('match_bond')
+    if match_bond and not data_access.direct():
         return build_response(500, request_id, {
             'errorCode': 'CONFIG_ERROR',
-            'message': 'LIST_FILES_FUNCTION_ARN is not configured',
+            'message': 'S3_DATA_BUCKET is not configured',
             'details': {},
         })
 
     try:
-        lambda_client = boto3.client('lambda', config=boto_config)
-        
         # Dynamically discover customer files
-        list_response = lambda_client.invoke(
-            FunctionName=LIST_FILES_FUNCTION_ARN,
-            InvocationType='RequestResponse',
-            Payload=json.dumps({'filename': 'customers'})
-        )
-        
-        list_result = json.loads(list_response['Payload'].read())
-        list_body = json.loads(list_result.get('body', '{}'))
-        
-        if list_result.get('statusCode') != 200:
-            log('warning', 'list-files failed for customers directory', requestId=request_id)
-            return build_response(404, request_id, {
-                'errorCode': 'CUSTOMER_DB_NOT_FOUND',
-                'message': 'Customer database not found',
-                'details': {},
-            })
-        
+        try:
+            listing = dict(data_access.list_objects('customers'))
+        except data_access.DataNotFound:
+            log('warning', 'listing failed for customers directory', requestId=request_id)
+            listing = {}
+
         # Get the first .json file (customer database)
-        files = list_body.get('files', [])
-        customer_file = next((f for f in files if f.endswith('.json')), None)
-        
+        customer_file = next((f for f in listing if f.endswith('.json')), None)
+
         if not customer_file:
             return build_response(404, request_id, {
                 'errorCode': 'CUSTOMER_DB_NOT_FOUND',
                 'message': 'No customer database file found',
                 'details': {},
             })
-        
-        response = lambda_client.invoke(
-            FunctionName=READ_FILE_FUNCTION_ARN,
-            InvocationType='RequestResponse',
-            Payload=json.dumps({'filename': f'customers/{customer_file}'})
-        )
 
-        result = json.loads(response['Payload'].read())
-        body = json.loads(result.get('body', '{}'))
-
-        if result.get('statusCode') != 200:
-            return build_response(404, request_id, {
-                'errorCode': 'CUSTOMER_DB_NOT_FOUND',
-                'message': 'Customer database not found',
+        if match_bond:
+            # Full profiles are read straight from S3: the whole book would exceed the
+            # 6 MB Lambda response limit of read-file, and only the matches are returned
+            limit = max(0, min(int(event.get('limit') or 50), MAX_MATCH_LIMIT))
+            customers = read_customers(customer_file, listing)
+            result = match_customers(customers, BondMatchCriteria.from_payload(match_bond), limit)
+            log('info', 'list-customers match success', requestId=request_id,
+                productId=match_bond.get('productId'), scanned=result['scannedCount'], matched=result['matchedCount'])
+            return build_response(200, request_id, {'productId': match_bond.get('productId'), **result})
+
+        customers = CountedRecords(read_customers(customer_file, listing))
+
+        try:
+            page, next_cursor = paginate(
+                customers, 'customerId', event.get('fields') or CUSTOMER_SUMMARY_FIELDS,
+                sort_by=event.get('sort_by'), descending=bool(event.get('descending')),
+                limit=event.get('limit') or DEFAULT_PAGE_SIZE, cursor=event.get('cursor'),
+            )
+        except (ValueError, TypeError) as e:
+            return build_response(400, request_id, {
+                'errorCode': 'INVALID_PAGE_REQUEST',
+                'message': str(e),
                 'details': {},
             })
 
-        customers = body.get('content', [])
-
-        summary = []
-        for customer in customers:
-            summary.append({
-                "customerId": customer.get("customerId"),
-                "name": customer.get("name"),
-                "email": customer.get("email"),
-            })
-
-        log('info', 'list-customers success', requestId=request_id, count=len(summary))
-        return build_response(200, request_id, {'customers': summary})
+        log('info', 'list-customers success', requestId=request_id, count=len(page), total=customers.count,
+            sortBy=event.get('sort_by'), more=next_cursor is not None)
+        return build_response(200, request_id, {'customers': page, 'total': customers.count, 'nextCursor': next_cursor})
+    except data_access.DataNotFound:
+        return build_response(404, request_id, {
+            'errorCode': 'CUSTOMER_DB_NOT_FOUND',
+            'message': 'Customer database not found',
+            'details': {},
+        })
     except Exception as e:  # noqa: BLE001
         log('error', 'list-customers failed', requestId=request_id, error=str(e))
         return build_response(500, request_id, {
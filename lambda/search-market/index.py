@@ -1,14 +1,13 @@
 import json
-import boto3
 import os
 from datetime import datetime
 
-# AWS clients
-s3_client = boto3.client('s3')
+import data_access
 
 # Environment variables
-S3_DATA_BUCKET = os.environ.get('S3_DATA_BUCKET')
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+# How long a warm container serves its parsed market data before revalidating the ETag
+MARKET_DATA_TTL_SECONDS = float(os.environ.get('MARKET_DATA_TTL_SECONDS', '300'))
 
 def log(level, message, **meta):
     """Emit structured JSON log."""
@@ -39,7 +38,7 @@ def lambda_handler(event, context):
     log('INFO', 'Search market invoked', requestId=request_id, functionName=context.function_name)
     
     # Validate configuration
-    if not S3_DATA_BUCKET:
+    if not data_access.direct():
         log('ERROR', 'Missing S3_DATA_BUCKET environment variable', requestId=request_id)
         return build_response(500, request_id, {
             'errorCode': 'ConfigurationError',
@@ -61,7 +60,7 @@ def lambda_handler(event, context):
         
         # Determine market data file based on product type
         if 'bond' in product_type.lower():
-            market_data_key = 'client-details/market-data/bond-market-data.json'
+            market_data_key = 'market-data/bond-market-data.json'
         else:
             # No market data available for this product type
             log('INFO', 'No market data available for product type', requestId=request_id, productType=product_type)
@@ -73,16 +72,15 @@ def lambda_handler(event, context):
                 }
             })
         
-        # Read market data from S3
+        # Read market data from S3 (parsed once per warm container, revalidated by ETag)
         try:
-            response = s3_client.get_object(Bucket=S3_DATA_BUCKET, Key=market_data_key)
-            market_data_raw = json.loads(response['Body'].read().decode('utf-8'))
-        except s3_client.exceptions.NoSuchKey:
+            market_data_raw = data_access.read_json(market_data_key, max_age=MARKET_DATA_TTL_SECONDS)
+        except data_access.DataNotFound:
             log('ERROR', 'Market data file not found in S3', requestId=request_id, key=market_data_key)
             return build_response(404, request_id, {
                 'errorCode': 'NotFoundError',
                 'message': 'Market data not found',
-                'details': {'key': market_data_key}
+                'details': {'key': data_access.s3_key(market_data_key)}
             })
         except Exception as s3_err:
             log('ERROR', 'Failed to read market data from S3', requestId=request_id, error=str(s3_err))